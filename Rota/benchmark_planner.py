@@ -0,0 +1,153 @@
+"""
+Planlayici ve karar motoru performans olcumu
+
+Her olcek icin sentetik veritabani uretilir (core.synthetic_data), ardindan
+ayri bir surecte ROTA_DB_PATH ile bu veritabanina baglanilarak olculur.
+Sonuclar regresyon takibi icin JSON olarak yazilir.
+
+Kullanim:
+    python benchmark_planner.py                          # 1k / 10k / 100k
+    python benchmark_planner.py --sizes 1000 5000 --repeat 3
+    python benchmark_planner.py --cases forecast impact --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CASES = ("forecast", "impact", "decision", "matrix")
+
+# Etki analizinde eklenen ornek siparis
+SAMPLE_ORDER = {
+    "width": 200, "height": 150, "quantity": 40, "total_m2": 120,
+    "route": "INTERMAC,DOUBLEDGER,TEMPER A1,SEVKIYAT", "priority": "Acil",
+}
+
+
+# =============================================================================
+# OLCUM (alt surec)
+# =============================================================================
+def _case_forecast():
+    from core.smart_planner import SmartPlanner
+    SmartPlanner().calculate_forecast()
+
+
+def _case_impact():
+    from core.smart_planner import SmartPlanner
+    SmartPlanner().calculate_impact(SAMPLE_ORDER)
+
+
+def _case_decision():
+    from core.db_manager import db
+    from views.decision_view import SmartRecommendationEngine   # PySide6 gerektirir
+    orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
+    SmartRecommendationEngine().analyze(orders)
+
+
+def _case_matrix():
+    from core.db_manager import db
+    db.get_production_matrix_advanced()
+
+
+def run_worker(cases, repeat):
+    """ROTA_DB_PATH veritabaninda olcum yapar: {case: {'status', 'seconds', 'runs'}}"""
+    results = {}
+    for case in cases:
+        fn = globals()[f"_case_{case}"]
+        runs = []
+        try:
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                runs.append(time.perf_counter() - t0)
+            results[case] = {"status": "ok", "seconds": min(runs), "runs": runs}
+        except ImportError as e:
+            results[case] = {"status": "skipped", "reason": str(e)}
+        except Exception as e:
+            results[case] = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    return results
+
+
+# =============================================================================
+# YONETIM (ana surec)
+# =============================================================================
+def run_size(size, args, workdir):
+    from core.synthetic_data import generate_dataset
+
+    path = os.path.join(workdir, f"rota_{size}.db")
+    t0 = time.perf_counter()
+    stats = generate_dataset(path, size, args.logs_per_order and int(size * args.logs_per_order), seed=args.seed)
+    generate_seconds = time.perf_counter() - t0
+
+    result_file = os.path.join(workdir, f"result_{size}.json")
+    env = dict(os.environ, ROTA_DB_PATH=path)
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", result_file,
+           "--repeat", str(args.repeat), "--cases", *args.cases]
+    proc = subprocess.run(cmd, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    if proc.returncode != 0 or not os.path.exists(result_file):
+        cases = {c: {"status": "error", "reason": proc.stderr.strip()[-500:]} for c in args.cases}
+    else:
+        with open(result_file, encoding="utf-8") as f:
+            cases = json.load(f)
+
+    return {"orders": size, "logs": stats["logs"], "generate_seconds": generate_seconds, "cases": cases}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA - Planlayici benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Siparis sayilari")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1, help="Her olcum kac kez (en iyisi raporlanir)")
+    parser.add_argument("--logs-per-order", type=float, default=None, help="Siparis basina uretim kaydi")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON dosyasi (verilmezse ekrana)")
+    parser.add_argument("--keep", action="store_true", help="Sentetik veritabanlarini silme")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with open(args.worker, "w", encoding="utf-8") as f:
+            json.dump(run_worker(args.cases, args.repeat), f)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="rota_bench_")
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for size in args.sizes:
+        entry = run_size(size, args, workdir)
+        report["results"].append(entry)
+        summary = ", ".join(f"{c}={r['seconds']:.3f}s" if r["status"] == "ok" else f"{c}={r['status']}"
+                            for c, r in entry["cases"].items())
+        print(f"[{size} siparis] uretim {entry['generate_seconds']:.2f}s | {summary}", file=sys.stderr)
+
+    if not args.keep:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+    else:
+        report["workdir"] = workdir
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Widget olusturma (stil) performans olcumu
+
+Ayni satir/kart widget'larini iki yoldan N adet olusturup gosterir:
+- inline: eski yol, her widget kendi f-string stil sayfasini tasir
+  (setStyleSheet -> her ornek icin ayri ayristirma ve polish)
+- qss: guncel yol, objectName + dinamik ozellik; stil uygulama genelinde
+  tek sefer (Theme.apply_app_style, ui/styles.qss)
+
+Iki yolda da ayni uygulama stili yuklenir; sure olusturma + ilk gosterim
+(polish) dahil olculur. Ekran gerekmez (QT_QPA_PLATFORM=offscreen).
+
+Kullanim:
+    python benchmark_styles.py                       # 1000 satir
+    python benchmark_styles.py --rows 200 1000 --repeat 3 --output styles.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (QApplication, QFrame, QHBoxLayout, QLabel, QProgressBar, QPushButton,
+                               QVBoxLayout, QWidget)
+
+from ui.theme import Theme, ExcelColors as C
+
+CASES = ("production_station", "route_station", "metric_card", "capacity_bar")
+STATIONS = [("Bitti", 40, 40), ("Kısmi", 15, 40), ("Bekliyor", 0, 40)]
+ROUTE = [("completed", 40), ("partial", 15), ("current", 0), ("pending", 0)]
+
+
+# =============================================================================
+# ESKI YOL (widget basina stil sayfasi)
+# Widget agaci, boyutlar ve kenar bosluklari user-049 oncesi kodun birebir
+# kopyasi; iki yol yalnizca stilin nereden geldigiyle ayrilir.
+# =============================================================================
+def _inline_station_row(i):
+    """views/production_view.py ProductionView._create_station_row (eski)"""
+    status, done, total = STATIONS[i % len(STATIONS)]
+    row = QFrame()
+    row.setFixedHeight(44)
+    row.setStyleSheet(f"QFrame {{ background-color: {C.ROW_ALT}; border: 1px solid {C.GRID}; border-radius: 4px; }}")
+    layout = QHBoxLayout(row)
+    layout.setContentsMargins(12, 6, 12, 6)
+    layout.setSpacing(12)
+    icon_text, color = {"Bitti": ("●", C.SUCCESS), "Kısmi": ("◐", C.WARNING)}.get(status, ("○", C.TEXT_MUTED))
+    for text, width, style in [(icon_text, 16, f"font-size: 14px; color: {color};"),
+                               (f"ISTASYON {i}", 110, f"font-size: 11px; font-weight: bold; color: {C.TEXT};"),
+                               (f"{done}/{total}", 60, f"font-size: 11px; color: {C.TEXT_SECONDARY};")]:
+        lbl = QLabel(text)
+        lbl.setFixedWidth(width)
+        lbl.setStyleSheet(style)
+        layout.addWidget(lbl)
+    bar = QProgressBar()
+    bar.setRange(0, 100)
+    bar.setValue(int(done / total * 100))
+    bar.setTextVisible(False)
+    bar.setFixedHeight(6)
+    bar.setStyleSheet(f"""
+        QProgressBar {{ background-color: {C.BORDER}; border: none; border-radius: 3px; }}
+        QProgressBar::chunk {{ background-color: {color}; border-radius: 3px; }}
+    """)
+    layout.addWidget(bar, 1)
+    layout.addStretch()
+    if status in ("Bekliyor", "Kısmi"):
+        btn = QPushButton("Uretim Gir")
+        btn.setFixedSize(85, 28)
+        btn.setStyleSheet(f"""
+            QPushButton {{ background-color: {C.ACCENT}; border: none; border-radius: 3px;
+                           color: white; font-size: 10px; font-weight: bold; }}
+            QPushButton:hover {{ background-color: #1D6640; }}
+        """)
+        layout.addWidget(btn)
+    else:
+        lbl_done = QLabel("Tamamlandi")
+        lbl_done.setStyleSheet(f"font-size: 10px; color: {C.SUCCESS}; font-weight: bold;")
+        layout.addWidget(lbl_done)
+    return row
+
+
+def _inline_route_row(i):
+    """views/order_detail_dialog.py OrderDetailDialog._create_station_row (eski)"""
+    status, done = ROUTE[i % len(ROUTE)]
+    bg, border, icon = {"completed": (C.SUCCESS_BG, C.SUCCESS, "●"), "partial": (C.WARNING_BG, C.WARNING, "◐"),
+                        "current": (C.INFO_BG, C.INFO, "▶")}.get(status, (C.BG, C.BORDER, "○"))
+    color = border if status != "pending" else C.TEXT_MUTED
+    row = QFrame()
+    row.setFixedHeight(36)
+    row.setStyleSheet(f"QFrame {{ background-color: {bg}; border: 1px solid {border}; border-radius: 3px; }}")
+    layout = QHBoxLayout(row)
+    layout.setContentsMargins(10, 0, 10, 0)
+    layout.setSpacing(10)
+    for text, width, style in [(icon, 16, f"color: {color}; font-size: 12px;"),
+                               (f"ISTASYON {i}", 120, f"font-size: 11px; font-weight: bold; color: {C.TEXT};")]:
+        lbl = QLabel(text)
+        lbl.setFixedWidth(width)
+        lbl.setStyleSheet(style)
+        layout.addWidget(lbl)
+    bar = QProgressBar()
+    bar.setFixedSize(80, 6)
+    bar.setValue(int(done / 40 * 100))
+    bar.setTextVisible(False)
+    bar.setStyleSheet(f"""
+        QProgressBar {{ background-color: {C.GRID}; border: none; border-radius: 3px; }}
+        QProgressBar::chunk {{ background-color: {color if status != 'pending' else C.GRID}; border-radius: 3px; }}
+    """)
+    layout.addWidget(bar)
+    lbl_qty = QLabel(f"{done}/40")
+    lbl_qty.setFixedWidth(60)
+    lbl_qty.setStyleSheet(f"font-size: 10px; color: {C.TEXT_SECONDARY};")
+    layout.addWidget(lbl_qty)
+    layout.addStretch()
+    text = {"completed": "Tamamlandı", "partial": "Devam ediyor", "current": "Sırada"}.get(status, "Bekliyor")
+    lbl_status = QLabel(text)
+    lbl_status.setStyleSheet(f"font-size: 10px; color: {color};")
+    layout.addWidget(lbl_status)
+    return row
+
+
+def _inline_metric_card(i):
+    """views/dashboard_view.py MetricCard (eski)"""
+    card = QFrame()
+    card.setStyleSheet(f"QFrame {{ background-color: {C.BG}; border: 1px solid {C.BORDER}; border-radius: 6px; }}")
+    layout = QVBoxLayout(card)
+    layout.setContentsMargins(16, 14, 16, 14)
+    layout.setSpacing(4)
+    header = QHBoxLayout()
+    lbl_title = QLabel("Aktif Siparisler")
+    lbl_title.setStyleSheet(f"font-size: 11px; color: {C.TEXT_MUTED}; font-weight: 500;")
+    header.addWidget(lbl_title)
+    header.addStretch()
+    layout.addLayout(header)
+    for text, style in [(str(i), f"font-size: 28px; font-weight: bold; color: {C.INFO};"),
+                        ("Beklemede + Uretimde", f"font-size: 10px; color: {C.TEXT_SECONDARY};")]:
+        lbl = QLabel(text)
+        lbl.setStyleSheet(style)
+        layout.addWidget(lbl)
+    return card
+
+
+def _inline_capacity_bar(i):
+    """views/dashboard_view.py CapacityBar (eski)"""
+    percent = (i * 7) % 120
+    color = C.CRITICAL if percent > 90 else C.WARNING if percent > 70 else C.SUCCESS
+    widget = QFrame()
+    widget.setFixedHeight(32)
+    layout = QHBoxLayout(widget)
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.setSpacing(12)
+    lbl = QLabel(f"ISTASYON {i}")
+    lbl.setFixedWidth(100)
+    lbl.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {C.TEXT};")
+    layout.addWidget(lbl)
+    bar = QProgressBar()
+    bar.setFixedHeight(8)
+    bar.setTextVisible(False)
+    bar.setValue(min(percent, 100))
+    bar.setStyleSheet(f"""
+        QProgressBar {{ background-color: {C.GRID}; border: none; border-radius: 4px; }}
+        QProgressBar::chunk {{ background-color: {color}; border-radius: 4px; }}
+    """)
+    layout.addWidget(bar, 1)
+    pct = QLabel(f"%{percent}")
+    pct.setFixedWidth(45)
+    pct.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    pct.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {color};")
+    layout.addWidget(pct)
+    lbl_status = QLabel("Normal")
+    lbl_status.setFixedWidth(50)
+    lbl_status.setStyleSheet(f"font-size: 10px; color: {C.TEXT_MUTED};")
+    layout.addWidget(lbl_status)
+    return widget
+
+
+# =============================================================================
+# GUNCEL YOL (uygulama stili + objectName / dinamik ozellik)
+# =============================================================================
+def _qss_station_row(i):
+    from views.production_view import ProductionView
+    status, done, total = STATIONS[i % len(STATIONS)]
+    # self yalnizca "Uretim Gir" tiklaninca kullanilir
+    return ProductionView._create_station_row(None, f"ISTASYON {i}", {"status": status, "done": done, "total": total})
+
+
+def _qss_route_row(i):
+    from views.order_detail_dialog import OrderDetailDialog
+    status, done = ROUTE[i % len(ROUTE)]
+    return OrderDetailDialog._create_station_row(None, f"ISTASYON {i}", done, 40, status)
+
+
+def _qss_metric_card(i):
+    from views.dashboard_view import MetricCard
+    return MetricCard("Aktif Siparisler", str(i), "Beklemede + Uretimde", "info")
+
+
+def _qss_capacity_bar(i):
+    from views.dashboard_view import CapacityBar
+    return CapacityBar(f"ISTASYON {i}", (i * 7) % 120)
+
+
+BUILDERS = {
+    "production_station": (_inline_station_row, _qss_station_row),
+    "route_station": (_inline_route_row, _qss_route_row),
+    "metric_card": (_inline_metric_card, _qss_metric_card),
+    "capacity_bar": (_inline_capacity_bar, _qss_capacity_bar),
+}
+
+
+# =============================================================================
+# OLCUM
+# =============================================================================
+def measure(app, builder, rows, repeat):
+    """rows adet widget'i olustur + goster (polish dahil); en iyi sureyi doner"""
+    runs = []
+    for _ in range(repeat):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        t0 = time.perf_counter()
+        for i in range(rows):
+            layout.addWidget(builder(i))
+        container.show()
+        app.processEvents()
+        runs.append(time.perf_counter() - t0)
+        container.deleteLater()
+        app.processEvents()
+    return min(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA - Widget stil benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000], help="Olusturulacak widget sayilari")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1, help="Her olcum kac kez (en iyisi raporlanir)")
+    parser.add_argument("--output", help="JSON dosyasi (verilmezse ekrana)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    Theme.apply_app_style(app)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for rows in args.rows:
+        entry = {"rows": rows, "cases": {}}
+        for case in args.cases:
+            inline, qss = BUILDERS[case]
+            before = measure(app, inline, rows, args.repeat)
+            after = measure(app, qss, rows, args.repeat)
+            entry["cases"][case] = {"inline": before, "qss": after, "speedup": before / after if after else None}
+            print(f"[{rows} satir] {case}: inline {before:.3f}s | qss {after:.3f}s", file=sys.stderr)
+        report["results"].append(entry)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,15 @@
 EFES ROTA X - Thread-Safe Veritabanı İşlemleri
 QThread ile arka planda veritabanı sorguları çalıştırır.
 UI donmasını önler.
+
+SQL metni yerine DatabaseManager metodu da çalıştırılabilir (async_db.call);
+ekran ViewModel'leri (core.view_models) verilerini bu yoldan yükler.
+Worker ilk görevde kendiliğinden başlar, uygulama kapanırken durdurulur.
 """
 
-from PySide6.QtCore import QThread, Signal, QObject, QMutex, QMutexLocker
+from PySide6.QtCore import (
+    QThread, Signal, QObject, QMutex, QMutexLocker, QWaitCondition, QCoreApplication
+)
 from typing import Any, Callable, Optional, List, Dict
 from dataclasses import dataclass
 from enum import Enum
@@ -29,6 +35,7 @@ class DBTask:
     error_callback: Callable = None
     priority: TaskPriority = TaskPriority.NORMAL
     fetch_type: str = "all"  # "all", "one", "execute"
+    func: Callable = None    # Verilirse sorgu yerine worker thread'de çağrılır
 
 
 class DatabaseWorker(QThread):
@@ -50,46 +57,51 @@ class DatabaseWorker(QThread):
         self.db_manager = db_manager
         self._tasks: List[DBTask] = []
         self._mutex = QMutex()
+        self._wake = QWaitCondition()
         self._running = True
     
     def add_task(self, task: DBTask):
         """Göreve ekle"""
         with QMutexLocker(self._mutex):
-            # Önceliğe göre sırala
+            # Önceliğe göre sırala (aynı öncelikte geliş sırası korunur)
             self._tasks.append(task)
             self._tasks.sort(key=lambda x: x.priority.value, reverse=True)
+            self._wake.wakeOne()
     
     def run(self):
-        """Thread ana döngüsü"""
+        """Thread ana döngüsü (kuyruk boşken uyur, görev gelince uyanır)"""
         while self._running:
             task = None
             
             with QMutexLocker(self._mutex):
+                if not self._tasks and self._running:
+                    self._wake.wait(self._mutex, 1000)
                 if self._tasks:
                     task = self._tasks.pop(0)
             
             if task:
                 self._execute_task(task)
-            else:
-                self.msleep(50)  # CPU kullanımını azalt
     
     def _execute_task(self, task: DBTask):
         """Görevi çalıştır"""
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.execute(task.query, task.params or ())
-                
-                if task.fetch_type == "all":
-                    result = cursor.fetchall()
-                elif task.fetch_type == "one":
-                    result = cursor.fetchone()
-                else:
-                    result = cursor.lastrowid
-                
-                self.result_ready.emit(task.task_id, result)
-                
-                if task.callback:
-                    task.callback(result)
+            if task.func is not None:
+                result = task.func()
+            else:
+                with self.db_manager.get_connection() as conn:
+                    cursor = conn.execute(task.query, task.params or ())
+                    
+                    if task.fetch_type == "all":
+                        result = cursor.fetchall()
+                    elif task.fetch_type == "one":
+                        result = cursor.fetchone()
+                    else:
+                        result = cursor.lastrowid
+            
+            self.result_ready.emit(task.task_id, result)
+            
+            if task.callback:
+                task.callback(result)
                     
         except Exception as e:
             error_msg = str(e)
@@ -100,7 +112,9 @@ class DatabaseWorker(QThread):
     
     def stop(self):
         """Worker'ı durdur"""
-        self._running = False
+        with QMutexLocker(self._mutex):
+            self._running = False
+            self._wake.wakeAll()
         self.wait()
 
 
@@ -138,6 +152,7 @@ class AsyncDatabaseManager(QObject):
         self._worker: Optional[DatabaseWorker] = None
         self._task_counter = 0
         self._callbacks: Dict[str, tuple] = {}
+        self._quit_hooked = False
     
     def set_database(self, db_manager):
         """Veritabanı bağlantısını ayarla"""
@@ -153,6 +168,25 @@ class AsyncDatabaseManager(QObject):
         self._worker.result_ready.connect(self._on_result)
         self._worker.error_occurred.connect(self._on_error)
         self._worker.start()
+        
+        # Uygulama kapanırken thread'i temiz durdur
+        app = QCoreApplication.instance()
+        if app is not None and not self._quit_hooked:
+            app.aboutToQuit.connect(self.shutdown)
+            self._quit_hooked = True
+    
+    def _submit(self, task: DBTask) -> str:
+        """Görevi worker kuyruğuna ekle (worker yoksa varsayılan veritabanıyla başlat)"""
+        if self._worker is None or not self._worker.isRunning():
+            if self._db_manager is None:
+                try:
+                    from core.db_manager import db as default_db
+                except ImportError:
+                    default_db = None
+                self._db_manager = default_db
+            self._start_worker()
+        self._worker.add_task(task)
+        return task.task_id
     
     def _generate_task_id(self) -> str:
         """Benzersiz görev ID'si oluştur"""
@@ -193,8 +227,7 @@ class AsyncDatabaseManager(QObject):
             fetch_type="all"
         )
         
-        self._worker.add_task(task)
-        return task_id
+        return self._submit(task)
     
     def fetch_one(self, query: str, params: tuple = None,
                   callback: Callable = None, error_callback: Callable = None,
@@ -212,8 +245,7 @@ class AsyncDatabaseManager(QObject):
             fetch_type="one"
         )
         
-        self._worker.add_task(task)
-        return task_id
+        return self._submit(task)
     
     def execute(self, query: str, params: tuple = None,
                 callback: Callable = None, error_callback: Callable = None,
@@ -231,8 +263,28 @@ class AsyncDatabaseManager(QObject):
             fetch_type="execute"
         )
         
-        self._worker.add_task(task)
-        return task_id
+        return self._submit(task)
+    
+    def call(self, func: Callable, *args,
+             callback: Callable = None, error_callback: Callable = None,
+             priority: TaskPriority = TaskPriority.NORMAL, **kwargs) -> str:
+        """
+        Bir fonksiyonu (ör. DatabaseManager metodu) worker thread'de çalıştır.
+        callback / error_callback GUI thread'inde çağrılır; func widget'lara dokunmamalı.
+        """
+        task_id = self._generate_task_id()
+        
+        self._callbacks[task_id] = (callback, error_callback)
+        
+        task = DBTask(
+            task_id=task_id,
+            query="",
+            priority=priority,
+            fetch_type="call",
+            func=lambda: func(*args, **kwargs)
+        )
+        
+        return self._submit(task)
     
     def execute_many(self, query: str, params_list: List[tuple],
                      callback: Callable = None, error_callback: Callable = None) -> str:
@@ -261,10 +313,10 @@ class AsyncDatabaseManager(QObject):
     def load_orders(self, status: str = None, callback: Callable = None):
         """Siparişleri yükle"""
         if status:
-            query = "SELECT * FROM orders WHERE status = ? ORDER BY deadline"
+            query = "SELECT * FROM orders WHERE status = ? ORDER BY delivery_date"
             params = (status,)
         else:
-            query = "SELECT * FROM orders ORDER BY deadline"
+            query = "SELECT * FROM orders ORDER BY delivery_date"
             params = None
         
         return self.fetch_all(query, params, callback, priority=TaskPriority.HIGH)
@@ -311,8 +363,8 @@ class AsyncDatabaseManager(QObject):
         """Sipariş ara"""
         query = """
             SELECT * FROM orders 
-            WHERE customer LIKE ? OR notes LIKE ? OR id = ?
-            ORDER BY deadline
+            WHERE customer_name LIKE ? OR order_code LIKE ? OR id = ?
+            ORDER BY delivery_date
             LIMIT 100
         """
         term = f"%{search_term}%"
@@ -358,6 +410,7 @@ class DataLoader(QObject):
         super().__init__()
         self.db = db_manager
         self._loading_count = 0
+        self._own_async: Optional[AsyncDatabaseManager] = None
     
     def _start_loading(self):
         """Yükleme başladı"""
@@ -386,47 +439,48 @@ class DataLoader(QObject):
             self._finish_loading()
             self.error.emit(f"Sipariş yükleme hatası: {msg}")
         
-        # Senkron çalıştır (basit kullanım için)
-        try:
-            with self.db.get_connection() as conn:
-                if status:
-                    cursor = conn.execute(
-                        "SELECT * FROM orders WHERE status = ? ORDER BY deadline",
-                        (status,)
-                    )
-                else:
-                    cursor = conn.execute("SELECT * FROM orders ORDER BY deadline")
-                
-                data = cursor.fetchall()
-                on_loaded(data)
-        except Exception as e:
-            on_error(str(e))
+        # Worker thread'de çalışır; sonuç sinyal/callback ile GUI thread'ine gelir
+        if status:
+            query = "SELECT * FROM orders WHERE status = ? ORDER BY delivery_date"
+            params = (status,)
+        else:
+            query = "SELECT * FROM orders ORDER BY delivery_date"
+            params = None
+        
+        self._async().fetch_all(query, params, callback=on_loaded, error_callback=on_error,
+                                priority=TaskPriority.HIGH)
     
     def load_order(self, order_id: int, callback: Callable = None):
         """Tek sipariş yükle"""
         self._start_loading()
         
-        try:
-            with self.db.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT * FROM orders WHERE id = ?",
-                    (order_id,)
-                )
-                row = cursor.fetchone()
-                
-                self._finish_loading()
-                
-                if row:
-                    order = dict(row)
-                    self.order_loaded.emit(order)
-                    if callback:
-                        callback(order)
-                else:
-                    self.error.emit(f"Sipariş bulunamadı: {order_id}")
-                    
-        except Exception as e:
+        def on_loaded(row):
+            self._finish_loading()
+            if row:
+                order = dict(row)
+                self.order_loaded.emit(order)
+                if callback:
+                    callback(order)
+            else:
+                self.error.emit(f"Sipariş bulunamadı: {order_id}")
+        
+        def on_error(msg):
             self._finish_loading()
-            self.error.emit(str(e))
+            self.error.emit(msg)
+        
+        self._async().fetch_one("SELECT * FROM orders WHERE id = ?", (order_id,),
+                                callback=on_loaded, error_callback=on_error,
+                                priority=TaskPriority.HIGH)
+    
+    def _async(self) -> "AsyncDatabaseManager":
+        """Yükleyicinin veritabanına bağlı asenkron yönetici"""
+        if async_db._db_manager is None:
+            async_db._db_manager = self.db
+        if async_db._db_manager is self.db:
+            return async_db
+        if self._own_async is None:
+            self._own_async = AsyncDatabaseManager(self.db)
+        return self._own_async
 
 
 # Global instance (db_manager sonra set edilecek)
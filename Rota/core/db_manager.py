@@ -4,6 +4,8 @@ import os
 from contextlib import contextmanager
 from datetime import datetime
 
+from core.queue_index import QUEUE_POSITION_UNSET, QUEUE_KEY_EPSILON
+
 # === YENİ: GÜVENLİK VE LOGLAMA ===
 try:
     from core.security import password_manager
@@ -19,6 +21,23 @@ class DatabaseManager:
     GÜNCELLENMİŞ SÜRÜM - Güvenlik + Loglama + Tüm Metodlar ✅
     """
     
+    # Değişiklik kapsamı -> izlenen tablo
+    DATA_VERSION_SCOPES = {
+        "orders": "orders",
+        "progress": "production_logs",
+        "pallets": "shipments",
+        "capacities": "factory_settings",
+        "calendar": "holidays",
+    }
+
+    # Sipariş bazlı değişiklik akışı: tablo -> (kapsam, sipariş id kolonu)
+    CHANGE_FEED_TABLES = {
+        "orders": ("orders", "id"),
+        "production_logs": ("progress", "order_id"),
+    }
+    CHANGE_LOG_KEEP = 50000     # Bu kadar son kayıt tutulur
+    CHANGE_LOG_TRIM_EVERY = 1000    # Her N eklemede bir budanır (uygulama açıkken de)
+
     def __init__(self, db_name="efes_factory.db"):
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = os.path.join(base_dir, db_name)
@@ -96,15 +115,97 @@ class DatabaseManager:
             # 7. SEVKİYAT
             cursor.execute("""CREATE TABLE IF NOT EXISTS shipments (id INTEGER PRIMARY KEY AUTOINCREMENT, pallet_name TEXT NOT NULL, customer_name TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, status TEXT DEFAULT 'Hazırlanıyor')""")
 
-            # 8. YENİ: PERFORMANS İÇİN INDEX'LER
+            # 8. TATİL GÜNLERİ (Planlama takvimi)
+            cursor.execute("""CREATE TABLE IF NOT EXISTS holidays (holiday_date TEXT UNIQUE, description TEXT)""")
+
+            # 9. VERİ SÜRÜMLERİ (Değişiklik algılama - tetikleyicilerle artar)
+            cursor.execute("""CREATE TABLE IF NOT EXISTS data_versions (scope TEXT PRIMARY KEY, version INTEGER DEFAULT 0)""")
+            for scope, table in self.DATA_VERSION_SCOPES.items():
+                cursor.execute("INSERT OR IGNORE INTO data_versions (scope, version) VALUES (?, 0)", (scope,))
+                for op in ("INSERT", "UPDATE", "DELETE"):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_version AFTER {op} ON {table}
+                        BEGIN UPDATE data_versions SET version = version + 1 WHERE scope = '{scope}'; END
+                    """)
+
+            # 9.1 DEĞİŞİKLİK AKIŞI (Hangi sipariş değişti - artımlı analiz için)
+            cursor.execute("""CREATE TABLE IF NOT EXISTS change_log (id INTEGER PRIMARY KEY AUTOINCREMENT, scope TEXT, order_id INTEGER, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+            for table, (scope, column) in self.CHANGE_FEED_TABLES.items():
+                for op, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_{table}_{op.lower()}_change AFTER {op} ON {table}
+                        BEGIN INSERT INTO change_log (scope, order_id) VALUES ('{scope}', {row}.{column}); END
+                    """)
+            cursor.execute("DELETE FROM change_log WHERE id <= (SELECT MAX(id) FROM change_log) - ?", (self.CHANGE_LOG_KEEP,))
+            # Çalışırken büyümesin: her N. kayıtta eskiler silinir (sabitler değişirse tetikleyici yenilenir)
+            cursor.execute("DROP TRIGGER IF EXISTS trg_change_log_trim")
+            cursor.execute(f"""
+                CREATE TRIGGER trg_change_log_trim AFTER INSERT ON change_log
+                WHEN NEW.id % {int(self.CHANGE_LOG_TRIM_EVERY)} = 0
+                BEGIN DELETE FROM change_log WHERE id <= NEW.id - {int(self.CHANGE_LOG_KEEP)}; END
+            """)
+
+            # 10. PLAN SONUÇLARI (Son tahmin bir kez saklanır, tüm ekranlar okur)
+            cursor.execute("""CREATE TABLE IF NOT EXISTS plan_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, plan_date TEXT, data_version INTEGER, horizon_days INTEGER, job_count INTEGER DEFAULT 0)""")
+            cursor.execute("""CREATE TABLE IF NOT EXISTS plan_cells (run_id INTEGER, station TEXT, day_idx INTEGER, percent REAL, load_m2 REAL)""")
+            cursor.execute("""CREATE TABLE IF NOT EXISTS plan_jobs (run_id INTEGER, station TEXT, order_code TEXT, customer_name TEXT, start_h REAL, end_h REAL, m2 REAL)""")
+            cursor.execute("""CREATE TABLE IF NOT EXISTS plan_orders (run_id INTEGER, order_code TEXT, finish_day REAL, finish_at TEXT)""")
+
+            # 10.1 SIRA ANAHTARI (Karar Destek sırası - seyrek/kesirli, bkz. core.queue_index)
+            order_columns = {r[1] for r in cursor.execute("PRAGMA table_info(orders)").fetchall()}
+            if "queue_position" not in order_columns:
+                cursor.execute(f"ALTER TABLE orders ADD COLUMN queue_position REAL DEFAULT {QUEUE_POSITION_UNSET}")
+
+            # 11. YENİ: PERFORMANS İÇİN INDEX'LER
             try:
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_queue_position ON orders(queue_position)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_name)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_order_id ON production_logs(order_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_station ON production_logs(station_name)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON production_logs(timestamp, id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_plan_cells_run ON plan_cells(run_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_plan_jobs_run ON plan_jobs(run_id, station, start_h)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_plan_orders_run ON plan_orders(run_id)")
             except:
                 pass
 
+    def get_data_versions(self):
+        """Kapsam bazında veri sürümleri: {'orders': 12, 'progress': 40, ...}"""
+        with self.get_connection() as conn:
+            return {r[0]: r[1] for r in conn.execute("SELECT scope, version FROM data_versions").fetchall()}
+
+    def get_change_cursor(self):
+        """Değişiklik akışının son konumu (artımlı okumanın başlangıcı)"""
+        with self.get_connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_log").fetchone()[0]
+
+    def get_changes_since(self, cursor):
+        """
+        cursor sonrasında değişen siparişler.
+        Dönüş: (yeni cursor, {kapsam: {order_id, ...}})
+        Akış cursor'dan sonrası budanmışsa değişiklikler None (tam yenileme gerekir).
+        """
+        with self.get_connection() as conn:
+            first, last = conn.execute("SELECT MIN(id), MAX(id) FROM change_log").fetchone()
+            if last is None or last <= cursor:
+                return cursor, {}
+            if cursor and first > cursor + 1:
+                return last, None
+            changes = {}
+            for scope, order_id in conn.execute(
+                    "SELECT DISTINCT scope, order_id FROM change_log WHERE id > ? AND id <= ?", (cursor, last)):
+                if order_id is not None:
+                    changes.setdefault(scope, set()).add(order_id)
+            return last, changes
+
+    def get_data_version(self, scopes=None):
+        """Tek sayılık değişiklik jetonu (verilen kapsamların toplamı)"""
+        versions = self.get_data_versions()
+        if scopes is None:
+            return sum(versions.values())
+        return sum(versions.get(s, 0) for s in scopes)
+
     # =========================================================================
     # BAŞLANGIÇ VERİLERİ
     # =========================================================================
@@ -406,6 +507,54 @@ class DatabaseManager:
             r = conn.execute("SELECT * FROM orders WHERE id=?", (order_id,)).fetchone()
             return dict(r) if r else None
 
+    def move_order_between(self, order_id, prev_id=None, next_id=None):
+        """
+        Siparişi iki komşusunun arasına taşır (tek satır UPDATE).
+        prev_id: üstteki komşu (None = en üst), next_id: alttaki komşu (None = en alt)
+        Dönüş: yeni queue_position; komşu sırasızsa ya da aralık tükendiyse None
+        (çağıran set_queue_positions ile yeniden numaralamalı).
+        """
+        with self.get_connection() as conn:
+            def position(oid):
+                r = conn.execute("SELECT queue_position FROM orders WHERE id = ?", (oid,)).fetchone()
+                return r[0] if r and r[0] is not None else QUEUE_POSITION_UNSET
+
+            lower = position(prev_id) if prev_id is not None else 0.0
+            upper = position(next_id) if next_id is not None else QUEUE_POSITION_UNSET
+            if lower >= QUEUE_POSITION_UNSET:
+                return None
+            if upper >= QUEUE_POSITION_UNSET:
+                upper = min(lower + 2.0, QUEUE_POSITION_UNSET)
+            if upper - lower < 2 * QUEUE_KEY_EPSILON:
+                return None
+            key = (lower + upper) / 2.0
+            conn.execute("UPDATE orders SET queue_position = ? WHERE id = ?", (key, order_id))
+            return key
+
+    def set_queue_positions(self, positions, priorities=None):
+        """
+        Sıra anahtarlarını (ve değişen öncelikleri) tek işlemde yazar.
+        positions: {order_id: queue_position}, priorities: {order_id: öncelik}
+        Yalnızca verilen satırlar güncellenir.
+        """
+        priorities = priorities or {}
+        with self.get_connection() as conn:
+            conn.executemany("UPDATE orders SET queue_position = ? WHERE id = ?",
+                             [(pos, oid) for oid, pos in positions.items()])
+            conn.executemany("UPDATE orders SET priority = ? WHERE id = ?",
+                             [(prio, oid) for oid, prio in priorities.items()])
+
+    def get_orders_by_ids(self, order_ids):
+        """Verilen id'lerdeki siparişler (parça parça, SQLite parametre sınırı)"""
+        order_ids = list(order_ids)
+        result = []
+        with self.get_connection() as conn:
+            for i in range(0, len(order_ids), 900):
+                chunk = order_ids[i:i + 900]
+                result.extend(dict(r) for r in conn.execute(
+                    f"SELECT * FROM orders WHERE id IN ({','.join(['?'] * len(chunk))})", chunk).fetchall())
+        return result
+
     def get_order_by_code(self, order_code):
         """Sipariş koduna göre sipariş bilgilerini getir"""
         with self.get_connection() as conn:
@@ -514,6 +663,27 @@ class DatabaseManager:
             """, (order_id, station_name)).fetchone()
             return r[0] if r[0] else 0
 
+    def get_station_progress_map(self, order_ids=None):
+        """Tüm siparişlerin istasyon ilerlemesi tek sorguda: {order_id: {istasyon: adet}}"""
+        query = """
+            SELECT order_id, station_name, SUM(quantity) FROM production_logs
+            WHERE action = 'Tamamlandi'
+        """
+        params = ()
+        if order_ids is not None:
+            order_ids = list(order_ids)
+            if not order_ids:
+                return {}
+            query += f" AND order_id IN ({','.join(['?'] * len(order_ids))})"
+            params = tuple(order_ids)
+        query += " GROUP BY order_id, station_name"
+
+        progress = {}
+        with self.get_connection() as conn:
+            for oid, station, qty in conn.execute(query, params).fetchall():
+                progress.setdefault(oid, {})[station] = qty or 0
+        return progress
+
     def get_completed_stations_list(self, order_id):
         with self.get_connection() as conn:
             res = conn.execute("SELECT quantity FROM orders WHERE id = ?", (order_id,)).fetchone()
@@ -565,13 +735,15 @@ class DatabaseManager:
     # =========================================================================
     # MATRİS VE DASHBOARD
     # =========================================================================
-    def get_production_matrix_advanced(self):
-        """Gelişmiş üretim matrisi - Karar destek için"""
+    def get_production_matrix_advanced(self, order_ids=None):
+        """Gelişmiş üretim matrisi - Karar destek için (order_ids: yalnızca bu siparişler)"""
         with self.get_connection() as conn:
-            orders = conn.execute("""
+            query = """
                 SELECT id, order_code, customer_name, route, quantity, priority, 
                        delivery_date, declared_total_m2, status, created_at
                 FROM orders WHERE status NOT IN ('Sevk Edildi', 'Hatalı/Fire')
+            """
+            order_by = """
                 ORDER BY 
                     CASE priority 
                         WHEN 'Kritik' THEN 1 
@@ -581,8 +753,20 @@ class DatabaseManager:
                         ELSE 5 
                     END,
                     delivery_date ASC
-            """).fetchall()
+            """
+            if order_ids is None:
+                orders = conn.execute(query + order_by).fetchall()
+            else:
+                # Artımlı yenileme: parça parça (SQLite parametre sınırı)
+                order_ids = list(order_ids)
+                orders = []
+                for i in range(0, len(order_ids), 900):
+                    chunk = order_ids[i:i + 900]
+                    orders.extend(conn.execute(
+                        f"{query} AND id IN ({','.join(['?'] * len(chunk))}) {order_by}", chunk).fetchall())
             
+            # İlerleme tek sorguda (sipariş x istasyon başına sorgu yerine)
+            progress = self.get_station_progress_map(order_ids)
             data = []
             all_stations = [
                 "INTERMAC", "LIVA KESIM", "LAMINE KESIM",
@@ -604,7 +788,7 @@ class DatabaseManager:
                     if st not in route:
                         status_map[st] = {"status": "Yok", "done": 0, "total": 0}
                     else:
-                        done = self.get_station_progress(oid, st)
+                        done = progress.get(oid, {}).get(st, 0)
                         if done >= total:
                             status_map[st] = {"status": "Bitti", "done": done, "total": total}
                         elif done > 0:
@@ -639,26 +823,84 @@ class DatabaseManager:
             urgent = conn.execute("SELECT COUNT(*) FROM orders WHERE priority IN ('Acil', 'Kritik') AND status != 'Tamamlandı'").fetchone()[0]
             return {"active": active, "completed": completed, "fire": fire, "urgent": urgent}
 
-    def get_station_loads(self):
-        CAPACITIES = self.get_all_capacities()
-        loads = {k: 0.0 for k in CAPACITIES.keys()}
+    def get_dashboard_snapshot(self):
+        """
+        Yönetici paneli için tüm sayılar tek bağlantıda, SQL toplamlarıyla:
+        durum sayıları, geciken / bugün teslim listeleri, en çok sipariş veren
+        müşteriler ve istasyon dolulukları.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        capacities = self.get_all_capacities()
         with self.get_connection() as conn:
-            orders = conn.execute("""
-                SELECT id, width, height, quantity, route, declared_total_m2 
+            r = conn.execute("""
+                SELECT
+                    COALESCE(SUM(status IN ('Beklemede', 'Üretimde')), 0),
+                    COALESCE(SUM(status = 'Tamamlandı'), 0),
+                    COALESCE(SUM(rework_count), 0),
+                    COALESCE(SUM(priority IN ('Acil', 'Kritik') AND status != 'Tamamlandı'), 0),
+                    COALESCE(SUM(status = 'Beklemede'), 0),
+                    COALESCE(SUM(status = 'Üretimde'), 0),
+                    COALESCE(SUM(status = 'Sevk Edildi'), 0)
+                FROM orders
+            """).fetchone()
+            snapshot = {
+                "active": r[0], "completed": r[1], "fire": r[2], "urgent": r[3],
+                "waiting": r[4], "production": r[5], "shipped": r[6],
+            }
+
+            # Teslim tarihi geçmiş / bugün olan açık siparişler (geçerli YYYY-MM-DD tarihler)
+            due = conn.execute("""
+                SELECT order_code, customer_name, delivery_date,
+                       CAST(julianday(?) - julianday(delivery_date) AS INTEGER)
+                FROM orders
+                WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
+                  AND delivery_date <= ? AND date(delivery_date) = delivery_date
+                ORDER BY created_at DESC
+            """, (today, today)).fetchall()
+            snapshot["overdue"] = [f"{code} - {customer} ({late} gun gecikti)"
+                                   for code, customer, day, late in due if day < today]
+            snapshot["today"] = [f"{code} - {customer}" for code, customer, day, _ in due if day == today]
+
+            snapshot["customers"] = [tuple(row) for row in conn.execute("""
+                SELECT customer_name, COUNT(*), COALESCE(SUM(declared_total_m2), 0)
+                FROM orders WHERE status != 'Sevk Edildi'
+                GROUP BY customer_name ORDER BY COUNT(*) DESC LIMIT 5
+            """).fetchall()]
+
+            snapshot["station_loads"] = self._station_load_rows(capacities, self._station_load_m2(conn, capacities))
+        return snapshot
+
+    def _station_load_m2(self, conn, capacities):
+        """Açık siparişlerin henüz bitmemiş rota istasyonlarındaki toplam m² (tek sorgu)"""
+        loads = {k: 0.0 for k in capacities}
+        if not capacities:
+            return loads
+        stations = ", ".join(["(?)"] * len(capacities))
+        rows = conn.execute(f"""
+            WITH stations(station) AS (VALUES {stations}),
+            open_orders AS (
+                SELECT id, route, quantity,
+                       CASE WHEN declared_total_m2 > 0 THEN declared_total_m2
+                            WHEN width THEN width * height * quantity / 10000.0
+                            ELSE 0 END AS m2
                 FROM orders WHERE status != 'Tamamlandı'
-            """).fetchall()
-            for r in orders:
-                if r['declared_total_m2'] > 0: 
-                    m2 = r['declared_total_m2']
-                else: 
-                    m2 = (r['width']*r['height']*r['quantity'])/10000.0 if r['width'] else 0
-                
-                completed = self.get_completed_stations_list(r['id'])
-                route = r['route'] or ""
-                
-                for st in CAPACITIES.keys():
-                    if st in route and st not in completed:
-                        loads[st] += m2
+            ),
+            done AS (
+                SELECT order_id, station_name, SUM(quantity) AS qty FROM production_logs
+                WHERE action = 'Tamamlandi' GROUP BY order_id, station_name
+            )
+            SELECT s.station, SUM(o.m2)
+            FROM open_orders o
+            JOIN stations s ON instr(COALESCE(o.route, ''), s.station) > 0
+            LEFT JOIN done d ON d.order_id = o.id AND d.station_name = s.station
+            WHERE d.qty IS NULL OR d.qty < o.quantity
+            GROUP BY s.station
+        """, tuple(capacities)).fetchall()
+        for station, m2 in rows:
+            loads[station] = m2 or 0.0
+        return loads
+
+    def _station_load_rows(self, capacities, loads):
         res = []
         ordered_keys = [
             "INTERMAC", "LIVA KESIM", "LAMINE KESIM", "CNC RODAJ", "DOUBLEDGER", "ZIMPARA",
@@ -666,8 +908,8 @@ class DatabaseManager:
             "TEMPER A1", "TEMPER B1", "TEMPER BOMBE", "LAMINE A1", "ISICAM B1", "SEVKİYAT"
         ]
         for station in ordered_keys:
-            if station in CAPACITIES:
-                limit = CAPACITIES[station]
+            if station in capacities:
+                limit = capacities[station]
                 if limit <= 0: limit = 1
                 percent = int((loads[station] / limit) * 100)
                 status = "Normal"
@@ -676,6 +918,12 @@ class DatabaseManager:
                 res.append({"name": station, "percent": min(percent, 100), "real_percent": percent, "status": status})
         return res
 
+    def get_station_loads(self):
+        CAPACITIES = self.get_all_capacities()
+        with self.get_connection() as conn:
+            loads = self._station_load_m2(conn, CAPACITIES)
+        return self._station_load_rows(CAPACITIES, loads)
+
     # =========================================================================
     # RAPORLAMA VE ANALİZ
     # =========================================================================
@@ -713,6 +961,73 @@ class DatabaseManager:
                 ORDER BY pl.timestamp DESC
             """, (d1, d2)).fetchall()]
 
+    # -------------------------------------------------------------------------
+    # LOG SAYFALAMA (keyset: timestamp DESC, id DESC - OFFSET kullanılmaz)
+    # -------------------------------------------------------------------------
+    LOG_PAGE_COLUMNS = """
+        pl.id, pl.timestamp, pl.operator_name, pl.station_name, pl.action, pl.quantity,
+        o.order_code, o.customer_name
+    """
+
+    def _log_filter(self, start=None, end=None, keyword=None):
+        """Log filtresi: tarih aralığı (gün dahil) ve sipariş kodu / personel araması"""
+        conditions, params = [], []
+        if start:
+            conditions.append("pl.timestamp >= ?")
+            params.append(start)
+        if end:
+            conditions.append("pl.timestamp < date(?, '+1 day')")
+            params.append(end)
+        if keyword:
+            conditions.append("(o.order_code LIKE ? OR pl.operator_name LIKE ?)")
+            params += [f"%{keyword}%"] * 2
+        return (" AND ".join(conditions) or "1=1"), params
+
+    @staticmethod
+    def _log_join(orders_only=False):
+        """
+        orders_only=True: yalnızca siparişe bağlı loglar (INNER JOIN - üretim
+        raporu, get_production_report_data ile aynı küme). False: sistem logları,
+        siparişi silinmiş kayıtlar da gelir (LEFT JOIN - get_system_logs gibi).
+        """
+        return "JOIN orders o ON pl.order_id = o.id" if orders_only else "LEFT JOIN orders o ON pl.order_id = o.id"
+
+    def count_logs(self, start=None, end=None, keyword=None, orders_only=False):
+        """Filtreye uyan log sayısı"""
+        where, params = self._log_filter(start, end, keyword)
+        join = self._log_join(orders_only) if keyword or orders_only else ""
+        with self.get_connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM production_logs pl {join} WHERE {where}", params).fetchone()[0]
+
+    def get_logs_page(self, start=None, end=None, keyword=None, after=None, limit=200, orders_only=False):
+        """
+        Bir log sayfası (yeniden eskiye). after: önceki sayfanın son satırının
+        (timestamp, id) anahtarı; None = ilk sayfa. orders_only: bkz. _log_join.
+        """
+        where, params = self._log_filter(start, end, keyword)
+        if after is not None:
+            where += " AND (pl.timestamp, pl.id) < (?, ?)"
+            params += list(after)
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute(f"""
+                SELECT {self.LOG_PAGE_COLUMNS}
+                FROM production_logs pl
+                {self._log_join(orders_only)}
+                WHERE {where}
+                ORDER BY pl.timestamp DESC, pl.id DESC
+                LIMIT ?
+            """, params + [limit]).fetchall()]
+
+    def iter_logs(self, start=None, end=None, keyword=None, batch=2000, orders_only=False):
+        """Filtreye uyan tüm logları sayfa sayfa üret (dışa aktarım; bellekte tek sayfa)"""
+        after = None
+        while True:
+            page = self.get_logs_page(start, end, keyword, after, batch, orders_only)
+            yield from page
+            if len(page) < batch:
+                return
+            after = (page[-1]['timestamp'], page[-1]['id'])
+
     def get_order_lifecycle(self, code):
         with self.get_connection() as conn:
             o = conn.execute("""
@@ -760,6 +1075,43 @@ class DatabaseManager:
                 ORDER BY fire_adedi DESC
             """).fetchall()]
 
+    def get_station_daily_output(self, days=90):
+        """İstasyon bazında günlük üretilen m² (risk modeli için): [{station_name, day, m2}]"""
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute("""
+                SELECT l.station_name, DATE(l.timestamp) AS day,
+                       SUM(l.quantity * (CASE WHEN o.declared_total_m2 > 0 THEN o.declared_total_m2
+                                              ELSE o.width * o.height * o.quantity / 10000.0 END) / o.quantity) AS m2
+                FROM production_logs l JOIN orders o ON o.id = l.order_id
+                WHERE l.action = 'Tamamlandi' AND o.quantity > 0
+                  AND l.timestamp >= DATE('now', ?)
+                GROUP BY l.station_name, day
+            """, (f"-{int(days)} days",)).fetchall()]
+
+    def get_station_completions(self, days=90):
+        """
+        Sipariş-istasyon bazında son tamamlanma zamanı (risk modelinin doygun gün
+        tespiti için): [{order_id, route, created_at, station_name, finished_at}]
+        """
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute("""
+                SELECT l.order_id, o.route, o.created_at, l.station_name, MAX(l.timestamp) AS finished_at
+                FROM production_logs l JOIN orders o ON o.id = l.order_id
+                WHERE l.action = 'Tamamlandi' AND l.timestamp >= DATE('now', ?)
+                GROUP BY l.order_id, l.station_name
+            """, (f"-{int(days)} days",)).fetchall()]
+
+    def get_station_fire_rates(self):
+        """İstasyon bazında üretilen ve fire adetleri: {istasyon: (üretilen, fire)}"""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT station_name,
+                       SUM(CASE WHEN action = 'Tamamlandi' THEN quantity ELSE 0 END),
+                       SUM(CASE WHEN action LIKE '%Fire%' OR action LIKE '%Kırık%' THEN quantity ELSE 0 END)
+                FROM production_logs GROUP BY station_name
+            """).fetchall()
+            return {r[0]: (r[1] or 0, r[2] or 0) for r in rows}
+
     # =========================================================================
     # KAPASİTE VE AYARLAR
     # =========================================================================
@@ -775,6 +1127,33 @@ class DatabaseManager:
         with self.get_connection() as conn: 
             conn.execute("UPDATE factory_settings SET setting_value=? WHERE setting_key=?", (v, m))
 
+    # =========================================================================
+    # ÇALIŞMA TAKVİMİ
+    # =========================================================================
+    def get_holidays(self):
+        """Tatil günleri (YYYY-MM-DD listesi)"""
+        with self.get_connection() as conn:
+            return [r[0] for r in conn.execute("SELECT holiday_date FROM holidays ORDER BY holiday_date").fetchall()]
+
+    def get_holiday_list(self):
+        """Tatil günleri açıklamalarıyla (ayarlar ekranı için)"""
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute("SELECT holiday_date, description FROM holidays ORDER BY holiday_date").fetchall()]
+
+    def add_holiday(self, holiday_date, description=""):
+        """Tatil günü ekle"""
+        with self.get_connection() as conn:
+            try:
+                conn.execute("INSERT INTO holidays (holiday_date, description) VALUES (?, ?)", (holiday_date, description))
+                return True
+            except sqlite3.IntegrityError:
+                return False
+
+    def delete_holiday(self, holiday_date):
+        """Tatil günü sil"""
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM holidays WHERE holiday_date = ?", (holiday_date,))
+
     # =========================================================================
     # FİYAT İŞLEMLERİ
     # =========================================================================
@@ -874,4 +1253,5 @@ class DatabaseManager:
 
 
 # Global instance
-db = DatabaseManager()
\ No newline at end of file
+# ROTA_DB_PATH: farklı bir veritabanı dosyası (ör. benchmark için sentetik veri)
+db = DatabaseManager(os.environ.get("ROTA_DB_PATH", "efes_factory.db"))
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+EFES ROTA X - Sevk Kuralı (Dispatch Rule) Motoru
+Sipariş sırasını klasik çizelgeleme kurallarıyla üretir ve her sırayı
+planlayıcının olay tabanlı simülasyonundan geçirerek gecikmeyi ölçer.
+
+Kurallar sipariş özetinden (NumPy dizileri) tek seferde hesaplanır:
+- EDD   : En erken teslim tarihi
+- SPT   : En kısa kalan işlem süresi
+- CR    : Kritik oran (teslime kalan süre / kalan işlem)
+- SLACK : Kalan operasyon başına bolluk
+- ATC   : Apparent Tardiness Cost (ağırlıklı, bolluğa duyarlı)
+- MIX   : Yukarıdakilerin ağırlıklı sıra ortalaması
+
+Yeni kural eklemek için:
+    register_rule("FIFO", "Gelis sirasi", lambda s: s.index.astype(float))
+
+Zaman birimi: çalışma saati (planlayıcının takvimiyle aynı eksen).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from core.simulation_engine import SimOrder, SimulationCancelled
+
+
+# Öncelik -> ağırlık (ağırlıklı gecikme ve ATC için)
+PRIORITY_WEIGHTS = {"Kritik": 4.0, "Çok Acil": 3.0, "Acil": 2.0, "Normal": 1.0}
+
+
+# =============================================================================
+# SİPARİŞ ÖZETİ
+# =============================================================================
+class OrderSnapshot:
+    """
+    Simülasyon girdisinden türetilen sipariş dizileri (çalışma saati)
+        due        : teslim günü sonuna kadar kalan çalışma saati (teslim yoksa inf)
+        proc       : kalan toplam işlem süresi
+        ops        : kalan operasyon sayısı
+        weight     : öncelik ağırlığı
+        index      : mevcut (öncelik) sırası
+    """
+
+    def __init__(self, setup):
+        self.setup = setup
+        calendar = setup.calendar
+        n = len(setup.orders)
+
+        self.index = np.arange(n)
+        self.due = np.full(n, np.inf)
+        self.due_wall = np.full(n, np.inf)      # teslim günü sonu (takvim saati)
+        self.proc = np.zeros(n)
+        self.ops = np.zeros(n)
+        self.weight = np.ones(n)
+
+        for i, sim_order in enumerate(setup.orders):
+            order = sim_order.key
+            self.proc[i] = sum(m2 / (setup.rates.get(st) or 1.0) for st, m2 in sim_order.steps)
+            self.ops[i] = len(sim_order.steps)
+            self.weight[i] = PRIORITY_WEIGHTS.get(order.get('priority'), 1.0)
+            due = order.get('delivery_date')
+            if due:
+                try:
+                    due_day = (datetime.strptime(str(due)[:10], '%Y-%m-%d').date() - calendar.origin).days
+                except ValueError:
+                    continue
+                self.due_wall[i] = (due_day + 1) * 24.0
+                self.due[i] = calendar.work_before(self.due_wall[i]) - setup.now_w
+
+    def __len__(self):
+        return len(self.index)
+
+
+# =============================================================================
+# KURALLAR (düşük skor = önce)
+# =============================================================================
+def _finite(values, fill):
+    return np.where(np.isfinite(values), values, fill)
+
+
+def rule_edd(s: OrderSnapshot):
+    return s.due
+
+
+def rule_spt(s: OrderSnapshot):
+    return s.proc
+
+
+def rule_cr(s: OrderSnapshot):
+    return s.due / np.maximum(s.proc, 1e-6)
+
+
+def rule_slack(s: OrderSnapshot):
+    return (s.due - s.proc) / np.maximum(s.ops, 1)
+
+
+def rule_atc(s: OrderSnapshot, k: float = 2.0):
+    """ATC indeksi: (w/p) * exp(-max(d - p, 0) / (k * p_ort)); büyük indeks önce"""
+    proc = np.maximum(s.proc, 1e-6)
+    p_mean = float(proc.mean()) if len(proc) else 1.0
+    slack = np.maximum(_finite(s.due, 1e12) - proc, 0.0)
+    return -(s.weight / proc) * np.exp(-slack / (k * p_mean))
+
+
+def _ranks(scores):
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores, kind='stable')] = np.arange(len(scores))
+    return ranks
+
+
+# Bileşik kuralın varsayılan ağırlıkları
+COMPOSITE_WEIGHTS = {"EDD": 0.3, "CR": 0.3, "ATC": 0.3, "SPT": 0.1}
+
+
+def rule_composite(s: OrderSnapshot, weights: Optional[Dict[str, float]] = None):
+    """Kural sıralarının ağırlıklı ortalaması"""
+    weights = weights or COMPOSITE_WEIGHTS
+    total = np.zeros(len(s))
+    for name, w in weights.items():
+        rule = RULES.get(name)
+        if rule and name != "MIX":
+            total += w * _ranks(rule.score(s))
+    return total
+
+
+@dataclass
+class DispatchRule:
+    name: str
+    label: str
+    score: Callable                       # OrderSnapshot -> np.ndarray (düşük önce)
+
+    def sequence(self, snapshot: OrderSnapshot):
+        """Sipariş indeksleri, kurala göre sıralı (eşitlikte mevcut sıra korunur)"""
+        return np.lexsort((snapshot.index, self.score(snapshot)))
+
+
+RULES: Dict[str, DispatchRule] = {}
+
+
+def register_rule(name: str, label: str, score: Callable):
+    """Yeni kural ekle / mevcut kuralı değiştir"""
+    RULES[name] = DispatchRule(name, label, score)
+
+
+register_rule("EDD", "Erken termin", rule_edd)
+register_rule("SPT", "Kisa is", rule_spt)
+register_rule("CR", "Kritik oran", rule_cr)
+register_rule("SLACK", "Operasyon basina bolluk", rule_slack)
+register_rule("ATC", "ATC (agirlikli)", rule_atc)
+register_rule("MIX", "Bilesik", rule_composite)
+
+
+# =============================================================================
+# DEĞERLENDİRME
+# =============================================================================
+@dataclass
+class RuleResult:
+    """Bir kuralın simülasyon sonucu (gecikmeler takvim günü)"""
+    name: str
+    label: str
+    total_tardiness: float
+    weighted_tardiness: float
+    late_count: int
+    max_tardiness: float
+    makespan_days: float
+    order_ids: List = field(default_factory=list)      # önerilen sıra (sipariş id)
+
+
+class DispatchRuleEngine:
+    """
+    Kuralları planlayıcı simülasyonu üzerinden karşılaştırır
+
+    Kullanım:
+        engine = DispatchRuleEngine(SmartPlanner())
+        results = engine.compare()                 # en az ağırlıklı gecikme önce
+    """
+
+    def __init__(self, planner):
+        self.planner = planner
+
+    def prepare(self):
+        setup = self.planner._prepare_simulation()
+        return setup, OrderSnapshot(setup)
+
+    def evaluate(self, setup, snapshot: OrderSnapshot, sequence, cancel_check=None):
+        """
+        Verilen sırayı simüle et.
+        Dönüş: (gecikme günleri dizisi, bitiş takvim saatleri dizisi)
+        """
+        orders = [SimOrder(setup.orders[i].key, rank, setup.orders[i].steps)
+                  for rank, i in enumerate(sequence)]
+        # Makine grupları ve fırın yükleri (bu sıraya göre kurulur) planla aynı
+        _, finish_work = setup.simulate(orders, cancel_check=cancel_check)
+
+        finish = np.full(len(snapshot), setup.now_h)
+        for rank, w in finish_work.items():
+            if w > setup.now_w:
+                finish[sequence[rank]] = setup.calendar.to_wall(w, clip=True)
+        tardiness = np.maximum(finish - snapshot.due_wall, 0.0) / 24.0
+        return np.where(np.isfinite(tardiness), tardiness, 0.0), finish
+
+    def compare(self, rules: Optional[List[str]] = None, cancel_check=None) -> List[RuleResult]:
+        """Kuralları simüle et; ağırlıklı gecikmeye göre sıralı sonuç (NumPy yoksa boş)"""
+        if not NUMPY_AVAILABLE:
+            return []
+
+        setup, snapshot = self.prepare()
+        if not len(snapshot):
+            return []
+
+        results = []
+        for name in rules or list(RULES):
+            rule = RULES[name]
+            if cancel_check and cancel_check():
+                raise SimulationCancelled()
+            sequence = rule.sequence(snapshot)
+            tardiness, finish = self.evaluate(setup, snapshot, sequence, cancel_check)
+            results.append(RuleResult(
+                name=rule.name,
+                label=rule.label,
+                total_tardiness=float(tardiness.sum()),
+                weighted_tardiness=float((tardiness * snapshot.weight).sum()),
+                late_count=int((tardiness > 0).sum()),
+                max_tardiness=float(tardiness.max()),
+                makespan_days=max(0.0, (float(finish.max()) - setup.now_h) / 24.0),
+                order_ids=[setup.orders[i].key.get('id') for i in sequence],
+            ))
+
+        results.sort(key=lambda r: (r.weighted_tardiness, r.total_tardiness))
+        return results
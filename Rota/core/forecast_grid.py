@@ -0,0 +1,177 @@
+"""
+EFES ROTA X - Seyrek Tahmin Izgarası
+Planlayıcının detay çıktısı: gün x istasyon x sipariş sözlükleri yerine
+istasyon başına kompakt aralık dizileri (order_idx, başlangıç, bitiş, m²).
+
+- Sipariş bilgisi (kod, müşteri) bir kez saklanır, aralıklar indeksle işaret eder.
+- Gün hücresi sorgusu bisect ile O(log n + k) çalışır.
+- Bellek iş sayısı ile büyür, ufuk (30/90/180 gün) ile büyümez.
+
+Eski kullanım korunur: grid["TEMPER A1"][3] -> o günün iş listesi (dict).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, List, Tuple
+
+
+class StationTrack:
+    """Tek istasyonun iş aralıkları (takvim saati cinsinden)"""
+
+    __slots__ = ("order_idx", "start", "end", "m2", "_max_end", "_sorted")
+
+    def __init__(self):
+        self.order_idx = array("l")
+        self.start = array("d")
+        self.end = array("d")
+        self.m2 = array("d")
+        self._max_end = array("d")      # start sırasına göre önek maksimum bitiş
+        self._sorted = True
+
+    def __len__(self):
+        return len(self.start)
+
+    def add(self, order_idx: int, start: float, end: float, m2: float):
+        if self.start and start < self.start[-1]:
+            self._sorted = False
+        self.order_idx.append(order_idx)
+        self.start.append(start)
+        self.end.append(end)
+        self.m2.append(m2)
+
+    def finalize(self):
+        """Başlangıca göre sırala ve aralık indeksini kur"""
+        if not self._sorted:
+            rows = sorted(zip(self.start, self.end, self.order_idx, self.m2))
+            self.start = array("d", (r[0] for r in rows))
+            self.end = array("d", (r[1] for r in rows))
+            self.order_idx = array("l", (r[2] for r in rows))
+            self.m2 = array("d", (r[3] for r in rows))
+            self._sorted = True
+
+        self._max_end = array("d")
+        running = float("-inf")
+        for e in self.end:
+            if e > running:
+                running = e
+            self._max_end.append(running)
+
+    def overlapping(self, t0: float, t1: float) -> List[int]:
+        """[t0, t1) ile kesişen aralıkların indeksleri"""
+        hi = bisect_left(self.start, t1)
+        lo = bisect_right(self._max_end, t0, 0, hi)
+        return [i for i in range(lo, hi) if self.end[i] > t0]
+
+
+class _StationDays(Sequence):
+    """grid[istasyon][gün] uyumluluğu için tembel görünüm"""
+
+    __slots__ = ("_grid", "_station")
+
+    def __init__(self, grid, station):
+        self._grid = grid
+        self._station = station
+
+    def __len__(self):
+        return self._grid.horizon_days
+
+    def __getitem__(self, day_idx):
+        if isinstance(day_idx, slice):
+            return [self[i] for i in range(*day_idx.indices(len(self)))]
+        if day_idx < 0:
+            day_idx += len(self)
+        if not 0 <= day_idx < len(self):
+            raise IndexError(day_idx)
+        return self._grid.jobs_on_day(self._station, day_idx)
+
+
+class ForecastGrid(Mapping):
+    """
+    Seyrek aralık tabanlı tahmin ızgarası
+
+    Kullanım:
+        jobs = grid.jobs_on_day("TEMPER A1", 2)   # [{'code','customer','m2'}, ...]
+        for station in grid: ...
+    """
+
+    def __init__(self, stations: Iterable[str], horizon_days: int = 30):
+        self.horizon_days = horizon_days
+        self.tracks: Dict[str, StationTrack] = {s: StationTrack() for s in stations}
+        self.orders: List[Tuple[str, str]] = []       # interned (kod, müşteri)
+        self._order_lookup: Dict[Tuple[str, str], int] = {}
+
+    # ------------------------------------------------------------------
+    # YAZMA
+    # ------------------------------------------------------------------
+    def intern_order(self, code: str, customer: str) -> int:
+        """Sipariş bilgisini bir kez sakla, indeksini döndür"""
+        key = (code, customer)
+        idx = self._order_lookup.get(key)
+        if idx is None:
+            idx = len(self.orders)
+            self.orders.append(key)
+            self._order_lookup[key] = idx
+        return idx
+
+    def add_interval(self, station: str, order_idx: int, start: float, end: float, m2: float):
+        track = self.tracks.get(station)
+        if track is None:
+            track = self.tracks[station] = StationTrack()
+        track.add(order_idx, start, end, m2)
+
+    def finalize(self):
+        for track in self.tracks.values():
+            track.finalize()
+        return self
+
+    # ------------------------------------------------------------------
+    # OKUMA
+    # ------------------------------------------------------------------
+    def intervals_on_day(self, station: str, day_idx: int) -> List[int]:
+        track = self.tracks.get(station)
+        if track is None or day_idx < 0 or day_idx >= self.horizon_days:
+            return []
+        return track.overlapping(day_idx * 24.0, (day_idx + 1) * 24.0)
+
+    def jobs_on_day(self, station: str, day_idx: int) -> List[dict]:
+        """
+        O gün istasyonda çalışılan işler (sadece istenen hücre üretilir).
+        Sipariş başına tek satır: fırın yüklerine / makinelere bölünmüş
+        aralıkların m²'si toplanır.
+        """
+        track = self.tracks.get(station)
+        jobs: Dict[int, dict] = {}
+        for i in self.intervals_on_day(station, day_idx):
+            order_idx = track.order_idx[i]
+            job = jobs.get(order_idx)
+            if job is None:
+                code, customer = self.orders[order_idx]
+                jobs[order_idx] = {"code": code, "customer": customer, "m2": track.m2[i]}
+            else:
+                job["m2"] += track.m2[i]
+        return list(jobs.values())
+
+    def order_machines(self) -> Dict[str, List[str]]:
+        """Sipariş kodu -> plandaki makineler (başlangıç sırasıyla)"""
+        starts: Dict[str, list] = {}
+        for station, track in self.tracks.items():
+            for i in range(len(track)):
+                code = self.orders[track.order_idx[i]][0]
+                starts.setdefault(code, []).append((track.start[i], station))
+        return {code: [s for _, s in sorted(items)] for code, items in starts.items()}
+
+    def job_count(self) -> int:
+        return sum(len(t) for t in self.tracks.values())
+
+    # Mapping arayüzü: grid[istasyon] -> gün dizisi
+    def __getitem__(self, station):
+        if station not in self.tracks:
+            raise KeyError(station)
+        return _StationDays(self, station)
+
+    def __iter__(self):
+        return iter(self.tracks)
+
+    def __len__(self):
+        return len(self.tracks)
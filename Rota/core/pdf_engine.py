@@ -7,6 +7,11 @@ from reportlab.pdfbase.ttfonts import TTFont
 import os
 from datetime import datetime, timedelta
 
+try:
+    from core.plan_store import plan_store
+except ImportError:
+    plan_store = None
+
 class PDFEngine:
     """
     EFES ROTA - Raporlama Motoru
@@ -71,11 +76,17 @@ class PDFEngine:
             return False, str(e)
 
     # --- GÜNCELLENEN KISIM ---
-    def generate_weekly_schedule_pdf(self, schedule_data):
+    def generate_weekly_schedule_pdf(self, schedule_data=None):
         """
         Haftalık planı PDF'e döker.
         schedule_data formatı: { 'KESİM': [ [Gun0_Isleri], [Gun1_Isleri]... ] }
+        Verilmezse kayıtlı plan tazeyse o kullanılır (burada plan hesaplanmaz).
         """
+        if schedule_data is None and plan_store is not None:
+            plan = plan_store.get_fresh_plan()
+            schedule_data = plan.details if plan else None
+        schedule_data = schedule_data or {}
+
         doc = SimpleDocTemplate(self.filename, pagesize=A4)
         elements = []
         styles = getSampleStyleSheet()
@@ -90,7 +101,8 @@ class PDFEngine:
 
         today = datetime.now()
         tr_days = ["PAZARTESİ", "SALI", "ÇARŞAMBA", "PERŞEMBE", "CUMA", "CUMARTESİ", "PAZAR"]
-        machines = ["KESİM", "RODAJ", "DELİK", "TEMPER", "LAMİNE", "ISICAM", "KUMLAMA", "SEVKİYAT"]
+        # İstasyonlar plandan gelir (sabit liste plan anahtarlarıyla eşleşmiyordu)
+        machines = list(schedule_data.keys())
 
         # 7 Gün İçin Döngü
         for day_idx in range(7):
@@ -0,0 +1,205 @@
+"""
+EFES ROTA X - Paylaşılan Plan Deposu
+Son tahmin (plan_runs / plan_cells / plan_jobs / plan_orders) veritabanında
+bir kez saklanır. Planlama ekranı, haftalık liste, PDF çıktısı, karar ekranı
+ve komut satırı aynı sonucu okur; yeniden hesaplama yalnızca girdi verisi
+(data_version) ya da plan günü değiştiğinde yapılır.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+from core.forecast_grid import ForecastGrid
+
+
+@dataclass
+class PlanResult:
+    """Saklanan / yeni hesaplanan plan"""
+    run_id: int
+    plan_date: str
+    data_version: int
+    horizon_days: int
+    grid: Dict[str, list]                    # istasyon -> gün bazında doluluk %
+    details: ForecastGrid                    # istasyon -> iş aralıkları
+    loads: Dict[str, list]                   # istasyon -> gün bazında m²
+    order_finish_days: Dict[str, float] = field(default_factory=dict)
+    order_finish_dates: Dict[str, datetime] = field(default_factory=dict)
+    capacities: Dict[str, float] = field(default_factory=dict)
+
+    def as_forecast(self):
+        """calculate_forecast() ile aynı biçim: (grid, details, loads)"""
+        return self.grid, self.details, self.loads
+
+
+class PlanStore:
+    """
+    Plan sonuçlarının kalıcı deposu
+
+    Kullanım:
+        from core.plan_store import plan_store
+        plan = plan_store.get_plan(horizon_days=30)      # güncelse DB'den okur
+        grid, details, loads = plan.as_forecast()
+    """
+
+    def __init__(self, db_manager=None):
+        self.db = db_manager or db
+
+    # ------------------------------------------------------------------
+    # TAZELİK
+    # ------------------------------------------------------------------
+    def current_version(self) -> int:
+        return self.db.get_data_version()
+
+    def get_latest_run(self) -> Optional[dict]:
+        with self.db.get_connection() as conn:
+            row = conn.execute("SELECT * FROM plan_runs ORDER BY id DESC LIMIT 1").fetchone()
+            return dict(row) if row else None
+
+    def is_fresh(self, run, horizon_days=None, version=None) -> bool:
+        """Plan bugüne ait mi, girdiler değişmedi mi, ufuk yeterli mi?"""
+        if not run:
+            return False
+        if run['plan_date'] != date.today().isoformat():
+            return False
+        if version is None:
+            version = self.current_version()
+        if run['data_version'] != version:
+            return False
+        return horizon_days is None or (run['horizon_days'] or 0) >= horizon_days
+
+    # ------------------------------------------------------------------
+    # OKUMA / YAZMA
+    # ------------------------------------------------------------------
+    def load(self, run, horizon_days=None) -> PlanResult:
+        """Kayıtlı planı belleğe al (istenirse ufku kırparak)"""
+        run_id = run['id']
+        horizon = min(horizon_days or run['horizon_days'], run['horizon_days'])
+        capacities = self.db.get_all_capacities()
+
+        grid = {k: [0.0] * horizon for k in capacities.keys()}
+        loads = {k: [0.0] * horizon for k in capacities.keys()}
+        details = ForecastGrid(capacities.keys(), horizon)
+        finish_days, finish_dates = {}, {}
+
+        now = datetime.now()
+        with self.db.get_connection() as conn:
+            for station, day_idx, percent, load_m2 in conn.execute(
+                    "SELECT station, day_idx, percent, load_m2 FROM plan_cells WHERE run_id = ? AND day_idx < ?",
+                    (run_id, horizon)):
+                grid.setdefault(station, [0.0] * horizon)[day_idx] = percent
+                loads.setdefault(station, [0.0] * horizon)[day_idx] = load_m2
+
+            for station, code, customer, start_h, end_h, m2 in conn.execute(
+                    "SELECT station, order_code, customer_name, start_h, end_h, m2 FROM plan_jobs WHERE run_id = ? ORDER BY station, start_h",
+                    (run_id,)):
+                details.add_interval(station, details.intern_order(code, customer), start_h, end_h, m2)
+
+            for code, finish_day, finish_at in conn.execute(
+                    "SELECT order_code, finish_day, finish_at FROM plan_orders WHERE run_id = ?", (run_id,)):
+                # Kalan gün hesaplama anına göre saklanır: okunurken şimdiye göre yeniden türetilir
+                try:
+                    finish_dates[code] = datetime.fromisoformat(finish_at)
+                    finish_days[code] = max(0.0, (finish_dates[code] - now).total_seconds() / 86400.0)
+                except (TypeError, ValueError):
+                    finish_days[code] = finish_day
+
+        return PlanResult(run_id, run['plan_date'], run['data_version'], horizon,
+                          grid, details.finalize(), loads, finish_days, finish_dates, capacities)
+
+    def save(self, grid, details, loads, finish_days, data_version, horizon_days) -> int:
+        """Yeni planı tek işlemde yaz, eskisini sil"""
+        now = datetime.now()
+        plan_date = date.today().isoformat()
+
+        cells = []
+        for station, percents in grid.items():
+            station_loads = loads.get(station, [])
+            for day_idx, percent in enumerate(percents):
+                if percent > 0:
+                    load_m2 = station_loads[day_idx] if day_idx < len(station_loads) else 0
+                    cells.append((station, day_idx, percent, load_m2))
+
+        jobs = []
+        for station, track in details.tracks.items():
+            for i in range(len(track)):
+                code, customer = details.orders[track.order_idx[i]]
+                jobs.append((station, code, customer, track.start[i], track.end[i], track.m2[i]))
+
+        orders = [(code, day, (now + timedelta(days=day)).isoformat(timespec='minutes'))
+                  for code, day in finish_days.items()]
+
+        with self.db.get_connection() as conn:
+            for table in ("plan_cells", "plan_jobs", "plan_orders", "plan_runs"):
+                conn.execute(f"DELETE FROM {table}")
+            cur = conn.execute(
+                "INSERT INTO plan_runs (plan_date, data_version, horizon_days, job_count) VALUES (?, ?, ?, ?)",
+                (plan_date, data_version, horizon_days, len(jobs)))
+            run_id = cur.lastrowid
+            conn.executemany("INSERT INTO plan_cells (run_id, station, day_idx, percent, load_m2) VALUES (?, ?, ?, ?, ?)",
+                             [(run_id,) + c for c in cells])
+            conn.executemany("INSERT INTO plan_jobs (run_id, station, order_code, customer_name, start_h, end_h, m2) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             [(run_id,) + j for j in jobs])
+            conn.executemany("INSERT INTO plan_orders (run_id, order_code, finish_day, finish_at) VALUES (?, ?, ?, ?)",
+                             [(run_id,) + o for o in orders])
+        return run_id
+
+    def get_plan(self, horizon_days=30, cancel_check=None, compute=True, force=False) -> Optional[PlanResult]:
+        """
+        Güncel planı döndürür.
+        Kayıtlı plan tazeyse doğrudan okunur; değilse (compute=True ise)
+        yeniden hesaplanıp kaydedilir. compute=False ve plan bayatsa None.
+        force=True her durumda yeniden hesaplar.
+        """
+        version = self.current_version()
+        run = self.get_latest_run()
+        if not force and self.is_fresh(run, horizon_days, version):
+            return self.load(run, horizon_days)
+        if not compute:
+            return None
+
+        from core.smart_planner import SmartPlanner
+        planner = SmartPlanner(horizon_days=horizon_days)
+        grid, details, loads, finish_days = planner.calculate_plan(cancel_check=cancel_check)
+        run_id = self.save(grid, details, loads, finish_days, version, horizon_days)
+
+        now = datetime.now()
+        return PlanResult(run_id, date.today().isoformat(), version, horizon_days, grid, details, loads,
+                          finish_days, {c: now + timedelta(days=d) for c, d in finish_days.items()},
+                          planner.capacities)
+
+    def get_fresh_plan(self) -> Optional[PlanResult]:
+        """Kayıtlı plan tazeyse onu, değilse None (hesaplama yapmaz)"""
+        try:
+            return self.get_plan(horizon_days=None, compute=False)
+        except Exception:
+            return None
+
+    def get_source_plan(self, source=None, horizon_days=30, cancel_check=None) -> Optional[PlanResult]:
+        """
+        Veri kaynağının planı: canlı veritabanı için kayıtlı taze plan (hesaplamaz),
+        what-if sandbox'ı için sandbox verisiyle hesaplanan plan (kaydedilmez).
+        """
+        if source is None or source is self.db:
+            return self.get_fresh_plan()
+        from core.smart_planner import SmartPlanner
+        planner = SmartPlanner(horizon_days=horizon_days, source=source)
+        grid, details, loads, finish_days = planner.calculate_plan(cancel_check=cancel_check)
+        now = datetime.now()
+        return PlanResult(0, date.today().isoformat(), source.get_data_version(), horizon_days, grid, details, loads,
+                          finish_days, {c: now + timedelta(days=d) for c, d in finish_days.items()},
+                          planner.capacities)
+
+    def get_fresh_finish_dates(self) -> Dict[str, datetime]:
+        """Kayıtlı plan tazeyse sipariş bitiş tarihleri, değilse boş sözlük (hesaplama yapmaz)"""
+        plan = self.get_fresh_plan()
+        return plan.order_finish_dates if plan else {}
+
+
+# Global instance
+plan_store = PlanStore()
@@ -0,0 +1,122 @@
+"""
+EFES ROTA X - Arka Plan Planlama İşçisi
+Uzun hesaplamaları (tahmin, risk simülasyonu) QThreadPool üzerinde çalıştırır,
+GUI thread'i bloklamaz.
+
+Her yeni istek bir öncekini iptal eder; iptal edilen simülasyon olay
+döngüsünde durur ve sonucu yayınlanmaz. Sonuçlar nesil (generation)
+numarasıyla gelir, ekran yalnızca en güncel nesli uygular.
+"""
+
+import threading
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from core.plan_store import plan_store
+from core.smart_planner import SmartPlanner
+from core.simulation_engine import SimulationCancelled
+
+
+class TaskWorkerSignals(QObject):
+    """İşçi sinyalleri (QRunnable sinyal taşıyamaz)"""
+    finished = Signal(int, object)      # generation, sonuç
+    failed = Signal(int, str)           # generation, hata mesajı
+
+
+class TaskWorker(QRunnable):
+    """Tek seferlik arka plan hesaplaması: fn(cancel_check) -> sonuç"""
+
+    def __init__(self, generation, fn, cancel_event, signals):
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.cancel_event = cancel_event
+        self.signals = signals
+        self.setAutoDelete(True)
+
+    def run(self):
+        if self.cancel_event.is_set():
+            return
+        try:
+            result = self.fn(self.cancel_event.is_set)
+            if self.cancel_event.is_set():
+                return
+            self.signals.finished.emit(self.generation, result)
+        except SimulationCancelled:
+            pass
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(self.generation, str(e))
+
+
+class BackgroundRunner(QObject):
+    """
+    Arka plan isteklerini yöneten ön yüz (en son istek kazanır)
+
+    Kullanım:
+        runner = BackgroundRunner(self)
+        runner.result_ready.connect(self.apply_result)
+        runner.submit(lambda cancel_check: hesapla(cancel_check=cancel_check))
+    """
+
+    result_ready = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool.globalInstance()
+        self._signals = TaskWorkerSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._generation = 0
+        self._cancel_event = None
+
+    def is_running(self):
+        return self._cancel_event is not None and not self._cancel_event.is_set()
+
+    def submit(self, fn):
+        """Yeni hesaplama başlat, eskisini iptal et"""
+        self.cancel()
+        self._generation += 1
+        self._cancel_event = threading.Event()
+        self._pool.start(TaskWorker(self._generation, fn, self._cancel_event, self._signals))
+        return self._generation
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def _on_finished(self, generation, result):
+        if generation != self._generation:
+            return  # Eski nesil, yok say
+        self._cancel_event = None
+        self.result_ready.emit(result)
+
+    def _on_failed(self, generation, message):
+        if generation != self._generation:
+            return
+        self._cancel_event = None
+        self.failed.emit(message)
+
+
+class PlanRunner(BackgroundRunner):
+    """
+    Planlama ekranı için tahmin istekleri
+    Sonuç plan deposundan (plan_store) okunur, girdiler değiştiyse yeniden
+    hesaplanıp saklanır. result_ready -> (grid, details, loads, capacities)
+    """
+
+    def request(self, horizon_days=30, force=False, source=None):
+        """
+        force: kayıtlı planı yok say, yeniden hesapla
+        source: what-if sandbox'ı; verilirse plan deposu atlanır (sonuç saklanmaz)
+        """
+        def job(cancel_check):
+            if source is not None:
+                planner = SmartPlanner(horizon_days, source=source)
+                grid, details, loads = planner.calculate_forecast(cancel_check=cancel_check)
+                return grid, details, loads, planner.capacities
+            plan = plan_store.get_plan(horizon_days=horizon_days, cancel_check=cancel_check, force=force)
+            return plan.grid, plan.details, plan.loads, plan.capacities
+        return self.submit(job)
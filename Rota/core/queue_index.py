@@ -0,0 +1,306 @@
+"""
+EFES ROTA X - Artımlı İstasyon Kuyruk İndeksi
+Her istasyon için bekleyen siparişlerin sıralı listesi ve toplam m² yükü
+bellekte tutulur. Sipariş eklendiğinde, bir istasyonu bitirdiğinde ya da
+sevk edildiğinde yalnızca ilgili istasyonlar güncellenir; kuyruk her
+analizde baştan kurulmaz.
+
+- Yük / adet / kuyruk günü okumaları O(1)
+- Kuyruktaki sıra (position) bisect ile O(log n)
+- Darboğaz ve boş istasyon kümeleri yük değiştikçe güncellenir
+
+Kullanım:
+    index = StationQueueIndex(capacities)
+    index.sync(orders, db.get_station_progress_map())   # farkları uygular
+    index.advance(order_id, "INTERMAC")                  # istasyon bitti
+    index.remove_order(order_id)                         # sevk edildi
+    index.take_dirty()                                   # yükü değişen istasyonlar
+
+Sıra anahtarları (queue_position) seyrek / kesirlidir: elle yapılan bir
+taşıma yalnızca taşınan siparişin anahtarını iki komşusunun arasına
+yazar (plan_queue_keys). Aralık tükenirse liste 1..n yeniden numaralanır.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+QUEUE_POSITION_UNSET = 9999     # Sırası verilmemiş sipariş
+QUEUE_KEY_EPSILON = 1e-6        # Komşu anahtarlar arasında kalması gereken en küçük aralık
+
+
+def plan_queue_keys(positions: List[Optional[float]], unset: float = QUEUE_POSITION_UNSET,
+                    epsilon: float = QUEUE_KEY_EPSILON) -> Optional[Dict[int, float]]:
+    """
+    Yeni liste sırası için en az sayıda anahtar değişikliği.
+    positions: listedeki sırayla mevcut queue_position değerleri (None / unset = sırasız)
+    Anahtarları zaten artan en uzun alt dizi (LIS) yerinde kalır; diğerleri
+    komşu anahtarların arasına eşit aralıkla yerleşir.
+    Dönüş: {liste indeksi: yeni anahtar}; aralık yetmezse None (yeniden numaralama)
+    """
+    # En uzun artan alt dizi, O(n log n)
+    tails: List[float] = []
+    tail_idx: List[int] = []
+    prev: Dict[int, Optional[int]] = {}
+    for i, p in enumerate(positions):
+        if p is None or not 0 < p < unset:
+            continue
+        j = bisect_left(tails, p)
+        if j == len(tails):
+            tails.append(p)
+            tail_idx.append(i)
+        else:
+            tails[j] = p
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j > 0 else None
+
+    keep = set()
+    k = tail_idx[-1] if tail_idx else None
+    while k is not None:
+        keep.add(k)
+        k = prev[k]
+
+    changes: Dict[int, float] = {}
+    lower = 0.0
+    i, n = 0, len(positions)
+    while i < n:
+        if i in keep:
+            lower = positions[i]
+            i += 1
+            continue
+        j = i
+        while j < n and j not in keep:
+            j += 1
+        count = j - i
+        if j < n:
+            step = (positions[j] - lower) / (count + 1)
+            if step < epsilon:
+                return None
+        else:
+            step = 1.0
+            if lower + count >= unset:
+                return None
+        for m in range(count):
+            changes[i + m] = lower + step * (m + 1)
+        lower = changes[j - 1]
+        i = j
+    return changes
+
+
+class StationQueueIndex:
+    """İstasyon bazında bekleyen iş indeksi"""
+
+    DEFAULT_CAPACITY = 500      # Kapasitesi tanımsız istasyon (m²/gün)
+    BOTTLENECK_RATIO = 2.0      # 2 günlük kuyruktan fazlası darboğaz
+    LOAD_EPSILON = 1e-6         # Kayan nokta artığı boş sayılır
+
+    def __init__(self, capacities: Optional[Dict[str, float]] = None):
+        self.capacities: Dict[str, float] = dict(capacities or {})
+        self.loads: Dict[str, float] = {}           # istasyon -> bekleyen m²
+        self._keys: Dict[str, List[Tuple]] = {}     # istasyon -> sıralı anahtarlar
+        self._orders: Dict[int, dict] = {}          # order_id -> {'order', 'key', 'm2', 'pending', 'sig'}
+        self._members: Dict[str, Set[int]] = {}     # istasyon -> bekleyen order_id'ler
+        self._bottlenecks: Set[str] = set()
+        self._dirty: Set[str] = set()               # yükü değişen istasyonlar (take_dirty ile okunur)
+        self.revision = 0                           # her değişiklikte artar (önbellek anahtarı)
+
+    # ------------------------------------------------------------------
+    # YARDIMCILAR
+    # ------------------------------------------------------------------
+    @staticmethod
+    def order_key(order) -> Tuple:
+        """Kuyruk sırası: karar ekranı sırası, teslim tarihi, id"""
+        position = order.get('queue_position')
+        return (position if position is not None else QUEUE_POSITION_UNSET,
+                str(order.get('delivery_date') or '9999-12-31'),
+                order.get('id') or 0)
+
+    @staticmethod
+    def pending_stations(order, done: Optional[Dict[str, float]] = None) -> List[str]:
+        """Rotada henüz bitmemiş istasyonlar (adet >= sipariş adedi ise bitmiş)"""
+        done = done or {}
+        total = order.get('quantity') or 0
+        pending = []
+        for station in (order.get('route') or '').split(','):
+            station = station.strip()
+            if station and station not in pending and not (total and done.get(station, 0) >= total):
+                pending.append(station)
+        return pending
+
+    def capacity(self, station) -> float:
+        cap = self.capacities.get(station, self.DEFAULT_CAPACITY)
+        return cap if cap and cap > 0 else self.DEFAULT_CAPACITY
+
+    def set_capacities(self, capacities: Dict[str, float]):
+        self.capacities = dict(capacities or {})
+        self.revision += 1
+        self._dirty.update(self.loads)
+        self._bottlenecks = {s for s in self.loads if self.queue_days(s) > self.BOTTLENECK_RATIO}
+
+    def _change_load(self, station, delta):
+        self.revision += 1
+        self._dirty.add(station)
+        load = self.loads.get(station, 0.0) + delta
+        if load < self.LOAD_EPSILON:
+            load = 0.0
+        self.loads[station] = load
+        if load / self.capacity(station) > self.BOTTLENECK_RATIO:
+            self._bottlenecks.add(station)
+        else:
+            self._bottlenecks.discard(station)
+
+    def _push(self, station, entry):
+        insort(self._keys.setdefault(station, []), entry['key'])
+        self._members.setdefault(station, set()).add(entry['order']['id'])
+        self._change_load(station, entry['m2'])
+
+    def _pop(self, station, entry):
+        keys = self._keys.get(station)
+        if keys:
+            i = bisect_left(keys, entry['key'])
+            if i < len(keys) and keys[i] == entry['key']:
+                del keys[i]
+        self._members.get(station, set()).discard(entry['order']['id'])
+        self._change_load(station, -entry['m2'])
+
+    # ------------------------------------------------------------------
+    # ARTIMLI GÜNCELLEMELER
+    # ------------------------------------------------------------------
+    def add_order(self, order, done: Optional[Dict[str, float]] = None):
+        """Siparişi (varsa eskisinin yerine) bekleyen istasyonlarına ekle"""
+        oid = order['id']
+        if oid in self._orders:
+            self.remove_order(oid)
+        pending = self.pending_stations(order, done)
+        entry = {
+            'order': order,
+            'key': self.order_key(order),
+            'm2': order.get('declared_total_m2') or 0,
+            'pending': pending,
+            'sig': self._signature(order, done),
+        }
+        self._orders[oid] = entry
+        self.revision += 1
+        for station in pending:
+            self._push(station, entry)
+
+    def advance(self, order_id, station):
+        """Sipariş bir istasyonu bitirdi: o istasyon kuyruğundan çıkar"""
+        entry = self._orders.get(order_id)
+        if not entry or station not in entry['pending']:
+            return
+        entry['pending'].remove(station)
+        self._pop(station, entry)
+
+    def remove_order(self, order_id):
+        """Sipariş sevk edildi / iptal: tüm kuyruklardan çıkar"""
+        entry = self._orders.pop(order_id, None)
+        if not entry:
+            return
+        self.revision += 1
+        for station in entry['pending']:
+            self._pop(station, entry)
+
+    @staticmethod
+    def _signature(order, done):
+        """Kuyruğu etkileyen alanların özeti (değişmediyse yeniden eklenmez)"""
+        done = done or {}
+        route = order.get('route') or ''
+        return (route, order.get('declared_total_m2') or 0, order.get('quantity') or 0,
+                StationQueueIndex.order_key(order),
+                tuple(done.get(s.strip(), 0) for s in route.split(',')))
+
+    def sync(self, orders: Iterable[dict], progress: Dict[int, Dict[str, float]]):
+        """
+        Aktif sipariş listesine göre farkları uygula.
+        progress: {order_id: {istasyon: biten adet}} (db.get_station_progress_map)
+        Dönüş: değişen sipariş sayısı
+        """
+        seen = set()
+        changed = 0
+        for order in orders:
+            oid = order.get('id')
+            if oid is None:
+                continue
+            seen.add(oid)
+            done = progress.get(oid, {})
+            entry = self._orders.get(oid)
+            if entry is not None and entry['sig'] == self._signature(order, done):
+                entry['order'] = order
+                continue
+            self.add_order(order, done)
+            changed += 1
+
+        for oid in [oid for oid in self._orders if oid not in seen]:
+            self.remove_order(oid)
+            changed += 1
+        return changed
+
+    def clear(self):
+        self.loads.clear()
+        self._keys.clear()
+        self._orders.clear()
+        self._members.clear()
+        self._bottlenecks.clear()
+        self._dirty.clear()
+        self.revision += 1
+
+    # ------------------------------------------------------------------
+    # OKUMALAR
+    # ------------------------------------------------------------------
+    def load(self, station) -> float:
+        return self.loads.get(station, 0.0)
+
+    def count(self, station) -> int:
+        return len(self._keys.get(station, ()))
+
+    def queue_days(self, station) -> float:
+        return self.load(station) / self.capacity(station)
+
+    def is_idle(self, station) -> bool:
+        return self.load(station) == 0
+
+    def bottlenecks(self) -> List[str]:
+        """Darboğaz istasyonlar (yük oranına göre azalan)"""
+        return sorted(self._bottlenecks, key=self.queue_days, reverse=True)
+
+    def position(self, order_id, station) -> Optional[int]:
+        """Siparişin istasyon kuyruğundaki sırası (0 = ilk)"""
+        entry = self._orders.get(order_id)
+        if not entry or station not in entry['pending']:
+            return None
+        return bisect_left(self._keys.get(station, []), entry['key'])
+
+    def entries(self):
+        """(sipariş, bekleyen istasyonlar) çiftleri - toplu hesaplamalar için"""
+        for entry in self._orders.values():
+            yield entry['order'], entry['pending']
+
+    def orders_at(self, station) -> Set[int]:
+        """İstasyonda bekleyen order_id'ler (salt okunur küme)"""
+        return self._members.get(station, set())
+
+    def get(self, order_id):
+        """(sipariş, bekleyen istasyonlar) ya da None"""
+        entry = self._orders.get(order_id)
+        return (entry['order'], entry['pending']) if entry else None
+
+    def take_dirty(self) -> Set[str]:
+        """Son okumadan beri yükü değişen istasyonlar (okununca sıfırlanır)"""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def get_pending(self, order_id) -> List[str]:
+        entry = self._orders.get(order_id)
+        return list(entry['pending']) if entry else []
+
+    def queue(self, station) -> List[dict]:
+        """İstasyondaki bekleyen siparişler (sıralı)"""
+        by_key = {e['key']: e['order'] for e in self._orders.values() if station in e['pending']}
+        return [by_key[k] for k in self._keys.get(station, []) if k in by_key]
+
+    def __contains__(self, order_id):
+        return order_id in self._orders
+
+    def __len__(self):
+        return len(self._orders)
@@ -0,0 +1,227 @@
+"""
+EFES ROTA X - Merkezi Yenileme Koordinatörü
+Ekranların her biri kendi zamanlayıcısıyla veritabanını yoklamak yerine
+değişiklik jetonu (data_versions) tek yerden, saniyede bir okunur ve
+değişen kapsamlar abone ekranlara olay olarak dağıtılır. Okuma async_db
+worker'ında yapılır; GUI thread'i SQLite kilidini beklemez.
+
+- Kapsamlar: orders, progress, pallets, capacities, calendar (+ gün değişimi: day)
+- orders / progress değişiminde değişiklik akışından hangi siparişlerin
+  değiştiği de okunur (ChangeEvent.ids); akış budandıysa ids None döner,
+  abone tam yenileme yapmalıdır.
+- Patlamalar birleştirilir: değişiklik gelmeyen ilk yoklamada ya da en geç
+  MAX_DELAY_MS sonunda tek olay yayınlanır.
+- Sahibi (owner) görünmeyen aboneye olay iletilmez, birikir; ekran
+  göründüğünde birleşik tek olay teslim edilir. Gizli ekranlar sorgu yapmaz.
+
+Kullanım:
+    from core.refresh_coordinator import refresh_coordinator
+    refresh_coordinator.subscribe(("orders", "progress"), self.on_data_changed, owner=self)
+"""
+
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from core.db_async import async_db
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+
+# Sipariş bazlı değişiklik akışı olan kapsamlar (DatabaseManager.CHANGE_FEED_TABLES)
+FEED_SCOPES = ("orders", "progress")
+
+
+@dataclass
+class ChangeEvent:
+    """Birleştirilmiş değişiklik olayı"""
+    scopes: Set[str] = field(default_factory=set)
+    order_ids: Optional[Dict[str, Set[int]]] = field(default_factory=dict)  # None = akış budandı
+
+    def touches(self, *scopes) -> bool:
+        return bool(self.scopes.intersection(scopes))
+
+    def ids(self, *scopes) -> Optional[Set[int]]:
+        """Verilen kapsamlarda değişen sipariş id'leri (bilinmiyorsa None)"""
+        if self.order_ids is None:
+            return None
+        result = set()
+        for scope in scopes or FEED_SCOPES:
+            result |= self.order_ids.get(scope, set())
+        return result
+
+    def merge(self, other: "ChangeEvent"):
+        self.scopes |= other.scopes
+        if self.order_ids is None or other.order_ids is None:
+            self.order_ids = None
+        else:
+            for scope, ids in other.order_ids.items():
+                self.order_ids.setdefault(scope, set()).update(ids)
+
+    def restrict(self, scopes) -> "ChangeEvent":
+        """Yalnızca verilen kapsamları içeren kopya"""
+        order_ids = None if self.order_ids is None else {
+            s: set(ids) for s, ids in self.order_ids.items() if s in scopes}
+        return ChangeEvent(self.scopes & set(scopes), order_ids)
+
+
+class Subscription:
+    """Tek abone: kapsamlar, geri çağrı, görünürlük sahibi ve bekleyen olay"""
+
+    def __init__(self, scopes, callback, owner=None):
+        self.scopes = frozenset(scopes)
+        self.callback = callback
+        self.owner = owner
+        self.pending: Optional[ChangeEvent] = None
+
+    def can_deliver(self) -> bool:
+        try:
+            return self.owner is None or self.owner.isVisible()
+        except RuntimeError:      # Qt nesnesi silinmiş
+            return False
+
+
+class RefreshCoordinator(QObject):
+    """
+    Değişiklik jetonunu tek yerden yoklayan ve olayları dağıtan koordinatör
+    Zamanlayıcı ilk abonelikte başlar, son abone ayrılınca durur.
+    """
+
+    changed = Signal(object)        # ChangeEvent (tüm kapsamlar)
+
+    POLL_MS = 1000                  # Yoklama aralığı (tek satırlık sürüm sorgusu)
+    MAX_DELAY_MS = 3000             # Sürekli değişimde en geç bu kadar sonra yayınla
+
+    def __init__(self, source=None, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self._subs = []
+        self._timer = None
+        self._versions = None
+        self._cursor = 0
+        self._day = None
+        self._pending: Optional[ChangeEvent] = None
+        self._pending_since = 0.0
+        self._reading = False           # Worker'da süren sürüm okuması
+
+    # ------------------------------------------------------------------
+    # ABONELİK
+    # ------------------------------------------------------------------
+    def subscribe(self, scopes: Iterable[str], callback: Callable[[ChangeEvent], None], owner=None) -> Subscription:
+        """
+        scopes: dinlenen kapsamlar; callback(ChangeEvent)
+        owner: görünürlüğü izlenen widget (gizliyken olaylar biriktirilir,
+        silinince abonelik kalkar)
+        """
+        sub = Subscription(scopes, callback, owner)
+        self._subs.append(sub)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(sub))
+        self._ensure_timer()
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self._subs:
+            self._subs.remove(sub)
+        if not self._subs and self._timer:
+            try:
+                self._timer.stop()
+            except RuntimeError:    # Kapanışta Qt nesnesi silinmiş
+                pass
+
+    def _ensure_timer(self):
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(self.poll)
+        if not self._timer.isActive():
+            self._timer.start(self.POLL_MS)
+
+    # ------------------------------------------------------------------
+    # YOKLAMA
+    # ------------------------------------------------------------------
+    def _read(self, source, versions, cursor, day):
+        """
+        Son yoklamadan bu yana değişenler (async_db worker thread'inde çalışır,
+        koordinatör durumuna dokunmaz). Dönüş: (sürümler, cursor, gün, olay | None)
+        """
+        current = source.get_data_versions()
+        today = date.today()
+        if versions is None:
+            return current, source.get_change_cursor(), today, None
+
+        scopes = {s for s, v in current.items() if v != versions.get(s)}
+        if today != day:
+            scopes.add("day")
+        if not scopes:
+            return current, cursor, today, None
+
+        event = ChangeEvent(scopes)
+        if scopes.intersection(FEED_SCOPES):
+            cursor, event.order_ids = source.get_changes_since(cursor)
+        return current, cursor, today, event
+
+    def poll(self):
+        """Sürüm okumasını worker'da başlat; GUI thread'i SQLite kilidini beklemez"""
+        source = self.source or db
+        if source is not None and not self._reading:
+            self._reading = True
+            async_db.call(self._read, source, self._versions, self._cursor, self._day,
+                          callback=self._on_read, error_callback=self._on_read_failed)
+        self._deliver_deferred()
+
+    def _on_read(self, result):
+        self._reading = False
+        self._versions, self._cursor, self._day, event = result
+        self._collect(event)
+
+    def _on_read_failed(self, message):
+        self._reading = False
+        self._collect(None)
+
+    def _collect(self, event: Optional[ChangeEvent]):
+        if event is not None:
+            if self._pending is None:
+                self._pending = event
+                self._pending_since = time.monotonic()
+            else:
+                self._pending.merge(event)
+
+        # Değişiklik durduysa ya da yeterince beklendiyse yayınla
+        if self._pending is not None and (
+                event is None or (time.monotonic() - self._pending_since) * 1000 >= self.MAX_DELAY_MS):
+            pending, self._pending = self._pending, None
+            self._dispatch(pending)
+
+    def _dispatch(self, event: ChangeEvent):
+        self.changed.emit(event)
+        for sub in list(self._subs):
+            if not sub.scopes.intersection(event.scopes):
+                continue
+            part = event.restrict(sub.scopes)
+            if sub.pending is not None:
+                sub.pending.merge(part)
+            else:
+                sub.pending = part
+        self._deliver_deferred()
+
+    def _deliver_deferred(self):
+        """Görünür sahiplerin bekleyen olaylarını teslim et"""
+        for sub in list(self._subs):
+            if sub.pending is None or not sub.can_deliver():
+                continue
+            event, sub.pending = sub.pending, None
+            try:
+                sub.callback(event)
+            except Exception:
+                traceback.print_exc()
+
+
+# Global koordinatör (zamanlayıcı ilk abonelikte başlar)
+refresh_coordinator = RefreshCoordinator()
@@ -0,0 +1,278 @@
+"""
+EFES ROTA X - Monte Carlo Teslim Riski Simülasyonu
+Deterministik planın üzerine istasyon hızı ve fire belirsizliği ekler.
+
+- İstasyon hız katsayısı: production_logs günlük üretim / kapasite oranından
+  log-normal dağılım olarak uydurulur. Yalnızca istasyonun kuyruğunun gün
+  boyu dolu olduğu (doygun) günler kullanılır; boş bekleyen günlerin düşük
+  çıktısı talebi ölçer, hızı değil.
+- Fire oranı: istasyonun üretilen / fire adetlerinden Beta dağılımı.
+  Kırılan parçalar yeniden üretildiği için iş miktarı (1 + fire) ile büyür.
+- Her istasyondaki iş sırası deterministik plandan (EventSimulator) alınır;
+  tüm replikasyonlar NumPy dizileri üzerinde birlikte ilerler.
+- Fırın yükleri plandaki gibi tek görevdir: üyeler birlikte başlar ve biter,
+  yük hazırlık (setup) süresi eklenir.
+- İsteğe bağlı olarak replikasyonlar süreç havuzuna (ProcessPoolExecutor) bölünür.
+
+Çıktı: sipariş başına P50 / P90 bitiş tarihi ve zamanında teslim olasılığı.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+
+@dataclass
+class StationModel:
+    """Bir istasyonun belirsizlik modeli"""
+    rate_mu: float = -0.0112        # log(hız katsayısı) ortalaması (E[katsayı] ~ 1)
+    rate_sigma: float = 0.15        # log(hız katsayısı) standart sapması
+    fire_alpha: float = 1.0         # Beta(alpha, beta) fire oranı
+    fire_beta: float = 99.0
+
+
+@dataclass
+class OrderRisk:
+    """Siparişin teslim riski"""
+    order_code: str
+    p50: datetime
+    p90: datetime
+    on_time_probability: Optional[float]     # teslim tarihi yoksa None
+
+
+class RiskModel:
+    """production_logs geçmişinden istasyon modellerini uydurur"""
+
+    MIN_SAMPLES = 5            # Bu kadar günden az veri varsa varsayılan model
+    FACTOR_RANGE = (0.2, 2.0)  # Uç değer kırpma (boş/eksik kayıtlı günler)
+
+    def __init__(self, models: Optional[Dict[str, StationModel]] = None):
+        self.models = models or {}
+
+    def get(self, station) -> StationModel:
+        return self.models.get(station) or StationModel()
+
+    @staticmethod
+    def saturated_days(completions) -> Set[Tuple[str, str]]:
+        """
+        Kuyruğu gün boyu dolu istasyon-günleri: {(istasyon, 'YYYY-MM-DD')}
+        Sipariş istasyona günden önce ulaşmış (önceki rota adımı bitmiş; ilk
+        adımda sipariş açılmış) ve istasyonda ertesi günden önce bitmemişse
+        istasyon o gün iş beklememiştir.
+        """
+        finished = {(r['order_id'], r['station_name']): r['finished_at'] for r in completions}
+        days: Set[Tuple[str, str]] = set()
+        for r in completions:
+            station = r['station_name']
+            route = [s.strip() for s in (r['route'] or '').split(',') if s.strip()]
+            if station not in route:
+                continue
+            k = route.index(station)
+            arrival = finished.get((r['order_id'], route[k - 1])) if k > 0 else r['created_at']
+            if not arrival:
+                continue
+            try:
+                day = date.fromisoformat(str(arrival)[:10]) + timedelta(days=1)
+                last = date.fromisoformat(str(r['finished_at'])[:10])
+            except ValueError:
+                continue
+            while day < last:
+                days.add((station, day.isoformat()))
+                day += timedelta(days=1)
+        return days
+
+    @classmethod
+    def fit(cls, capacities, db_manager=None, days=90):
+        manager = db_manager or db
+        samples: Dict[str, List[float]] = {}
+        try:
+            saturated = cls.saturated_days(manager.get_station_completions(days))
+            for row in manager.get_station_daily_output(days):
+                if (row['station_name'], row['day']) not in saturated:
+                    continue
+                cap = capacities.get(row['station_name']) or 0
+                if cap > 0 and row['m2']:
+                    factor = min(max(row['m2'] / cap, cls.FACTOR_RANGE[0]), cls.FACTOR_RANGE[1])
+                    samples.setdefault(row['station_name'], []).append(factor)
+            fire_counts = manager.get_station_fire_rates()
+        except Exception:
+            fire_counts = {}
+
+        models = {}
+        for station in capacities:
+            model = StationModel()
+            logs = [math.log(f) for f in samples.get(station, [])]
+            if len(logs) >= cls.MIN_SAMPLES:
+                mean = sum(logs) / len(logs)
+                var = sum((x - mean) ** 2 for x in logs) / (len(logs) - 1)
+                model.rate_mu, model.rate_sigma = mean, max(math.sqrt(var), 0.02)
+            done, fire = fire_counts.get(station, (0, 0))
+            # Beta(1 + fire, 99 + sağlam): veri yokken ~%1 fire beklentisi
+            model.fire_alpha = 1.0 + fire
+            model.fire_beta = 99.0 + max(done - fire, 0)
+            models[station] = model
+        return cls(models)
+
+
+def _simulate_chunk(task_station, task_orders, task_m2, task_rates, task_setup,
+                    station_params, n_orders, start_work, replications, seed):
+    """
+    Replikasyon yığını (süreç havuzunda da çalışabilmesi için modül fonksiyonu).
+    Görevler deterministik plandaki başlangıç sırasıyla gelir; her adım
+    R replikasyon için tek vektör işlemidir. Bir görev tek iş ya da fırın
+    yüküdür: yük, tüm üyeleri hazır olunca hazırlık süresinden sonra tek
+    seferde işlenir ve üyeleri birlikte bitirir.
+    Dönüş: (n_orders x R) bitiş zamanları (çalışma saati)
+    """
+    rng = np.random.default_rng(seed)
+    n_stations = len(station_params)
+    mu = np.array([p[0] for p in station_params])
+    sigma = np.array([p[1] for p in station_params])
+    fire = rng.beta(np.array([p[2] for p in station_params])[:, None],
+                    np.array([p[3] for p in station_params])[:, None],
+                    size=(n_stations, replications))
+
+    station_free = np.full((n_stations, replications), start_work)
+    order_ready = np.full((n_orders, replications), start_work)
+
+    for j in range(len(task_station)):
+        st = task_station[j]
+        members = task_orders[j]
+        factor = rng.lognormal(mu[st], sigma[st], replications)
+        duration = task_setup[j] + task_m2[j] * (1.0 + fire[st]) / (task_rates[j] * factor)
+        if len(members) == 1:
+            start = np.maximum(order_ready[members[0]], station_free[st])
+        else:
+            start = np.maximum(order_ready[members].max(axis=0), station_free[st])
+        end = start + duration
+        station_free[st] = end
+        order_ready[members] = end
+
+    return order_ready
+
+class DeliveryRiskSimulator:
+    """
+    Monte Carlo teslim riski
+
+    Kullanım:
+        sim = DeliveryRiskSimulator(planner)
+        risks = sim.run(replications=2000)       # {order_code: OrderRisk}
+    """
+
+    def __init__(self, planner, model: Optional[RiskModel] = None):
+        self.planner = planner
+        self.model = model
+
+    def run(self, replications=2000, workers=0, seed=None, cancel_check=None) -> Dict[str, OrderRisk]:
+        if not NUMPY_AVAILABLE:
+            return {}
+
+        from core.simulation_engine import EventSimulator, SimulationCancelled
+
+        setup = self.planner._prepare_simulation()
+        model = self.model or RiskModel.fit(self.planner.capacities)
+
+        # Deterministik plan -> istasyon sıraları ve fırın yükleri (tahminle aynı)
+        jobs, _ = EventSimulator(setup.calendar, setup.rates).run(
+            setup.orders, start_work=setup.now_w, cancel_check=cancel_check,
+            blocks=setup.batches, alternatives=setup.alternatives, block_setup=setup.batch_setup)
+        if not jobs:
+            return {}
+        jobs.sort(key=lambda j: (j.work_start, j.order_idx))
+
+        stations = sorted({j.station for j in jobs})
+        station_idx = {s: i for i, s in enumerate(stations)}
+        params = [(m.rate_mu, m.rate_sigma, m.fire_alpha, m.fire_beta)
+                  for m in (model.get(s) for s in stations)]
+
+        # Görevler: yük dışı her iş tek görev, bir fırın yükünün işleri tek görev.
+        # Yükün hazırlık süresi plandaki süre - işleme süresidir (fiili yük sırasıyla hesaplanmış)
+        tasks, load_task = [], {}
+        for j in jobs:
+            task = load_task.get((j.station, j.block)) if j.block >= 0 else None
+            if task is None:
+                task = [j.station, [], 0.0, j.work_end - j.work_start if j.block >= 0 else None]
+                tasks.append(task)
+                if j.block >= 0:
+                    load_task[(j.station, j.block)] = task
+            if j.order_idx not in task[1]:
+                task[1].append(j.order_idx)
+            task[2] += j.m2
+
+        task_station = np.array([station_idx[t[0]] for t in tasks], dtype=np.int64)
+        task_orders = [np.array(t[1], dtype=np.int64) for t in tasks]
+        task_m2 = np.array([t[2] for t in tasks])
+        task_rates = np.array([setup.rates.get(t[0]) or 1.0 for t in tasks])
+        task_setup = np.array([0.0 if t[3] is None else max(t[3] - t[2] / rate, 0.0)
+                               for t, rate in zip(tasks, task_rates)])
+        n_orders = len(setup.orders)
+        args = (task_station, task_orders, task_m2, task_rates, task_setup, params, n_orders, setup.now_w)
+
+        if cancel_check and cancel_check():
+            raise SimulationCancelled()
+
+        seeds = np.random.SeedSequence(seed)
+        if workers and workers > 1:
+            chunks = [replications // workers + (1 if i < replications % workers else 0) for i in range(workers)]
+            child_seeds = seeds.spawn(workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_simulate_chunk_star,
+                                      [args + (n, s) for n, s in zip(chunks, child_seeds) if n > 0]))
+            finish = np.concatenate(parts, axis=1)
+        else:
+            finish = _simulate_chunk(*args, replications, seeds)
+
+        if cancel_check and cancel_check():
+            raise SimulationCancelled()
+
+        return self._summarize(setup, finish)
+
+    def _summarize(self, setup, finish_work) -> Dict[str, OrderRisk]:
+        calendar = setup.calendar
+        # Ufku aşan replikasyonlar takvim sonuna kırpılır (planın to_wall(clip=True) davranışı)
+        finish_work = np.minimum(finish_work, calendar.work_horizon())
+        p50_w, p90_w = np.percentile(finish_work, [50, 90], axis=1)
+
+        # Çalışma saati -> takvim saati (vektörel, takvim indeksi üzerinden)
+        starts, cum_start, cum_end = (np.asarray(a) for a in calendar.work_index(float(finish_work.max())))
+
+        def to_wall(w):
+            i = np.minimum(np.searchsorted(cum_end, w, side='left'), len(cum_end) - 1)
+            return np.where(w <= setup.now_w, calendar.hours_since_origin(), starts[i] + (w - cum_start[i]))
+
+        results = {}
+        for oi, sim_order in enumerate(setup.orders):
+            order = sim_order.key
+            code = order.get('order_code')
+            on_time = None
+            due = order.get('delivery_date')
+            if due:
+                try:
+                    due_day = (datetime.strptime(str(due)[:10], '%Y-%m-%d').date() - calendar.origin).days
+                    # Teslim günü sonuna kadar biten replikasyonların oranı
+                    due_w = calendar.work_before((due_day + 1) * 24.0)
+                    on_time = float(np.mean(finish_work[oi] <= due_w))
+                except ValueError:
+                    on_time = None
+            p50, p90 = to_wall(np.array([p50_w[oi], p90_w[oi]]))
+            results[code] = OrderRisk(code, calendar.to_datetime(float(p50)),
+                                      calendar.to_datetime(float(p90)), on_time)
+        return results
+
+
+def _simulate_chunk_star(args):
+    return _simulate_chunk(*args)
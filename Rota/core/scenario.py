@@ -0,0 +1,321 @@
+"""
+EFES ROTA X - What-if Senaryo Alanı (Sandbox)
+Canlı sipariş defteri üzerinde veritabanına dokunmadan öncelik, kapasite ve
+varsayımsal sipariş denemeleri.
+
+- PlanningSnapshot: veritabanından bir kez alınan salt okunur taban
+  (aktif siparişler, istasyon ilerlemesi, kapasiteler, tatiller).
+- Sandbox: tabanın üzerine yalnızca farkları (düzenleme / yeni sipariş /
+  kapasite) tutan katman. Okumalar taban + farkı birleştirir; değişmeyen
+  sipariş sözlükleri kopyalanmadan paylaşılır, düzenlenen sipariş için
+  yeni sözlük üretilir (copy-on-write). Birden çok sandbox aynı tabanı
+  paylaşır; fork() yalnızca fark sözlüklerini kopyalar.
+- Sandbox, planlayıcının kullandığı veri erişim metodlarını
+  (get_orders_by_status, get_station_progress_map, get_all_capacities,
+  get_holidays, get_data_version) DatabaseManager ile aynı imzayla sunar:
+      SmartPlanner(source=sandbox).calculate_forecast()
+- commit(): farklar tek işlemde veritabanına yazılır; taban alındıktan
+  sonra sipariş / kapasite verisi değiştiyse ScenarioConflict.
+
+Dönen sipariş sözlükleri paylaşımlıdır, salt okunur kabul edilmelidir.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from core.queue_index import QUEUE_POSITION_UNSET, QUEUE_KEY_EPSILON
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+
+class ScenarioConflict(Exception):
+    """Taban alındıktan sonra canlı veri değişti (commit reddedildi)"""
+    pass
+
+
+# Sandbox'ın tuttuğu siparişler (DecisionView 'Uretimde' yazımını da kapsar)
+ACTIVE_STATUSES = ("Beklemede", "Üretimde", "Uretimde")
+
+# Düzenlenebilir sipariş alanları (commit'te kolon adı olarak kullanılır)
+EDITABLE_FIELDS = (
+    "customer_name", "product_type", "thickness", "width", "height", "quantity",
+    "declared_total_m2", "route", "priority", "delivery_date", "status", "queue_position",
+)
+
+# Yeni sipariş kolonları (DatabaseManager.add_order ile aynı)
+INSERT_FIELDS = (
+    "order_code", "barcode", "customer_name", "product_type", "thickness",
+    "width", "height", "quantity", "declared_total_m2", "route",
+    "sale_price", "total_price", "currency", "priority", "delivery_date",
+)
+
+PRIORITY_ORDER = {"Kritik": 1, "Acil": 2}
+
+
+# =============================================================================
+# TABAN
+# =============================================================================
+@dataclass(frozen=True)
+class PlanningSnapshot:
+    """Salt okunur taban (sandbox'lar arasında kopyalanmadan paylaşılır)"""
+    orders: Tuple[dict, ...]
+    by_id: Mapping[int, dict]
+    progress: Mapping[int, Mapping[str, float]]
+    capacities: Mapping[str, float]
+    holidays: Tuple[str, ...]
+    versions: Mapping[str, int]             # alındığı andaki kapsam sürümleri
+    taken_at: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def capture(cls, source=None) -> "PlanningSnapshot":
+        """Canlı veritabanından tabanı al (4 sorgu)"""
+        source = source or db
+        orders = tuple(source.get_orders_by_status(list(ACTIVE_STATUSES)))
+        try: holidays = tuple(source.get_holidays())
+        except Exception: holidays = ()
+        return cls(
+            orders=orders,
+            by_id=MappingProxyType({o['id']: o for o in orders}),
+            progress=MappingProxyType(source.get_station_progress_map([o['id'] for o in orders])),
+            capacities=MappingProxyType(dict(source.get_all_capacities())),
+            holidays=holidays,
+            versions=MappingProxyType(dict(source.get_data_versions())),
+        )
+
+    def sandbox(self, name: str = "") -> "Sandbox":
+        return Sandbox(self, name)
+
+
+# =============================================================================
+# SANDBOX
+# =============================================================================
+class Sandbox:
+    """
+    Taban + fark katmanı
+
+    Kullanım:
+        base = PlanningSnapshot.capture()
+        a = base.sandbox("Kritik one")
+        a.set_priority(42, "Kritik")
+        a.set_capacity("TEMPER A1", 700)
+        b = a.fork("Ek siparis")
+        b.add_order({"order_code": "DENEME", "quantity": 40, "declared_total_m2": 120,
+                     "route": "INTERMAC,TEMPER A1,SEVKIYAT", "delivery_date": "2025-12-01"})
+        grid, details, loads = SmartPlanner(source=b).calculate_forecast()
+        a.commit()                       # tek işlem
+    """
+
+    _new_ids = itertools.count(1)
+
+    def __init__(self, base: PlanningSnapshot, name: str = ""):
+        self.base = base
+        self.name = name
+        self.revision = 0
+        self._edits: Dict[int, dict] = {}           # order_id -> alan değişiklikleri
+        self._merged: Dict[int, dict] = {}          # order_id -> taban + değişiklik (önbellek)
+        self._new: Dict[int, dict] = {}             # negatif id -> varsayımsal sipariş
+        self._capacities: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # DÜZENLEME
+    # ------------------------------------------------------------------
+    def _touch(self):
+        self.revision += 1
+
+    def update_order(self, order_id, **fields):
+        """Sipariş alanlarını değiştir (taban değişmez)"""
+        unknown = set(fields) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise KeyError(f"Düzenlenemez alan: {', '.join(sorted(unknown))}")
+        if order_id in self._new:
+            self._new[order_id] = {**self._new[order_id], **fields}
+        elif order_id in self.base.by_id:
+            self._edits[order_id] = {**self._edits.get(order_id, {}), **fields}
+            self._merged.pop(order_id, None)
+        else:
+            raise KeyError(f"Sipariş yok: {order_id}")
+        self._touch()
+
+    def set_priority(self, order_id, priority):
+        self.update_order(order_id, priority=priority)
+
+    def set_capacity(self, station, m2_per_day):
+        self._capacities[station] = float(m2_per_day)
+        self._touch()
+
+    def add_order(self, data: dict) -> int:
+        """Varsayımsal sipariş ekle; negatif id döner"""
+        order_id = -next(self._new_ids)
+        order = {key: data.get(key) for key in INSERT_FIELDS}
+        order.update({
+            'id': order_id,
+            'order_code': data.get('order_code') or f"SENARYO-{-order_id}",
+            'quantity': data.get('quantity', 1),
+            'declared_total_m2': data.get('declared_total_m2', data.get('total_m2', 0)),
+            'priority': data.get('priority', 'Normal'),
+            'status': 'Beklemede',
+            'queue_position': data.get('queue_position'),
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'is_scenario': True,
+        })
+        self._new[order_id] = order
+        self._touch()
+        return order_id
+
+    def remove_order(self, order_id):
+        """Varsayımsal siparişi çıkar (taban siparişler için update_order(status=...))"""
+        if self._new.pop(order_id, None) is None:
+            raise KeyError(f"Senaryo siparişi değil: {order_id}")
+        self._touch()
+
+    def reset(self):
+        self._edits.clear()
+        self._merged.clear()
+        self._new.clear()
+        self._capacities.clear()
+        self._touch()
+
+    def fork(self, name: str = "") -> "Sandbox":
+        """Aynı tabanı paylaşan kopya (yalnızca farklar kopyalanır)"""
+        other = Sandbox(self.base, name or self.name)
+        other._edits = {oid: dict(edit) for oid, edit in self._edits.items()}
+        other._new = {oid: dict(order) for oid, order in self._new.items()}
+        other._capacities = dict(self._capacities)
+        return other
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._edits or self._new or self._capacities)
+
+    def changes(self) -> Dict[str, int]:
+        return {"orders": len(self._edits), "new_orders": len(self._new), "capacities": len(self._capacities)}
+
+    # ------------------------------------------------------------------
+    # OKUMA (DatabaseManager ile aynı imzalar)
+    # ------------------------------------------------------------------
+    def get_order(self, order_id) -> Optional[dict]:
+        if order_id in self._new:
+            return self._new[order_id]
+        order = self.base.by_id.get(order_id)
+        if order is None or order_id not in self._edits:
+            return order
+        merged = self._merged.get(order_id)
+        if merged is None:
+            merged = self._merged[order_id] = {**order, **self._edits[order_id]}
+        return merged
+
+    def get_orders_by_status(self, status) -> List[dict]:
+        statuses = set(status) if isinstance(status, (list, tuple, set)) else {status}
+        edited = set(self._edits)
+        orders = [self.get_order(o['id']) if o['id'] in edited else o for o in self.base.orders]
+        orders.extend(list(self._new.values()))
+        result = [o for o in orders if o.get('status') in statuses]
+        # DatabaseManager.get_orders_by_status ile aynı sıra
+        result.sort(key=lambda o: str(o.get('created_at') or ''), reverse=True)
+        result.sort(key=lambda o: PRIORITY_ORDER.get(o.get('priority'), 3))
+        return result
+
+    def get_orders_by_ids(self, order_ids) -> List[dict]:
+        return [o for o in (self.get_order(oid) for oid in order_ids) if o is not None]
+
+    def get_station_progress_map(self, order_ids=None):
+        if order_ids is None:
+            return dict(self.base.progress)
+        return {oid: self.base.progress[oid] for oid in order_ids if oid in self.base.progress}
+
+    def get_all_capacities(self) -> Dict[str, float]:
+        if not self._capacities:
+            return dict(self.base.capacities)
+        return {**self.base.capacities, **self._capacities}
+
+    def get_holidays(self) -> List[str]:
+        return list(self.base.holidays)
+
+    def get_data_versions(self) -> Dict[str, int]:
+        return {**self.base.versions, "scenario": self.revision}
+
+    def get_data_version(self, scopes=None) -> int:
+        """Sandbox içi değişiklik jetonu (önbellek anahtarları için)"""
+        versions = self.get_data_versions()
+        if scopes is None:
+            return sum(versions.values())
+        return sum(versions.get(s, 0) for s in scopes) + self.revision
+
+    # Karar ekranının sıra yazımı sandbox'a yönlenir
+    def set_queue_positions(self, positions, priorities=None):
+        for order_id, position in positions.items():
+            self.update_order(order_id, queue_position=position)
+        for order_id, priority in (priorities or {}).items():
+            self.update_order(order_id, priority=priority)
+
+    def move_order_between(self, order_id, prev_id=None, next_id=None):
+        """DatabaseManager.move_order_between ile aynı kural, sandbox içinde"""
+        def position(oid):
+            order = self.get_order(oid)
+            value = order.get('queue_position') if order else None
+            return value if value is not None else QUEUE_POSITION_UNSET
+
+        lower = position(prev_id) if prev_id is not None else 0.0
+        upper = position(next_id) if next_id is not None else QUEUE_POSITION_UNSET
+        if lower >= QUEUE_POSITION_UNSET:
+            return None
+        if upper >= QUEUE_POSITION_UNSET:
+            upper = min(lower + 2.0, QUEUE_POSITION_UNSET)
+        if upper - lower < 2 * QUEUE_KEY_EPSILON:
+            return None
+        key = (lower + upper) / 2.0
+        self.update_order(order_id, queue_position=key)
+        return key
+
+    # ------------------------------------------------------------------
+    # COMMIT
+    # ------------------------------------------------------------------
+    def commit(self, target=None, force=False) -> Dict[str, int]:
+        """
+        Farkları tek işlemde veritabanına yaz.
+        force=False iken taban alındıktan sonra sipariş / kapasite verisi
+        değiştiyse ScenarioConflict. Başarılıysa farklar temizlenir.
+        Dönüş: {'orders': güncellenen, 'new_orders': eklenen, 'capacities': değişen}
+        """
+        target = target or db
+        counts = self.changes()
+        stale = []
+        with target.get_connection() as conn:
+            # Yazma kilidi önce alınır; sürüm kontrolü ile yazım arasında başka yazım giremez
+            conn.execute("BEGIN IMMEDIATE")
+            if not force:
+                current = {r[0]: r[1] for r in conn.execute("SELECT scope, version FROM data_versions")}
+                stale = [s for s in ("orders", "capacities") if current.get(s) != self.base.versions.get(s)]
+            if not stale:
+                self._write(conn)
+        # Çakışma veritabanı hata işleyicisinin dışında bildirilir (hata olarak loglanmaz)
+        if stale:
+            raise ScenarioConflict(f"Canlı veri değişti: {', '.join(stale)}")
+
+        self.reset()
+        return counts
+
+    def _write(self, conn):
+        for order_id, edit in self._edits.items():
+            columns = [c for c in EDITABLE_FIELDS if c in edit]
+            conn.execute(f"UPDATE orders SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                         [edit[c] for c in columns] + [order_id])
+
+        for order in self._new.values():
+            columns = list(INSERT_FIELDS) + ["queue_position"]
+            values = [order.get(c) for c in columns]
+            values[columns.index("currency")] = order.get("currency") or "TL"
+            for money in ("sale_price", "total_price"):
+                values[columns.index(money)] = order.get(money) or 0
+            conn.execute(f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                         values)
+
+        conn.executemany("UPDATE factory_settings SET setting_value = ? WHERE setting_key = ?",
+                         [(value, station) for station, value in self._capacities.items()])
+
@@ -0,0 +1,340 @@
+"""
+EFES ROTA X - Sıra (queue_position) Optimizasyonu
+Sipariş sırasını yerel arama (değiştir / araya ekle komşulukları, tavlama
+benzetimi) ile ağırlıklı gecikmeyi azaltacak şekilde iyileştirir.
+
+Değerlendirme modeli: permütasyon çizelgesi. Her istasyon siparişleri
+sıra sırasıyla işler; işin başlangıcı max(siparişin önceki adımı bitti,
+istasyon boşaldı). Aday hamlelerde tüm plan yeniden simüle edilmez:
+- Sıra belirli aralıklarla kontrol noktalarına (istasyon boşalma anları)
+  bölünür; hamle penceresinden önceki kontrol noktasından başlanır.
+- Pencereden sonra yalnızca boşalma anı değişmiş istasyonlara dokunan
+  siparişler yeniden hesaplanır; fark kalmadığında kalan maliyet
+  önceki çözümden okunur. Kabul edilen hamle de aynı yolla uygulanır.
+
+Model her istasyonu tek makine sayar; makine grupları (alternatifler) ve
+temper fırın yükleri yoktur. Bu yüzden önerilen sıra ve başlangıç sırası
+planlayıcının olay simülasyonundan (gruplar + bu sıraya göre kurulan
+yükler) geçirilir; orada iyileşme yoksa mevcut sıra korunur.
+"""
+
+import math
+import random
+import time
+from itertools import accumulate
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+
+from core.dispatch_rules import PRIORITY_WEIGHTS
+from core.simulation_engine import SimOrder, SimulationCancelled
+
+
+# =============================================================================
+# ARTIMLI DEĞERLENDİRİCİ
+# =============================================================================
+class SequenceEvaluator:
+    """
+    Permütasyon çizelgesinin ağırlıklı gecikmesi (çalışma saati)
+
+    steps[i]  : siparişin [(istasyon_idx, süre), ...] adımları
+    due[i]    : teslim anı (kümülatif çalışma saati, yoksa inf)
+    weight[i] : öncelik ağırlığı
+    """
+
+    EPS = 1e-9
+
+    def __init__(self, steps, due, weight, start_work, n_stations, checkpoint_every=None):
+        self.steps = steps
+        self.due = due
+        self.weight = weight
+        self.start = start_work
+        self.n_stations = n_stations
+        n = len(steps)
+        self.block = checkpoint_every or max(8, int(math.sqrt(n)) or 1)
+        self.seq: List[int] = []
+        self.ends: List[List[float]] = []       # pozisyon -> adım bitişleri
+        self.cost: List[float] = []             # pozisyon -> ağırlıklı gecikme
+        self.cum: List[float] = [0.0]           # önek toplamı (cum[p] = p'den öncekiler)
+        self.checkpoints: List[List[float]] = []  # blok başı istasyon boşalma anları
+
+    def _order_cost(self, oi, finish):
+        late = finish - self.due[oi]
+        return self.weight[oi] * late if late > 0 else 0.0
+
+    def load(self, sequence):
+        """Sırayı baştan değerlendir"""
+        self.seq = list(sequence)
+        n = len(self.seq)
+        self.ends = [None] * n
+        self.cost = [0.0] * n
+        self.cum = [0.0] * (n + 1)
+        self.checkpoints = []
+        self._replay(0, [self.start] * self.n_stations)
+        return self.total
+
+    @property
+    def total(self) -> float:
+        return self.cum[-1]
+
+    def _replay(self, pos0, free):
+        """pos0'dan sona kadar yeniden hesapla (pos0 blok başı olmalı)"""
+        seq, steps, block = self.seq, self.steps, self.block
+        del self.checkpoints[pos0 // block:]
+        for p in range(pos0, len(seq)):
+            if p % block == 0:
+                self.checkpoints.append(list(free))
+            oi = seq[p]
+            ready = self.start
+            ends = []
+            for s, d in steps[oi]:
+                t = free[s] if free[s] > ready else ready
+                ready = t + d
+                free[s] = ready
+                ends.append(ready)
+            self.ends[p] = ends
+            self.cost[p] = self._order_cost(oi, ready)
+            self.cum[p + 1] = self.cum[p] + self.cost[p]
+
+    def _base_free(self, pos0, upto):
+        """Mevcut çözümde 'upto' pozisyonundan önceki istasyon boşalma anları"""
+        free = list(self.checkpoints[pos0 // self.block])
+        seq, steps, ends = self.seq, self.steps, self.ends
+        for p in range(pos0, upto):
+            for (s, _), e in zip(steps[seq[p]], ends[p]):
+                free[s] = e
+        return free
+
+    def evaluate(self, lo, window, apply=False) -> float:
+        """
+        seq[lo:lo+len(window)] yerine window konursa toplam maliyet.
+        Pencere mevcut sıradaki aynı siparişlerin bir permütasyonu olmalı.
+        apply=True: hamle uygulanır (yalnızca etkilenen pozisyonlar güncellenir).
+        """
+        seq, steps, ends, eps, block = self.seq, self.steps, self.ends, self.EPS, self.block
+        hi = lo + len(window)               # pencereden sonraki ilk pozisyon
+        pos0 = (lo // block) * block
+
+        free = self._base_free(pos0, lo)
+        base = self._base_free(pos0, hi) if apply else None
+        cost = self.cum[lo]
+        for k, oi in enumerate(window):
+            p = lo + k
+            if apply and p > lo and p % block == 0:
+                self.checkpoints[p // block] = list(free)
+            ready = self.start
+            new_ends = []
+            for s, d in steps[oi]:
+                t = free[s] if free[s] > ready else ready
+                ready = t + d
+                free[s] = ready
+                new_ends.append(ready)
+            order_cost = self._order_cost(oi, ready)
+            cost += order_cost
+            if apply:
+                ends[p] = new_ends
+                self.cost[p] = order_cost
+        if apply:
+            seq[lo:hi] = window
+        else:
+            base = self._base_free(pos0, hi)
+
+        # Pencere sonrası: sadece farklı istasyonlara dokunan siparişler
+        delta = {s: free[s] for s in range(self.n_stations) if abs(free[s] - base[s]) > eps}
+        p = hi
+        n = len(seq)
+        while delta and p < n:
+            if apply and p % block == 0:
+                checkpoint = self.checkpoints[p // block]
+                for s, v in delta.items():
+                    checkpoint[s] = v
+            oi = seq[p]
+            order_steps = steps[oi]
+            if any(s in delta for s, _ in order_steps):
+                ready = self.start
+                new_ends = []
+                for (s, d), be in zip(order_steps, ends[p]):
+                    f = delta.get(s, base[s])
+                    t = f if f > ready else ready
+                    ready = t + d
+                    new_ends.append(ready)
+                    if abs(ready - be) > eps:
+                        delta[s] = ready
+                    else:
+                        delta.pop(s, None)
+                    base[s] = be
+                order_cost = self._order_cost(oi, ready)
+                cost += order_cost
+                if apply:
+                    ends[p] = new_ends
+                    self.cost[p] = order_cost
+            else:
+                for (s, _), be in zip(order_steps, ends[p]):
+                    base[s] = be
+                cost += self.cost[p]
+            p += 1
+
+        if apply:
+            self.cum[lo + 1:] = list(accumulate(self.cost[lo:], initial=self.cum[lo]))[1:]
+        return cost + self.cum[n] - self.cum[p] if not apply else self.total
+
+    def commit(self, lo, window):
+        """Hamleyi uygula; dönüş: yeni toplam maliyet"""
+        return self.evaluate(lo, window, apply=True)
+
+
+# =============================================================================
+# YEREL ARAMA
+# =============================================================================
+@dataclass
+class OptimizationResult:
+    """Optimizasyon sonucu (gecikmeler takvim günü, olay simülasyonuyla)"""
+    order_ids: List = field(default_factory=list)     # önerilen sıra (sipariş id)
+    baseline_weighted_tardiness: float = 0.0
+    proposed_weighted_tardiness: float = 0.0
+    baseline_late_count: int = 0
+    proposed_late_count: int = 0
+    iterations: int = 0
+    accepted: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def improvement(self) -> float:
+        """Ağırlıklı gecikmedeki iyileşme oranı (0-1)"""
+        if self.baseline_weighted_tardiness <= 0:
+            return 0.0
+        return 1.0 - self.proposed_weighted_tardiness / self.baseline_weighted_tardiness
+
+
+class SequenceOptimizer:
+    """
+    Tavlama benzetimi ile sıra arama
+
+    Kullanım:
+        opt = SequenceOptimizer(SmartPlanner())
+        result = opt.run(order_ids=ekrandaki_sira, time_limit=2.0)
+        result.order_ids   # önerilen sıra
+    """
+
+    MAX_SHIFT = 40              # hamle mesafesi (pozisyon)
+    CANCEL_CHECK_INTERVAL = 64
+
+    def __init__(self, planner):
+        self.planner = planner
+
+    @staticmethod
+    def _due_wall(order, calendar):
+        due = order.get('delivery_date')
+        if not due:
+            return math.inf
+        try:
+            due_day = (datetime.strptime(str(due)[:10], '%Y-%m-%d').date() - calendar.origin).days
+        except ValueError:
+            return math.inf
+        return (due_day + 1) * 24.0
+
+    def _build(self, setup):
+        stations = sorted({st for o in setup.orders for st, _ in o.steps})
+        station_idx = {s: i for i, s in enumerate(stations)}
+        steps, due, due_wall, weight = [], [], [], []
+        for sim_order in setup.orders:
+            order = sim_order.key
+            steps.append([(station_idx[st], m2 / (setup.rates.get(st) or 1.0)) for st, m2 in sim_order.steps])
+            wall = self._due_wall(order, setup.calendar)
+            due_wall.append(wall)
+            due.append(setup.calendar.work_before(wall) if wall != math.inf else math.inf)
+            weight.append(PRIORITY_WEIGHTS.get(order.get('priority'), 1.0))
+        return steps, due, due_wall, weight, len(stations)
+
+    @staticmethod
+    def simulate(setup, sequence, due_wall, weight, cancel_check=None):
+        """Olay simülasyonu ile (ağırlıklı gecikme günü, geciken sayısı)"""
+        orders = [SimOrder(setup.orders[i].key, rank, setup.orders[i].steps)
+                  for rank, i in enumerate(sequence)]
+        _, finish_work = setup.simulate(orders, cancel_check=cancel_check)
+        total, late = 0.0, 0
+        for rank, w in finish_work.items():
+            oi = sequence[rank]
+            finish = setup.calendar.to_wall(w, clip=True) if w > setup.now_w else setup.now_h
+            tardy = (finish - due_wall[oi]) / 24.0
+            if tardy > 0:
+                total += weight[oi] * tardy
+                late += 1
+        return total, late
+
+    def run(self, order_ids=None, time_limit=2.0, seed=None, cancel_check=None) -> OptimizationResult:
+        """
+        order_ids: başlangıç sırası (ekrandaki sıra); listede olmayanlar
+        planlayıcının öncelik sırasıyla sona eklenir.
+        """
+        t0 = time.perf_counter()
+        setup = self.planner._prepare_simulation()
+        n = len(setup.orders)
+        if n < 2:
+            return OptimizationResult(order_ids=[o.key.get('id') for o in setup.orders])
+
+        by_id = {o.key.get('id'): i for i, o in enumerate(setup.orders)}
+        initial = [by_id[oid] for oid in (order_ids or []) if oid in by_id]
+        placed = set(initial)
+        initial += [i for i in range(n) if i not in placed]
+
+        steps, due, due_wall, weight, n_stations = self._build(setup)
+        evaluator = SequenceEvaluator(steps, due, weight, setup.now_w, n_stations)
+        current = evaluator.load(initial)
+        best, best_seq = current, list(initial)
+
+        rng = random.Random(seed)
+        # Başlangıç sıcaklığı: ortalama sipariş maliyetinin küçük bir kesri
+        temperature = max(current / n * 0.002, 1e-6)
+        iterations = accepted = 0
+        deadline = t0 + time_limit
+
+        while True:
+            iterations += 1
+            if iterations % self.CANCEL_CHECK_INTERVAL == 0:
+                if cancel_check and cancel_check():
+                    raise SimulationCancelled()
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                # Süreye göre soğuma (sona doğru yalnızca iyileştirme)
+                temperature = max(current / n * 0.002, 1e-6) * max(0.0, (deadline - now) / time_limit)
+
+            i = rng.randrange(n)
+            j = min(n - 1, max(0, i + rng.randint(-self.MAX_SHIFT, self.MAX_SHIFT)))
+            if i == j:
+                continue
+            lo, hi = min(i, j), max(i, j)
+            window = evaluator.seq[lo:hi + 1]
+            if rng.random() < 0.5:
+                window[0], window[-1] = window[-1], window[0]           # değiştir
+            elif i < j:
+                window = window[1:] + window[:1]                        # i'yi j'ye taşı
+            else:
+                window = window[-1:] + window[:-1]                      # i'yi j'ye çek
+
+            candidate = evaluator.evaluate(lo, window)
+            diff = candidate - current
+            if diff < -SequenceEvaluator.EPS or (temperature > 1e-6 and diff > 0
+                                                 and rng.random() < math.exp(-diff / temperature)):
+                current = evaluator.commit(lo, window)
+                accepted += 1
+                if current < best - SequenceEvaluator.EPS:
+                    best, best_seq = current, list(evaluator.seq)
+
+        base_wt, base_late = self.simulate(setup, initial, due_wall, weight, cancel_check)
+        best_wt, best_late = self.simulate(setup, best_seq, due_wall, weight, cancel_check)
+        if best_wt > base_wt:
+            # Model iyileşmesi olay simülasyonunda karşılık bulmadıysa mevcut sırada kal
+            best_seq, best_wt, best_late = initial, base_wt, base_late
+
+        return OptimizationResult(
+            order_ids=[setup.orders[i].key.get('id') for i in best_seq],
+            baseline_weighted_tardiness=base_wt,
+            proposed_weighted_tardiness=best_wt,
+            baseline_late_count=base_late,
+            proposed_late_count=best_late,
+            iterations=iterations,
+            accepted=accepted,
+            elapsed=time.perf_counter() - t0,
+        )
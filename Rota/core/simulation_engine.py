@@ -0,0 +1,413 @@
+"""
+EFES ROTA X - Olay Tabanlı Simülasyon Motoru
+Planlayıcının saat çözünürlüğündeki çekirdeği.
+
+- WorkCalendar: Vardiya, hafta sonu ve tatil günlerini bilen çalışma takvimi.
+  Çalışma aralıkları bir kez indekslenir; "şu saate kadar kaç çalışma saati
+  geçti" ve "şu kadar çalışma saati sonra saat kaç" soruları bisect ile
+  O(log n) cevaplanır.
+- EventSimulator: Her istasyonda iş başla/bitir olaylarını heap kuyruğu ile
+  işler. Maliyet zaman adımı sayısına değil olay sayısına bağlıdır.
+  Toplu (batch) istasyonlarda sabit sıralı fırın yükleri blok olarak işlenir.
+  Alternatifi olan istasyonlarda iş, gruptaki en erken boşalacak makineye
+  atanır (makine başına boşalma zamanı heap'i, O(log k)).
+
+Zaman birimi: plan başlangıç gününün (origin) gece yarısından itibaren saat.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class SimulationCancelled(Exception):
+    """Simülasyon dışarıdan iptal edildi (yeni bir istek geldi)"""
+    pass
+
+
+class WorkCalendar:
+    """
+    Vardiya takvimi ve çalışma zamanı indeksi
+
+    Kullanım:
+        cal = WorkCalendar(date.today(), holidays=["2025-10-29"])
+        bitis = cal.to_wall(cal.work_before(simdi) + 12)   # 12 çalışma saati sonrası
+    """
+
+    # Varsayılan: 2 vardiya (08:00-16:00, 16:00-24:00)
+    DEFAULT_SHIFTS: List[Tuple[float, float]] = [(8.0, 16.0), (16.0, 24.0)]
+    # Pazartesi(0) - Cumartesi(5) çalışılır, Pazar tatil
+    DEFAULT_WORKDAYS: Tuple[int, ...] = (0, 1, 2, 3, 4, 5)
+    # Takvimin uzatılabileceği üst sınır (sonsuz döngü koruması)
+    MAX_DAYS = 3650
+
+    def __init__(self, origin: Optional[date] = None,
+                 shifts: Optional[List[Tuple[float, float]]] = None,
+                 workdays: Optional[Iterable[int]] = None,
+                 holidays: Optional[Iterable] = None):
+        if isinstance(origin, datetime):
+            origin = origin.date()
+        self.origin: date = origin or date.today()
+        self.shifts = sorted(shifts if shifts is not None else self.DEFAULT_SHIFTS)
+        self.workdays = set(workdays if workdays is not None else self.DEFAULT_WORKDAYS)
+        self.holidays = {self._to_date(h) for h in (holidays or [])}
+
+        # Standart bir iş gününün çalışma saati (kapasite m²/gün -> m²/saat)
+        self.shift_hours = sum(max(0.0, e - s) for s, e in self.shifts)
+
+        # İndeks: çalışma aralıkları ve kümülatif çalışma saatleri
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._cum_start: List[float] = []    # aralık başına kadar birikmiş çalışma
+        self._cum_end: List[float] = []      # aralık sonuna kadar birikmiş çalışma
+        self._day_hours: List[float] = []    # gün bazında çalışma saati
+        self._day_work_start: List[float] = [0.0]  # gün başına kadar birikmiş çalışma
+        self._built_days = 0
+
+    @staticmethod
+    def _to_date(value) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+    # ------------------------------------------------------------------
+    # İNDEKS
+    # ------------------------------------------------------------------
+    def is_working_day(self, day: date) -> bool:
+        """Gün çalışma günü mü? (hafta sonu / tatil değil)"""
+        return day.weekday() in self.workdays and day not in self.holidays
+
+    def _extend(self, days: int):
+        """İndeksi verilen gün sayısına kadar genişlet"""
+        total = self._cum_end[-1] if self._cum_end else 0.0
+        while self._built_days < days:
+            d = self._built_days
+            base = d * 24.0
+            hours = 0.0
+            if self.is_working_day(self.origin + timedelta(days=d)):
+                for s, e in self.shifts:
+                    if e <= s:
+                        continue
+                    self._starts.append(base + s)
+                    self._ends.append(base + e)
+                    self._cum_start.append(total)
+                    total += e - s
+                    self._cum_end.append(total)
+                    hours += e - s
+            self._day_hours.append(hours)
+            self._day_work_start.append(total)
+            self._built_days += 1
+
+    def _ensure_time(self, t: float):
+        if t >= self._built_days * 24.0:
+            self._extend(min(self.MAX_DAYS, int(t // 24.0) + 1))
+
+    def _ensure_work(self, w: float):
+        if self.shift_hours <= 0 or not self.workdays:
+            raise ValueError("Takvimde çalışma zamanı tanımlı değil")
+        while (not self._cum_end or self._cum_end[-1] < w) and self._built_days < self.MAX_DAYS:
+            self._extend(min(self.MAX_DAYS, max(self._built_days * 2, 32)))
+        if not self._cum_end or self._cum_end[-1] < w:
+            raise ValueError("Takvim ufku aşıldı")
+
+    # ------------------------------------------------------------------
+    # SORGULAR
+    # ------------------------------------------------------------------
+    def work_before(self, t: float) -> float:
+        """[0, t) aralığındaki toplam çalışma saati"""
+        if t <= 0:
+            return 0.0
+        self._ensure_time(t)
+        i = bisect_right(self._starts, t) - 1
+        if i < 0:
+            return 0.0
+        return self._cum_start[i] + min(t, self._ends[i]) - self._starts[i]
+
+    def to_wall(self, w: float, start: bool = False, clip: bool = False) -> float:
+        """
+        Kümülatif çalışma saatini takvim saatine çevirir.
+        start=True: o noktadan sonra işin fiilen başlayabileceği an
+        start=False: o çalışma miktarının tamamlandığı an
+        clip=True: takvim ufkunu (MAX_DAYS) aşan iş ValueError yerine ufkun sonuna kırpılır
+        """
+        if clip:
+            try:
+                return self.to_wall(w, start=start)
+            except ValueError:
+                return self.MAX_DAYS * 24.0
+        if start:
+            self._ensure_work(w + 1e-9)
+            i = bisect_right(self._cum_end, w)
+        else:
+            if w <= 0:
+                return 0.0
+            self._ensure_work(w)
+            i = bisect_left(self._cum_end, w)
+        return self._starts[i] + (w - self._cum_start[i])
+
+    def work_horizon(self) -> float:
+        """Takvim ufkundaki (MAX_DAYS) toplam çalışma saati"""
+        self._extend(self.MAX_DAYS)
+        return self._cum_end[-1] if self._cum_end else 0.0
+
+    def work_index(self, w_max: float):
+        """
+        Toplu (vektörel) dönüşüm için indeks dizileri.
+        w_max çalışma saatine kadar genişletilir.
+        Dönüş: (aralık başlangıçları, kümülatif başlangıç, kümülatif bitiş)
+        """
+        self._ensure_work(w_max)
+        return self._starts, self._cum_start, self._cum_end
+
+    def day_hours(self, day_idx: int) -> float:
+        """Günün toplam çalışma saati"""
+        self._extend(day_idx + 1)
+        return self._day_hours[day_idx]
+
+    def day_work_bounds(self, day_idx: int) -> Tuple[float, float]:
+        """Günün kümülatif çalışma saati cinsinden [başlangıç, bitiş] sınırları"""
+        self._extend(day_idx + 1)
+        return self._day_work_start[day_idx], self._day_work_start[day_idx + 1]
+
+    def to_datetime(self, t: float) -> datetime:
+        """Takvim saatini tarihe çevir"""
+        return datetime.combine(self.origin, datetime.min.time()) + timedelta(hours=t)
+
+    def hours_since_origin(self, moment: Optional[datetime] = None) -> float:
+        """Verilen anın (varsayılan: şimdi) origin'e göre saat karşılığı"""
+        moment = moment or datetime.now()
+        delta = moment - datetime.combine(self.origin, datetime.min.time())
+        return max(0.0, delta.total_seconds() / 3600.0)
+
+
+@dataclass
+class SimOrder:
+    """Simülasyona giren sipariş"""
+    key: object                                   # Dışarıdan tanıtıcı (id / kod)
+    rank: int                                     # Küçük = önce (öncelik sırası)
+    steps: List[Tuple[str, float]] = field(default_factory=list)  # (istasyon, kalan m²)
+
+
+@dataclass
+class SimJob:
+    """Bir siparişin bir istasyondaki işi (çalışma saati cinsinden)"""
+    order_idx: int
+    station: str
+    m2: float
+    work_start: float
+    work_end: float
+    block: int = -1                               # Fırın yükü no (istasyon içinde), yük dışı iş: -1
+
+
+class EventSimulator:
+    """
+    Heap tabanlı ayrık olay simülasyonu
+
+    Her istasyon tek makinedir; boşaldığında bekleyenler arasından en düşük
+    rank'lı işi alır. Alternatif istasyonlar verilirse bir adım, aynı işi
+    yapabilen makineler arasında en erken boşalacak olana yönlendirilir
+    (SimJob.station fiilen seçilen makinedir). Tüm istasyonlar aynı takvimi paylaştığından simülasyon
+    çalışma saati ekseninde yürür, takvim saatine dönüşüm yalnızca çıktıda
+    yapılır.
+    """
+
+    def __init__(self, calendar: WorkCalendar, rates: Dict[str, float]):
+        self.calendar = calendar
+        self.rates = rates          # istasyon -> m²/çalışma saati
+
+    # İptal kontrolü kaç olayda bir yapılır
+    CANCEL_CHECK_INTERVAL = 512
+
+    def run(self, orders: List[SimOrder], start_work: float = 0.0, cancel_check=None,
+            blocks: Optional[Dict[str, list]] = None,
+            alternatives: Optional[Dict[str, List[str]]] = None,
+            block_setup: Optional[Callable] = None):
+        """
+        Simülasyonu çalıştırır.
+        cancel_check: True dönerse SimulationCancelled fırlatılır.
+        blocks: {istasyon: [yük, ...]} planlı sırada toplu işler (ör. temper fırını).
+            Her yükün .items = [(order_idx, m2), ...] ve .setup_hours alanı vardır.
+            Yük, tüm üyeleri istasyona ulaştığında hazır olur; istasyon
+            boşaldığında hazır yüklerden plan sırası en önde olan başlar.
+            Süresi hazırlık + toplam m² / hız. Bloklarda yer almayan işler
+            istasyonun normal kuyruğundan alınır.
+        block_setup: (önceki yük | None, yük) -> hazırlık saati. Yükler plan
+            dışı sırada başlayabildiğinden hazırlık fiili sıraya göre
+            hesaplanır; verilmezse yükün .setup_hours değeri kullanılır.
+        alternatives: {istasyon: [alternatif istasyonlar]} - aynı işi yapan
+            makine grupları (ilişki simetrik kabul edilir). Bloklara bağlı
+            adımlar yönlendirilmez.
+        Dönüş: (jobs, finish_work)
+            jobs: SimJob listesi
+            finish_work: {order_idx: bitiş (çalışma saati)}
+        """
+        jobs: List[SimJob] = []
+        finish_work: Dict[int, float] = {}
+        waiting: Dict[str, list] = {}
+        busy: Dict[str, bool] = {}
+        events: list = []
+        seq = 0
+
+        # Blok durumu: (istasyon, sipariş) -> kalan yük sayısı / bekleyen adım
+        blocks = blocks or {}
+        block_parts: Dict[Tuple[str, int], int] = {}
+        member_loads: Dict[Tuple[str, int], List[int]] = {}
+        block_missing: Dict[Tuple[str, int], int] = {}      # yük -> henüz gelmemiş üye
+        for station, loads in blocks.items():
+            for b, load in enumerate(loads):
+                members = {oi for oi, _ in load.items}
+                block_missing[(station, b)] = len(members)
+                for oi in members:
+                    block_parts[(station, oi)] = block_parts.get((station, oi), 0) + 1
+                    member_loads.setdefault((station, oi), []).append(b)
+        ready: Dict[str, list] = {}                          # istasyon -> hazır yük heap'i (plan sırası)
+        last_load: Dict[str, object] = {}
+        arrived: Dict[Tuple[str, int], int] = {}
+
+        # Makine grupları: istasyon -> grup heap'i [(planlanan boşalma, makine)]
+        pools = self._machine_pools(alternatives)
+        machine_free: Dict[str, float] = {m: start_work for m in pools}
+        pool_heaps: Dict[tuple, list] = {}
+        for machine, pool in pools.items():
+            heap = pool_heaps.setdefault(pool, [])
+            heap.append((start_work, machine))
+        for heap in pool_heaps.values():
+            heapq.heapify(heap)
+
+        def assign(station: str, m2: float, t: float) -> str:
+            """Grubun en erken boşalacak makinesi (istenen makine boşsa o)"""
+            pool = pools.get(station)
+            if pool is None:
+                return station
+            heap = pool_heaps[pool]
+            if machine_free[station] <= t:
+                machine = station
+            else:
+                # Eski (güncellenmiş) kayıtlar tembel silinir
+                while heap[0][0] != machine_free[heap[0][1]]:
+                    heapq.heappop(heap)
+                machine = heap[0][1]
+            machine_free[machine] = max(machine_free[machine], t) + m2 / (self.rates.get(machine) or 1.0)
+            heapq.heappush(heap, (machine_free[machine], machine))
+            return machine
+
+        def enqueue(oi: int, step: int, t: float):
+            nonlocal seq
+            station, m2 = orders[oi].steps[step]
+            if (station, oi) in block_parts:
+                arrived[(station, oi)] = step
+                for b in member_loads[(station, oi)]:
+                    block_missing[(station, b)] -= 1
+                    if block_missing[(station, b)] == 0:
+                        heapq.heappush(ready.setdefault(station, []), b)
+                return station
+            machine = assign(station, m2, t) if pools else station
+            heapq.heappush(waiting.setdefault(machine, []), (orders[oi].rank, seq, oi, step))
+            seq += 1
+            return machine
+
+        def dispatch_block(station: str, t: float) -> bool:
+            # Yalnızca tüm üyeleri gelmiş yükler adaydır: üyesi eksik bir yük
+            # arkasındaki hazır yükleri ve istasyonun normal kuyruğunu bekletmez
+            nonlocal seq
+            if not ready.get(station):
+                return False
+            b = heapq.heappop(ready[station])
+            load = blocks[station][b]
+            setup = block_setup(last_load.get(station), load) if block_setup else load.setup_hours
+            last_load[station] = load
+            rate = self.rates.get(station) or 1.0
+            end = t + setup + sum(m2 for _, m2 in load.items) / rate
+            busy[station] = True
+            for oi, m2 in load.items:
+                jobs.append(SimJob(oi, station, m2, t, end, b))
+            heapq.heappush(events, (end, seq, -1, b, station))
+            seq += 1
+            return True
+
+        def dispatch(station: str, t: float):
+            nonlocal seq
+            if busy.get(station):
+                return
+            if station in blocks and dispatch_block(station, t):
+                return
+            queue = waiting.get(station)
+            if not queue:
+                return
+            _, _, oi, step = heapq.heappop(queue)
+            m2 = orders[oi].steps[step][1]
+            rate = self.rates.get(station) or 1.0
+            end = t + m2 / rate
+            busy[station] = True
+            jobs.append(SimJob(oi, station, m2, t, end))
+            heapq.heappush(events, (end, seq, oi, step, station))
+            seq += 1
+
+        def complete(oi: int, step: int, now: float, touched: set):
+            if step + 1 < len(orders[oi].steps):
+                touched.add(enqueue(oi, step + 1, now))
+            else:
+                finish_work[oi] = now
+
+        touched = set()
+        for oi, order in enumerate(orders):
+            if order.steps:
+                touched.add(enqueue(oi, 0, start_work))
+            else:
+                finish_work[oi] = start_work
+        for station in touched:
+            dispatch(station, start_work)
+
+        processed = 0
+        while events:
+            processed += 1
+            if cancel_check and processed % self.CANCEL_CHECK_INTERVAL == 0 and cancel_check():
+                raise SimulationCancelled()
+            now = events[0][0]
+            touched = set()
+            # Aynı andaki tüm bitişleri topla, sonra dağıt (öncelik adaleti)
+            while events and events[0][0] == now:
+                _, _, oi, step, station = heapq.heappop(events)
+                busy[station] = False
+                touched.add(station)
+                if oi < 0:
+                    # Fırın yükü bitti: son yükü biten üyeler sonraki adıma geçer
+                    b = step
+                    for member in {m for m, _ in blocks[station][b].items}:
+                        key = (station, member)
+                        block_parts[key] -= 1
+                        if block_parts[key] == 0:
+                            complete(member, arrived[key], now, touched)
+                    continue
+                complete(oi, step, now, touched)
+            for station in touched:
+                dispatch(station, now)
+
+        return jobs, finish_work
+
+    def _machine_pools(self, alternatives: Optional[Dict[str, List[str]]]) -> Dict[str, tuple]:
+        """Alternatif ilişkisinden makine grupları: {istasyon: grup üyeleri (sıralı)}"""
+        if not alternatives:
+            return {}
+        parent: Dict[str, str] = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for station, alts in alternatives.items():
+            for alt in alts:
+                if station in self.rates and alt in self.rates:
+                    parent[find(station)] = find(alt)
+
+        groups: Dict[str, list] = {}
+        for station in list(parent):
+            groups.setdefault(find(station), []).append(station)
+        return {s: tuple(sorted(members)) for members in groups.values() if len(members) > 1 for s in members}
@@ -1,9 +1,39 @@
 import math
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
 try:
     from core.db_manager import db
 except ImportError:
-    pass
+    db = None
+from core.simulation_engine import WorkCalendar, EventSimulator, SimOrder, SimulationCancelled
+from core.forecast_grid import ForecastGrid
+from core.temper_batching import TemperBatcher
+
+@dataclass
+class SimulationSetup:
+    """Hazırlanmış simülasyon girdisi"""
+    orders: List[SimOrder]          # öncelik sırasına göre (key = sipariş dict)
+    calendar: WorkCalendar
+    rates: Dict[str, float]         # istasyon -> m²/çalışma saati
+    now_h: float                    # şu an (takvim saati)
+    now_w: float                    # şu an (kümülatif çalışma saati)
+    batches: Optional[Dict[str, list]] = None   # istasyon -> sıralı fırın yükleri
+    batch_setup: Optional[Callable] = None      # (önceki yük, yük) -> hazırlık saati
+    alternatives: Optional[Dict[str, List[str]]] = None  # istasyon -> alternatif makineler
+    batcher: Optional[TemperBatcher] = None     # yükler başka bir sıra için yeniden kurulurken
+
+    def simulate(self, orders: List[SimOrder], cancel_check=None):
+        """
+        Siparişleri verilen sırayla (SimOrder.rank) yeniden simüle et.
+        Fırın yükleri bu sıraya göre yeniden kurulur; makine grupları ve yük
+        hazırlığı planla aynıdır. Dönüş: EventSimulator.run ile aynı
+        """
+        blocks = self.batcher.build(orders) if self.batcher else None
+        return EventSimulator(self.calendar, self.rates).run(
+            orders, start_work=self.now_w, cancel_check=cancel_check,
+            blocks=blocks, alternatives=self.alternatives, block_setup=self.batch_setup)
+
 
 class SmartPlanner:
     """
@@ -11,11 +41,20 @@ class SmartPlanner:
     Yeni bir acil siparişin, mevcut kuyruğu nasıl etkilediğini hesaplar.
     """
     
-    def __init__(self):
-        self.FORECAST_DAYS = 30 
+    # Planlama ufku seçenekleri (gün)
+    HORIZON_OPTIONS = (30, 90, 180)
+    # Temper istasyonları fırın yükü (batch) olarak simüle edilir
+    TEMPER_BATCHING = True
+    # Adımlar alternatif makineler arasında en erken boşalana atanır
+    LOAD_BALANCING = True
+
+    def __init__(self, horizon_days=30, source=None):
+        self.FORECAST_DAYS = horizon_days
+        # Veri kaynağı: canlı veritabanı ya da what-if sandbox'ı (core.scenario.Sandbox)
+        self.source = source if source is not None else db
         
         try:
-            self.capacities = db.get_all_capacities()
+            self.capacities = self.source.get_all_capacities()
             if not self.capacities: raise ValueError
         except:
             self.capacities = {} 
@@ -39,12 +78,42 @@ class SmartPlanner:
                 sorted_route.append(station)
         return ",".join(sorted_route)
 
-    def _run_simulation(self, new_order=None):
+    def _build_calendar(self):
+        """Bugünden başlayan çalışma takvimi (tatiller veritabanından)"""
+        try: holidays = self.source.get_holidays()
+        except: holidays = []
+        return WorkCalendar(date.today(), holidays=holidays)
+
+    def _alternatives(self):
+        """Kapasitesi tanımlı istasyonlar için alternatif makineler (FactoryConfig)"""
+        try:
+            from core.factory_config import factory_config
+            result = {}
+            for station in self.capacities:
+                alts = [a for a in factory_config.get_alternatives(station) if a in self.capacities]
+                if alts: result[station] = alts
+            return result
+        except Exception:
+            return {}
+
+    def _order_m2(self, order):
+        m2 = order.get('declared_total_m2', 0)
+        if not m2 or m2 <= 0:
+            w = order.get('width', 0)
+            h = order.get('height', 0)
+            q = order.get('quantity', 0)
+            if w and h and q: m2 = (w * h * q) / 10000.0
+        return m2 or 0
+
+    def _prepare_simulation(self, new_order=None):
+        """
+        Simülasyon girdisini hazırlar (sipariş sırası, takvim, hızlar).
+        Dönüş: SimulationSetup
+        """
         # 1. Mevcut İşleri Çek
-        active_orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
+        active_orders = self.source.get_orders_by_status(["Beklemede", "Üretimde"])
         
         # 2. Yeni Siparişi Ekle (Eğer varsa)
-        target_order_code = None
         if new_order:
             simulated_order = {
                 'id': -1,
@@ -70,105 +139,151 @@ class SmartPlanner:
             str(x.get('delivery_date', '9999'))
         ))
 
-        # 4. SİMÜLASYON DEĞİŞKENLERİ
-        forecast_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        loads_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        details_grid = {k: [[] for _ in range(self.FORECAST_DAYS)] for k in self.capacities.keys()}
-        machine_free_time = {k: 0.0 for k in self.capacities.keys()}
-        
-        # Siparişlerin tahmini bitiş günlerini saklayacak sözlük
-        # { 'SIP-001': 2.5, 'SIP-002': 4.1 }
-        order_finish_times = {} 
-        target_finish_day = 0
+        # 4. TAKVİM VE HIZLAR
+        # Kapasite m²/gün -> vardiya saatine bölünerek m²/saat
+        calendar = self._build_calendar()
+        hours_per_day = calendar.shift_hours or 24.0
+        rates = {k: (v if v and v > 0 else 1) / hours_per_day for k, v in self.capacities.items()}
+        now_h = calendar.hours_since_origin()
+        now_w = calendar.work_before(now_h)
 
-        # 5. MOTOR ÇALIŞIYOR
-        for order in active_orders:
-            m2 = order.get('declared_total_m2', 0)
-            if not m2 or m2 <= 0:
-                w = order.get('width', 0)
-                h = order.get('height', 0)
-                q = order.get('quantity', 0)
-                if w and h and q: m2 = (w * h * q) / 10000.0
-            
+        # Tek sorguda tüm ilerleme (sipariş başına sorgu yok)
+        try: progress = self.source.get_station_progress_map()
+        except: progress = {}
+
+        # 5. SİMÜLASYON GİRDİSİ
+        sim_orders = []
+        for rank, order in enumerate(active_orders):
+            m2 = self._order_m2(order)
             if m2 <= 0: continue
-            
-            total_qty = order.get('quantity', 1)
-            route_str = order.get('route', '')
-            route_steps = route_str.split(',')
-            
-            completed_stops = []
-            if not order.get('is_new'):
-                completed_stops = db.get_completed_stations_list(order['id'])
-            
-            current_order_ready_time = 0.0 
-            
-            for station in route_steps:
+
+            total_qty = order.get('quantity', 1) or 1
+            done_map = {} if order.get('is_new') else progress.get(order['id'], {})
+
+            steps = []
+            for station in (order.get('route') or '').split(','):
                 station = station.strip()
                 if station not in self.capacities: continue
-                
-                # Eğer istasyon bitmişse, o istasyonda zaman harcama
-                # AMA sipariş o istasyondan çıktı sayılır, zaman akmaya devam eder.
-                if station in completed_stops: continue 
-
-                daily_cap = self.capacities[station]
-                if daily_cap <= 0: daily_cap = 1
-                
-                done_qty = 0
-                if not order.get('is_new'):
-                    done_qty = db.get_station_progress(order['id'], station)
-                
-                remaining_ratio = 1.0 - (done_qty / total_qty)
+
+                # Bitmiş istasyonda zaman harcanmaz
+                remaining_ratio = 1.0 - (done_map.get(station, 0) / total_qty)
                 if remaining_ratio <= 0: continue
+                steps.append((station, m2 * remaining_ratio))
+
+            sim_orders.append(SimOrder(key=order, rank=rank, steps=steps))
+
+        # 6. FIRIN YÜKLERİ (kalınlık/tip gruplu, hazırlık süresi dahil)
+        batcher = TemperBatcher() if self.TEMPER_BATCHING else None
+        batches = batcher.build(sim_orders) if batcher else None
+
+        alternatives = self._alternatives() if self.LOAD_BALANCING else None
+
+        return SimulationSetup(sim_orders, calendar, rates, now_h, now_w, batches,
+                               batcher.load_setup if batcher else None, alternatives, batcher)
+
+    def _run_simulation(self, new_order=None, cancel_check=None):
+        setup = self._prepare_simulation(new_order)
+        sim_orders, calendar, rates = setup.orders, setup.calendar, setup.rates
+        now_h, now_w = setup.now_h, setup.now_w
 
-                remaining_m2 = m2 * remaining_ratio
-                duration_days = remaining_m2 / daily_cap
-                
-                # MANTIK: 
-                # Bu sipariş ne zaman başlayabilir?
-                # 1. Kendisi hazır olmalı (Önceki makineden çıkmalı) -> current_order_ready_time
-                # 2. Makine boş olmalı -> machine_free_time[station]
-                start_day = max(current_order_ready_time, machine_free_time[station])
-                end_day = start_day + duration_days
-                
-                # GANTT'A YAZ
-                temp_start = start_day
-                while temp_start < end_day:
-                    day_idx = int(temp_start)
-                    if day_idx >= self.FORECAST_DAYS: break 
-                    
-                    chunk_end = min(end_day, day_idx + 1)
-                    work_amount = chunk_end - temp_start
-                    
-                    forecast_grid[station][day_idx] += (work_amount * 100)
-                    loads_grid[station][day_idx] += (work_amount * daily_cap)
-                    
-                    info = {
-                        "code": order['order_code'],
-                        "customer": order.get('customer_name', 'Tahmini'),
-                        "m2": remaining_m2
-                    }
-                    exists = any(x['code'] == info['code'] for x in details_grid[station][day_idx])
-                    if not exists:
-                        details_grid[station][day_idx].append(info)
-                    
-                    temp_start = chunk_end
-                
-                machine_free_time[station] = end_day
-                current_order_ready_time = end_day
-            
-            # Siparişin Bitiş Gününü Kaydet
-            order_code = order.get('order_code')
-            order_finish_times[order_code] = current_order_ready_time
-            
+        # 6. MOTOR ÇALIŞIYOR (olay tabanlı)
+        if cancel_check and cancel_check(): raise SimulationCancelled()
+        jobs, finish_work = EventSimulator(calendar, rates).run(
+            sim_orders, start_work=now_w, cancel_check=cancel_check,
+            blocks=setup.batches, alternatives=setup.alternatives, block_setup=setup.batch_setup)
+
+        # 7. GÜN KOVALARINI TÜRET
+        forecast_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
+        loads_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
+        # Detaylar: istasyon başına seyrek aralık dizisi (ufuktan bağımsız)
+        details_grid = ForecastGrid(self.capacities.keys(), self.FORECAST_DAYS)
+        interned = {}
+
+        for job in jobs:
+            wall_start = calendar.to_wall(job.work_start, start=True, clip=True)
+            wall_end = calendar.to_wall(job.work_end, clip=True)
+
+            grid_idx = interned.get(job.order_idx)
+            if grid_idx is None:
+                order = sim_orders[job.order_idx].key
+                grid_idx = details_grid.intern_order(order['order_code'], order.get('customer_name', 'Tahmini'))
+                interned[job.order_idx] = grid_idx
+            details_grid.add_interval(job.station, grid_idx, wall_start, wall_end, job.m2)
+
+            first_day = int(wall_start // 24)
+            last_day = min(int(wall_end // 24), self.FORECAST_DAYS - 1)
+            for day_idx in range(first_day, last_day + 1):
+                day_start, day_end = calendar.day_work_bounds(day_idx)
+                worked = min(job.work_end, day_end) - max(job.work_start, day_start)
+                if worked <= 0: continue
+
+                forecast_grid[job.station][day_idx] += worked / calendar.day_hours(day_idx) * 100
+                loads_grid[job.station][day_idx] += worked * rates[job.station]
+
+        details_grid.finalize()
+
+        # Siparişlerin tahmini bitiş günleri (şu andan itibaren gün)
+        # { 'SIP-001': 2.5, 'SIP-002': 4.1 }
+        order_finish_times = {}
+        target_finish_day = 0
+        for oi, work_end in finish_work.items():
+            order = sim_orders[oi].key
+            finish_h = calendar.to_wall(work_end, clip=True) if work_end > now_w else now_h
+            finish_day = max(0.0, (finish_h - now_h) / 24.0)
+            order_finish_times[order.get('order_code')] = finish_day
             if order.get('is_new'):
-                target_finish_day = current_order_ready_time
+                target_finish_day = finish_day
 
         return forecast_grid, details_grid, loads_grid, target_finish_day, order_finish_times
 
-    def calculate_forecast(self):
-        try: self.capacities = db.get_all_capacities()
+    def calculate_plan(self, cancel_check=None):
+        """
+        Tahmin ızgarası + sipariş bitiş günleri.
+        cancel_check verilirse uzun simülasyon yarıda kesilebilir (SimulationCancelled).
+        """
+        try: self.capacities = self.source.get_all_capacities()
+        except: pass
+        grid, details, loads, _, finish_times = self._run_simulation(new_order=None, cancel_check=cancel_check)
+        return grid, details, loads, finish_times
+
+    def calculate_delivery_risk(self, replications=2000, workers=0, seed=None, cancel_check=None):
+        """
+        MONTE CARLO TESLİM RİSKİ 🎲
+        İstasyon hızı ve fire oranı production_logs'tan uydurulan dağılımlardan
+        örneklenir. Dönüş: {order_code: OrderRisk(p50, p90, on_time_probability)}
+        (NumPy yoksa boş sözlük)
+        """
+        try: self.capacities = self.source.get_all_capacities()
         except: pass
-        grid, details, loads, _, _ = self._run_simulation(new_order=None)
+        from core.risk_simulator import DeliveryRiskSimulator
+        return DeliveryRiskSimulator(self).run(replications=replications, workers=workers,
+                                               seed=seed, cancel_check=cancel_check)
+
+    def compare_dispatch_rules(self, rules=None, cancel_check=None):
+        """
+        SEVK KURALI KARŞILAŞTIRMASI 📋
+        EDD / SPT / CR / SLACK / ATC / Bileşik sıraları simüle edilir.
+        Dönüş: RuleResult listesi (en az ağırlıklı gecikme önce, NumPy yoksa boş)
+        """
+        try: self.capacities = self.source.get_all_capacities()
+        except: pass
+        from core.dispatch_rules import DispatchRuleEngine
+        return DispatchRuleEngine(self).compare(rules=rules, cancel_check=cancel_check)
+
+    def optimize_sequence(self, order_ids=None, time_limit=2.0, seed=None, cancel_check=None):
+        """
+        SIRA OPTİMİZASYONU 🔀
+        Verilen sıradan başlayıp yerel arama ile ağırlıklı gecikmeyi azaltır.
+        Dönüş: OptimizationResult (önerilen sipariş id sırası + önce/sonra gecikme)
+        """
+        try: self.capacities = self.source.get_all_capacities()
+        except: pass
+        from core.sequence_optimizer import SequenceOptimizer
+        return SequenceOptimizer(self).run(order_ids=order_ids, time_limit=time_limit,
+                                           seed=seed, cancel_check=cancel_check)
+
+    def calculate_forecast(self, cancel_check=None):
+        grid, details, loads, _ = self.calculate_plan(cancel_check=cancel_check)
         return grid, details, loads
 
     def calculate_impact(self, new_order_data):
@@ -177,7 +292,7 @@ class SmartPlanner:
         Yeni siparişi eklemeden önce ve ekledikten sonraki durumu karşılaştırır.
         Geciken siparişleri listeler.
         """
-        try: self.capacities = db.get_all_capacities()
+        try: self.capacities = self.source.get_all_capacities()
         except: pass
 
         # 1. SENARYO: Yeni sipariş YOK (Baz Durum)
@@ -203,9 +318,8 @@ class SmartPlanner:
                     })
         
         # Hedef siparişin bitiş tarihi
-        today = datetime.now()
-        delivery_date = today + timedelta(days=math.ceil(target_day))
-        if delivery_date.weekday() == 6: delivery_date += timedelta(days=1)
+        # (Takvim hafta sonu/tatili zaten atladığı için ayrıca Pazar kontrolü gerekmez)
+        delivery_date = datetime.now() + timedelta(days=target_day)
         
         return delivery_date, math.ceil(target_day), delayed_orders
 
@@ -0,0 +1,195 @@
+"""
+EFES ROTA X - Sentetik Fabrika Verisi Üreticisi
+Planlayıcı ve karar motorunu gerçekçi ölçekte ölçmek için boş bir SQLite
+dosyasını N sipariş ve M üretim kaydı ile doldurur.
+
+- Rotalar FactoryConfig.DEFAULT_STATIONS'tan ürün tipine göre kurulur
+  (kesim -> işleme -> yüzey -> temper -> birleştirme -> sevkiyat).
+- Aynı seed ve başlangıç tarihi her zaman aynı veriyi üretir.
+
+Kullanım:
+    from core.synthetic_data import generate_dataset
+    stats = generate_dataset("/tmp/rota_10k.db", n_orders=10000, seed=42)
+"""
+
+import os
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from core.db_manager import DatabaseManager
+from core.factory_config import FactoryConfig
+
+
+# =============================================================================
+# DAĞILIMLAR
+# =============================================================================
+PRODUCT_TYPES = [("Duz Cam", 0.35), ("Temperli", 0.30), ("Lamine", 0.12),
+                 ("Satina", 0.08), ("Renkli", 0.08), ("Ayna", 0.07)]
+THICKNESSES = [(4, 0.20), (5, 0.10), (6, 0.35), (8, 0.20), (10, 0.10), (12, 0.05)]
+PRIORITIES = [("Normal", 0.70), ("Acil", 0.18), ("Çok Acil", 0.08), ("Kritik", 0.04)]
+STATUSES = [("Beklemede", 0.55), ("Üretimde", 0.30), ("Tamamlandı", 0.10), ("Sevk Edildi", 0.05)]
+CUSTOMERS = ["ALFA YAPI", "BETA INSAAT", "CAM DEKOR", "DELTA MIMARLIK", "EGE PVC",
+             "FORM ALUMINYUM", "GUNES CEPHE", "HAS YAPI", "ISIK DOGRAMA", "KUZEY CAM"]
+
+
+def _pick(rng: random.Random, table):
+    """Ağırlıklı seçim [(değer, ağırlık), ...]"""
+    values, weights = zip(*table)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _names(stations: Dict, group: str) -> List[str]:
+    return [s.name for s in stations.values() if s.group.name == group and s.is_active]
+
+
+def build_route(rng: random.Random, product_type: str, stations: Optional[Dict] = None) -> List[str]:
+    """Ürün tipine göre istasyon sırasına dizilmiş gerçekçi bir rota"""
+    stations = stations or FactoryConfig.DEFAULT_STATIONS
+    route = []
+
+    # Kesim: lamine için lamine kesim, diğerlerinde iki masadan biri
+    if product_type == "Lamine" and "LAMINE KESIM" in stations:
+        route.append("LAMINE KESIM")
+    else:
+        route.append(rng.choice([s for s in _names(stations, "KESIM") if s != "LAMINE KESIM"]))
+
+    # Kenar işleme: çoğunlukla tek makine, bazen rodaj + zımpara
+    processing = _names(stations, "ISLEME")
+    if processing and rng.random() < 0.8:
+        route.extend(rng.sample(processing, 2 if rng.random() < 0.15 else 1))
+
+    # Yüzey: tesir / delik / oyuk
+    surface = _names(stations, "YUZEY")
+    tesir = [s for s in surface if s.startswith("TESIR")]
+    if tesir and rng.random() < 0.25:
+        route.append(rng.choice(tesir))
+    for extra, p in (("DELIK", 0.20), ("OYGU", 0.10)):
+        if extra in stations and rng.random() < p:
+            route.append(extra)
+
+    # Temper: temperli ürünlerde zorunlu, diğerlerinde seyrek
+    temper = _names(stations, "TEMPER")
+    if temper and (product_type == "Temperli" or rng.random() < 0.15):
+        route.append(rng.choices(temper, weights=[5, 4, 1][:len(temper)])[0])
+
+    # Birleştirme
+    if product_type == "Lamine" and "LAMINE A1" in stations:
+        route.append("LAMINE A1")
+    elif "ISICAM B1" in stations and rng.random() < 0.20:
+        route.append("ISICAM B1")
+    if "KUMLAMA" in stations and product_type == "Satina" and rng.random() < 0.5:
+        route.append("KUMLAMA")
+
+    route.extend(_names(stations, "SEVKIYAT"))
+    route.sort(key=lambda s: stations[s].order_index)
+    return route
+
+
+# =============================================================================
+# ÜRETİCİ
+# =============================================================================
+def generate_dataset(path: str, n_orders: int, n_logs: Optional[int] = None,
+                     seed: int = 42, today: Optional[date] = None, overwrite: bool = True) -> Dict:
+    """
+    path'e N siparişlik sentetik veritabanı yazar.
+    n_logs: üretilecek yaklaşık üretim kaydı sayısı (varsayılan: sipariş başına ~2)
+    today: tarihlerin referans günü (varsayılan: bugün)
+    Dönüş: {'path', 'orders', 'logs', 'seed', 'today'}
+    """
+    path = os.path.abspath(path)
+    if overwrite and os.path.exists(path):
+        os.remove(path)
+
+    rng = random.Random(seed)
+    today = today or date.today()
+    n_logs = n_orders * 2 if n_logs is None else n_logs
+    stations = FactoryConfig.DEFAULT_STATIONS
+    midnight = datetime.combine(today, datetime.min.time())
+
+    # Şema + varsayılan kapasiteler/kullanıcılar
+    manager = DatabaseManager(path)
+
+    orders = []
+    progress_plan = []          # (rota, adet, durum, oluşturma zamanı)
+    for i in range(n_orders):
+        product = _pick(rng, PRODUCT_TYPES)
+        thickness = _pick(rng, THICKNESSES)
+        width = rng.randrange(300, 3200, 10) / 10.0       # cm
+        height = rng.randrange(300, 2500, 10) / 10.0
+        quantity = max(1, int(rng.lognormvariate(2.3, 0.9)))
+        total_m2 = round(width * height * quantity / 10000.0, 2)
+        route = build_route(rng, product, stations)
+        status = _pick(rng, STATUSES)
+        created = midnight - timedelta(days=rng.randint(0, 45), minutes=rng.randint(0, 1439))
+        delivery = created + timedelta(days=rng.randint(3, 35))
+
+        orders.append((
+            f"SYN-{i + 1:06d}", f"SYN{i + 1:09d}", rng.choice(CUSTOMERS),
+            f"{thickness}mm {product}", thickness, width, height, quantity, total_m2,
+            ",".join(route), status, _pick(rng, PRIORITIES),
+            delivery.strftime("%Y-%m-%d"), created.strftime("%Y-%m-%d %H:%M:%S")))
+        progress_plan.append((route, quantity, status, created))
+
+    with manager.get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO orders (order_code, barcode, customer_name, product_type, thickness,
+                                width, height, quantity, declared_total_m2, route,
+                                status, priority, delivery_date, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, orders)
+        first_id = conn.execute("SELECT MIN(id) FROM orders WHERE order_code = 'SYN-000001'").fetchone()[0]
+
+    # Üretim kayıtları: bitmiş siparişlerde tüm rota, üretimdekilerde ilk
+    # istasyonlar (son istasyon kısmi). Bütçe dolunca durur.
+    logs = []
+    operators = ["operator1", "operator2", "operator3", "operator4"]
+    active = [i for i, p in enumerate(progress_plan) if p[2] != "Beklemede"]
+    rng.shuffle(active)
+    for i in active:
+        if len(logs) >= n_logs:
+            break
+        route, quantity, status, created = progress_plan[i]
+        if status == "Üretimde":
+            done_steps = rng.randint(0, len(route) - 1)
+        else:
+            done_steps = len(route)
+        moment = created
+        for step, station in enumerate(route[:done_steps + 1]):
+            if step < done_steps:
+                qty = quantity
+            else:
+                qty = rng.randint(0, quantity - 1) if quantity > 1 else 0
+            if qty <= 0:
+                continue
+            moment += timedelta(hours=rng.uniform(1, 20))
+            moment = min(moment, midnight)
+            # Büyük adetler birkaç parçalı kayıt halinde girilir
+            parts = 1 if qty < 20 else rng.randint(1, 3)
+            for part in range(parts):
+                part_qty = qty // parts + (1 if part < qty % parts else 0)
+                logs.append((first_id + i, station, "Tamamlandi", part_qty, rng.choice(operators),
+                             moment.strftime("%Y-%m-%d %H:%M:%S")))
+            if rng.random() < 0.03:
+                logs.append((first_id + i, station, "Fire/Kırık", rng.randint(1, max(1, qty // 10)),
+                             rng.choice(operators), moment.strftime("%Y-%m-%d %H:%M:%S")))
+
+    with manager.get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, logs)
+
+    return {"path": path, "orders": n_orders, "logs": len(logs), "seed": seed, "today": today.isoformat()}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="EFES ROTA - Sentetik veri üretici")
+    parser.add_argument("path", help="Oluşturulacak SQLite dosyası")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--logs", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(generate_dataset(args.path, args.orders, args.logs, seed=args.seed))
@@ -0,0 +1,262 @@
+"""
+EFES ROTA X - Temper Fırını Yükleme (Batch) Motoru
+Temper istasyonlarında (FactoryConfig batch istasyonları) bekleyen işleri
+fırın yüklerine böler ve yükleri hazırlık (changeover) süresini azaltacak
+şekilde sıralar.
+
+- Gruplama: istasyon + kalınlık + cam tipi (aynı fırın profili)
+- Yükleme: fırın alanı sınırı altında, öncelik sırasıyla ilk-uyan (first-fit);
+  tek başına fırından büyük işler tam yüklere bölünür
+- Sıralama: gruplar aciliyet sırasıyla ele alınır, kısa bir ileri bakış
+  penceresi içinde en az hazırlık gerektiren grup seçilir; bir grubun
+  yükleri art arda fırına girer
+- Çıktı planlayıcı simülasyonuna blok olarak verilir
+  (EventSimulator.run(..., blocks=..., block_setup=batcher.load_setup));
+  fırın hazır yükler arasından plan sırası en önde olanı alır
+
+Yüzlerce bekleyen sipariş için maliyet O(k log k) mertebesindedir.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.factory_config import factory_config
+except ImportError:
+    factory_config = None
+
+
+# Fırın yatağı alanı (m² / yük)
+FURNACE_AREA = {"TEMPER A1": 9.0, "TEMPER B1": 12.0, "TEMPER BOMBE": 5.0}
+DEFAULT_FURNACE_AREA = 9.0
+DEFAULT_BATCH_STATIONS = ["TEMPER A1", "TEMPER B1", "TEMPER BOMBE"]
+
+# Hazırlık süreleri (çalışma saati)
+THICKNESS_CHANGE_HOURS = 0.75       # Isı profili değişimi
+TYPE_CHANGE_HOURS = 0.25            # Cam tipi (ör. düz -> renkli) değişimi
+
+
+@dataclass
+class BatchItem:
+    """Fırına girecek iş parçası"""
+    key: object                     # Planlayıcıda sipariş indeksi, ekranda sipariş id
+    rank: int                       # Küçük = daha acil
+    station: str
+    thickness: int
+    glass_type: str
+    m2: float
+
+
+@dataclass
+class FurnaceLoad:
+    """Tek fırın yükü (simülasyonda sabit blok)"""
+    station: str
+    thickness: int
+    glass_type: str
+    area: float                                     # fırın alanı
+    items: List[Tuple[object, float]] = field(default_factory=list)   # (key, m2)
+    urgency: int = 0                                # içindeki en acil rank
+    setup_hours: float = 0.0                        # bu yükten önceki hazırlık
+
+    @property
+    def profile(self) -> Tuple[int, str]:
+        return (self.thickness, self.glass_type)
+
+    @property
+    def m2(self) -> float:
+        return sum(m2 for _, m2 in self.items)
+
+    @property
+    def fill_ratio(self) -> float:
+        return self.m2 / self.area if self.area > 0 else 0.0
+
+
+def glass_type_of(order) -> str:
+    """'6mm Temperli' / 'Temperli' -> 'TEMPERLI' (kalınlık öneki atılır)"""
+    text = (order.get('product_type') or '').strip()
+    return re.sub(r'^\d+\s*mm\s*', '', text, flags=re.IGNORECASE).upper()
+
+
+def batch_stations() -> List[str]:
+    if factory_config:
+        try:
+            stations = factory_config.get_batch_stations()
+            if stations:
+                return stations
+        except Exception:
+            pass
+    return list(DEFAULT_BATCH_STATIONS)
+
+
+class _OpenLoads:
+    """
+    Açık yüklerin kalan alanı üzerinde max ağacı: kalan alanı yetecek
+    en soldaki (ilk açılan) yük O(log k) adımda bulunur (first-fit)
+    """
+
+    def __init__(self, capacity: int):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.tree = [-1.0] * (2 * self.size)
+        self.count = 0
+
+    def first_fit(self, m2: float) -> Optional[int]:
+        if self.tree[1] < m2:
+            return None
+        i = 1
+        while i < self.size:
+            i = 2 * i if self.tree[2 * i] >= m2 else 2 * i + 1
+        return i - self.size
+
+    def update(self, slot: int, space: float):
+        i = slot + self.size
+        self.tree[i] = space
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def add(self, space: float) -> int:
+        slot = self.count
+        self.count += 1
+        self.update(slot, space)
+        return slot
+
+
+class TemperBatcher:
+    """
+    Fırın yükü oluşturucu
+
+    Kullanım:
+        batcher = TemperBatcher()
+        loads = batcher.plan(items)          # {istasyon: [FurnaceLoad, ...]} (fırın sırası)
+        blocks = batcher.build(sim_orders)   # planlayıcı girdisinden
+    """
+
+    LOOKAHEAD = 3               # aciliyet sırasından en fazla bu kadar grup ileri bakılır
+
+    def __init__(self, furnace_area: Optional[Dict[str, float]] = None,
+                 stations: Optional[List[str]] = None,
+                 thickness_change_hours: float = THICKNESS_CHANGE_HOURS,
+                 type_change_hours: float = TYPE_CHANGE_HOURS):
+        self.furnace_area = dict(FURNACE_AREA)
+        self.furnace_area.update(furnace_area or {})
+        self.stations = set(stations or batch_stations())
+        self.thickness_change_hours = thickness_change_hours
+        self.type_change_hours = type_change_hours
+
+    # ------------------------------------------------------------------
+    # HAZIRLIK MALİYETİ
+    # ------------------------------------------------------------------
+    def changeover(self, prev: Optional[Tuple[int, str]], nxt: Tuple[int, str]) -> float:
+        """(kalınlık, tip) profilleri arası hazırlık süresi"""
+        if prev is None or prev == nxt:
+            return 0.0
+        hours = 0.0
+        if prev[0] != nxt[0]:
+            hours += self.thickness_change_hours
+        if prev[1] != nxt[1]:
+            hours += self.type_change_hours
+        return hours
+
+    def load_setup(self, prev: Optional[FurnaceLoad], load: FurnaceLoad) -> float:
+        """Simülasyon için: fiilen önceki yükten bu yüke geçiş süresi"""
+        return self.changeover(prev.profile if prev else None, load.profile)
+
+    # ------------------------------------------------------------------
+    # YÜKLEME
+    # ------------------------------------------------------------------
+    def _pack(self, station, profile, items: List[BatchItem]) -> List[FurnaceLoad]:
+        """Bir profilin işlerini fırın yüklerine yerleştir (öncelik sırasıyla first-fit)"""
+        area = self.furnace_area.get(station, DEFAULT_FURNACE_AREA)
+        thickness, glass_type = profile
+        loads: List[FurnaceLoad] = []
+        open_loads = _OpenLoads(len(items))     # tam yükler dışında her iş en fazla bir yük açar
+        slot_loads: List[FurnaceLoad] = []      # ağaç sırası -> yük
+        free: List[float] = []                  # ağaç sırası -> kalan alan
+
+        for item in sorted(items, key=lambda x: x.rank):
+            m2 = item.m2
+            # Fırından büyük iş: tam yükler
+            while m2 > area:
+                loads.append(FurnaceLoad(station, thickness, glass_type, area, [(item.key, area)], item.rank))
+                m2 -= area
+            if m2 <= 0:
+                continue
+            slot = open_loads.first_fit(m2)
+            if slot is not None:
+                load = slot_loads[slot]
+                load.items.append((item.key, m2))
+                load.urgency = min(load.urgency, item.rank)
+                free[slot] -= m2
+                open_loads.update(slot, free[slot])
+            else:
+                load = FurnaceLoad(station, thickness, glass_type, area, [(item.key, m2)], item.rank)
+                loads.append(load)
+                slot_loads.append(load)
+                free.append(area - m2)
+                open_loads.add(area - m2)
+
+        loads.sort(key=lambda l: l.urgency)
+        return loads
+
+    def _sequence(self, groups: Dict[Tuple[int, str], List[FurnaceLoad]]) -> List[FurnaceLoad]:
+        """Grupları aciliyet + hazırlık süresine göre sırala"""
+        pending = sorted(groups.items(), key=lambda g: g[1][0].urgency if g[1] else 0)
+        sequence: List[FurnaceLoad] = []
+        current = None
+        while pending:
+            window = pending[:self.LOOKAHEAD]
+            best = min(range(len(window)), key=lambda i: (self.changeover(current, window[i][0]), i))
+            profile, loads = pending.pop(best)
+            setup = self.changeover(current, profile)
+            for n, load in enumerate(loads):
+                load.setup_hours = setup if n == 0 else 0.0
+            sequence.extend(loads)
+            current = profile
+        return sequence
+
+    def plan(self, items: List[BatchItem]) -> Dict[str, List[FurnaceLoad]]:
+        """İşleri istasyon bazında sıralı fırın yüklerine dönüştür"""
+        by_group: Dict[str, Dict[Tuple[int, str], List[BatchItem]]] = {}
+        for item in items:
+            if item.m2 > 0:
+                by_group.setdefault(item.station, {}).setdefault((item.thickness, item.glass_type), []).append(item)
+
+        result = {}
+        for station, groups in by_group.items():
+            packed = {profile: self._pack(station, profile, group) for profile, group in groups.items()}
+            result[station] = self._sequence(packed)
+        return result
+
+    # ------------------------------------------------------------------
+    # PLANLAYICI GİRDİSİ
+    # ------------------------------------------------------------------
+    def build(self, sim_orders) -> Dict[str, List[FurnaceLoad]]:
+        """
+        SimOrder listesinden blokları üret (anahtar = sipariş indeksi).
+        Bir siparişin yalnızca ilk temper adımı yüke bağlanır.
+        """
+        items = []
+        for oi, sim_order in enumerate(sim_orders):
+            order = sim_order.key
+            for station, m2 in sim_order.steps:
+                if station in self.stations:
+                    items.append(BatchItem(oi, sim_order.rank, station, int(order.get('thickness') or 0),
+                                           glass_type_of(order), m2))
+                    break
+        return self.plan(items)
+
+    @staticmethod
+    def summary(loads: List[FurnaceLoad]) -> Dict:
+        """Yük listesi özeti (yük sayısı, ortalama doluluk, toplam hazırlık, profil değişimi)"""
+        if not loads:
+            return {"loads": 0, "fill": 0.0, "setup_hours": 0.0, "changeovers": 0}
+        return {
+            "loads": len(loads),
+            "fill": sum(l.fill_ratio for l in loads) / len(loads),
+            "setup_hours": sum(l.setup_hours for l in loads),
+            "changeovers": sum(1 for l in loads if l.setup_hours > 0),
+        }
@@ -0,0 +1,454 @@
+"""
+EFES ROTA X - Ekran ViewModel'leri
+Her ekranın verisi async_db worker thread'inde okunur ve şekillendirilir;
+ekran yalnızca hazır veriyi sinyalle alıp çizer, GUI thread'i SQLite
+beklemez.
+
+- Aynı anda tek istek çalışır; arada gelen istekler birleştirilir
+  (tam yükleme bekleyen artımlı istekleri de kapsar).
+- Son başarılı veri (snapshot) saklanır; hata olursa ekran eski veriyi
+  göstermeye devam eder, failed sinyali yayınlanır.
+- fetch / fetch_changes worker thread'de çalışır, widget'lara dokunmaz.
+
+Kullanım:
+    self.vm = ProductionViewModel(self)
+    self.vm.data_ready.connect(self.apply_orders)
+    self.vm.reload()
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from core.db_async import async_db, TaskPriority
+from core.queue_index import QUEUE_POSITION_UNSET
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+try:
+    from core.plan_store import plan_store
+except ImportError:
+    plan_store = None
+
+
+_FULL = object()    # Bekleyen istek: tam yükleme
+
+
+class ViewModel(QObject):
+    """
+    Ekran verisi için temel ViewModel
+
+    Alt sınıflar fetch(source, **params) ile tam veriyi, isterse
+    fetch_changes(source, ids) + merge(snapshot, changes) ile artımlı
+    güncellemeyi tanımlar.
+    """
+
+    data_ready = Signal(object)         # Tam veri (render'a hazır)
+    changes_ready = Signal(object)      # Artımlı paket (fetch_changes sonucu)
+    failed = Signal(str)                # Hata mesajı (snapshot korunur)
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent=None, source=None):
+        super().__init__(parent)
+        self.source = source            # None = canlı veritabanı
+        self.snapshot = None            # Son başarılı veri
+        self.error: Optional[str] = None
+        self._params: Dict[str, Any] = {}
+        self._pending = None            # None | _FULL | {order_id}
+        self._in_flight = False
+        self._generation = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._in_flight
+
+    def data_source(self):
+        return self.source if self.source is not None else db
+
+    # ------------------------------------------------------------------
+    # İSTEKLER
+    # ------------------------------------------------------------------
+    def reload(self, **params):
+        """Tam yükleme iste (params verilmezse son parametreler kullanılır)"""
+        if params:
+            self._params = params
+        self._pending = _FULL
+        self._pump()
+
+    def update(self, ids: Iterable[int]):
+        """Yalnızca verilen siparişleri yenile (ilk yüklemeden önce tam yükleme)"""
+        ids = set(ids)
+        if not ids:
+            return
+        if self.snapshot is None:
+            self.reload()
+            return
+        if self._pending is _FULL:
+            return
+        self._pending = ids | (self._pending or set())
+        self._pump()
+
+    def set_source(self, source=None):
+        """Veri kaynağını değiştir (devam eden isteğin sonucu yok sayılır)"""
+        self.source = source
+        self.snapshot = None
+        self._generation += 1
+        self._in_flight = False
+        self.reload()
+
+    def _pump(self):
+        if self._in_flight or self._pending is None:
+            return
+        source = self.data_source()
+        if source is None:
+            return
+        request, self._pending = self._pending, None
+        generation = self._generation
+
+        if request is _FULL:
+            params = dict(self._params)
+            job, full = (lambda: self.fetch(source, **params)), True
+        else:
+            job, full = (lambda: self.fetch_changes(source, request)), False
+
+        self._in_flight = True
+        self.busy_changed.emit(True)
+        async_db.call(
+            job,
+            callback=lambda result: self._on_result(generation, full, result),
+            error_callback=lambda msg: self._on_failed(generation, msg),
+            priority=TaskPriority.HIGH,
+        )
+
+    def _on_result(self, generation, full, result):
+        if generation != self._generation:
+            return
+        try:
+            self._in_flight = False
+            self.error = None
+            if full:
+                self.snapshot = result
+                self.data_ready.emit(result)
+            else:
+                self.snapshot = self.merge(self.snapshot, result)
+                self.changes_ready.emit(result)
+            self._finish()
+        except RuntimeError:    # Qt nesnesi silinmiş
+            pass
+
+    def _on_failed(self, generation, msg):
+        if generation != self._generation:
+            return
+        try:
+            self._in_flight = False
+            self.error = msg
+            self.failed.emit(msg)
+            self._finish()
+        except RuntimeError:
+            pass
+
+    def _finish(self):
+        if self._pending is None:
+            self.busy_changed.emit(False)
+        self._pump()
+
+    # ------------------------------------------------------------------
+    # ALT SINIFLAR (worker thread'de çalışır)
+    # ------------------------------------------------------------------
+    def fetch(self, source, **params):
+        """Tam veri (alt sınıf tanımlamazsa boş)"""
+        return None
+
+    def fetch_changes(self, source, ids):
+        """Artımlı güncelleme desteklenmiyorsa tam veri"""
+        return self.fetch(source, **self._params)
+
+    def merge(self, snapshot, changes):
+        return changes
+
+
+# ============================================================================
+# SİPARİŞ LİSTESİ
+# ============================================================================
+class OrdersViewModel(ViewModel):
+    """
+    Tüm siparişler + istasyon ilerlemesi
+    builder(orders, progress) -> [(order, satır)] worker thread'de çağrılır
+    (satırların hesaplanması ve durum senkronu GUI'yi bekletmez).
+
+    data_ready: [(order, satır)]
+    changes_ready: ([(order, satır)], silinen id'ler)
+    """
+
+    def __init__(self, builder: Callable = None, parent=None, source=None):
+        super().__init__(parent, source)
+        self.builder = builder
+
+    def _build(self, orders, progress):
+        if self.builder is None:
+            return [(order, progress.get(order.get('id'), {})) for order in orders]
+        return self.builder(orders, progress)
+
+    def fetch(self, source):
+        return self._build(source.get_all_orders(), source.get_station_progress_map())
+
+    def fetch_changes(self, source, ids):
+        orders = source.get_orders_by_ids(ids)
+        entries = self._build(orders, source.get_station_progress_map(ids))
+        return entries, set(ids) - {order['id'] for order in orders}
+
+    def merge(self, snapshot, changes):
+        entries, removed = changes
+        by_id = {entry[0]['id']: entry for entry in snapshot or []}
+        for order_id in removed:
+            by_id.pop(order_id, None)
+        for entry in entries:
+            by_id[entry[0]['id']] = entry
+        return list(by_id.values())
+
+
+# ============================================================================
+# ÜRETİM TAKİP
+# ============================================================================
+class ProductionViewModel(ViewModel):
+    """
+    Üretim matrisi, Karar Destek sırasına (queue_position) göre sıralı
+    data_ready: [order] (priority, delivery_date, queue_position, queue_rank eklenmiş)
+    changes_ready: ([değişen order], silinen id'ler) - snapshot birleştirilip yeniden sıralanır
+    """
+
+    def _enrich(self, source, matrix_data, order_ids=None):
+        # Orders tablosundan queue_position, priority ve delivery_date al
+        query = """
+            SELECT id, priority, delivery_date, queue_position
+            FROM orders
+            WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
+        """
+        params = ()
+        if order_ids is not None:
+            ids = [o['id'] for o in matrix_data]
+            if not ids:
+                return matrix_data
+            query += f" AND id IN ({','.join(['?'] * len(ids))})"
+            params = tuple(ids)
+        orders_info = {}
+        with source.get_connection() as conn:
+            for row in conn.execute(query, params).fetchall():
+                orders_info[row['id']] = {
+                    'priority': row['priority'],
+                    'delivery_date': row['delivery_date'],
+                    'queue_position': row['queue_position'] if row['queue_position'] is not None else QUEUE_POSITION_UNSET
+                }
+
+        # Matrisi zenginleştir
+        for order in matrix_data:
+            info = orders_info.get(order.get('id'))
+            if info:
+                order.update(info)
+            else:
+                order['priority'] = 'Normal'
+                order['queue_position'] = QUEUE_POSITION_UNSET
+        return matrix_data
+
+    @staticmethod
+    def _arrange(orders):
+        """Sırala ve kartta gösterilen sıra numarasını ver (anahtarlar kesirli olabilir)"""
+        orders.sort(key=lambda x: (x.get('queue_position', QUEUE_POSITION_UNSET),
+                                   x.get('delivery_date') or '9999-12-31'))
+        rank = 0
+        for i, order in enumerate(orders):
+            if order.get('queue_position', QUEUE_POSITION_UNSET) < QUEUE_POSITION_UNSET:
+                rank += 1
+                if order.get('queue_rank') != rank:
+                    # Yeni nesne: model satırı değişmiş sayar (dataChanged)
+                    orders[i] = dict(order, queue_rank=rank)
+            elif 'queue_rank' in order:
+                orders[i] = {k: v for k, v in order.items() if k != 'queue_rank'}
+        return orders
+
+    def fetch(self, source):
+        return self._arrange(self._enrich(source, source.get_production_matrix_advanced()))
+
+    def fetch_changes(self, source, ids):
+        rows = self._enrich(source, source.get_production_matrix_advanced(ids), ids)
+        return rows, set(ids) - {o['id'] for o in rows}
+
+    def merge(self, snapshot, changes):
+        rows, removed = changes
+        by_id = {o['id']: o for o in snapshot or []}
+        for order_id in removed:
+            by_id.pop(order_id, None)
+        for order in rows:
+            by_id[order['id']] = order
+        return self._arrange(list(by_id.values()))
+
+
+# ============================================================================
+# SEVKİYAT
+# ============================================================================
+class ShippingViewModel(ViewModel):
+    """
+    Sevke hazır siparişler, aktif sehpalar, son sevkiyatlar
+    data_ready: {'ready', 'delayed', 'today', 'pallets', 'shipped'}
+    """
+
+    SHIPPED_LIMIT = 10
+
+    def fetch(self, source):
+        return {
+            **self._ready_orders(source),
+            'pallets': source.get_active_pallets(),
+            'shipped': source.get_shipped_pallets()[:self.SHIPPED_LIMIT],
+        }
+
+    def _ready_orders(self, source):
+        all_orders = source.get_production_matrix_advanced()
+        today = datetime.now().date()
+
+        orders_info = {}
+        with source.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT id, delivery_date, declared_total_m2, pallet_id, status
+                FROM orders
+                WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
+            """).fetchall()
+            for row in rows:
+                orders_info[row['id']] = {
+                    'delivery_date': row['delivery_date'],
+                    'm2': row['declared_total_m2'] or 0,
+                    'pallet_id': row['pallet_id'],
+                }
+
+        ready, delayed, due_today = [], [], []
+        for order in all_orders:
+            status_map = order.get('status_map', {})
+            # İş var mı, tüm istasyonlar bitti mi?
+            if not any(s.get('status') != 'Yok' for s in status_map.values()):
+                continue
+            if not all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values()):
+                continue
+            # Zaten sehpada mı?
+            info = orders_info.get(order.get('id'), {})
+            if info.get('pallet_id'):
+                continue
+
+            order['delivery_date'] = info.get('delivery_date', '')
+            order['m2'] = info.get('m2', 0)
+            order['total_qty'] = int(max((s.get('total', 0) for s in status_map.values()), default=0))
+            order['status_type'] = 'normal'
+            order['days_diff'] = 999
+
+            if order['delivery_date']:
+                try:
+                    days_diff = (datetime.strptime(order['delivery_date'], '%Y-%m-%d').date() - today).days
+                    order['days_diff'] = days_diff
+                    if days_diff < 0:
+                        order['status_type'] = 'delayed'
+                        delayed.append(order)
+                    elif days_diff == 0:
+                        order['status_type'] = 'today'
+                        due_today.append(order)
+                except ValueError:
+                    pass
+            ready.append(order)
+
+        # Öncelik: geciken > bugün > diğer
+        rank = {'delayed': 0, 'today': 1}
+        ready.sort(key=lambda x: (rank.get(x['status_type'], 2), x['days_diff']))
+        return {'ready': ready, 'delayed': delayed, 'today': due_today}
+
+
+class PalletContentViewModel(ViewModel):
+    """
+    Seçili sehpanın içeriği
+    data_ready: {'pallet_id', 'pallet', 'orders', 'total_m2'} (sehpa yoksa pallet None)
+    """
+
+    def fetch(self, source, pallet_id=None):
+        content = {'pallet_id': pallet_id, 'pallet': None, 'orders': [], 'total_m2': 0}
+        if not pallet_id:
+            return content
+        with source.get_connection() as conn:
+            pallet = conn.execute("SELECT * FROM shipments WHERE id = ?", (pallet_id,)).fetchone()
+            rows = conn.execute("""
+                SELECT order_code, customer_name, product_type, quantity, declared_total_m2
+                FROM orders
+                WHERE pallet_id = ?
+                ORDER BY order_code
+            """, (pallet_id,)).fetchall()
+        content['pallet'] = dict(pallet) if pallet else None
+        content['orders'] = [dict(r) for r in rows]
+        content['total_m2'] = sum(r['declared_total_m2'] or 0 for r in rows)
+        return content
+
+
+# ============================================================================
+# KARAR DESTEK
+# ============================================================================
+class DecisionViewModel(ViewModel):
+    """
+    Aktif siparişler (kayıtlı Karar Destek sırasıyla) + ilerleme + taze plan
+    data_ready: {'orders', 'progress', 'plan'}
+    changes_ready: {'active': {id: order}, 'progress', 'removed': {id}}
+    """
+
+    def __init__(self, statuses, parent=None, source=None):
+        super().__init__(parent, source)
+        self.statuses = list(statuses)
+
+    def fetch(self, source):
+        orders = source.get_orders_by_status(self.statuses)
+        # Sırasızlar öncelik sırasıyla sonda
+        orders.sort(key=lambda o: o.get('queue_position') or QUEUE_POSITION_UNSET)
+        progress = source.get_station_progress_map([o['id'] for o in orders if o.get('id') is not None])
+        # Kayıtlı taze plan (yalnızca okuma). Sandbox planı simülasyon gerektirir;
+        # ekran onu arka planda (BackgroundRunner) hesaplar, burada None döner
+        plan = plan_store.get_fresh_plan() if plan_store and source is db else None
+        return {'orders': orders, 'progress': progress, 'plan': plan}
+
+    def fetch_changes(self, source, ids):
+        rows = source.get_orders_by_ids(ids)
+        active = {o['id']: o for o in rows if o.get('status') in self.statuses}
+        return {
+            'active': active,
+            'progress': source.get_station_progress_map(active.keys()),
+            'removed': set(ids) - active.keys(),
+        }
+
+    def merge(self, snapshot, changes):
+        if snapshot is None:
+            return snapshot
+        changed = changes['active'].keys() | changes['removed']
+        orders = [changes['active'].get(o['id'], o) for o in snapshot['orders']
+                  if o['id'] not in changes['removed']]
+        known = {o['id'] for o in orders}
+        orders += [o for oid, o in changes['active'].items() if oid not in known]
+        progress = {oid: p for oid, p in snapshot['progress'].items() if oid not in changed}
+        progress.update(changes['progress'])
+        return {'orders': orders, 'progress': progress, 'plan': snapshot['plan']}
+
+
+# ============================================================================
+# RAPORLAR
+# ============================================================================
+class ReportViewModel(ViewModel):
+    """
+    Tek rapor sekmesinin verisi (sekme başına bir örnek; istekler birbirini ezmez)
+    data_ready: rapor satırları [dict]
+    """
+
+    REPORTS = {
+        "performance": lambda source, days=30: source.get_operator_performance(days=days),
+        "fire": lambda source: source.get_fire_analysis_data(),
+    }
+
+    def __init__(self, report, parent=None, source=None):
+        super().__init__(parent, source)
+        self.report = report
+
+    def fetch(self, source, **params):
+        return self.REPORTS[self.report](source, **params) or []
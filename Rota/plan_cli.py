@@ -0,0 +1,47 @@
+"""
+Kayitli uretim planini komut satirindan goster
+
+Kullanim:
+    python plan_cli.py              # kayitli plan (girdiler degistiyse yeniden hesaplanir)
+    python plan_cli.py --days 7     # ilk 7 gun
+    python plan_cli.py --force      # her durumda yeniden hesapla
+    python plan_cli.py --orders     # siparis bitis tarihleri
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from core.plan_store import plan_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EFES ROTA - Plan ozeti")
+    parser.add_argument("--days", type=int, default=14, help="Gosterilecek gun sayisi")
+    parser.add_argument("--horizon", type=int, default=30, help="Planlama ufku (gun)")
+    parser.add_argument("--force", action="store_true", help="Kayitli plani yok say, yeniden hesapla")
+    parser.add_argument("--orders", action="store_true", help="Siparis bitis tarihlerini listele")
+    args = parser.parse_args()
+
+    plan = plan_store.get_plan(horizon_days=args.horizon, force=args.force)
+    days = min(args.days, plan.horizon_days)
+
+    print(f"=== PLAN #{plan.run_id} ({plan.plan_date}, veri surumu {plan.data_version}) ===\n")
+
+    today = datetime.now()
+    header = "ISTASYON".ljust(16) + "".join((today + timedelta(days=i)).strftime("%d.%m").rjust(7) for i in range(days))
+    print(header)
+    print("-" * len(header))
+    for station, percents in plan.grid.items():
+        if not any(percents[:days]):
+            continue
+        cells = "".join((f"%{int(p)}" if p > 0 else "-").rjust(7) for p in percents[:days])
+        print(station.ljust(16) + cells)
+
+    if args.orders:
+        print("\n=== SIPARIS BITIS TARIHLERI ===\n")
+        for code, finish in sorted(plan.order_finish_dates.items(), key=lambda x: x[1]):
+            print(f"{code.ljust(20)} {finish.strftime('%d.%m.%Y %H:%M')}")
+
+
+if __name__ == "__main__":
+    main()
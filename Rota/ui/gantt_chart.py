@@ -0,0 +1,667 @@
+"""
+EFES ROTA X - Ölçeklenebilir Gantt Şeması
+PlanningView'in iş yükü tablosunun (istasyon x gün hücresi + delegate) yerine
+tahmin ızgarasındaki (ForecastGrid) aralıklardan sipariş çubuklarını çizer.
+
+- Yalnızca görünen bölge çizilir: satırlar y'den, çubuklar StationTrack
+  aralık indeksiyle (bisect) bulunur. Kaydırmada viewport().scroll ile
+  mevcut görüntü kaydırılır, sadece açılan şerit boyanır.
+- Yeni plan geldiğinde yalnızca aralıkları/doluluğu değişen istasyon
+  satırları, fare gezinirken yalnızca eski ve yeni vurgulu çubuk boyanır.
+- Ayrıntı düzeyi: yakında etiketli çubuklar, ortada etiketsiz çubuklar,
+  uzakta günlük doluluk hücreleri.
+- Yakınlaştırma saatten aya (Ctrl + tekerlek; fare altındaki an sabit kalır).
+- Aynı anda çalışan işler (fırın yükü vb.) satır içinde şeritlere ayrılır.
+
+Kullanım:
+    chart = GanttChart(["TEMPER A1", ...], horizon_days=180)
+    chart.day_clicked.connect(lambda station, day_idx: ...)
+    chart.set_plan(details, forecast, loads, capacities)
+    chart.set_zoom("Hafta")
+"""
+
+import heapq
+import math
+import zlib
+from array import array
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QAbstractScrollArea, QFrame, QToolTip, QWidget
+
+from ui.theme import Theme
+
+TR_DAYS = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
+TR_MONTHS = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+             "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+# Yakınlaştırma ön ayarları (piksel / saat); FIT tüm ufku ekrana sığdırır
+ZOOM_LEVELS = {"Saat": 40.0, "Gün": 4.0, "Hafta": 1.0, "Ay": 0.25}
+FIT = "Tümü"
+MIN_PX_PER_HOUR = 0.05
+MAX_PX_PER_HOUR = 120.0
+
+# Ayrıntı düzeyi eşikleri (piksel / saat)
+LOD_LABELS = 2.0        # üstünde çubuklarda sipariş kodu yazılır
+LOD_BARS = 0.5          # altında çubuk yerine günlük doluluk hücreleri çizilir
+
+MAX_LANES = 4           # satır içi en fazla şerit (fazlası son şeride biner)
+TICK_STEPS = (1, 2, 3, 6, 12, 24, 48, 72, 168, 336, 672)     # saat
+
+# Sipariş çubuğu renkleri (sipariş koduna göre sabit)
+BAR_PALETTE = ["#26A69A", "#42A5F5", "#7E57C2", "#5C6BC0", "#26C6DA",
+               "#8D6E63", "#EC407A", "#66BB6A", "#FFA726", "#78909C"]
+
+
+def assign_lanes(track) -> Tuple[array, int]:
+    """
+    Başlangıç sırasındaki aralıklara açgözlü şerit ataması (çakışanlar alt alta).
+    Dönüş: (aralık başına şerit, satırdaki şerit sayısı)
+    """
+    lanes = array("b")
+    busy = []       # (bitiş, şerit)
+    free = []       # boşalan şeritler (küçük önce)
+    count = 0
+    for i in range(len(track)):
+        start = track.start[i]
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = count
+            count += 1
+        heapq.heappush(busy, (track.end[i], lane))
+        lanes.append(min(lane, MAX_LANES - 1))
+    return lanes, max(1, min(count, MAX_LANES))
+
+
+def nearest_zoom(px_per_hour) -> str:
+    """Serbest ölçeğe (Ctrl + tekerlek) en yakın ön ayar (logaritmik uzaklık)"""
+    return min(ZOOM_LEVELS, key=lambda name: abs(math.log(ZOOM_LEVELS[name] / px_per_hour)))
+
+
+def load_level(percent) -> int:
+    """Günlük doluluk seviyesi (eski tablo ile aynı eşikler): 0 boş, 1 normal, 2 yoğun, 3 dolu"""
+    if percent <= 0:
+        return 0
+    if percent < 50:
+        return 1
+    if percent < 90:
+        return 2
+    return 3
+
+
+class GanttRow:
+    """Tek istasyon satırının çizim verisi"""
+
+    __slots__ = ("station", "key", "track", "lanes", "lane_count",
+                 "percents", "loads", "capacity", "_signature")
+
+    def __init__(self, station):
+        self.station = station
+        self.key = station.upper()
+        self.track = None
+        self.lanes = array("b")
+        self.lane_count = 1
+        self.percents = []
+        self.loads = []
+        self.capacity = 0
+        self._signature = None
+
+    def __len__(self):
+        return len(self.track) if self.track is not None else 0
+
+    def load(self, track, orders, percents, loads, capacity) -> bool:
+        """Yeni plan verisini al; satırın görüntüsü değiştiyse True"""
+        self.track = track if track is not None and len(track) else None
+        self.percents = list(percents or ())
+        self.loads = list(loads or ())
+        self.capacity = capacity or 0
+        if self.track is not None:
+            self.lanes, self.lane_count = assign_lanes(self.track)
+            bars = (self.track.start.tobytes(), self.track.end.tobytes(),
+                    tuple(orders[i][0] for i in self.track.order_idx))
+        else:
+            self.lanes, self.lane_count, bars = array("b"), 1, None
+        signature = (bars, tuple(self.percents), self.capacity)
+        changed = signature != self._signature
+        self._signature = signature
+        return changed
+
+    def percent_on(self, day_idx):
+        return self.percents[day_idx] if 0 <= day_idx < len(self.percents) else 0
+
+    def load_on(self, day_idx):
+        return self.loads[day_idx] if 0 <= day_idx < len(self.loads) else 0
+
+
+class GanttChart(QAbstractScrollArea):
+    """İstasyon x zaman Gantt şeması (özel boyama, görünür bölge kadar iş)"""
+
+    day_clicked = Signal(str, int)          # istasyon, gün indeksi
+    zoom_changed = Signal(float)            # piksel / saat
+
+    ROW_HEIGHT = 56
+    LABEL_WIDTH = 200
+    AXIS_HEIGHT = 44
+    BAR_PAD = 6
+    LOAD_STRIP = 5          # çubuk görünümünde satır altındaki doluluk şeridi
+
+    def __init__(self, stations, horizon_days=30, parent=None):
+        super().__init__(parent)
+        self.rows: List[GanttRow] = [GanttRow(s) for s in stations]
+        self.horizon_days = horizon_days
+        self.px_per_hour = ZOOM_LEVELS["Gün"]
+        self.origin = datetime.combine(date.today(), time())
+        self.details = None
+        self._colors: List[QColor] = []
+        self._load_colors = [None] + [QColor(c) for c in (Theme.SUCCESS, Theme.WARNING, Theme.DANGER)]
+        self._white = QColor("white")
+        self._hover = None          # (satır, aralık) - vurgulu çubuk
+        self._tip_key = None
+
+        self.bar_font = QFont(self.font())
+        self.bar_font.setPixelSize(11)
+        self.bar_font.setBold(True)
+        self.axis_font = QFont(self.font())
+        self.axis_font.setPixelSize(11)
+
+        self.axis = _TimeAxis(self)
+        self.labels = _StationLabels(self)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setViewportMargins(self.LABEL_WIDTH, self.AXIS_HEIGHT, 0, 0)
+        self.viewport().setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_OpaquePaintEvent)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self._update_scrollbars()
+
+    # ------------------------------------------------------------------
+    # VERİ
+    # ------------------------------------------------------------------
+    def set_plan(self, details, forecast=None, loads=None, capacities=None):
+        """
+        Yeni planı yükle (details: ForecastGrid). Yalnızca görüntüsü değişen
+        istasyon satırları yeniden boyanır.
+        """
+        forecast, loads, capacities = forecast or {}, loads or {}, capacities or {}
+        origin = datetime.combine(date.today(), time())
+        full = origin != self.origin
+        self.origin = origin
+        self.details = details
+
+        orders = details.orders if details is not None else []
+        self._colors = [self._color_for(code) for code, _ in orders]
+        tracks = details.tracks if details is not None else {}
+
+        dirty = []
+        for row_idx, row in enumerate(self.rows):
+            if row.load(tracks.get(row.key), orders, forecast.get(row.key),
+                        loads.get(row.key), capacities.get(row.key, 0)):
+                dirty.append(row_idx)
+
+        self._hover = None
+        self._tip_key = None
+        if full:
+            self.viewport().update()
+            self.axis.update()
+        else:
+            for row_idx in dirty:
+                self.viewport().update(self.row_rect(row_idx))
+        self.labels.update()
+
+    def set_horizon(self, days):
+        if days == self.horizon_days:
+            return
+        self.horizon_days = days
+        self._update_scrollbars()
+        self.viewport().update()
+        self.axis.update()
+
+    @staticmethod
+    def _color_for(code):
+        return QColor(BAR_PALETTE[zlib.crc32(str(code).encode("utf-8")) % len(BAR_PALETTE)])
+
+    # ------------------------------------------------------------------
+    # YAKINLAŞTIRMA
+    # ------------------------------------------------------------------
+    def set_zoom(self, name):
+        """Ön ayar: Saat / Gün / Hafta / Ay / Tümü"""
+        if name == FIT:
+            width = max(1, self.viewport().width())
+            self.set_px_per_hour(width / (self.horizon_days * 24.0), anchor_x=0)
+        else:
+            self.set_px_per_hour(ZOOM_LEVELS[name])
+
+    def set_px_per_hour(self, value, anchor_x=None):
+        """Ölçeği değiştir; anchor_x (viewport x) altındaki an yerinde kalır"""
+        value = max(MIN_PX_PER_HOUR, min(MAX_PX_PER_HOUR, value))
+        if value == self.px_per_hour:
+            return
+        if anchor_x is None:
+            anchor_x = self.viewport().width() / 2
+        hour = self.hour_at(anchor_x)
+        self.px_per_hour = value
+        self._hover = None
+        self._tip_key = None
+        self._update_scrollbars()
+        self.horizontalScrollBar().setValue(round(hour * value - anchor_x))
+        self.viewport().update()
+        self.axis.update()
+        self.zoom_changed.emit(value)
+
+    # ------------------------------------------------------------------
+    # GEOMETRİ (viewport koordinatları)
+    # ------------------------------------------------------------------
+    def x_at(self, hour):
+        return hour * self.px_per_hour - self.horizontalScrollBar().value()
+
+    def hour_at(self, x):
+        return (x + self.horizontalScrollBar().value()) / self.px_per_hour
+
+    def row_top(self, row_idx):
+        return row_idx * self.ROW_HEIGHT - self.verticalScrollBar().value()
+
+    def row_at(self, y) -> Optional[int]:
+        row_idx = int((y + self.verticalScrollBar().value()) // self.ROW_HEIGHT)
+        return row_idx if 0 <= row_idx < len(self.rows) else None
+
+    def row_rect(self, row_idx) -> QRect:
+        return QRect(0, self.row_top(row_idx), self.viewport().width(), self.ROW_HEIGHT)
+
+    def bar_rect(self, row_idx, i) -> QRectF:
+        row = self.rows[row_idx]
+        lane_h = (self.ROW_HEIGHT - 2 * self.BAR_PAD - self.LOAD_STRIP) / row.lane_count
+        x0 = self.x_at(row.track.start[i])
+        x1 = self.x_at(row.track.end[i])
+        y = self.row_top(row_idx) + self.BAR_PAD + row.lanes[i] * lane_h
+        return QRectF(x0, y, max(1.0, x1 - x0), lane_h - 1)
+
+    def show_bars(self):
+        return self.px_per_hour >= LOD_BARS
+
+    def bar_at(self, pos) -> Optional[Tuple[int, int]]:
+        """Noktadaki çubuk (satır, aralık indeksi)"""
+        row_idx = self.row_at(pos.y())
+        if row_idx is None or not self.show_bars() or self.rows[row_idx].track is None:
+            return None
+        hour = self.hour_at(pos.x())
+        slack = 2.0 / self.px_per_hour
+        point = QPointF(pos)
+        for i in self.rows[row_idx].track.overlapping(hour - slack, hour + slack):
+            if self.bar_rect(row_idx, i).adjusted(-2, 0, 2, 0).contains(point):
+                return row_idx, i
+        return None
+
+    def tick_steps(self) -> Tuple[int, int]:
+        """(ince, kaba) ölçek adımı (saat): ince >= 14 px, kaba >= 90 px"""
+        minor = next((s for s in TICK_STEPS if s * self.px_per_hour >= 14), TICK_STEPS[-1])
+        major = next((s for s in TICK_STEPS if s * self.px_per_hour >= 90), TICK_STEPS[-1])
+        return minor, major
+
+    def ticks(self, step, t0, t1):
+        """[t0, t1] içindeki ölçek çizgileri (hafta ve üstü pazartesiye hizalı)"""
+        base = 0.0
+        if step >= 168:
+            base = ((7 - self.origin.weekday()) % 7) * 24.0 - step
+        k = max(0, int((t0 - base) // step))
+        hour = base + k * step
+        end = min(t1, self.horizon_days * 24.0)
+        while hour <= end:
+            if hour >= 0:
+                yield hour
+            hour += step
+
+    def to_datetime(self, hour):
+        return self.origin + timedelta(hours=hour)
+
+    def _update_scrollbars(self):
+        vp = self.viewport()
+        width = int(self.horizon_days * 24 * self.px_per_hour)
+        height = len(self.rows) * self.ROW_HEIGHT
+        hbar, vbar = self.horizontalScrollBar(), self.verticalScrollBar()
+        hbar.setRange(0, max(0, width - vp.width()))
+        hbar.setPageStep(vp.width())
+        hbar.setSingleStep(max(1, int(self.px_per_hour * 6)))
+        vbar.setRange(0, max(0, height - vp.height()))
+        vbar.setPageStep(vp.height())
+        vbar.setSingleStep(self.ROW_HEIGHT // 2)
+
+    # ------------------------------------------------------------------
+    # BOYAMA
+    # ------------------------------------------------------------------
+    def paintEvent(self, event):
+        rect = event.rect()
+        painter = QPainter(self.viewport())
+        painter.fillRect(rect, QColor(Theme.SURFACE))
+
+        t0, t1 = self.hour_at(rect.left()), self.hour_at(rect.right() + 1)
+        self._paint_grid(painter, rect, t0, t1)
+
+        first = self.row_at(rect.top())
+        if first is not None:
+            last = self.row_at(rect.bottom())
+            last = len(self.rows) - 1 if last is None else last
+            for row_idx in range(first, last + 1):
+                self._paint_row(painter, row_idx, t0, t1)
+
+        now_x = self.x_at((datetime.now() - self.origin).total_seconds() / 3600.0)
+        if rect.left() <= now_x <= rect.right():
+            painter.setPen(QPen(QColor(Theme.DANGER), 1))
+            painter.drawLine(int(now_x), rect.top(), int(now_x), rect.bottom())
+
+        end_x = self.x_at(self.horizon_days * 24.0)
+        if end_x < rect.right():
+            painter.fillRect(QRectF(end_x, rect.top(), rect.right() - end_x + 1, rect.height()),
+                             QColor(Theme.SURFACE_DARK))
+
+    def _paint_grid(self, painter, rect, t0, t1):
+        minor, major = self.tick_steps()
+        for step, color in ((minor, Theme.BORDER_LIGHT), (major, Theme.DIVIDER)):
+            painter.setPen(QPen(QColor(color), 1))
+            for hour in self.ticks(step, t0, t1):
+                x = int(self.x_at(hour))
+                painter.drawLine(x, rect.top(), x, rect.bottom())
+
+        painter.setPen(QPen(QColor(Theme.DIVIDER), 1))
+        first = self.row_at(rect.top()) or 0
+        for row_idx in range(first, len(self.rows)):
+            y = self.row_top(row_idx) + self.ROW_HEIGHT - 1
+            if y > rect.bottom():
+                break
+            painter.drawLine(rect.left(), y, rect.right(), y)
+
+    def _paint_row(self, painter, row_idx, t0, t1):
+        row = self.rows[row_idx]
+        top = self.row_top(row_idx)
+        if not self.show_bars():
+            self._paint_load_cells(painter, row, top + 3, self.ROW_HEIGHT - 7, t0, t1, label=True)
+            return
+
+        self._paint_load_cells(painter, row, top + self.ROW_HEIGHT - self.LOAD_STRIP - 2,
+                               self.LOAD_STRIP, t0, t1)
+        if row.track is None:
+            return
+
+        # Sıcak döngü: geometri yerel değişkenlerle (bar_rect ile aynı hesap)
+        labels = self.px_per_hour >= LOD_LABELS
+        if labels:
+            painter.setFont(self.bar_font)
+            painter.setPen(self._white)
+            metrics = QFontMetrics(self.bar_font)
+        track, orders, colors = row.track, self.details.orders, self._colors
+        starts, ends, order_idx, lanes = track.start, track.end, track.order_idx, row.lanes
+        pxh, sx = self.px_per_hour, self.horizontalScrollBar().value()
+        lane_h = (self.ROW_HEIGHT - 2 * self.BAR_PAD - self.LOAD_STRIP) / row.lane_count
+        y0 = top + self.BAR_PAD
+        # 1 pikselden dar çubuklar şerit başına tek dikdörtgende birleştirilir
+        pending = {}
+        for i in track.overlapping(t0, t1):
+            x0, x1 = starts[i] * pxh - sx, ends[i] * pxh - sx
+            lane = lanes[i]
+            if x1 - x0 < 1.5:
+                run = pending.get(lane)
+                if run is not None and x0 <= run[1] + 1:
+                    run[1] = max(run[1], x1)
+                    continue
+                if run is not None:
+                    painter.fillRect(QRectF(run[0], y0 + lane * lane_h, max(1.0, run[1] - run[0]), lane_h - 1), run[2])
+                pending[lane] = [x0, x1, colors[order_idx[i]]]
+                continue
+            bar = QRectF(x0, y0 + lane * lane_h, x1 - x0, lane_h - 1)
+            painter.fillRect(bar, colors[order_idx[i]])
+            if labels and x1 - x0 > 28:
+                text = metrics.elidedText(orders[order_idx[i]][0], Qt.ElideRight, int(x1 - x0) - 6)
+                painter.drawText(bar.adjusted(4, 0, -2, 0), Qt.AlignLeft | Qt.AlignVCenter, text)
+        for lane, run in pending.items():
+            painter.fillRect(QRectF(run[0], y0 + lane * lane_h, max(1.0, run[1] - run[0]), lane_h - 1), run[2])
+
+        if self._hover is not None and self._hover[0] == row_idx:
+            painter.setPen(QPen(QColor(Theme.TEXT_DARK), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self.bar_rect(*self._hover).adjusted(1, 1, -1, -1))
+
+    def _paint_load_cells(self, painter, row, y, height, t0, t1, label=False):
+        """Günlük doluluk hücreleri (uzak görünüm) veya satır altı şeridi"""
+        first = max(0, int(t0 // 24))
+        last = min(self.horizon_days - 1, int(t1 // 24))
+        day_w = 24 * self.px_per_hour
+        label = label and day_w >= 30
+        if label:
+            painter.setFont(self.axis_font)
+            painter.setPen(self._white)
+        # Dar günlerde aynı seviyedeki ardışık günler tek dikdörtgen
+        merge = day_w < 8
+        sx = self.horizontalScrollBar().value()
+        percents, colors = row.percents, self._load_colors
+        run_start, run_level = None, 0
+        for day_idx in range(first, min(last, len(percents) - 1) + 1):
+            level = load_level(percents[day_idx])
+            if merge:
+                if level != run_level:
+                    if run_level:
+                        painter.fillRect(QRectF(run_start * day_w - sx, y, (day_idx - run_start) * day_w, height),
+                                         colors[run_level])
+                    run_start, run_level = day_idx, level
+                continue
+            if not level:
+                continue
+            cell = QRectF(day_idx * day_w - sx + 1, y, max(1.0, day_w - 2), height)
+            painter.fillRect(cell, colors[level])
+            if label:
+                painter.drawText(cell, Qt.AlignCenter, f"%{int(percents[day_idx])}")
+        if merge and run_level:
+            end = min(last, len(percents) - 1) + 1
+            painter.fillRect(QRectF(run_start * day_w - sx, y, (end - run_start) * day_w, height), colors[run_level])
+
+    # ------------------------------------------------------------------
+    # ETKİLEŞİM
+    # ------------------------------------------------------------------
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().scroll(dx, dy)
+        if dx:
+            self.axis.update()      # kaydırılmaz: kısmi gün/ay etiketi sol kenara yapışık
+        if dy:
+            self.labels.scroll(0, dy, QRect(0, self.AXIS_HEIGHT, self.LABEL_WIDTH,
+                                            self.labels.height() - self.AXIS_HEIGHT))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        vp = self.viewport().geometry()
+        self.axis.setGeometry(vp.left(), vp.top() - self.AXIS_HEIGHT, vp.width(), self.AXIS_HEIGHT)
+        self.labels.setGeometry(vp.left() - self.LABEL_WIDTH, vp.top() - self.AXIS_HEIGHT,
+                                self.LABEL_WIDTH, vp.height() + self.AXIS_HEIGHT)
+        self._update_scrollbars()
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta().y()
+        if event.modifiers() & Qt.ControlModifier and delta:
+            self.set_px_per_hour(self.px_per_hour * 1.25 ** (delta / 120.0),
+                                 anchor_x=event.position().x())
+            event.accept()
+        elif event.modifiers() & Qt.ShiftModifier and delta:
+            hbar = self.horizontalScrollBar()
+            hbar.setValue(hbar.value() - delta)
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        hit = self.bar_at(pos)
+        if hit != self._hover:
+            for old_or_new in (self._hover, hit):
+                if old_or_new is not None:
+                    self.viewport().update(self.bar_rect(*old_or_new).toAlignedRect().adjusted(-2, -2, 2, 2))
+            self._hover = hit
+
+        row_idx = self.row_at(pos.y())
+        day_idx = int(self.hour_at(pos.x()) // 24)
+        key = ("bar",) + hit if hit else ("day", row_idx, day_idx)
+        if key == self._tip_key:
+            return
+        self._tip_key = key
+        text = self.describe_bar(*hit) if hit else self.describe_day(row_idx, day_idx)
+        if text:
+            QToolTip.showText(event.globalPosition().toPoint(), text, self.viewport())
+        else:
+            QToolTip.hideText()
+
+    def leaveEvent(self, event):
+        if self._hover is not None:
+            self.viewport().update(self.bar_rect(*self._hover).toAlignedRect().adjusted(-2, -2, 2, 2))
+            self._hover = None
+        self._tip_key = None
+        QToolTip.hideText()
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            pos = event.position().toPoint()
+            row_idx = self.row_at(pos.y())
+            day_idx = int(self.hour_at(pos.x()) // 24)
+            if row_idx is not None and 0 <= day_idx < self.horizon_days:
+                self.day_clicked.emit(self.rows[row_idx].station, day_idx)
+        super().mouseReleaseEvent(event)
+
+    # ------------------------------------------------------------------
+    # AYRINTI METİNLERİ
+    # ------------------------------------------------------------------
+    def describe_bar(self, row_idx, i):
+        row = self.rows[row_idx]
+        track = row.track
+        code, customer = self.details.orders[track.order_idx[i]]
+        start, end = track.start[i], track.end[i]
+        return (f"{code} - {customer}\n{row.station}\n"
+                f"{self.to_datetime(start):%d.%m %H:%M} → {self.to_datetime(end):%d.%m %H:%M} "
+                f"({end - start:.1f} saat)\n{track.m2[i]:.1f} m²")
+
+    def describe_day(self, row_idx, day_idx):
+        if row_idx is None or not 0 <= day_idx < self.horizon_days:
+            return ""
+        row = self.rows[row_idx]
+        day = self.to_datetime(day_idx * 24.0)
+        jobs = len(self.details.jobs_on_day(row.key, day_idx)) if self.details is not None else 0
+        return (f"{row.station}\n{day:%d.%m.%Y} {TR_DAYS[day.weekday()]}\n"
+                f"Doluluk: %{int(row.percent_on(day_idx))} "
+                f"({int(row.load_on(day_idx))}/{int(row.capacity)} m²)\n{jobs} iş")
+
+
+class _TimeAxis(QWidget):
+    """Üst zaman ekseni: üst kat gün/ay, alt kat saat/gün ölçeği"""
+
+    def __init__(self, chart):
+        super().__init__(chart)
+        self.chart = chart
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def paintEvent(self, event):
+        chart = self.chart
+        rect = event.rect()
+        painter = QPainter(self)
+        painter.fillRect(rect, QColor(Theme.SURFACE_DARK))
+        painter.setFont(chart.axis_font)
+        metrics = QFontMetrics(chart.axis_font)
+        half = self.height() // 2
+        t0, t1 = chart.hour_at(rect.left()), chart.hour_at(rect.right() + 1)
+
+        # Üst kat: yakında günler, uzakta aylar
+        for start, end, label, short in self._spans(t0, t1):
+            x0, x1 = chart.x_at(start), chart.x_at(end)
+            painter.setPen(QColor(Theme.DIVIDER))
+            painter.drawLine(int(x0), 0, int(x0), self.height())
+            # Kısmen görünen gün/ayın etiketi sol kenara yapışır
+            lx = max(x0, 0.0)
+            width = x1 - lx - 8
+            text = label if metrics.horizontalAdvance(label) <= width else short
+            if metrics.horizontalAdvance(text) <= width:
+                painter.setPen(QColor(Theme.TEXT_SECONDARY))
+                painter.drawText(QRectF(lx + 4, 0, width, half), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        # Alt kat: ince ölçek
+        minor, _ = chart.tick_steps()
+        for hour in chart.ticks(minor, t0, t1):
+            x = chart.x_at(hour)
+            painter.setPen(QColor(Theme.DIVIDER))
+            painter.drawLine(int(x), self.height() - 6, int(x), self.height())
+            if minor < 24:
+                text = f"{int(hour % 24):02d}"
+            else:
+                text = chart.to_datetime(hour).strftime("%d")
+            if metrics.horizontalAdvance(text) + 4 <= minor * chart.px_per_hour:
+                painter.setPen(QColor(Theme.TEXT_DISABLED))
+                painter.drawText(QRectF(x + 2, half, minor * chart.px_per_hour, half - 4),
+                                 Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        painter.setPen(QColor(Theme.DIVIDER))
+        painter.drawLine(rect.left(), self.height() - 1, rect.right(), self.height() - 1)
+
+    def _spans(self, t0, t1):
+        """(başlangıç saati, bitiş saati, etiket, kısa etiket)"""
+        chart = self.chart
+        horizon = chart.horizon_days * 24.0
+        t0, t1 = max(0.0, t0), min(horizon, t1)
+        if chart.px_per_hour * 24 >= 60:
+            for day_idx in range(int(t0 // 24), int(t1 // 24) + 1):
+                day = chart.to_datetime(day_idx * 24.0)
+                yield (day_idx * 24.0, min(horizon, day_idx * 24.0 + 24),
+                       f"{day:%d.%m} {TR_DAYS[day.weekday()]}", f"{day:%d.%m}")
+            return
+        month = chart.to_datetime(t0).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        while True:
+            start = (month - chart.origin).total_seconds() / 3600.0
+            if start > t1:
+                break
+            following = (month + timedelta(days=32)).replace(day=1)
+            end = (following - chart.origin).total_seconds() / 3600.0
+            yield (max(0.0, start), min(horizon, end),
+                   f"{TR_MONTHS[month.month - 1]} {month.year}", TR_MONTHS[month.month - 1][:3])
+            month = following
+
+
+class _StationLabels(QWidget):
+    """Sol istasyon sütunu (dikey kaydırmayı izler)"""
+
+    def __init__(self, chart):
+        super().__init__(chart)
+        self.chart = chart
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.name_font = QFont(chart.font())
+        self.name_font.setPixelSize(12)
+        self.name_font.setBold(True)
+
+    def paintEvent(self, event):
+        chart = self.chart
+        rect = event.rect()
+        painter = QPainter(self)
+        painter.fillRect(rect, QColor(Theme.SURFACE_DARK))
+        axis_h = chart.AXIS_HEIGHT
+
+        painter.save()
+        painter.setClipRect(QRect(0, axis_h, self.width(), self.height() - axis_h))
+        for row_idx, row in enumerate(chart.rows):
+            top = axis_h + chart.row_top(row_idx)
+            if top > rect.bottom():
+                break
+            if top + chart.ROW_HEIGHT < rect.top():
+                continue
+            cell = QRect(12, top, self.width() - 24, chart.ROW_HEIGHT)
+            painter.setFont(self.name_font)
+            painter.setPen(QColor(Theme.TEXT_PRIMARY))
+            half = chart.ROW_HEIGHT // 2
+            painter.drawText(cell.adjusted(0, 0, 0, -half), Qt.AlignLeft | Qt.AlignBottom, row.station)
+            painter.setFont(chart.axis_font)
+            painter.setPen(QColor(Theme.TEXT_SECONDARY))
+            painter.drawText(cell.adjusted(0, half + 2, 0, 0), Qt.AlignLeft | Qt.AlignTop, f"{len(row)} iş")
+            painter.setPen(QColor(Theme.DIVIDER))
+            painter.drawLine(0, top + chart.ROW_HEIGHT - 1, self.width(), top + chart.ROW_HEIGHT - 1)
+        painter.restore()
+
+        painter.setFont(chart.axis_font)
+        painter.setPen(QColor(Theme.TEXT_SECONDARY))
+        painter.drawText(QRect(12, 0, self.width() - 12, axis_h), Qt.AlignLeft | Qt.AlignVCenter, "İSTASYON")
+        painter.setPen(QColor(Theme.DIVIDER))
+        painter.drawLine(0, axis_h - 1, self.width(), axis_h - 1)
+        painter.drawLine(self.width() - 1, 0, self.width() - 1, self.height())
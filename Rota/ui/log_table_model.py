@@ -0,0 +1,206 @@
+"""
+EFES ROTA X - Tembel Yüklenen Log Tablosu Modeli
+Üretim loglarını sayfa sayfa (keyset: timestamp DESC, id DESC) okur:
+ilk sayfa hemen gösterilir, tablo en alta kaydırıldıkça canFetchMore /
+fetchMore ile sonraki sayfa async_db worker'ında okunur. Toplam kayıt
+sayısı ayrı bir COUNT sorgusuyla gelir (count_ready).
+
+Dışa aktarım tablodaki widget'lardan değil doğrudan sorgudan akar
+(export_rows / export_xlsx); bellekte yalnızca bir sayfa tutulur.
+
+Kullanım:
+    model = LazyLogModel([LogColumn("Tarih", lambda r: r['timestamp']), ...])
+    view.setModel(model)
+    model.query(start="2025-01-01", end="2025-12-31")
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QColor, QFont
+
+from core.db_async import async_db, TaskPriority
+
+try:
+    from core.db_manager import db
+except ImportError:
+    db = None
+
+
+@dataclass(frozen=True)
+class LogColumn:
+    """Tablo sütunu: başlık, metin, (isteğe bağlı) renk, kalınlık / yazı tipi, hizalama"""
+    header: str
+    text: Callable[[dict], str]
+    color: Optional[Callable[[dict], Optional[str]]] = None
+    bold: bool = False
+    font: Optional[QFont] = None        # Verilirse bold yerine kullanılır
+    align: int = int(Qt.AlignLeft | Qt.AlignVCenter)
+
+
+class LazyLogModel(QAbstractTableModel):
+    """Keyset sayfalamalı, tembel yüklenen log modeli"""
+
+    ROW_ROLE = Qt.UserRole          # Satırın ham verisi (dict)
+    PAGE_SIZE = 200
+
+    count_ready = Signal(int)       # Filtreye uyan toplam kayıt
+    page_loaded = Signal(int)       # Yüklenen satır sayısı
+    failed = Signal(str)
+
+    def __init__(self, columns: List[LogColumn], parent=None, source=None, page_size: int = None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.source = source
+        self.page_size = page_size or self.PAGE_SIZE
+        self.rows: List[dict] = []
+        self.total: Optional[int] = None
+        self.filters = None          # None = henüz sorgulanmadı
+        self._after = None
+        self._exhausted = True
+        self._fetching = False
+        self._generation = 0
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._colors = {}
+
+    def data_source(self):
+        return self.source if self.source is not None else db
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section].header
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            return column.text(row)
+        if role == Qt.ForegroundRole and column.color:
+            color = column.color(row)
+            if color:
+                if color not in self._colors:
+                    self._colors[color] = QColor(color)
+                return self._colors[color]
+            return None
+        if role == Qt.FontRole:
+            if column.font is not None:
+                return column.font
+            return self._bold if column.bold else None
+        if role == Qt.TextAlignmentRole:
+            return column.align
+        if role == self.ROW_ROLE:
+            return row
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._request_page()
+
+    # ------------------------------------------------------------------
+    # SORGU
+    # ------------------------------------------------------------------
+    def query(self, **filters):
+        """Yeni filtreyle baştan başla (önceki isteklerin sonuçları yok sayılır)"""
+        self.beginResetModel()
+        self.rows = []
+        self.total = None
+        self.filters = filters
+        self._after = None
+        self._exhausted = False
+        self._fetching = False
+        self._generation += 1
+        self.endResetModel()
+
+        source = self.data_source()
+        if source is None:
+            self._exhausted = True
+            return
+        generation = self._generation
+        self._request_page()
+        async_db.call(source.count_logs, **filters,
+                      callback=lambda total: self._on_count(generation, total),
+                      error_callback=self.failed.emit)
+
+    def _request_page(self):
+        source = self.data_source()
+        if source is None or self.filters is None:
+            return
+        self._fetching = True
+        generation = self._generation
+        async_db.call(source.get_logs_page, after=self._after, limit=self.page_size, **self.filters,
+                      callback=lambda page: self._on_page(generation, page),
+                      error_callback=lambda msg: self._on_failed(generation, msg),
+                      priority=TaskPriority.HIGH)
+
+    def _on_page(self, generation, page):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._exhausted = len(page) < self.page_size
+        if page:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+            self._after = (page[-1]['timestamp'], page[-1]['id'])
+        self.page_loaded.emit(len(self.rows))
+
+    def _on_count(self, generation, total):
+        if generation != self._generation:
+            return
+        self.total = total
+        self.count_ready.emit(total)
+
+    def _on_failed(self, generation, msg):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._exhausted = True
+        self.failed.emit(msg)
+
+    # ------------------------------------------------------------------
+    # DIŞA AKTARIM
+    # ------------------------------------------------------------------
+    def export_rows(self) -> Iterator[List[str]]:
+        """Son sorgunun tüm satırları, tablodaki metinlerle (doğrudan sorgudan akar)"""
+        source = self.data_source()
+        if source is None or self.filters is None:
+            return
+        for row in source.iter_logs(**self.filters):
+            yield [column.text(row) for column in self.columns]
+
+    def export_xlsx(self, file_path, title, cancel_check=None) -> int:
+        """
+        Son sorguyu Excel'e akıt (write-only çalışma kitabı, arka plan thread'inde
+        çağrılabilir). Yazılan satır sayısını döner.
+        """
+        import openpyxl
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(title)
+        ws.append([column.header for column in self.columns])
+        count = 0
+        for values in self.export_rows():
+            ws.append(values)
+            count += 1
+            if cancel_check and count % 5000 == 0 and cancel_check():
+                return count
+        wb.save(file_path)
+        return count
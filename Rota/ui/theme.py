@@ -1,5 +1,37 @@
+import os
+import textwrap
+
 from PySide6.QtGui import QColor, QFont, QPalette
 
+
+class ExcelColors:
+    """
+    Excel temalı ekranların (dashboard, üretim, sipariş detayı) ortak paleti.
+    Görünümlerdeki Colors sınıfları bundan türetilir; bileşen stilleri
+    (ui/styles.qss) da buradan üretilir.
+    """
+    BG = "#FFFFFF"
+    HEADER_BG = "#F3F3F3"
+    BORDER = "#D4D4D4"
+    GRID = "#E0E0E0"
+    TEXT = "#1A1A1A"
+    TEXT_SECONDARY = "#666666"
+    TEXT_MUTED = "#999999"
+    SELECTION = "#B4D7FF"
+    ACCENT = "#217346"
+    ACCENT_HOVER = "#1D6640"
+    ROW_ALT = "#F9F9F9"
+    
+    CRITICAL = "#C00000"
+    CRITICAL_BG = "#FDE8E8"
+    WARNING = "#C65911"
+    WARNING_BG = "#FFF3E0"
+    SUCCESS = "#107C41"
+    SUCCESS_BG = "#E6F4EA"
+    INFO = "#0066CC"
+    INFO_BG = "#E3F2FD"
+
+
 class Theme:
     """
     EFES ROTA - MINIMAL KURUMSAL TEMA
@@ -56,16 +88,65 @@ class Theme:
     RADIUS_LG = "12px"
     RADIUS_XL = "16px"
 
+    # Üretilmiş stil sayfası (python -m ui.theme ile yeniden yazılır)
+    STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.qss")
+
     @staticmethod
     def apply_app_style(app):
-        """Uygulamaya minimal ve kurumsal temayı uygula"""
+        """Uygulamaya minimal ve kurumsal temayı uygula (tek stil sayfası, bir kez)"""
         
         # Font ayarları
         font = QFont("Inter, Segoe UI, Roboto")
         font.setPixelSize(14)
         app.setFont(font)
 
-        style = f"""
+        app.setStyleSheet(Theme.load_stylesheet())
+
+    @staticmethod
+    def load_stylesheet():
+        """ui/styles.qss'i oku; dosya yoksa veya boşsa temadan üret"""
+        try:
+            with open(Theme.STYLESHEET_PATH, encoding="utf-8") as f:
+                style = f.read()
+            if style.strip():
+                return style
+        except OSError:
+            pass
+        return Theme.build_stylesheet()
+
+    @staticmethod
+    def write_stylesheet(path=None):
+        """Temadan üretilen stil sayfasını ui/styles.qss'e yaz"""
+        path = path or Theme.STYLESHEET_PATH
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(Theme.build_stylesheet())
+        return path
+
+    @staticmethod
+    def build_stylesheet():
+        """Genel stiller + bileşen stilleri (bileşenler sonda: eşit özgüllükte sonraki kazanır)"""
+        header = "/* Otomatik üretildi (ui/theme.py) - elle düzenlemeyin: python -m ui.theme */\n"
+        return header + _dedent(Theme.base_stylesheet()) + _dedent(component_stylesheet())
+
+    @staticmethod
+    def set_state(widget, name, value):
+        """
+        Dinamik özelliği değiştir ve stili yeniden uygula (ör. [level="critical"]).
+        Qt özellik seçicilerini kendiliğinden yeniden değerlendirmez; değer
+        aynıysa hiçbir şey yapılmaz.
+        """
+        if widget.property(name) == value:
+            return False
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        return True
+
+    @staticmethod
+    def base_stylesheet():
+        """Uygulama geneli widget stilleri"""
+        return f"""
             /* GENEL WIDGET STİLLERİ */
             QWidget {{
                 background-color: {Theme.BACKGROUND};
@@ -311,5 +392,230 @@ class Theme:
                 font-size: {Theme.FONT_SIZE_SM};
             }}
         """
+
+
+# =============================================================================
+# BİLEŞEN STİLLERİ
+# =============================================================================
+# Sık oluşturulan satır/kart widget'ları kendi stil sayfalarını taşımaz
+# (her setStyleSheet ayrı ayrıştırma ve polish demektir); objectName ve
+# dinamik özellik seçicileriyle buradaki tek uygulama stiline bağlanır.
+# Not: Qt'de ata widget'ın stil sayfası uygulama stilinden önce gelir, bu
+# yüzden bu bileşenlerin atalarında seçicisiz ("background: ...") stil olmamalı.
+
+# Metin tonu -> renk (MetricCard[tone=...])
+TONES = {
+    "text": ExcelColors.TEXT,
+    "secondary": ExcelColors.TEXT_SECONDARY,
+    "muted": ExcelColors.TEXT_MUTED,
+    "info": ExcelColors.INFO,
+    "success": ExcelColors.SUCCESS,
+    "warning": ExcelColors.WARNING,
+    "critical": ExcelColors.CRITICAL,
+}
+
+# Kapasite seviyesi -> renk (CapacityBar[level=...])
+CAPACITY_LEVELS = {
+    "normal": ExcelColors.SUCCESS,
+    "busy": ExcelColors.WARNING,
+    "critical": ExcelColors.CRITICAL,
+}
+
+# Üretim ekranı istasyon durumu -> renk (StationRow[status=...])
+STATION_STATES = {
+    "done": ExcelColors.SUCCESS,
+    "partial": ExcelColors.WARNING,
+    "waiting": ExcelColors.TEXT_MUTED,
+}
+
+# Sipariş detayı rota durumu -> (arka plan, kenar, metin, çubuk)
+ROUTE_STATES = {
+    "completed": (ExcelColors.SUCCESS_BG, ExcelColors.SUCCESS, ExcelColors.SUCCESS, ExcelColors.SUCCESS),
+    "partial": (ExcelColors.WARNING_BG, ExcelColors.WARNING, ExcelColors.WARNING, ExcelColors.WARNING),
+    "current": (ExcelColors.INFO_BG, ExcelColors.INFO, ExcelColors.INFO, ExcelColors.INFO),
+    "pending": (ExcelColors.BG, ExcelColors.BORDER, ExcelColors.TEXT_MUTED, ExcelColors.GRID),
+}
+
+
+def _dedent(css):
+    return textwrap.dedent(css).strip("\n") + "\n\n"
+
+
+def _variants(selector, prop, values, body):
+    """Her değer için selector[prop="değer"] kuralı; selector'daki {} özellik seçicisinin yeri"""
+    rules = []
+    for key, value in values.items():
+        attribute = '[%s="%s"]' % (prop, key)
+        rules.append(f"        {selector.format(attribute)} {{ {body(value)} }}")
+    return "\n".join(rules)
+
+
+def component_stylesheet():
+    """Dashboard kartları ve istasyon satırları (objectName + dinamik özellik)"""
+    C = ExcelColors
+    metric_tones = _variants("QLabel#MetricValue{}", "tone", TONES, lambda c: f"color: {c};")
+    capacity_chunks = _variants("QProgressBar#CapacityGauge{}::chunk", "level", CAPACITY_LEVELS,
+                                lambda c: f"background-color: {c};")
+    capacity_labels = _variants("QLabel#CapacityPercent{}", "level", CAPACITY_LEVELS, lambda c: f"color: {c};")
+    station_icons = _variants("QLabel#StationIcon{}", "status", STATION_STATES, lambda c: f"color: {c};")
+    station_chunks = _variants("QProgressBar#StationGauge{}::chunk", "status", STATION_STATES,
+                               lambda c: f"background-color: {c};")
+    route_rows = _variants("QFrame#RouteStationRow{}", "status", ROUTE_STATES,
+                           lambda c: f"background-color: {c[0]}; border-color: {c[1]};")
+    route_icons = _variants("QFrame#RouteStationRow QLabel#RouteStationIcon{}", "status", ROUTE_STATES,
+                            lambda c: f"color: {c[2]};")
+    route_status = _variants("QFrame#RouteStationRow QLabel#RouteStationStatus{}", "status", ROUTE_STATES,
+                             lambda c: f"color: {c[2]};")
+    route_chunks = _variants("QProgressBar#RouteStationGauge{}::chunk", "status", ROUTE_STATES,
+                             lambda c: f"background-color: {c[3]};")
+    return f"""
+        /* DASHBOARD */
+        /* Görünüm zemini alt widget'lara iner (eski seçicisiz stil gibi). Ata
+           seçicisinde tip yok: özgüllük bileşen kurallarıyla (QFrame#MetricCard)
+           eşit kalır ve sonra gelen bileşen kuralı kazanır. */
+        QWidget#DashboardView, #DashboardView QWidget {{
+            background-color: {C.HEADER_BG};
+        }}
+        
+        QFrame#MetricCard, QFrame#CapacityPanel {{
+            background-color: {C.BG};
+            border: 1px solid {C.BORDER};
+            border-radius: 6px;
+        }}
+        
+        QFrame#MetricCard QLabel, QFrame#CapacityPanel QLabel {{
+            background-color: transparent;
+            border: none;
+        }}
+        
+        QLabel#MetricTitle {{ font-size: 11px; color: {C.TEXT_MUTED}; font-weight: 500; }}
+        QLabel#MetricIcon {{ font-size: 14px; }}
+        QLabel#MetricValue {{ font-size: 28px; font-weight: bold; color: {C.TEXT}; }}
+        QLabel#MetricSubtitle {{ font-size: 10px; color: {C.TEXT_SECONDARY}; }}
+{metric_tones}
+        
+        QFrame#CapacityBar {{
+            background-color: transparent;
+            border: none;
+        }}
+        
+        QLabel#CapacityName {{ font-size: 11px; font-weight: bold; color: {C.TEXT}; }}
+        QLabel#CapacityPercent {{ font-size: 11px; font-weight: bold; }}
+        QLabel#CapacityStatus {{ font-size: 10px; color: {C.TEXT_MUTED}; }}
+{capacity_labels}
+        
+        QProgressBar#CapacityGauge {{
+            background-color: {C.GRID};
+            border: none;
+            border-radius: 4px;
+        }}
+        
+        QProgressBar#CapacityGauge::chunk {{
+            border-radius: 4px;
+        }}
+{capacity_chunks}
+        
+        /* ÜRETİM EKRANI - İSTASYON SATIRLARI */
+        QWidget#ProductionView, #ProductionView QWidget {{
+            background-color: {C.BG};
+        }}
+        
+        QFrame#StationRow {{
+            background-color: {C.ROW_ALT};
+            border: 1px solid {C.GRID};
+            border-radius: 4px;
+        }}
+        
+        QFrame#StationRow QLabel {{
+            background-color: transparent;
+            border: none;
+        }}
+        
+        QLabel#StationIcon {{ font-size: 14px; }}
+        QLabel#StationName {{ font-size: 11px; font-weight: bold; color: {C.TEXT}; }}
+        QLabel#StationQty {{ font-size: 11px; color: {C.TEXT_SECONDARY}; }}
+        QLabel#StationDone {{ font-size: 10px; color: {C.SUCCESS}; font-weight: bold; }}
+{station_icons}
+        
+        QProgressBar#StationGauge {{
+            background-color: {C.BORDER};
+            border: none;
+            border-radius: 3px;
+        }}
         
-        app.setStyleSheet(style)
\ No newline at end of file
+        QProgressBar#StationGauge::chunk {{
+            border-radius: 3px;
+        }}
+{station_chunks}
+        
+        QPushButton#StationEntryButton {{
+            background-color: {C.ACCENT};
+            border: none;
+            border-radius: 3px;
+            color: white;
+            font-size: 10px;
+            font-weight: bold;
+        }}
+        
+        QPushButton#StationEntryButton:hover {{
+            background-color: {C.ACCENT_HOVER};
+        }}
+        
+        /* SİPARİŞ DETAYI - ROTA SATIRLARI */
+        QDialog#OrderDetailDialog, QWidget#OrderDetailContent {{
+            background-color: {C.BG};
+        }}
+        
+        QDialog#OrderDetailDialog QLabel {{
+            color: {C.TEXT};
+            background-color: transparent;
+        }}
+        
+        QFrame#RouteStationList {{
+            background-color: {C.BG};
+            border: 1px solid {C.BORDER};
+            border-radius: 4px;
+        }}
+        
+        QFrame#RouteStationRow {{
+            border: 1px solid;
+            border-radius: 3px;
+        }}
+{route_rows}
+        
+        QFrame#RouteStationRow QLabel {{
+            border: none;
+        }}
+        
+        QFrame#RouteStationRow QLabel#RouteStationIcon {{ font-size: 12px; }}
+        QFrame#RouteStationRow QLabel#RouteStationName {{ font-size: 11px; font-weight: bold; color: {C.TEXT}; }}
+        QFrame#RouteStationRow QLabel#RouteStationQty {{ font-size: 10px; color: {C.TEXT_SECONDARY}; }}
+        QFrame#RouteStationRow QLabel#RouteStationStatus {{ font-size: 10px; }}
+{route_icons}
+{route_status}
+        
+        QProgressBar#RouteStationGauge {{
+            background-color: {C.GRID};
+            border: none;
+            border-radius: 3px;
+        }}
+        
+        QProgressBar#RouteStationGauge::chunk {{
+            border-radius: 3px;
+        }}
+{route_chunks}
+        
+        /* İŞ YÜKÜ - BAŞLIK SEÇİCİLERİ (ufuk, ölçek) */
+        QComboBox#PlanningCombo {{
+            background-color: {Theme.SURFACE};
+            color: {Theme.TEXT_PRIMARY};
+            border: 1px solid {Theme.BORDER};
+            border-radius: {Theme.RADIUS_SM};
+            padding: 0 12px;
+            font-size: 13px;
+        }}
+    """
+
+
+if __name__ == "__main__":
+    print(Theme.write_stylesheet())
@@ -0,0 +1,120 @@
+"""
+EFES ROTA X - Widget Geri Dönüşümü
+Periyodik yenilenen panellerde (dashboard) widget'ları silip yeniden
+oluşturmak yerine anahtarla eşleyip yerinde günceller:
+
+- Recyclable: update_value(value) değer değişmediyse hiçbir şey yapmaz,
+  değiştiyse apply_value ile yalnızca ilgili alt widget'ları günceller.
+  (QWidget.update() ezilmesin diye metot adı update_value'dur.)
+- KeyedWidgetPool: layout'taki widget'ları anahtara göre tutar; yeni
+  anahtar için fabrikayla oluşturur, kaybolan anahtarın widget'ını
+  gizler (geri gelirse yeniden kullanılır), sıra yalnızca değiştiyse
+  layout'ta yeniden dizilir.
+
+Kullanım:
+    pool = KeyedWidgetPool(layout, lambda key: CapacityBar(key))
+    pool.sync((s['name'], (s['percent'], s['status'])) for s in loads)
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from PySide6.QtWidgets import QLabel
+
+
+_UNSET = object()
+
+
+class Recyclable:
+    """Yerinde güncellenebilen widget karışımı (mixin)"""
+
+    _value = _UNSET
+
+    def update_value(self, value) -> bool:
+        """Değeri uygula; değişiklik yoksa False (yeniden çizim/yerleşim yok)"""
+        if value == self._value:
+            return False
+        self._value = value
+        self.apply_value(value)
+        return True
+
+    def apply_value(self, value):
+        """Değişen değeri alt widget'lara yansıt (alt sınıf tanımlar)"""
+        pass
+
+
+def set_label_text(label: QLabel, text: str) -> bool:
+    """Metin farklıysa yaz (aynı metinde yeniden yerleşim tetiklenmez)"""
+    if label.text() == text:
+        return False
+    label.setText(text)
+    return True
+
+
+def set_style(widget, style: str) -> bool:
+    """Stil farklıysa uygula (setStyleSheet pahalıdır: stil yeniden çözülür)"""
+    if widget.styleSheet() == style:
+        return False
+    widget.setStyleSheet(style)
+    return True
+
+
+class RecyclableLabel(Recyclable, QLabel):
+    """Değeri metni olan etiket (liste satırları için)"""
+
+    def __init__(self, style: str = "", word_wrap: bool = False, parent=None):
+        super().__init__(parent)
+        if style:
+            self.setStyleSheet(style)
+        self.setWordWrap(word_wrap)
+
+    def apply_value(self, value):
+        self.setText(str(value))
+
+
+class KeyedWidgetPool:
+    """Anahtarlı widget havuzu (layout içinde, yerinde güncelleme)"""
+
+    def __init__(self, layout, factory: Callable[[Hashable], Any]):
+        self.layout = layout
+        self.factory = factory
+        self.widgets: Dict[Hashable, Any] = {}
+        self._order: List[Hashable] = []
+
+    def sync(self, items: Iterable[Tuple[Hashable, Any]]) -> int:
+        """
+        items: (anahtar, değer) sırası. Değeri değişen widget sayısını döner.
+        Görünür widget'lar verilen sırayla dizilir; listede olmayanlar gizlenir.
+        """
+        order, changed = [], 0
+        for key, value in items:
+            widget = self.widgets.get(key)
+            if widget is None:
+                widget = self.widgets[key] = self.factory(key)
+            if widget.update_value(value):
+                changed += 1
+            order.append(key)
+
+        if order != self._order:
+            self._relayout(order)
+        return changed
+
+    def _relayout(self, order):
+        visible = set(order)
+        for index, key in enumerate(order):
+            widget = self.widgets[key]
+            if self.layout.indexOf(widget) != index:
+                self.layout.removeWidget(widget)
+                self.layout.insertWidget(index, widget)
+            widget.setVisible(True)
+        for key, widget in self.widgets.items():
+            if key not in visible:
+                widget.setVisible(False)
+        self._order = order
+
+    def clear(self):
+        """Tüm widget'ları sil (havuz boşalır)"""
+        for widget in self.widgets.values():
+            self.layout.removeWidget(widget)
+            widget.deleteLater()
+        self.widgets.clear()
+        self._order = []
@@ -17,14 +17,27 @@ from PySide6.QtWidgets import (
     QPushButton, QFrame, QStackedWidget, QButtonGroup, 
     QScrollArea, QGridLayout, QProgressBar, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont
 
+from ui.theme import Theme, ExcelColors
+from ui.widget_pool import Recyclable, RecyclableLabel, KeyedWidgetPool, set_label_text
+
 try:
     from core.db_manager import db
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+try:
+    from core.plan_worker import BackgroundRunner
+except ImportError:
+    BackgroundRunner = None
+
 # View importlari
 try:
     from views.orders_view import OrdersView
@@ -75,53 +88,31 @@ except:
 # =============================================================================
 # EXCEL TEMASI
 # =============================================================================
-class Colors:
-    BG = "#FFFFFF"
-    HEADER_BG = "#F3F3F3"
-    BORDER = "#D4D4D4"
-    GRID = "#E0E0E0"
-    TEXT = "#1A1A1A"
-    TEXT_SECONDARY = "#666666"
-    TEXT_MUTED = "#999999"
-    SELECTION = "#B4D7FF"
-    ACCENT = "#217346"
-    ROW_ALT = "#F9F9F9"
-    
+class Colors(ExcelColors):
+    """Excel paleti (kart/cubuk stilleri ui/styles.qss'te) + sidebar renkleri"""
     SIDEBAR_BG = "#1E3A2F"
     SIDEBAR_TEXT = "#FFFFFF"
     SIDEBAR_HOVER = "#2D5A47"
     SIDEBAR_ACTIVE = "#217346"
-    
-    CRITICAL = "#C00000"
-    CRITICAL_BG = "#FDE8E8"
-    WARNING = "#C65911"
-    WARNING_BG = "#FFF3E0"
-    SUCCESS = "#107C41"
-    SUCCESS_BG = "#E6F4EA"
-    INFO = "#0066CC"
-    INFO_BG = "#E3F2FD"
 
 
 # =============================================================================
 # METRIK KARTI
 # =============================================================================
-class MetricCard(QFrame):
-    """Buyuk metrik karti"""
+class MetricCard(Recyclable, QFrame):
+    """
+    Buyuk metrik karti (deger yerinde guncellenir).
+    Stil uygulama stilinden gelir (QFrame#MetricCard, QLabel#MetricValue[tone=...]).
+    tone: text / secondary / muted / info / success / warning / critical
+    """
     
-    def __init__(self, title, value, subtitle="", color=Colors.TEXT, icon=""):
+    def __init__(self, title, value, subtitle="", tone="text", icon=""):
         super().__init__()
-        self.color = color
+        self.tone = tone
+        self.setObjectName("MetricCard")
         self.setup_ui(title, value, subtitle, icon)
     
     def setup_ui(self, title, value, subtitle, icon):
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {Colors.BG};
-                border: 1px solid {Colors.BORDER};
-                border-radius: 6px;
-            }}
-        """)
-        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 14, 16, 14)
         layout.setSpacing(4)
@@ -130,46 +121,48 @@ class MetricCard(QFrame):
         header = QHBoxLayout()
         
         lbl_title = QLabel(title)
-        lbl_title.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_MUTED}; font-weight: 500;")
+        lbl_title.setObjectName("MetricTitle")
         header.addWidget(lbl_title)
         
         header.addStretch()
         
         if icon:
             lbl_icon = QLabel(icon)
-            lbl_icon.setStyleSheet(f"font-size: 14px;")
+            lbl_icon.setObjectName("MetricIcon")
             header.addWidget(lbl_icon)
         
         layout.addLayout(header)
         
         # Deger
         self.lbl_value = QLabel(str(value))
-        self.lbl_value.setStyleSheet(f"""
-            font-size: 28px;
-            font-weight: bold;
-            color: {self.color};
-        """)
+        self.lbl_value.setObjectName("MetricValue")
+        self.lbl_value.setProperty("tone", self.tone)
         layout.addWidget(self.lbl_value)
         
         # Alt yazi
         if subtitle:
             self.lbl_subtitle = QLabel(subtitle)
-            self.lbl_subtitle.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_SECONDARY};")
+            self.lbl_subtitle.setObjectName("MetricSubtitle")
             layout.addWidget(self.lbl_subtitle)
         else:
             self.lbl_subtitle = None
     
+    def apply_value(self, value):
+        self.lbl_value.setText(value)
+    
     def set_value(self, value, subtitle=None):
-        self.lbl_value.setText(str(value))
+        self.update_value(str(value))
         if subtitle and self.lbl_subtitle:
-            self.lbl_subtitle.setText(subtitle)
+            set_label_text(self.lbl_subtitle, subtitle)
 
 
 # =============================================================================
 # UYARI KARTI
 # =============================================================================
-class AlertCard(QFrame):
-    """Kritik uyari karti"""
+class AlertCard(Recyclable, QFrame):
+    """Kritik uyari karti (satirlar yeniden kullanilir)"""
+    
+    MAX_ITEMS = 5
     
     def __init__(self, alert_type="warning"):
         super().__init__()
@@ -232,46 +225,46 @@ class AlertCard(QFrame):
         
         layout.addLayout(header)
         
-        # Liste alani
+        # Liste alani (satir havuzu: konum -> etiket, "more" -> kalan sayisi)
         self.list_layout = QVBoxLayout()
         self.list_layout.setSpacing(4)
         layout.addLayout(self.list_layout)
+        self.rows = KeyedWidgetPool(self.list_layout, self._create_row)
+    
+    def _create_row(self, key):
+        if key == "more":
+            return RecyclableLabel(f"font-size: 10px; color: {Colors.TEXT_MUTED}; padding-left: 4px;")
+        return RecyclableLabel(f"font-size: 11px; color: {Colors.TEXT}; padding-left: 4px;", word_wrap=True)
     
     def set_items(self, items):
-        """Listeyi guncelle"""
+        """Listeyi guncelle (ayni liste icin hicbir sey yapilmaz)"""
         self.items = items
+        self.update_value(tuple(items))
+    
+    def apply_value(self, items):
         self.lbl_count.setText(str(len(items)))
-        
-        # Mevcut itemlari temizle
-        while self.list_layout.count():
-            item = self.list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Yeni itemlari ekle (max 5)
-        for item in items[:5]:
-            row = QLabel(f"• {item}")
-            row.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT}; padding-left: 4px;")
-            row.setWordWrap(True)
-            self.list_layout.addWidget(row)
-        
-        if len(items) > 5:
-            more = QLabel(f"... ve {len(items) - 5} siparis daha")
-            more.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_MUTED}; padding-left: 4px;")
-            self.list_layout.addWidget(more)
+        rows = [(i, f"• {item}") for i, item in enumerate(items[:self.MAX_ITEMS])]
+        if len(items) > self.MAX_ITEMS:
+            rows.append(("more", f"... ve {len(items) - self.MAX_ITEMS} siparis daha"))
+        self.rows.sync(rows)
 
 
 # =============================================================================
 # KAPASITE CUBUGU
 # =============================================================================
-class CapacityBar(QFrame):
-    """Istasyon kapasite cubugu"""
+class CapacityBar(Recyclable, QFrame):
+    """
+    Istasyon kapasite cubugu (deger: (yuzde, durum), yerinde guncellenir).
+    Renk, uygulama stilindeki [level="normal|busy|critical"] kurallarindan gelir.
+    """
     
-    def __init__(self, name, percent, status="Normal"):
+    def __init__(self, name, percent=0, status="Normal"):
         super().__init__()
-        self.setup_ui(name, percent, status)
+        self.setObjectName("CapacityBar")
+        self.setup_ui(name)
+        self.update_value((percent, status))
     
-    def setup_ui(self, name, percent, status):
+    def setup_ui(self, name):
         self.setFixedHeight(32)
         
         layout = QHBoxLayout(self)
@@ -280,55 +273,74 @@ class CapacityBar(QFrame):
         
         # Istasyon adi
         lbl_name = QLabel(name)
+        lbl_name.setObjectName("CapacityName")
         lbl_name.setFixedWidth(100)
-        lbl_name.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {Colors.TEXT};")
         layout.addWidget(lbl_name)
         
         # Progress bar
-        bar = QProgressBar()
-        bar.setFixedHeight(8)
-        bar.setValue(min(percent, 100))
-        bar.setTextVisible(False)
-        
-        if status == "Kritik" or percent > 90:
-            bar_color = Colors.CRITICAL
-        elif status == "Yogun" or percent > 70:
-            bar_color = Colors.WARNING
-        else:
-            bar_color = Colors.SUCCESS
-        
-        bar.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: {Colors.GRID};
-                border: none;
-                border-radius: 4px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {bar_color};
-                border-radius: 4px;
-            }}
-        """)
-        layout.addWidget(bar, 1)
+        self.bar = QProgressBar()
+        self.bar.setObjectName("CapacityGauge")
+        self.bar.setFixedHeight(8)
+        self.bar.setTextVisible(False)
+        layout.addWidget(self.bar, 1)
         
         # Yuzde
-        lbl_pct = QLabel(f"%{percent}")
-        lbl_pct.setFixedWidth(45)
-        lbl_pct.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        lbl_pct.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {bar_color};")
-        layout.addWidget(lbl_pct)
+        self.lbl_pct = QLabel()
+        self.lbl_pct.setObjectName("CapacityPercent")
+        self.lbl_pct.setFixedWidth(45)
+        self.lbl_pct.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        layout.addWidget(self.lbl_pct)
         
         # Durum
-        lbl_status = QLabel(status)
-        lbl_status.setFixedWidth(50)
-        lbl_status.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_MUTED};")
-        layout.addWidget(lbl_status)
+        self.lbl_status = QLabel()
+        self.lbl_status.setObjectName("CapacityStatus")
+        self.lbl_status.setFixedWidth(50)
+        layout.addWidget(self.lbl_status)
+    
+    def apply_value(self, value):
+        percent, status = value
+        if status == "Kritik" or percent > 90:
+            level = "critical"
+        elif status == "Yogun" or percent > 70:
+            level = "busy"
+        else:
+            level = "normal"
+        
+        self.bar.setValue(min(percent, 100))
+        # Stil yalnizca seviye degisince yeniden uygulanir
+        Theme.set_state(self.bar, "level", level)
+        Theme.set_state(self.lbl_pct, "level", level)
+        set_label_text(self.lbl_pct, f"%{percent}")
+        set_label_text(self.lbl_status, status)
 
 
 # =============================================================================
 # MINI TABLO
 # =============================================================================
-class MiniTable(QFrame):
-    """Kucuk veri tablosu"""
+class MiniTableRow(Recyclable, QWidget):
+    """Mini tablo satiri (deger: hucre metinleri)"""
+    
+    def __init__(self, columns):
+        super().__init__()
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+        self.cells = []
+        for _ in range(columns):
+            lbl = QLabel()
+            lbl.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT};")
+            layout.addWidget(lbl, 1)
+            self.cells.append(lbl)
+    
+    def apply_value(self, value):
+        for lbl, cell in zip(self.cells, value):
+            set_label_text(lbl, str(cell))
+
+
+class MiniTable(Recyclable, QFrame):
+    """Kucuk veri tablosu (satirlar yeniden kullanilir)"""
+    
+    MAX_ROWS = 8
     
     def __init__(self, title, headers):
         super().__init__()
@@ -368,33 +380,18 @@ class MiniTable(QFrame):
         sep.setStyleSheet(f"background-color: {Colors.BORDER};")
         layout.addWidget(sep)
         
-        # Veri alani
+        # Veri alani (satir havuzu: konum -> satir)
         self.data_layout = QVBoxLayout()
         self.data_layout.setSpacing(6)
         layout.addLayout(self.data_layout)
+        self.rows = KeyedWidgetPool(self.data_layout, lambda key: MiniTableRow(len(self.headers)))
     
     def set_data(self, rows):
-        """Veriyi guncelle"""
-        while self.data_layout.count():
-            item = self.data_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.layout():
-                while item.layout().count():
-                    sub = item.layout().takeAt(0)
-                    if sub.widget():
-                        sub.widget().deleteLater()
-        
-        for row_data in rows[:8]:  # Max 8 satir
-            row_layout = QHBoxLayout()
-            row_layout.setSpacing(8)
-            
-            for i, cell in enumerate(row_data):
-                lbl = QLabel(str(cell))
-                lbl.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT};")
-                row_layout.addWidget(lbl, 1)
-            
-            self.data_layout.addLayout(row_layout)
+        """Veriyi guncelle (ayni veri icin hicbir sey yapilmaz)"""
+        self.update_value(tuple(tuple(str(cell) for cell in row) for row in rows[:self.MAX_ROWS]))
+    
+    def apply_value(self, rows):
+        self.rows.sync(enumerate(rows))
 
 
 # =============================================================================
@@ -406,15 +403,25 @@ class DashboardView(QWidget):
     def __init__(self, user_data):
         super().__init__()
         self.user = user_data
+        self._snapshot = {}     # Son uygulanan ozet (yalnizca degisen bolumler yeniden cizilir)
+        
+        # Ozet arka planda hesaplanir (en son istek kazanir)
+        self.snapshot_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.snapshot_runner:
+            self.snapshot_runner.result_ready.connect(self.apply_snapshot)
+            self.snapshot_runner.failed.connect(lambda msg: print(f"Dashboard guncelleme hatasi: {msg}"))
+        
         self.setup_ui()
         
-        # Canli yenileme (5 saniye)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_dashboard)
-        self.timer.start(5000)
+        # Canli yenileme (merkezi koordinator; sayfa gizliyken olaylar bekler)
+        if refresh_coordinator:
+            refresh_coordinator.subscribe(("orders", "progress", "capacities", "day"),
+                                          lambda event: self.update_dashboard(), owner=self.dashboard_page)
     
     def setup_ui(self):
-        self.setStyleSheet(f"background-color: {Colors.HEADER_BG};")
+        # Arka plan uygulama stilinde (QWidget#DashboardView); burada secicisiz
+        # stil kart kurallarini ezerdi (ata stili uygulama stilinden once gelir)
+        self.setObjectName("DashboardView")
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -426,7 +433,6 @@ class DashboardView(QWidget):
         
         # === ICERIK ALANI ===
         content = QWidget()
-        content.setStyleSheet(f"background-color: {Colors.HEADER_BG};")
         
         self.content_layout = QVBoxLayout(content)
         self.content_layout.setContentsMargins(0, 0, 0, 0)
@@ -518,7 +524,7 @@ class DashboardView(QWidget):
                     font-weight: bold;
                 }}
             """)
-            btn.clicked.connect(lambda checked, i=idx: self.stack.setCurrentIndex(i))
+            btn.clicked.connect(lambda checked, i=idx: self.show_page(i))
             self.menu_group.addButton(btn, idx)
             layout.addWidget(btn)
         
@@ -548,65 +554,50 @@ class DashboardView(QWidget):
         return sidebar
     
     def _load_pages(self):
-        """Sayfalari yukle"""
+        """
+        Sayfalari kaydet. Genel Bakis hemen kurulur; diger sayfalar ilk
+        acildiklarinda olusturulur (girisde on ekranin DB sorgulari calismaz).
+        """
         # 0. Dashboard
         self.dashboard_page = QWidget()
         self._setup_dashboard_page()
         self.stack.addWidget(self.dashboard_page)
         
-        # 1. Siparisler
-        if OrdersView:
-            self.stack.addWidget(OrdersView())
-        else:
-            self.stack.addWidget(self._placeholder("Siparisler"))
-        
-        # 2. Uretim Takip
-        if ProductionView:
-            self.stack.addWidget(ProductionView())
-        else:
-            self.stack.addWidget(self._placeholder("Uretim Takip"))
-        
-        # 3. Planlama
-        if PlanningView:
-            self.stack.addWidget(PlanningView())
-        else:
-            self.stack.addWidget(self._placeholder("Is Yuku"))
-        
-        # 4. Stok
-        if StockView:
-            self.stack.addWidget(StockView())
-        else:
-            self.stack.addWidget(self._placeholder("Stok"))
-        
-        # 5. Sevkiyat
-        if ShippingView:
-            self.stack.addWidget(ShippingView())
-        else:
-            self.stack.addWidget(self._placeholder("Sevkiyat"))
-        
-        # 6. Raporlar
-        if ReportView:
-            self.stack.addWidget(ReportView())
-        else:
-            self.stack.addWidget(self._placeholder("Raporlama"))
-        
-        # 7. Loglar
-        if LogsView:
-            self.stack.addWidget(LogsView())
-        else:
-            self.stack.addWidget(self._placeholder("Islem Gecmisi"))
-        
-        # 8. Ayarlar
-        if SettingsView:
-            self.stack.addWidget(SettingsView())
-        else:
-            self.stack.addWidget(self._placeholder("Ayarlar"))
-        
-        # 9. Karar Destek
-        if DecisionView:
-            self.stack.addWidget(DecisionView())
-        else:
-            self.stack.addWidget(self._placeholder("Karar Destek"))
+        # 1..9: indeks -> (sinif, yuklenemezse gosterilecek ad)
+        self._page_factories = {
+            1: (OrdersView, "Siparisler"),
+            2: (ProductionView, "Uretim Takip"),
+            3: (PlanningView, "Is Yuku"),
+            4: (StockView, "Stok"),
+            5: (ShippingView, "Sevkiyat"),
+            6: (ReportView, "Raporlama"),
+            7: (LogsView, "Islem Gecmisi"),
+            8: (SettingsView, "Ayarlar"),
+            9: (DecisionView, "Karar Destek"),
+        }
+        self._page_hosts = {}
+        for idx in sorted(self._page_factories):
+            host = QWidget()
+            host_layout = QVBoxLayout(host)
+            host_layout.setContentsMargins(0, 0, 0, 0)
+            self._page_hosts[idx] = host
+            self.stack.addWidget(host)
+    
+    def _build_page(self, idx):
+        """Sayfayi ilk acilista olustur"""
+        cls, name = self._page_factories.pop(idx)
+        try:
+            page = cls() if cls else self._placeholder(name)
+        except Exception as e:
+            print(f"{name} sayfasi olusturulamadi: {e}")
+            page = self._placeholder(name)
+        self._page_hosts[idx].layout().addWidget(page)
+    
+    def show_page(self, idx):
+        """Sayfaya gec: ilk acilista olustur (gizli sayfalara yenileme olaylari koordinatorde birikir)"""
+        if idx in self._page_factories:
+            self._build_page(idx)
+        self.stack.setCurrentIndex(idx)
     
     def _placeholder(self, name):
         """Placeholder sayfa"""
@@ -626,10 +617,8 @@ class DashboardView(QWidget):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet(f"background-color: {Colors.HEADER_BG};")
         
         content = QWidget()
-        content.setStyleSheet(f"background-color: {Colors.HEADER_BG};")
         layout = QVBoxLayout(content)
         layout.setContentsMargins(24, 20, 24, 20)
         layout.setSpacing(20)
@@ -691,10 +680,10 @@ class DashboardView(QWidget):
         metrics_layout = QHBoxLayout()
         metrics_layout.setSpacing(16)
         
-        self.metric_active = MetricCard("Aktif Siparisler", "0", "Beklemede + Uretimde", Colors.INFO, "📦")
-        self.metric_today_done = MetricCard("Bugun Tamamlanan", "0", "Adet", Colors.SUCCESS, "✓")
-        self.metric_urgent = MetricCard("Acil / Kritik", "0", "Oncelikli isler", Colors.WARNING, "⚡")
-        self.metric_fire = MetricCard("Fire / Hata", "0", "Toplam", Colors.CRITICAL, "🔥")
+        self.metric_active = MetricCard("Aktif Siparisler", "0", "Beklemede + Uretimde", "info", "📦")
+        self.metric_today_done = MetricCard("Bugun Tamamlanan", "0", "Adet", "success", "✓")
+        self.metric_urgent = MetricCard("Acil / Kritik", "0", "Oncelikli isler", "warning", "⚡")
+        self.metric_fire = MetricCard("Fire / Hata", "0", "Toplam", "critical", "🔥")
         
         metrics_layout.addWidget(self.metric_active, 1)
         metrics_layout.addWidget(self.metric_today_done, 1)
@@ -707,10 +696,10 @@ class DashboardView(QWidget):
         metrics2_layout = QHBoxLayout()
         metrics2_layout.setSpacing(16)
         
-        self.metric_waiting = MetricCard("Beklemede", "0", "Uretim bekleniyor", Colors.TEXT_SECONDARY, "⏳")
-        self.metric_production = MetricCard("Uretimde", "0", "Aktif uretim", Colors.INFO, "🔧")
-        self.metric_completed = MetricCard("Tamamlandi", "0", "Sevke hazir", Colors.SUCCESS, "📋")
-        self.metric_shipped = MetricCard("Sevk Edildi", "0", "Bu ay", Colors.TEXT_MUTED, "🚚")
+        self.metric_waiting = MetricCard("Beklemede", "0", "Uretim bekleniyor", "secondary", "⏳")
+        self.metric_production = MetricCard("Uretimde", "0", "Aktif uretim", "info", "🔧")
+        self.metric_completed = MetricCard("Tamamlandi", "0", "Sevke hazir", "success", "📋")
+        self.metric_shipped = MetricCard("Sevk Edildi", "0", "Bu ay", "muted", "🚚")
         
         metrics2_layout.addWidget(self.metric_waiting, 1)
         metrics2_layout.addWidget(self.metric_production, 1)
@@ -725,13 +714,7 @@ class DashboardView(QWidget):
         
         # Sol: Darbogaz analizi
         bottleneck_frame = QFrame()
-        bottleneck_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {Colors.BG};
-                border: 1px solid {Colors.BORDER};
-                border-radius: 6px;
-            }}
-        """)
+        bottleneck_frame.setObjectName("CapacityPanel")
         bottleneck_layout = QVBoxLayout(bottleneck_frame)
         bottleneck_layout.setContentsMargins(16, 14, 16, 14)
         bottleneck_layout.setSpacing(12)
@@ -761,6 +744,7 @@ class DashboardView(QWidget):
         self.capacity_layout = QVBoxLayout()
         self.capacity_layout.setSpacing(8)
         bottleneck_layout.addLayout(self.capacity_layout)
+        self.capacity_bars = KeyedWidgetPool(self.capacity_layout, CapacityBar)
         
         bottom_layout.addWidget(bottleneck_frame, 2)
         
@@ -792,96 +776,66 @@ class DashboardView(QWidget):
         self.update_dashboard()
     
     def update_dashboard(self):
-        """Dashboard verilerini guncelle"""
+        """Dashboard verilerini guncelle (ozet sorgusu arka planda)"""
         if not db:
             return
         
+        if self.snapshot_runner:
+            self.snapshot_runner.submit(lambda cancel_check: db.get_dashboard_snapshot())
+        else:
+            try:
+                self.apply_snapshot(db.get_dashboard_snapshot())
+            except Exception as e:
+                print(f"Dashboard guncelleme hatasi: {e}")
+    
+    def apply_snapshot(self, snapshot):
+        """Ozeti widget'lara uygula; onceki ozetle ayni olan bolumlere dokunma"""
         try:
             self.lbl_time.setText(datetime.now().strftime("Son guncelleme: %H:%M:%S"))
+            previous = self._snapshot
+            self._snapshot = snapshot
             
-            # === TEMEL ISTATISTIKLER ===
-            stats = db.get_dashboard_stats()
-            self.metric_active.set_value(stats.get('active', 0))
-            self.metric_urgent.set_value(stats.get('urgent', 0))
-            self.metric_fire.set_value(stats.get('fire', 0))
-            
-            # === DETAYLI DURUM SAYILARI ===
-            all_orders = db.get_all_orders()
-            
-            beklemede = sum(1 for o in all_orders if o.get('status') == 'Beklemede')
-            uretimde = sum(1 for o in all_orders if o.get('status') == 'Üretimde')
-            tamamlandi = sum(1 for o in all_orders if o.get('status') == 'Tamamlandı')
-            sevk_edildi = sum(1 for o in all_orders if o.get('status') == 'Sevk Edildi')
-            
-            self.metric_waiting.set_value(beklemede)
-            self.metric_production.set_value(uretimde)
-            self.metric_completed.set_value(tamamlandi)
-            self.metric_shipped.set_value(sevk_edildi)
-            self.metric_today_done.set_value(tamamlandi)  # Simdilik toplam
-            
-            # === GECIKEN SIPARISLER ===
-            today = datetime.now().date()
-            overdue = []
-            today_delivery = []
+            def changed(*keys):
+                return any(snapshot.get(k) != previous.get(k) for k in keys)
             
-            for o in all_orders:
-                if o.get('status') in ['Sevk Edildi', 'Tamamlandı']:
-                    continue
-                
-                delivery = o.get('delivery_date')
-                if delivery:
-                    try:
-                        if isinstance(delivery, str):
-                            d_date = datetime.strptime(delivery, '%Y-%m-%d').date()
-                        else:
-                            d_date = delivery
-                        
-                        if d_date < today:
-                            days_late = (today - d_date).days
-                            overdue.append(f"{o['order_code']} - {o['customer_name']} ({days_late} gun gecikti)")
-                        elif d_date == today:
-                            today_delivery.append(f"{o['order_code']} - {o['customer_name']}")
-                    except:
-                        pass
+            # === TEMEL ISTATISTIKLER ===
+            metrics = [
+                ('active', self.metric_active), ('urgent', self.metric_urgent), ('fire', self.metric_fire),
+                ('waiting', self.metric_waiting), ('production', self.metric_production),
+                ('completed', self.metric_completed), ('shipped', self.metric_shipped),
+                ('completed', self.metric_today_done),  # Simdilik toplam
+            ]
+            for key, card in metrics:
+                if changed(key):
+                    card.set_value(snapshot.get(key, 0))
             
-            self.alert_overdue.set_items(overdue)
-            self.alert_today.set_items(today_delivery)
+            # === GECIKEN / BUGUN TESLIM ===
+            if changed('overdue'):
+                self.alert_overdue.set_items(snapshot['overdue'])
+            if changed('today'):
+                self.alert_today.set_items(snapshot['today'])
             
             # === KAPASITE CUBUKLARI ===
-            while self.capacity_layout.count():
-                item = self.capacity_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
-            
-            station_loads = db.get_station_loads()
-            for station in station_loads:
-                bar = CapacityBar(station['name'], station['percent'], station['status'])
-                self.capacity_layout.addWidget(bar)
+            if changed('station_loads'):
+                # Istasyon adina gore yerinde guncelle (yalnizca degisen cubuk yeniden cizilir)
+                self.capacity_bars.sync((station['name'], (station['percent'], station['status']))
+                                        for station in snapshot['station_loads'])
             
             # === MUSTERI TABLOSU ===
-            customer_stats = {}
-            for o in all_orders:
-                if o.get('status') == 'Sevk Edildi':
-                    continue
-                cust = o.get('customer_name', 'Bilinmiyor')
-                m2 = o.get('declared_total_m2', 0) or 0
-                if cust not in customer_stats:
-                    customer_stats[cust] = {'count': 0, 'm2': 0}
-                customer_stats[cust]['count'] += 1
-                customer_stats[cust]['m2'] += m2
-            
-            sorted_customers = sorted(customer_stats.items(), key=lambda x: x[1]['count'], reverse=True)
-            customer_rows = [(c, str(v['count']), f"{v['m2']:.0f}") for c, v in sorted_customers[:5]]
-            self.table_customers.set_data(customer_rows)
+            if changed('customers'):
+                customer_rows = [(c if c is not None else 'Bilinmiyor', str(count), f"{m2:.0f}")
+                                 for c, count, m2 in snapshot['customers']]
+                self.table_customers.set_data(customer_rows)
             
             # === GUNLUK OZET ===
             # Simdilik statik veri
-            daily_rows = [
-                ("Bugun", str(tamamlandi), str(stats.get('fire', 0))),
-                ("Dun", "-", "-"),
-                ("2 gun once", "-", "-"),
-            ]
-            self.table_daily.set_data(daily_rows)
+            if changed('completed', 'fire'):
+                daily_rows = [
+                    ("Bugun", str(snapshot.get('completed', 0)), str(snapshot.get('fire', 0))),
+                    ("Dun", "-", "-"),
+                    ("2 gun once", "-", "-"),
+                ]
+                self.table_daily.set_data(daily_rows)
             
         except Exception as e:
             print(f"Dashboard guncelleme hatasi: {e}")
@@ -897,6 +851,7 @@ if __name__ == "__main__":
     
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    Theme.apply_app_style(app)
     app.setFont(QFont("Segoe UI", 9))
     
     window = DashboardView({"full_name": "Test Admin", "role": "admin"})
@@ -13,12 +13,13 @@ Ozellikler:
 import sys
 from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QTableWidget, QTableWidgetItem,
     QHeaderView, QMessageBox, QAbstractItemView,
     QFileDialog, QFrame, QApplication, QScrollArea,
-    QProgressBar, QToolTip
+    QProgressBar, QToolTip, QDialog, QMenu, QInputDialog
 )
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor, QFont, QCursor
@@ -28,6 +29,39 @@ try:
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+from core.queue_index import StationQueueIndex, QUEUE_POSITION_UNSET, plan_queue_keys
+from core.view_models import DecisionViewModel
+
+try:
+    from core.temper_batching import TemperBatcher, BatchItem, glass_type_of
+except ImportError:
+    TemperBatcher = None
+    BatchItem = None
+    glass_type_of = None
+
+try:
+    from core.plan_store import plan_store
+except ImportError:
+    plan_store = None
+
+try:
+    from core.smart_planner import SmartPlanner
+    from core.plan_worker import BackgroundRunner
+except ImportError:
+    SmartPlanner = None
+    BackgroundRunner = None
+
+try:
+    from core.scenario import PlanningSnapshot, ScenarioConflict
+except ImportError:
+    PlanningSnapshot = None
+    ScenarioConflict = None
+
 
 # =============================================================================
 # TEMA RENKLERI (Excel Tarzi)
@@ -60,6 +94,12 @@ class Colors:
     OVERLOAD = "#F44336"   # Asiri yuk
 
 
+@lru_cache(maxsize=4096)
+def _parse_day(value):
+    """'YYYY-MM-DD' -> datetime (teslim tarihleri cok tekrar eder, onbellekli)"""
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
 # =============================================================================
 # FABRIKA YAPISI VE KURALLARI
 # =============================================================================
@@ -131,54 +171,74 @@ class FactoryConfig:
 # ISTASYON KUYRUK YONETICISI
 # =============================================================================
 class StationQueueManager:
-    """Her istasyon icin kuyruk yonetimi"""
+    """Her istasyon icin kuyruk yonetimi (artimli indeks uzerinde)"""
     
     def __init__(self):
         self.capacities = FactoryConfig.DEFAULT_CAPACITIES.copy()
-        self.queues = defaultdict(list)  # station -> [orders]
-        self.loads = defaultdict(float)   # station -> total m2
+        # Veri kaynagi: canli veritabani ya da what-if sandbox'i (DecisionView.set_source)
+        self.source = db
         
         if db:
             try:
                 self.capacities = db.get_all_capacities()
             except:
                 pass
-    
-    def build_queues(self, orders):
-        """Siparislerden istasyon kuyruklarini olustur"""
-        self.queues = defaultdict(list)
-        self.loads = defaultdict(float)
         
+        # Kalici kuyruk indeksi: her analizde sadece degisen siparisler islenir
+        self.index = StationQueueIndex(self.capacities)
+    
+    def set_source(self, source):
+        """Veri kaynagini degistir; kapasiteler kaynaktan (sandbox farklariyla) okunur"""
+        self.source = source
+        try:
+            self.capacities = source.get_all_capacities() or FactoryConfig.DEFAULT_CAPACITIES.copy()
+        except:
+            self.capacities = FactoryConfig.DEFAULT_CAPACITIES.copy()
+        self.index.set_capacities(self.capacities)
+    
+    @property
+    def loads(self):
+        """station -> bekleyen toplam m2"""
+        return self.index.loads
+    
+    @property
+    def queues(self):
+        """station -> [orders] (sirali)"""
+        return {station: self.index.queue(station) for station in self.index.loads}
+    
+    def build_queues(self, orders, progress=None):
+        """Siparislerden istasyon kuyruklarini guncelle (ilerleme verilmezse tek sorgu)"""
+        if progress is None and self.source:
+            try:
+                progress = self.source.get_station_progress_map([o['id'] for o in orders if o.get('id') is not None])
+            except:
+                pass
+        self.index.sync(orders, progress or {})
+    
+    def add_order(self, order, done=None):
+        """Yeni siparis kuyruklara eklendi"""
+        self.index.add_order(order, done)
+    
+    def advance_order(self, order_id, station):
+        """Siparis bir istasyonu bitirdi"""
+        self.index.advance(order_id, station)
+    
+    def remove_order(self, order_id):
+        """Siparis sevk edildi / kuyruktan cikti"""
+        self.index.remove_order(order_id)
+    
+    def apply_changes(self, orders, progress, removed_ids=()):
+        """Degisiklik akisindan gelen siparisleri uygula (tum liste yeniden kurulmaz)"""
         for order in orders:
-            route = order.get('route', '')
-            m2 = order.get('declared_total_m2', 0)
-            
-            if not route:
-                continue
-            
-            # Tamamlanmis istasyonlari al
-            completed = []
-            if db:
-                try:
-                    completed = db.get_completed_stations_list(order['id'])
-                except:
-                    pass
-            
-            # Rotadaki her istasyon icin
-            for station in route.split(','):
-                station = station.strip()
-                if station and station not in completed:
-                    self.queues[station].append(order)
-                    self.loads[station] += m2
+            self.index.add_order(order, progress.get(order['id'], {}))
+        for order_id in removed_ids:
+            self.index.remove_order(order_id)
     
     def get_station_status(self, station_name):
         """Istasyon durumunu dondur"""
-        cap = self.capacities.get(station_name, 500)
-        load = self.loads.get(station_name, 0)
-        queue_count = len(self.queues.get(station_name, []))
-        
-        if cap <= 0:
-            cap = 500
+        cap = self.index.capacity(station_name)
+        load = self.index.load(station_name)
+        queue_count = self.index.count(station_name)
         
         ratio = load / cap
         queue_days = ratio
@@ -216,23 +276,13 @@ class StationQueueManager:
     
     def get_idle_stations(self):
         """Bos istasyonlari dondur"""
-        idle = []
-        for station in FactoryConfig.STATION_ORDER:
-            if station == "SEVKIYAT":
-                continue
-            status = self.get_station_status(station)
-            if status['status'] == 'idle':
-                idle.append(station)
-        return idle
+        return [station for station in FactoryConfig.STATION_ORDER
+                if station != "SEVKIYAT" and self.index.is_idle(station)]
     
     def get_bottlenecks(self):
-        """Darbogaz istasyonlari dondur"""
-        bottlenecks = []
-        for station in FactoryConfig.STATION_ORDER:
-            status = self.get_station_status(station)
-            if status['ratio'] > 2:  # 2 gunluk kuyruktan fazla
-                bottlenecks.append(status)
-        return sorted(bottlenecks, key=lambda x: x['ratio'], reverse=True)
+        """Darbogaz istasyonlari dondur (2 gunluk kuyruktan fazla)"""
+        return [self.get_station_status(station) for station in self.index.bottlenecks()
+                if station in FactoryConfig.STATION_ORDER]
 
 
 # =============================================================================
@@ -245,59 +295,159 @@ class CriticalRatioCalculator:
     CR < 1.0: Gecikme riski (oncelikli)
     CR = 1.0: Tam zamaninda
     CR > 1.0: Guvenli
+    
+    Tum siparislerin kalan suresi, CR'i ve tahmini bitisi kuyruk indeksi
+    uzerinden tek geciste hesaplanir ve veri surumu + gun + indeks revizyonu
+    anahtariyla saklanir. Siralama, tablo, yan panel ve disa aktarma ayni
+    ozeti okur; DB'ye siparis basina sorgu atilmaz.
     """
     
     def __init__(self, queue_manager):
         self.queue_manager = queue_manager
+        self.plan_finish_dates = {}  # Kayitli plandan: order_code -> bitis tarihi
+        self.plan_machines = {}      # Kayitli plandan: order_code -> makineler (baslangic sirasiyla)
+        self._plan_revision = 0
+        self._snapshot = {}          # order_id -> {'remaining', 'cr', 'status', 'est_date', 'est_days', 'station'}
+        self._snapshot_key = None
+        self.generation = 0          # tam yeniden kurulum sayaci
+        self._updated_ids = set()    # artimli guncellenen siparisler (take_updates ile okunur)
     
-    def calculate_remaining_time(self, order):
-        """Kalan islem suresini gun olarak hesapla"""
-        route = order.get('route', '')
-        m2 = order.get('declared_total_m2', 0)
-        
-        if not route or m2 <= 0:
-            return 0
-        
-        # Tamamlanmis istasyonlar
-        completed = []
-        if db:
+    def load_plan_finish_dates(self):
+        """Kayitli plan guncelse bitis tarihlerini ve makine atamalarini al (hesaplama yapmaz)"""
+        self.set_plan(plan_store.get_fresh_plan() if plan_store else None)
+    
+    def set_plan(self, plan):
+        """Onceden okunmus plani uygula (ViewModel worker'da okur)"""
+        self.plan_finish_dates = plan.order_finish_dates if plan else {}
+        self.plan_machines = plan.details.order_machines() if plan else {}
+        self._plan_revision += 1
+
+    def planned_machine(self, order, station):
+        """Planlayicinin bu adim icin sectigi makine (istasyon veya alternatifi), plan yoksa None"""
+        machines = self.plan_machines.get(order.get('order_code'))
+        if not machines or not station:
+            return None
+        pool = {station, *FactoryConfig.get_alternatives(station)}
+        return next((m for m in machines if m in pool), None)
+    
+    # -------------------------------------------------------------------------
+    # OZET (SNAPSHOT)
+    # -------------------------------------------------------------------------
+    def _snapshot_key_now(self):
+        version = 0
+        source = self.queue_manager.source
+        if source:
             try:
-                completed = db.get_completed_stations_list(order['id'])
+                version = source.get_data_version()
             except:
                 pass
+        return (version, datetime.now().date(), self.queue_manager.index.revision, self._plan_revision)
+    
+    def _station_constants(self):
+        """Istasyon basina sabitler: bekleme (yuk / kapasite) ve 1 / kapasite"""
+        index = self.queue_manager.index
+        station_wait = {}
+        station_inv = {}
+        for station in index.loads:
+            cap = index.capacity(station)
+            station_wait[station] = index.load(station) / cap
+            station_inv[station] = 1.0 / cap
+        return station_wait, station_inv
+    
+    def _snapshot_entry(self, order, pending, station_wait, station_inv, now):
+        m2 = order.get('declared_total_m2', 0) or 0
         
-        total_days = 0
-        capacities = self.queue_manager.capacities
+        remaining = 0
+        if order.get('route') and m2 > 0:
+            remaining = sum(station_wait.get(st, 0) for st in pending) + \
+                m2 * sum(station_inv.get(st, 0) for st in pending)
+            remaining = max(remaining, 0.1)
         
-        for station in route.split(','):
-            station = station.strip()
-            if station and station not in completed:
-                cap = capacities.get(station, 500)
-                if cap > 0:
-                    # Kuyruk bekleme suresi + islem suresi
-                    queue_load = self.queue_manager.loads.get(station, 0)
-                    queue_wait = queue_load / cap
-                    process_time = m2 / cap
-                    total_days += queue_wait + process_time
+        cr, status = self._ratio(order, remaining, now)
         
-        return max(total_days, 0.1)  # Minimum 0.1 gun
+        planned = self.plan_finish_dates.get(order.get('order_code'))
+        if planned:
+            est_date = planned
+            est_days = max((planned - now).total_seconds() / 86400.0, 0)
+        else:
+            est_date = now + timedelta(days=remaining)
+            est_days = remaining
+        
+        return {
+            'remaining': remaining, 'cr': cr, 'status': status,
+            'est_date': est_date, 'est_days': est_days,
+            'station': pending[0] if pending else None,
+        }
     
-    def calculate_cr(self, order):
-        """Critical Ratio hesapla"""
+    def ensure_snapshot(self, changed_ids=None):
+        """
+        Ozet guncel degilse yeniden hesapla.
+        changed_ids verilirse (degisiklik akisi) yalnizca bu siparisler ve
+        yuku degisen istasyonlarda bekleyenler hesaplanir.
+        Donus: yeniden hesaplanan order_id kumesi (tam hesapta None)
+        """
+        key = self._snapshot_key_now()
+        if key == self._snapshot_key:
+            return set()
+        
+        index = self.queue_manager.index
+        now = datetime.now()
+        station_wait, station_inv = self._station_constants()
+        dirty = index.take_dirty()
+        
+        incremental = (changed_ids is not None and self._snapshot_key is not None
+                       and self._snapshot_key[1:2] == key[1:2] and self._snapshot_key[3] == key[3])
+        if incremental:
+            affected = set(changed_ids)
+            for station in dirty:
+                affected |= index.orders_at(station)
+            for order_id in affected:
+                item = index.get(order_id)
+                if item:
+                    self._snapshot[order_id] = self._snapshot_entry(*item, station_wait, station_inv, now)
+                else:
+                    self._snapshot.pop(order_id, None)
+            self._snapshot_key = key
+            self._updated_ids |= affected
+            return affected
+        
+        self._snapshot = {
+            order['id']: self._snapshot_entry(order, pending, station_wait, station_inv, now)
+            for order, pending in index.entries()
+        }
+        self._snapshot_key = key
+        self.generation += 1
+        self._updated_ids = set()
+        return None
+    
+    def take_updates(self):
+        """
+        Ozet degisiklikleri (oneri motoru icin):
+        (generation, son okumadan beri artimli guncellenen order_id'ler).
+        generation degistiyse ozet tamamen yeniden kurulmustur.
+        """
+        updated, self._updated_ids = self._updated_ids, set()
+        return self.generation, updated
+    
+    def get_snapshot(self, order):
+        """Siparisin ozet kaydi (indeks degistiyse / yoksa None)"""
+        if not self._snapshot_key or self._snapshot_key[2] != self.queue_manager.index.revision:
+            return None
+        return self._snapshot.get(order.get('id'))
+    
+    @staticmethod
+    def _ratio(order, remaining_time, now):
+        """Kalan sureden CR ve durum"""
         delivery_str = order.get('delivery_date', '')
         
         if not delivery_str:
             return None, "unknown"
         
         try:
-            delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d')
-            today = datetime.now()
+            delivery_date = _parse_day(delivery_str)
             
             # Kalan gun
-            days_until_due = (delivery_date - today).days
-            
-            # Kalan islem suresi
-            remaining_time = self.calculate_remaining_time(order)
+            days_until_due = (delivery_date - now).days
             
             if remaining_time <= 0:
                 remaining_time = 0.1
@@ -321,8 +471,67 @@ class CriticalRatioCalculator:
         except:
             return None, "unknown"
     
+    # -------------------------------------------------------------------------
+    # TEKIL SORGULAR (ozet varsa oradan)
+    # -------------------------------------------------------------------------
+    def calculate_remaining_time(self, order):
+        """Kalan islem suresini gun olarak hesapla"""
+        cached = self.get_snapshot(order)
+        if cached:
+            return cached['remaining']
+        
+        route = order.get('route', '')
+        m2 = order.get('declared_total_m2', 0)
+        
+        if not route or m2 <= 0:
+            return 0
+        
+        # Tamamlanmis istasyonlar
+        completed = []
+        if db:
+            try:
+                completed = db.get_completed_stations_list(order['id'])
+            except:
+                pass
+        
+        total_days = 0
+        capacities = self.queue_manager.capacities
+        
+        for station in route.split(','):
+            station = station.strip()
+            if station and station not in completed:
+                cap = capacities.get(station, 500)
+                if cap > 0:
+                    # Kuyruk bekleme suresi + islem suresi
+                    queue_load = self.queue_manager.loads.get(station, 0)
+                    queue_wait = queue_load / cap
+                    process_time = m2 / cap
+                    total_days += queue_wait + process_time
+        
+        return max(total_days, 0.1)  # Minimum 0.1 gun
+    
+    def calculate_cr(self, order):
+        """Critical Ratio hesapla"""
+        cached = self.get_snapshot(order)
+        if cached:
+            return cached['cr'], cached['status']
+        
+        if not order.get('delivery_date', ''):
+            return None, "unknown"
+        return self._ratio(order, self.calculate_remaining_time(order), datetime.now())
+    
     def estimate_completion_date(self, order, queue_position, all_orders):
         """Tahmini tamamlanma tarihi"""
+        cached = self.get_snapshot(order)
+        if cached:
+            return cached['est_date'], cached['est_days']
+        
+        # Planlama ekraniyla ayni sonucu kullan (varsa)
+        planned = self.plan_finish_dates.get(order.get('order_code'))
+        if planned:
+            remaining_days = max((planned - datetime.now()).total_seconds() / 86400.0, 0)
+            return planned, remaining_days
+        
         remaining_days = self.calculate_remaining_time(order)
         completion_date = datetime.now() + timedelta(days=remaining_days)
         return completion_date, remaining_days
@@ -336,28 +545,32 @@ class AlternativeRouteOptimizer:
     
     def __init__(self, queue_manager):
         self.queue_manager = queue_manager
+        self._cache = {}    # order_id -> (imza, oneriler)
+    
+    def _signature(self, order, pending):
+        """Oneriyi etkileyenler: bekleyen istasyonlar ve onlarin/alternatiflerinin yuku"""
+        index = self.queue_manager.index
+        stations = [s for st in pending for s in (st, *FactoryConfig.get_alternatives(st))]
+        return (order.get('order_code'), tuple((s, index.load(s), index.capacity(s)) for s in stations))
+    
+    def retain(self, order_ids):
+        """Yalnizca verilen siparislerin onbellegini tut"""
+        self._cache = {oid: v for oid, v in self._cache.items() if oid in order_ids}
     
     def find_alternative_routes(self, order):
-        """Siparis icin alternatif rota onerileri"""
-        suggestions = []
-        route = order.get('route', '')
-        
-        if not route:
-            return suggestions
-        
-        # Tamamlanmis istasyonlar
-        completed = []
-        if db:
-            try:
-                completed = db.get_completed_stations_list(order['id'])
-            except:
-                pass
+        """
+        Siparis icin alternatif rota onerileri. Bekleyen istasyonlar kuyruk
+        indeksinden okunur (DB sorgusu yok, sandbox'ta da gecerli); imzasi
+        degismeyen siparisin onceki onerileri aynen doner.
+        """
+        pending = self.queue_manager.index.get_pending(order.get('id'))
+        signature = self._signature(order, pending)
+        cached = self._cache.get(order.get('id'))
+        if cached and cached[0] == signature:
+            return cached[1]
         
-        for station in route.split(','):
-            station = station.strip()
-            if not station or station in completed:
-                continue
-            
+        suggestions = []
+        for station in pending:
             # Mevcut istasyon durumu
             current_status = self.queue_manager.get_station_status(station)
             
@@ -380,6 +593,7 @@ class AlternativeRouteOptimizer:
                         "message": f"{order['order_code']}: {station} yerine {alt} kullanilabilir ({time_saved:.1f} gun kazanc)"
                     })
         
+        self._cache[order.get('id')] = (signature, suggestions)
         return suggestions
 
 
@@ -387,59 +601,66 @@ class AlternativeRouteOptimizer:
 # BATCH OPTIMIZER (Kalinlik Bazli Gruplama)
 # =============================================================================
 class BatchOptimizer:
-    """Temper icin kalinlik bazli gruplama onerileri"""
-    
+    """Temper firin yukleri: istasyon + kalinlik + cam tipi gruplari (TemperBatcher)"""
+
+    MAX_SUGGESTIONS = 5
+
     def __init__(self, queue_manager):
         self.queue_manager = queue_manager
-    
+        self.batcher = TemperBatcher(stations=FactoryConfig.BATCH_STATIONS) if TemperBatcher else None
+
     def find_batch_opportunities(self, orders):
-        """Batch firsatlarini bul"""
-        suggestions = []
-        
-        # Temper bekleyen siparisleri kalinliga gore grupla
-        thickness_groups = defaultdict(list)
-        
-        for order in orders:
-            route = order.get('route', '')
+        """Batch firsatlarini bul (bekleyen temper adimlari kuyruk indeksinden)"""
+        if not self.batcher:
+            return []
+        index = self.queue_manager.index
+        codes = {}
+        items = []
+        for rank, order in enumerate(orders):
             thickness = order.get('thickness', 0)
-            
-            # Temper istasyonu rotada var mi?
-            has_temper = any(st in route for st in FactoryConfig.BATCH_STATIONS)
-            
-            if has_temper and thickness:
-                # Tamamlanmis istasyonlar
-                completed = []
-                if db:
-                    try:
-                        completed = db.get_completed_stations_list(order['id'])
-                    except:
-                        pass
-                
-                # Temper henuz yapilmamissa
-                temper_pending = any(
-                    st in route and st not in completed 
-                    for st in FactoryConfig.BATCH_STATIONS
-                )
-                
-                if temper_pending:
-                    thickness_groups[thickness].append(order)
-        
-        # 2'den fazla siparis olan gruplari oner
-        for thickness, group_orders in thickness_groups.items():
-            if len(group_orders) >= 2:
-                total_m2 = sum(o.get('declared_total_m2', 0) for o in group_orders)
-                order_codes = [o['order_code'] for o in group_orders[:5]]
-                
+            if not thickness:
+                continue
+            pending = index.get_pending(order['id']) if order.get('id') in index else []
+            station = next((st for st in pending if st in self.batcher.stations), None)
+            if station:
+                codes[order['id']] = order['order_code']
+                items.append(BatchItem(order['id'], rank, station, thickness,
+                                       glass_type_of(order), order.get('declared_total_m2', 0) or 0))
+
+        suggestions = []
+        for station, loads in self.batcher.plan(items).items():
+            # Firin sirasinda ardisik ayni profil yukleri tek grup
+            groups = []
+            for load in loads:
+                if groups and groups[-1][0] == (load.thickness, load.glass_type):
+                    groups[-1][1].append(load)
+                else:
+                    groups.append(((load.thickness, load.glass_type), [load]))
+
+            for (thickness, glass_type), group in groups:
+                order_ids = list(dict.fromkeys(key for load in group for key, _ in load.items))
+                if len(order_ids) < 2:
+                    continue
+                total_m2 = sum(load.m2 for load in group)
+                fill = total_m2 / sum(load.area for load in group)
                 suggestions.append({
                     "type": "batch",
+                    "station": station,
                     "thickness": thickness,
-                    "count": len(group_orders),
+                    "glass_type": glass_type,
+                    "count": len(order_ids),
+                    "loads": len(group),
+                    "fill": round(fill, 2),
+                    "setup_hours": group[0].setup_hours,
                     "total_m2": round(total_m2, 1),
-                    "orders": order_codes,
-                    "message": f"Temper Batch: {len(group_orders)} siparis {thickness}mm kalinlikta ({total_m2:.0f} m2). Birlikte islenmeli."
+                    "orders": [codes[oid] for oid in order_ids[:5]],
+                    "message": (f"Temper Batch: {station} - {len(order_ids)} siparis {thickness}mm {glass_type} "
+                                f"({total_m2:.0f} m2, {len(group)} firin yuku, %{fill * 100:.0f} doluluk). "
+                                f"Birlikte islenmeli.")
                 })
-        
-        return suggestions
+
+        suggestions.sort(key=lambda x: x['count'], reverse=True)
+        return suggestions[:self.MAX_SUGGESTIONS]
 
 
 # =============================================================================
@@ -453,29 +674,85 @@ class SmartRecommendationEngine:
         self.cr_calculator = CriticalRatioCalculator(self.queue_manager)
         self.route_optimizer = AlternativeRouteOptimizer(self.queue_manager)
         self.batch_optimizer = BatchOptimizer(self.queue_manager)
-    
-    def analyze(self, orders):
-        """Kapsamli analiz yap"""
-        # Kuyruklari olustur
-        self.queue_manager.build_queues(orders)
         
-        recommendations = []
-        
-        # 1. Critical Ratio analizi
+        # Onceki analiz (artimli guncelleme icin)
+        self._cr_recs = {}           # order_id -> CR onerisi (yoksa anahtar yok)
+        self._cr_generation = None   # _cr_recs hangi tam ozetten turetildi
+        self._batch_recs = []
+        self._batch_sigs = {}        # order_id -> temper adimi ozeti (batch onerisini etkileyen alanlar)
+    
+    def _cr_recommendation(self, order):
+        cr, status = self.cr_calculator.calculate_cr(order)
+        if status in ["late", "critical"]:
+            return {
+                "type": "critical",
+                "priority": 1,
+                "message": f"{order['order_code']}: CR={cr:.2f} - Gecikme riski yuksek! Hemen one alinmali."
+            }
+        if status == "risk":
+            return {
+                "type": "warning",
+                "priority": 2,
+                "message": f"{order['order_code']}: CR={cr:.2f} - Teslim tarihine yakin, dikkat."
+            }
+        return None
+    
+    def _batch_signature(self, order_id):
+        """Batch onerisini etkileyen alanlar: bekleyen temper istasyonu, kalinlik, tip, m2"""
+        batcher = self.batch_optimizer.batcher
+        item = self.queue_manager.index.get(order_id) if batcher else None
+        if not item:
+            return None
+        order, pending = item
+        station = next((st for st in pending if st in batcher.stations), None)
+        if not station:
+            return None
+        return (station, order.get('thickness'), glass_type_of(order), order.get('declared_total_m2'))
+    
+    def _update_batch(self, orders, changed_ids):
+        """Batch onerileri yalnizca bir siparisin temper adimi degistiyse yeniden hesaplanir"""
+        if changed_ids is not None and all(
+                self._batch_sigs.get(oid) == self._batch_signature(oid) for oid in changed_ids):
+            return
+        suggestions = self.batch_optimizer.find_batch_opportunities(orders)
+        self._batch_sigs = {}
         for order in orders:
-            cr, status = self.cr_calculator.calculate_cr(order)
-            if status in ["late", "critical"]:
-                recommendations.append({
-                    "type": "critical",
-                    "priority": 1,
-                    "message": f"{order['order_code']}: CR={cr:.2f} - Gecikme riski yuksek! Hemen one alinmali."
-                })
-            elif status == "risk":
-                recommendations.append({
-                    "type": "warning",
-                    "priority": 2,
-                    "message": f"{order['order_code']}: CR={cr:.2f} - Teslim tarihine yakin, dikkat."
-                })
+            sig = self._batch_signature(order['id'])
+            if sig:
+                self._batch_sigs[order['id']] = sig
+        self._batch_recs = [{"type": "info", "priority": 5, "message": batch['message']}
+                            for batch in suggestions]
+    
+    def analyze(self, orders, changed_ids=None):
+        """
+        Kapsamli analiz yap.
+        changed_ids: degisiklik akisindan gelen order_id'ler (kuyruklar
+        queue_manager.apply_changes ile zaten guncellenmis olmali). Verilirse
+        onceki analiz korunur, yalnizca etkilenen oneriler yeniden hesaplanir.
+        """
+        if changed_ids is None:
+            # Kuyruklari olustur (farklar uygulanir)
+            self.queue_manager.build_queues(orders)
+        
+        self.cr_calculator.ensure_snapshot(changed_ids)
+        
+        # 1. Critical Ratio analizi (yalnizca ozeti degisen siparisler)
+        generation, updated = self.cr_calculator.take_updates()
+        if generation != self._cr_generation:
+            self._cr_generation = generation
+            self._cr_recs = {}
+            updated = [o['id'] for o in orders]
+        if updated:
+            live = {o['id']: o for o in orders}
+            for order_id in updated:
+                order = live.get(order_id)
+                rec = self._cr_recommendation(order) if order else None
+                if rec:
+                    self._cr_recs[order_id] = rec
+                else:
+                    self._cr_recs.pop(order_id, None)
+        
+        recommendations = [self._cr_recs[o['id']] for o in orders if o['id'] in self._cr_recs]
         
         # 2. Darbogaz analizi
         bottlenecks = self.queue_manager.get_bottlenecks()
@@ -487,6 +764,7 @@ class SmartRecommendationEngine:
             })
         
         # 3. Alternatif rota onerileri
+        self.route_optimizer.retain({o['id'] for o in orders[:10]})
         for order in orders[:10]:  # Ilk 10 siparis icin
             alt_routes = self.route_optimizer.find_alternative_routes(order)
             for alt in alt_routes:
@@ -498,13 +776,8 @@ class SmartRecommendationEngine:
                     })
         
         # 4. Batch onerileri
-        batch_suggestions = self.batch_optimizer.find_batch_opportunities(orders)
-        for batch in batch_suggestions:
-            recommendations.append({
-                "type": "info",
-                "priority": 5,
-                "message": batch['message']
-            })
+        self._update_batch(orders, changed_ids)
+        recommendations.extend(self._batch_recs)
         
         # 5. Bos istasyonlar
         idle = self.queue_manager.get_idle_stations()
@@ -522,6 +795,10 @@ class SmartRecommendationEngine:
     
     def get_order_current_station(self, order):
         """Siparisin mevcut istasyonunu bul"""
+        cached = self.cr_calculator.get_snapshot(order)
+        if cached:
+            return cached['station']
+        
         if not db:
             return None
         
@@ -541,6 +818,14 @@ class SmartRecommendationEngine:
         except:
             return None
     
+    def get_station_label(self, order):
+        """Mevcut istasyon; plan alternatif makineye yonlendirdiyse 'ISTASYON > MAKINE'"""
+        station = self.get_order_current_station(order)
+        machine = self.cr_calculator.planned_machine(order, station)
+        if station and machine and machine != station:
+            return f"{station} > {machine}"
+        return station
+    
     def can_reorder(self, order_to_move, target_order):
         """Siparis yer degistirebilir mi?"""
         if order_to_move.get('status') == 'Beklemede':
@@ -553,20 +838,124 @@ class SmartRecommendationEngine:
         return True, ""
 
 
+# =============================================================================
+# KURAL KARSILASTIRMA PENCERESI
+# =============================================================================
+class RuleComparisonDialog(QDialog):
+    """Sevk kurallarinin simulasyon sonuclari; secilen kuralin sirasi uygulanabilir"""
+    
+    def __init__(self, results, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.selected = None
+        self.setWindowTitle("Sevk Kurali Karsilastirmasi")
+        self.resize(720, 320)
+        self.setStyleSheet(f"background-color: {Colors.BG};")
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        
+        info = QLabel("Her kural planlayici simulasyonundan gecirildi (gecikmeler takvim gunu). "
+                      "En az agirlikli gecikme en ustte.")
+        info.setWordWrap(True)
+        info.setStyleSheet(f"color: {Colors.TEXT_SECONDARY}; font-size: 11px;")
+        layout.addWidget(info)
+        
+        headers = ["Kural", "Agirlikli Gecikme", "Toplam Gecikme", "Geciken", "En Uzun", "Bitis (gun)"]
+        self.table = QTableWidget(len(results), len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        
+        for row, r in enumerate(results):
+            values = [f"{r.name} - {r.label}", f"{r.weighted_tardiness:.0f}", f"{r.total_tardiness:.0f}",
+                      str(r.late_count), f"{r.max_tardiness:.1f}", f"{r.makespan_days:.1f}"]
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment((Qt.AlignLeft if col == 0 else Qt.AlignCenter) | Qt.AlignVCenter)
+                if row == 0:
+                    item.setForeground(QColor(Colors.SUCCESS))
+                self.table.setItem(row, col, item)
+        if results:
+            self.table.selectRow(0)
+        layout.addWidget(self.table)
+        
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        btn_apply = QPushButton("Sirayi Uygula")
+        btn_apply.clicked.connect(self.accept_selected)
+        btn_close = QPushButton("Kapat")
+        btn_close.clicked.connect(self.reject)
+        buttons.addWidget(btn_apply)
+        buttons.addWidget(btn_close)
+        layout.addLayout(buttons)
+    
+    def accept_selected(self):
+        rows = self.table.selectionModel().selectedRows()
+        if rows:
+            self.selected = self.results[rows[0].row()]
+            self.accept()
+
+
 # =============================================================================
 # ANA WIDGET
 # =============================================================================
 class DecisionView(QWidget):
     """Karar Destek Sistemi Ana Ekrani"""
     
+    ACTIVE_STATUSES = ["Beklemede", "Uretimde"]
+    FULL_RELOAD_THRESHOLD = 500      # Bundan fazla siparis degistiyse tam yukleme
+    
     def __init__(self):
         super().__init__()
         self.all_orders = []
         self.original_orders = []
         self.engine = SmartRecommendationEngine()
         self.panel_visible = False
+        self.risk_by_code = {}  # order_code -> OrderRisk (Monte Carlo)
+        
+        # Teslim riski arka planda hesaplanir
+        self.risk_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.risk_runner:
+            self.risk_runner.result_ready.connect(self.apply_risk_results)
+        
+        # Sevk kurali karsilastirmasi (simulasyon arka planda)
+        self.rule_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.rule_runner:
+            self.rule_runner.result_ready.connect(self.show_rule_comparison)
+            self.rule_runner.failed.connect(lambda msg: self.status_label.setText(f"Kural karsilastirma hatasi: {msg}"))
+        
+        # Sira optimizasyonu (yerel arama, sure sinirli)
+        self.optimize_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.optimize_runner:
+            self.optimize_runner.result_ready.connect(self.show_optimization)
+            self.optimize_runner.failed.connect(lambda msg: self.status_label.setText(f"Optimizasyon hatasi: {msg}"))
+        
+        self.source = db            # Canli veritabani ya da what-if sandbox'i (set_source)
+        self.scenarios = []         # Acik sandbox'lar (Senaryo menusu)
+        self.sandbox_plan = None    # Aktif sandbox'in son hesaplanan plani
+        
+        # Sandbox plani (tam simulasyon) async_db kuyrugunu bekletmesin diye ayri havuzda
+        self.plan_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.plan_runner:
+            self.plan_runner.result_ready.connect(self.apply_sandbox_plan)
+            self.plan_runner.failed.connect(lambda msg: self.status_label.setText(f"Senaryo plani hatasi: {msg}"))
+        
+        # Siparis, ilerleme ve plan worker thread'de okunur
+        self.vm = DecisionViewModel(self.ACTIVE_STATUSES, self, source=self.source)
+        self.vm.data_ready.connect(self.apply_orders)
+        self.vm.changes_ready.connect(self.apply_change_set)
+        self.vm.failed.connect(lambda msg: self.status_label.setText(f"Hata: {msg}"))
+        
         self.setup_ui()
         self.load_orders()
+        
+        # Canli yenileme (merkezi koordinator, degisiklik akisi)
+        if refresh_coordinator:
+            refresh_coordinator.subscribe(("orders", "progress"), self.on_data_changed, owner=self)
     
     def setup_ui(self):
         self.setStyleSheet(f"background-color: {Colors.BG};")
@@ -663,6 +1052,8 @@ class DecisionView(QWidget):
             ("Termin", self.sort_by_deadline),
             ("Oncelik", self.sort_by_priority),
             ("Kisa Is", self.sort_by_duration),
+            ("Kural Karsilastir", self.compare_rules),
+            ("Optimize Et", self.optimize_order),
             ("Sifirla", self.reset_order)
         ]:
             btn = QPushButton(text)
@@ -684,6 +1075,16 @@ class DecisionView(QWidget):
             btn.clicked.connect(func)
             layout.addWidget(btn)
         
+        # What-if senaryolari (sandbox)
+        if PlanningSnapshot:
+            self._add_separator(layout)
+            self.btn_scenario = QPushButton("Senaryo: Canli")
+            self.btn_scenario.setStyleSheet(btn_style)
+            self.scenario_menu = QMenu(self.btn_scenario)
+            self.scenario_menu.aboutToShow.connect(self._fill_scenario_menu)
+            self.btn_scenario.setMenu(self.scenario_menu)
+            layout.addWidget(self.btn_scenario)
+        
         layout.addStretch()
         
         # Istatistikler
@@ -744,10 +1145,10 @@ class DecisionView(QWidget):
     
     def _create_table(self):
         table = QTableWidget()
-        table.setColumnCount(12)
+        table.setColumnCount(13)
         table.setHorizontalHeaderLabels([
             "#", "Kod", "Musteri", "Urun", "m2", 
-            "CR", "Termin", "Tahmini", "Fark",
+            "CR", "Termin", "Tahmini", "Fark", "Risk",
             "Durum", "Istasyon", "Uyari"
         ])
         
@@ -809,9 +1210,10 @@ class DecisionView(QWidget):
         table.setColumnWidth(6, 80)
         table.setColumnWidth(7, 80)
         table.setColumnWidth(8, 50)
-        table.setColumnWidth(9, 70)
-        table.setColumnWidth(10, 85)
-        table.setColumnWidth(11, 45)
+        table.setColumnWidth(9, 50)
+        table.setColumnWidth(10, 70)
+        table.setColumnWidth(11, 85)
+        table.setColumnWidth(12, 45)
         
         header.setStretchLastSection(True)
         table.verticalHeader().setDefaultSectionSize(22)
@@ -996,8 +1398,8 @@ class DecisionView(QWidget):
         if self.panel_visible:
             self.update_side_panel()
     
-    def update_side_panel(self):
-        """Yan paneli guncelle"""
+    def update_side_panel(self, changed_ids=None):
+        """Yan paneli guncelle (changed_ids: artimli analiz)"""
         # Istasyon durumlarini temizle
         while self.station_layout.count():
             item = self.station_layout.takeAt(0)
@@ -1018,7 +1420,7 @@ class DecisionView(QWidget):
                 item.widget().deleteLater()
         
         # Onerileri ekle
-        recommendations = self.engine.analyze(self.all_orders)
+        recommendations = self.engine.analyze(self.all_orders, changed_ids)
         
         if not recommendations:
             lbl = QLabel("Sistem normal, oneri yok.")
@@ -1042,122 +1444,371 @@ class DecisionView(QWidget):
     # VERI ISLEMLERI
     # =========================================================================
     
+    def set_source(self, source=None):
+        """Ekrani bir what-if sandbox'i uzerinde calistir (None = canli veri)"""
+        self.source = source or db
+        self.sandbox_plan = None
+        if self.plan_runner:
+            self.plan_runner.cancel()
+        self.engine.queue_manager.set_source(self.source)
+        self.vm.set_source(self.source)
+    
+    # =========================================================================
+    # SENARYOLAR
+    # =========================================================================
+    
+    def _fill_scenario_menu(self):
+        """Senaryo menusu her acilista yeniden kurulur"""
+        menu = self.scenario_menu
+        menu.clear()
+        sandbox = self.source if self.source is not db else None
+        
+        menu.addAction("Yeni Senaryo...", self.new_scenario)
+        menu.addAction("Senaryoyu Catalla...", self.fork_scenario).setEnabled(sandbox is not None)
+        menu.addSeparator()
+        
+        for name, target in [("Canli veri", None)] + [(sb.name, sb) for sb in self.scenarios]:
+            action = menu.addAction(name, lambda t=target: self.switch_scenario(t))
+            action.setCheckable(True)
+            action.setChecked(target is sandbox)
+        
+        menu.addSeparator()
+        menu.addAction("Canliya Yaz", self.commit_scenario).setEnabled(sandbox is not None)
+        menu.addAction("Senaryoyu Kapat", self.discard_scenario).setEnabled(sandbox is not None)
+    
+    def _ask_scenario_name(self, default):
+        name, ok = QInputDialog.getText(self, "Senaryo", "Senaryo adi:", text=default)
+        return name.strip() or default if ok else None
+    
+    def new_scenario(self):
+        """Canli veriden taban al, bos sandbox ac"""
+        if not db:
+            return
+        name = self._ask_scenario_name(f"Senaryo {len(self.scenarios) + 1}")
+        if name is None:
+            return
+        try:
+            sandbox = PlanningSnapshot.capture(db).sandbox(name)
+        except Exception as e:
+            self.status_label.setText(f"Senaryo acilamadi: {e}")
+            return
+        self.scenarios.append(sandbox)
+        self.switch_scenario(sandbox)
+    
+    def fork_scenario(self):
+        """Aktif senaryonun farklarini kopyala (ayni taban)"""
+        if self.source is db:
+            return
+        name = self._ask_scenario_name(f"{self.source.name} (kopya)")
+        if name is None:
+            return
+        sandbox = self.source.fork(name)
+        self.scenarios.append(sandbox)
+        self.switch_scenario(sandbox)
+    
+    def switch_scenario(self, sandbox=None):
+        """Ekrani bir senaryoya (None = canli veri) gecir"""
+        self.set_source(sandbox)
+        self.btn_scenario.setText(f"Senaryo: {sandbox.name}" if sandbox else "Senaryo: Canli")
+        self.load_orders()
+    
+    def commit_scenario(self):
+        """Aktif senaryonun farklarini tek islemde canli veriye yaz"""
+        sandbox = self.source
+        if sandbox is db:
+            return
+        changes = sandbox.changes()
+        reply = QMessageBox.question(
+            self, "Canliya Yaz",
+            f"'{sandbox.name}' senaryosu canli veriye yazilacak:\n\n"
+            f"Degisen siparis: {changes['orders']}\n"
+            f"Yeni siparis: {changes['new_orders']}\n"
+            f"Kapasite: {changes['capacities']}\n\n"
+            f"Devam edilsin mi?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        
+        try:
+            try:
+                sandbox.commit(db)
+            except ScenarioConflict as e:
+                reply = QMessageBox.question(
+                    self, "Cakisma",
+                    f"{e}\n\nSenaryo alindiktan sonra canli veri degisti. Yine de yazilsin mi?",
+                    QMessageBox.Yes | QMessageBox.No
+                )
+                if reply != QMessageBox.Yes:
+                    return
+                sandbox.commit(db, force=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Senaryo yazilamadi: {e}")
+            return
+        
+        self.scenarios.remove(sandbox)
+        self.switch_scenario(None)
+        self.status_label.setText(f"'{sandbox.name}' canliya yazildi")
+    
+    def discard_scenario(self):
+        """Aktif senaryoyu kapat (farklar atilir)"""
+        if self.source is db:
+            return
+        self.scenarios.remove(self.source)
+        self.switch_scenario(None)
+    
     def load_orders(self):
+        """Aktif siparisleri yukle (sonuc apply_orders ile gelir)"""
+        if self.source:
+            self.vm.reload()
+        else:
+            self.apply_orders({'orders': [], 'progress': {}, 'plan': None})
+    
+    def apply_orders(self, data):
+        """ViewModel'den gelen siparisleri (kayitli Karar Destek sirasiyla) uygula"""
         try:
-            if db:
-                self.all_orders = db.get_orders_by_status(["Beklemede", "Uretimde"])
-            else:
-                self.all_orders = []
-            
+            self.all_orders = list(data['orders'])
             self.original_orders = self.all_orders.copy()
-            self.engine.queue_manager.build_queues(self.all_orders)
+            self.engine.queue_manager.build_queues(self.all_orders, data['progress'])
+            # Sandbox'ta yeni plan gelene kadar son sandbox plani kullanilir
+            self.engine.cr_calculator.set_plan(data['plan'] if self.source is db else self.sandbox_plan)
+            self.engine.cr_calculator.ensure_snapshot()
             self.refresh_table()
+            self.start_risk_analysis()
             self.update_stats()
             
             if self.panel_visible:
                 self.update_side_panel()
             
             self.status_label.setText(f"{len(self.all_orders)} siparis yuklendi")
+            self.start_sandbox_plan()
         except Exception as e:
             self.status_label.setText(f"Hata: {str(e)}")
     
+    def start_sandbox_plan(self):
+        """Sandbox verisiyle plani arka planda hesapla (sonuc apply_sandbox_plan ile gelir)"""
+        if not self.plan_runner or not plan_store or self.source is db:
+            return
+        source = self.source
+        self.plan_runner.submit(
+            lambda cancel_check: (source, plan_store.get_source_plan(source, cancel_check=cancel_check)))
+    
+    def apply_sandbox_plan(self, result):
+        """Hesaplanan sandbox planini uygula (bu arada senaryo degistiyse yok sayilir)"""
+        source, plan = result
+        if source is not self.source:
+            return
+        self.sandbox_plan = plan
+        self.engine.cr_calculator.set_plan(plan)
+        self.engine.cr_calculator.ensure_snapshot()
+        self.refresh_table()
+        self.update_stats()
+        if self.panel_visible:
+            self.update_side_panel()
+    
+    def on_data_changed(self, event):
+        """Koordinator olayi: degisen siparisleri artimli uygula (sandbox'ta canli veri yok sayilir)"""
+        if not db or self.source is not db:
+            return
+        changed_ids = event.ids("orders", "progress")
+        if changed_ids is None or len(changed_ids) > self.FULL_RELOAD_THRESHOLD:
+            self.load_orders()
+            return
+        if changed_ids:
+            self.apply_order_changes(changed_ids)
+    
+    def apply_order_changes(self, changed_ids):
+        """Degisen siparisleri arka planda oku (sonuc apply_change_set ile gelir)"""
+        self.vm.update(changed_ids)
+    
+    def apply_change_set(self, changes):
+        """Degisen siparisleri kuyruk indeksine, listeye, tabloya ve yan panele uygula"""
+        active, removed = changes['active'], changes['removed']
+        changed_ids = active.keys() | removed
+        self.engine.queue_manager.apply_changes(active.values(), changes['progress'], removed)
+        
+        # Listeler: guncellenen yerinde, kapanan cikar, yeni sona
+        structure_changed = False
+        for name in ("all_orders", "original_orders"):
+            current = getattr(self, name)
+            known = set()
+            updated = []
+            for order in current:
+                oid = order['id']
+                known.add(oid)
+                if oid in changed_ids:
+                    if oid not in active:
+                        structure_changed = True
+                        continue
+                    order = active[oid]
+                updated.append(order)
+            new_orders = [o for oid, o in active.items() if oid not in known]
+            structure_changed = structure_changed or bool(new_orders)
+            setattr(self, name, updated + new_orders)
+        
+        affected = self.engine.cr_calculator.ensure_snapshot(changed_ids)
+        if structure_changed or affected is None:
+            self.refresh_table()
+        else:
+            self.refresh_rows(affected | changed_ids)
+        self.update_stats()
+        
+        if self.panel_visible:
+            self.update_side_panel(changed_ids)
+        
+        self.status_label.setText(f"{len(changed_ids)} siparis guncellendi")
+    
     def refresh_table(self):
         self.table.setRowCount(0)
         self.table.setRowCount(len(self.all_orders))
         
         critical_count = 0
+        self.engine.cr_calculator.ensure_snapshot()
         
         for row, order in enumerate(self.all_orders):
-            # CR hesapla
-            cr, cr_status = self.engine.cr_calculator.calculate_cr(order)
-            
-            # Tahmini tamamlanma
-            est_date, remaining_days = self.engine.cr_calculator.estimate_completion_date(
-                order, row, self.all_orders
-            )
-            
-            # Mevcut istasyon
-            current_station = self.engine.get_order_current_station(order)
-            
-            # Fark hesapla
-            delivery_str = order.get('delivery_date', '')
-            diff_days = None
-            if delivery_str and est_date:
-                try:
-                    delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d')
-                    diff_days = (delivery_date - est_date).days
-                except:
-                    pass
-            
-            if cr_status in ["late", "critical"]:
+            if self._fill_row(row, order) in ["late", "critical"]:
                 critical_count += 1
-            
-            # Sutunlar
-            self._set_cell(row, 0, str(row + 1), Qt.AlignCenter, Colors.TEXT_MUTED)
-            self._set_cell(row, 1, order['order_code'], Qt.AlignLeft, Colors.TEXT, bold=True)
-            self._set_cell(row, 2, order['customer_name'], Qt.AlignLeft)
-            self._set_cell(row, 3, order['product_type'], Qt.AlignLeft, Colors.TEXT_SECONDARY)
-            
-            m2 = order.get('declared_total_m2', 0)
-            self._set_cell(row, 4, f"{m2:.0f}", Qt.AlignRight)
-            
-            # CR
-            if cr is not None:
-                cr_color = {
-                    "late": Colors.CRITICAL,
-                    "critical": Colors.CRITICAL,
-                    "risk": Colors.WARNING,
-                    "tight": Colors.WARNING,
-                    "safe": Colors.SUCCESS
-                }.get(cr_status, Colors.TEXT_SECONDARY)
-                self._set_cell(row, 5, f"{cr:.2f}", Qt.AlignCenter, cr_color)
-            else:
-                self._set_cell(row, 5, "-", Qt.AlignCenter, Colors.TEXT_MUTED)
-            
-            # Termin
-            self._set_cell(row, 6, delivery_str, Qt.AlignCenter)
-            
-            # Tahmini
-            est_str = est_date.strftime('%Y-%m-%d') if est_date else "-"
-            self._set_cell(row, 7, est_str, Qt.AlignCenter)
-            
-            # Fark
-            if diff_days is not None:
-                if diff_days < 0:
-                    diff_color = Colors.CRITICAL
-                    diff_str = str(diff_days)
-                elif diff_days < 3:
-                    diff_color = Colors.WARNING
-                    diff_str = f"+{diff_days}"
-                else:
-                    diff_color = Colors.SUCCESS
-                    diff_str = f"+{diff_days}"
-                self._set_cell(row, 8, diff_str, Qt.AlignCenter, diff_color)
+        
+        self.lbl_critical.setText(f"Kritik: {critical_count}")
+    
+    def refresh_rows(self, order_ids):
+        """Yalnizca verilen siparislerin satirlarini guncelle"""
+        critical_count = 0
+        for row, order in enumerate(self.all_orders):
+            if order['id'] in order_ids:
+                cr_status = self._fill_row(row, order)
             else:
-                self._set_cell(row, 8, "-", Qt.AlignCenter, Colors.TEXT_MUTED)
-            
-            # Durum
-            status = order.get('status', 'Beklemede')
-            status_colors = {
-                'Uretimde': (Colors.SUCCESS, Colors.SUCCESS_BG),
-                'Beklemede': (Colors.INFO, Colors.INFO_BG),
-            }
-            s_fg, s_bg = status_colors.get(status, (Colors.TEXT_SECONDARY, None))
-            self._set_cell(row, 9, status, Qt.AlignCenter, s_fg, s_bg)
-            
-            # Istasyon
-            self._set_cell(row, 10, current_station or "-", Qt.AlignCenter, Colors.TEXT_SECONDARY)
-            
-            # Uyari
+                _, cr_status = self.engine.cr_calculator.calculate_cr(order)
             if cr_status in ["late", "critical"]:
-                self._set_cell(row, 11, "!", Qt.AlignCenter, Colors.CRITICAL, Colors.CRITICAL_BG)
-            elif cr_status == "risk":
-                self._set_cell(row, 11, "!", Qt.AlignCenter, Colors.WARNING, Colors.WARNING_BG)
-            else:
-                self._set_cell(row, 11, "", Qt.AlignCenter)
+                critical_count += 1
         
         self.lbl_critical.setText(f"Kritik: {critical_count}")
     
+    def _fill_row(self, row, order):
+        """Tek satiri doldur, CR durumunu dondur"""
+        # CR hesapla
+        cr, cr_status = self.engine.cr_calculator.calculate_cr(order)
+        
+        # Tahmini tamamlanma
+        est_date, remaining_days = self.engine.cr_calculator.estimate_completion_date(
+            order, row, self.all_orders
+        )
+        
+        # Mevcut istasyon (planlanan makine ile)
+        current_station = self.engine.get_station_label(order)
+        
+        # Fark hesapla
+        delivery_str = order.get('delivery_date', '')
+        diff_days = None
+        if delivery_str and est_date:
+            try:
+                delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d')
+                diff_days = (delivery_date - est_date).days
+            except:
+                pass
+        
+        # Sutunlar
+        self._set_cell(row, 0, str(row + 1), Qt.AlignCenter, Colors.TEXT_MUTED)
+        self._set_cell(row, 1, order['order_code'], Qt.AlignLeft, Colors.TEXT, bold=True)
+        self._set_cell(row, 2, order['customer_name'], Qt.AlignLeft)
+        self._set_cell(row, 3, order['product_type'], Qt.AlignLeft, Colors.TEXT_SECONDARY)
+        
+        m2 = order.get('declared_total_m2', 0)
+        self._set_cell(row, 4, f"{m2:.0f}", Qt.AlignRight)
+        
+        # CR
+        if cr is not None:
+            cr_color = {
+                "late": Colors.CRITICAL,
+                "critical": Colors.CRITICAL,
+                "risk": Colors.WARNING,
+                "tight": Colors.WARNING,
+                "safe": Colors.SUCCESS
+            }.get(cr_status, Colors.TEXT_SECONDARY)
+            self._set_cell(row, 5, f"{cr:.2f}", Qt.AlignCenter, cr_color)
+        else:
+            self._set_cell(row, 5, "-", Qt.AlignCenter, Colors.TEXT_MUTED)
+        
+        # Termin
+        self._set_cell(row, 6, delivery_str, Qt.AlignCenter)
+        
+        # Tahmini
+        est_str = est_date.strftime('%Y-%m-%d') if est_date else "-"
+        self._set_cell(row, 7, est_str, Qt.AlignCenter)
+        
+        # Fark
+        if diff_days is not None:
+            if diff_days < 0:
+                diff_color = Colors.CRITICAL
+                diff_str = str(diff_days)
+            elif diff_days < 3:
+                diff_color = Colors.WARNING
+                diff_str = f"+{diff_days}"
+            else:
+                diff_color = Colors.SUCCESS
+                diff_str = f"+{diff_days}"
+            self._set_cell(row, 8, diff_str, Qt.AlignCenter, diff_color)
+        else:
+            self._set_cell(row, 8, "-", Qt.AlignCenter, Colors.TEXT_MUTED)
+        
+        # Durum
+        status = order.get('status', 'Beklemede')
+        status_colors = {
+            'Uretimde': (Colors.SUCCESS, Colors.SUCCESS_BG),
+            'Beklemede': (Colors.INFO, Colors.INFO_BG),
+        }
+        s_fg, s_bg = status_colors.get(status, (Colors.TEXT_SECONDARY, None))
+        self._set_cell(row, 10, status, Qt.AlignCenter, s_fg, s_bg)
+        
+        # Risk (Monte Carlo sonucu gelince doldurulur)
+        self._set_risk_cell(row, order)
+        
+        # Istasyon
+        self._set_cell(row, 11, current_station or "-", Qt.AlignCenter, Colors.TEXT_SECONDARY)
+        
+        # Uyari
+        if cr_status in ["late", "critical"]:
+            self._set_cell(row, 12, "!", Qt.AlignCenter, Colors.CRITICAL, Colors.CRITICAL_BG)
+        elif cr_status == "risk":
+            self._set_cell(row, 12, "!", Qt.AlignCenter, Colors.WARNING, Colors.WARNING_BG)
+        else:
+            self._set_cell(row, 12, "", Qt.AlignCenter)
+        
+        return cr_status
+    
+    def _set_risk_cell(self, row, order):
+        """Zamaninda teslim olasiligi (P50/P90 ipucunda)"""
+        risk = self.risk_by_code.get(order.get('order_code'))
+        if risk is None or risk.on_time_probability is None:
+            self._set_cell(row, 9, "-", Qt.AlignCenter, Colors.TEXT_MUTED)
+            return
+        
+        prob = risk.on_time_probability
+        if prob >= 0.9:
+            color = Colors.SUCCESS
+        elif prob >= 0.6:
+            color = Colors.WARNING
+        else:
+            color = Colors.CRITICAL
+        self._set_cell(row, 9, f"%{prob * 100:.0f}", Qt.AlignCenter, color)
+        self.table.item(row, 9).setToolTip(
+            f"P50: {risk.p50.strftime('%d.%m.%Y %H:%M')}\nP90: {risk.p90.strftime('%d.%m.%Y %H:%M')}"
+        )
+    
+    def start_risk_analysis(self):
+        """Monte Carlo teslim riskini arka planda baslat"""
+        if not self.risk_runner or not SmartPlanner:
+            return
+        self.risk_runner.submit(
+            lambda cancel_check, source=self.source: SmartPlanner(source=source).calculate_delivery_risk(replications=1000, cancel_check=cancel_check)
+        )
+    
+    def apply_risk_results(self, risks):
+        """Sadece Risk sutununu guncelle (tablo yeniden kurulmaz)"""
+        self.risk_by_code = risks or {}
+        for row, order in enumerate(self.all_orders):
+            self._set_risk_cell(row, order)
+    
     def _set_cell(self, row, col, text, alignment=Qt.AlignLeft, 
                   fg_color=None, bg_color=None, bold=False):
         item = QTableWidgetItem(str(text))
@@ -1199,6 +1850,8 @@ class DecisionView(QWidget):
     
     def sort_by_cr(self):
         """Critical Ratio'ya gore sirala (dusuk CR once)"""
+        self.engine.cr_calculator.ensure_snapshot()
+        
         def get_cr(order):
             cr, _ = self.engine.cr_calculator.calculate_cr(order)
             return cr if cr is not None else 999
@@ -1236,6 +1889,72 @@ class DecisionView(QWidget):
             self.update_side_panel()
         self.status_label.setText("Kisa is once siralandi")
     
+    def compare_rules(self):
+        """EDD / SPT / CR / SLACK / ATC / Bilesik kurallarini simule et"""
+        if not self.rule_runner or not SmartPlanner:
+            self.status_label.setText("Planlayici kullanilamiyor")
+            return
+        self.status_label.setText("Kurallar simule ediliyor...")
+        self.rule_runner.submit(
+            lambda cancel_check, source=self.source: SmartPlanner(source=source).compare_dispatch_rules(cancel_check=cancel_check)
+        )
+    
+    def show_rule_comparison(self, results):
+        if not results:
+            self.status_label.setText("Kural karsilastirmasi icin NumPy ve aktif siparis gerekli")
+            return
+        self.status_label.setText(f"{len(results)} kural karsilastirildi")
+        
+        dialog = RuleComparisonDialog(results, self)
+        if dialog.exec() != QDialog.Accepted or not dialog.selected:
+            return
+        
+        # Secilen kuralin sirasi; planlayicida olmayan siparisler sonda kalir
+        rank = {oid: i for i, oid in enumerate(dialog.selected.order_ids)}
+        self.all_orders.sort(key=lambda o: rank.get(o.get('id'), len(rank)))
+        self.refresh_table()
+        if self.panel_visible:
+            self.update_side_panel()
+        self.status_label.setText(f"{dialog.selected.name} kuralina gore siralandi")
+    
+    def optimize_order(self):
+        """Ekrandaki siradan baslayarak agirlikli gecikmeyi azaltan sirayi ara (2 sn)"""
+        if not self.optimize_runner or not SmartPlanner:
+            self.status_label.setText("Planlayici kullanilamiyor")
+            return
+        order_ids = [o.get('id') for o in self.all_orders]
+        self.status_label.setText("Sira optimize ediliyor (2 sn)...")
+        self.optimize_runner.submit(
+            lambda cancel_check, source=self.source: SmartPlanner(source=source).optimize_sequence(
+                order_ids=order_ids, time_limit=2.0, cancel_check=cancel_check)
+        )
+    
+    def show_optimization(self, result):
+        if not result or result.proposed_weighted_tardiness >= result.baseline_weighted_tardiness:
+            self.status_label.setText("Daha iyi bir sira bulunamadi")
+            return
+        
+        reply = QMessageBox.question(
+            self, "Onerilen Sira",
+            f"Agirlikli gecikme: {result.baseline_weighted_tardiness:.0f} -> "
+            f"{result.proposed_weighted_tardiness:.0f} gun (%{result.improvement * 100:.0f} iyilesme)\n"
+            f"Geciken siparis: {result.baseline_late_count} -> {result.proposed_late_count}\n"
+            f"({result.iterations} deneme, {result.elapsed:.1f} sn)\n\n"
+            f"Onerilen sira tabloya uygulansin mi?\n"
+            f"(Kalici olmasi icin ardindan 'Uygula' ile kaydedin.)",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            self.status_label.setText("Oneri reddedildi")
+            return
+        
+        rank = {oid: i for i, oid in enumerate(result.order_ids)}
+        self.all_orders.sort(key=lambda o: rank.get(o.get('id'), len(rank)))
+        self.refresh_table()
+        if self.panel_visible:
+            self.update_side_panel()
+        self.status_label.setText("Onerilen sira uygulandi")
+    
     def reset_order(self):
         self.all_orders = self.original_orders.copy()
         self.refresh_table()
@@ -1331,12 +2050,13 @@ class DecisionView(QWidget):
         try:
             with open(filename, 'w', encoding='utf-8-sig') as f:
                 f.write("SIRA,KOD,MUSTERI,URUN,M2,CR,TERMIN,TAHMINI,FARK,DURUM,ISTASYON\n")
+                self.engine.cr_calculator.ensure_snapshot()
                 
                 for idx, order in enumerate(self.all_orders):
                     cr, _ = self.engine.cr_calculator.calculate_cr(order)
                     est_date, _ = self.engine.cr_calculator.estimate_completion_date(order, idx, self.all_orders)
                     est_str = est_date.strftime('%Y-%m-%d') if est_date else ""
-                    current_st = self.engine.get_order_current_station(order)
+                    current_st = self.engine.get_station_label(order)
                     
                     f.write(f"{idx+1},")
                     f.write(f"{order['order_code']},")
@@ -1361,6 +2081,13 @@ class DecisionView(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Kayit hatasi:\n{str(e)}")
     
+    def _neighbours(self, keys):
+        """Tek tasinan siparis: (order_id, ustteki komsu id, alttaki komsu id)"""
+        idx = next(iter(keys))
+        prev_id = self.all_orders[idx - 1]['id'] if idx > 0 else None
+        next_id = self.all_orders[idx + 1]['id'] if idx + 1 < len(self.all_orders) else None
+        return self.all_orders[idx]['id'], prev_id, next_id
+    
     def apply_order(self):
         if not self.all_orders:
             self.status_label.setText("Veri yok")
@@ -1385,29 +2112,34 @@ class DecisionView(QWidget):
             return
         
         try:
-            if db:
-                with db.get_connection() as conn:
-                    # Oncelikle queue_position kolonu var mi kontrol et, yoksa ekle
-                    try:
-                        conn.execute("ALTER TABLE orders ADD COLUMN queue_position INTEGER DEFAULT 9999")
-                    except:
-                        pass  # Kolon zaten var
+            positions, priorities = {}, {}
+            if self.source:
+                for idx, order in enumerate(self.all_orders):
+                    if idx < kritik_count:
+                        new_priority = "Kritik"
+                    elif idx < acil_count:
+                        new_priority = "Acil"
+                    else:
+                        new_priority = "Normal"
                     
-                    for idx, order in enumerate(self.all_orders):
-                        if idx < kritik_count:
-                            new_priority = "Kritik"
-                        elif idx < acil_count:
-                            new_priority = "Acil"
-                        else:
-                            new_priority = "Normal"
-                        
-                        # Hem priority hem de queue_position guncelle
-                        conn.execute(
-                            "UPDATE orders SET priority = ?, queue_position = ? WHERE id = ?",
-                            (new_priority, idx + 1, order['id'])
-                        )
+                    # Yalnizca degisen oncelikler yazilir
+                    if order.get('priority') != new_priority:
+                        priorities[order['id']] = new_priority
+                
+                # Sira anahtarlari: yalnizca yeri degisen siparisler (aralik tukenirse 1..n)
+                keys = plan_queue_keys([order.get('queue_position') for order in self.all_orders])
+                if keys is None:
+                    positions = {order['id']: idx + 1 for idx, order in enumerate(self.all_orders)}
+                else:
+                    positions = {self.all_orders[idx]['id']: key for idx, key in keys.items()}
+                
+                moved = self.source.move_order_between(*self._neighbours(keys)) if keys and len(keys) == 1 else None
+                self.source.set_queue_positions({} if moved is not None else positions, priorities)
             
-            self.status_label.setText(f"Uygulandi - K:{kritik_count} A:{acil_count-kritik_count} N:{total-acil_count}")
+            self.status_label.setText(
+                f"Uygulandi - {len(positions)} sira, {len(priorities)} oncelik yazildi - "
+                f"K:{kritik_count} A:{acil_count-kritik_count} N:{total-acil_count}"
+            )
             self.load_orders()
             
         except Exception as e:
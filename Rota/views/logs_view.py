@@ -1,17 +1,46 @@
 import sys
 from datetime import datetime
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QTableWidget, QTableWidgetItem, QHeaderView, 
+                               QTableView, QHeaderView, 
                                QPushButton, QLineEdit, QAbstractItemView)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QFont
+from PySide6.QtGui import QFont
 
 try:
-    from core.db_manager import db
     from ui.theme import Theme
 except ImportError:
     pass
 
+from ui.log_table_model import LazyLogModel, LogColumn
+
+
+def _format_date(row):
+    """YYYY-MM-DD HH:MM:SS -> DD.MM.YYYY HH:MM"""
+    raw_date = row.get('timestamp')
+    try:
+        return datetime.strptime(raw_date, "%Y-%m-%d %H:%M:%S").strftime("%d.%m.%Y  %H:%M")
+    except:
+        return str(raw_date or '')
+
+
+def _action_text(row):
+    action = str(row.get('action'))
+    if "Tamamlandi" in action:
+        return "✅ TAMAMLANDI"
+    if "Fire" in action or "Kirildi" in action:
+        return "🔥 FİRE / KIRIK"
+    return action
+
+
+def _action_color(row):
+    action = str(row.get('action'))
+    if "Tamamlandi" in action:
+        return "#27AE60"
+    if "Fire" in action or "Kirildi" in action:
+        return "#C0392B"
+    return "#3498DB"
+
+
 class LogsView(QWidget):
     def __init__(self):
         super().__init__()
@@ -57,12 +86,17 @@ class LogsView(QWidget):
         
         layout.addLayout(header)
 
-        # --- LOG TABLOSU ---
-        self.table = QTableWidget()
-        
-        columns = ["TARİH / SAAT", "PERSONEL", "İSTASYON", "DURUM", "SİPARİŞ KODU", "MÜŞTERİ"]
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
+        # --- LOG TABLOSU (sayfa sayfa yüklenir, kaydırdıkça devamı gelir) ---
+        self.model = LazyLogModel([
+            LogColumn("TARİH / SAAT", _format_date, lambda r: "#7F8C8D", font=QFont("Consolas", 10)),
+            LogColumn("PERSONEL", lambda r: str(r.get('operator_name')).upper(), font=QFont("Segoe UI", 10, QFont.Bold)),
+            LogColumn("İSTASYON", lambda r: str(r.get('station_name'))),
+            LogColumn("DURUM", _action_text, _action_color, font=QFont("Segoe UI", 10, QFont.Bold)),
+            LogColumn("SİPARİŞ KODU", lambda r: str(r.get('order_code'))),
+            LogColumn("MÜŞTERİ", lambda r: str(r.get('customer_name'))),
+        ], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         # Görünüm Ayarları
         self.table.verticalHeader().setVisible(False)
@@ -79,16 +113,15 @@ class LogsView(QWidget):
         
         # Satır stilleri
         self.table.setStyleSheet("""
-            QTableWidget { background-color: white; border: 1px solid #BDC3C7; border-radius: 6px; gridline-color: #F2F3F4; }
-            QTableWidget::item { padding: 5px; border-bottom: 1px solid #F2F3F4; }
+            QTableView { background-color: white; border: 1px solid #BDC3C7; border-radius: 6px; gridline-color: #F2F3F4; }
+            QTableView::item { padding: 5px; border-bottom: 1px solid #F2F3F4; }
         """)
         
         layout.addWidget(self.table)
 
     def refresh_data(self):
-        """Tüm logları getir"""
-        data = db.get_system_logs()
-        self.fill_table(data)
+        """Tüm logları getir (ilk sayfa hemen, devamı kaydırdıkça)"""
+        self.model.query()
 
     def search_logs(self):
         """Arama yap"""
@@ -97,55 +130,4 @@ class LogsView(QWidget):
             self.refresh_data()
             return
             
-        data = db.search_logs(keyword)
-        self.fill_table(data)
-
-    def fill_table(self, data):
-        """Tabloyu doldurur"""
-        self.table.setRowCount(0)
-        self.table.setRowCount(len(data))
-        
-        for row_idx, item in enumerate(data):
-            # Tarih Formatı (YYYY-MM-DD HH:MM:SS -> DD.MM HH:MM)
-            raw_date = item['timestamp']
-            try:
-                dt = datetime.strptime(raw_date, "%Y-%m-%d %H:%M:%S")
-                date_str = dt.strftime("%d.%m.%Y  %H:%M")
-            except:
-                date_str = raw_date
-
-            # 1. Tarih
-            cell_date = QTableWidgetItem(date_str)
-            cell_date.setForeground(QColor("#7F8C8D")) # Gri tarih
-            cell_date.setFont(QFont("Consolas", 10))
-            self.table.setItem(row_idx, 0, cell_date)
-            
-            # 2. Personel
-            cell_user = QTableWidgetItem(str(item['operator_name']).upper())
-            cell_user.setFont(QFont("Segoe UI", 10, QFont.Bold))
-            self.table.setItem(row_idx, 1, cell_user)
-            
-            # 3. İstasyon
-            self.table.setItem(row_idx, 2, QTableWidgetItem(str(item['station_name'])))
-            
-            # 4. Durum (Renkli)
-            action = str(item['action'])
-            cell_action = QTableWidgetItem(action)
-            cell_action.setFont(QFont("Segoe UI", 10, QFont.Bold))
-            
-            if "Tamamlandi" in action:
-                cell_action.setText("✅ TAMAMLANDI")
-                cell_action.setForeground(QColor("#27AE60"))
-            elif "Fire" in action or "Kirildi" in action:
-                cell_action.setText("🔥 FİRE / KIRIK")
-                cell_action.setForeground(QColor("#C0392B"))
-            else:
-                cell_action.setForeground(QColor("#3498DB"))
-                
-            self.table.setItem(row_idx, 3, cell_action)
-            
-            # 5. Sipariş
-            self.table.setItem(row_idx, 4, QTableWidgetItem(str(item['order_code'])))
-            
-            # 6. Müşteri
-            self.table.setItem(row_idx, 5, QTableWidgetItem(str(item['customer_name'])))
\ No newline at end of file
+        self.model.query(keyword=keyword)
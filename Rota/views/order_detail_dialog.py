@@ -14,7 +14,7 @@ from PySide6.QtWidgets import (
     QFrame, QPushButton, QScrollArea, QWidget,
     QGridLayout, QProgressBar
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
 from datetime import datetime, timedelta
 
@@ -23,29 +23,28 @@ try:
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+from ui.theme import Theme, ExcelColors
+
 
 # =============================================================================
 # TEMA
 # =============================================================================
-class Colors:
-    BG = "#FFFFFF"
-    HEADER_BG = "#F3F3F3"
-    BORDER = "#D4D4D4"
-    GRID = "#E0E0E0"
-    TEXT = "#1A1A1A"
-    TEXT_SECONDARY = "#666666"
-    TEXT_MUTED = "#999999"
-    ACCENT = "#217346"
-    ROW_ALT = "#F9F9F9"
-    
-    CRITICAL = "#C00000"
-    CRITICAL_BG = "#FDE8E8"
-    WARNING = "#C65911"
-    WARNING_BG = "#FFF3E0"
-    SUCCESS = "#107C41"
-    SUCCESS_BG = "#E6F4EA"
-    INFO = "#0066CC"
-    INFO_BG = "#E3F2FD"
+class Colors(ExcelColors):
+    """Excel paleti (rota satiri stilleri ui/styles.qss'te)"""
+
+
+# Rota durumu -> (ikon, metin); renkler uygulama stilinde [status=...]
+ROUTE_STATES = {
+    'completed': ("●", "Tamamlandı"),
+    'partial': ("◐", "Devam ediyor"),
+    'current': ("▶", "Sırada"),
+    'pending': ("○", "Bekliyor"),
+}
 
 
 # =============================================================================
@@ -101,10 +100,15 @@ class OrderDetailDialog(QDialog):
         self.load_order_data()
         self.setup_ui()
         
-        # Canli yenileme (3 saniye)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_data)
-        self.timer.start(3000)
+        # Canli yenileme (merkezi koordinator: yalnizca bu siparis degisince)
+        self.subscription = None
+        if refresh_coordinator:
+            self.subscription = refresh_coordinator.subscribe(("orders", "progress"), self.on_data_changed, owner=self)
+    
+    def on_data_changed(self, event):
+        changed_ids = event.ids("orders", "progress")
+        if changed_ids is None or self.order.get('id') in changed_ids:
+            self.refresh_data()
     
     def load_order_data(self):
         """Veritabanindan siparis bilgilerini cek"""
@@ -190,14 +194,9 @@ class OrderDetailDialog(QDialog):
                 layout.addStretch()
     
     def setup_ui(self):
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {Colors.BG};
-            }}
-            QLabel {{
-                color: {Colors.TEXT};
-            }}
-        """)
+        # Dialog/etiket varsayilanlari uygulama stilinde (QDialog#OrderDetailDialog);
+        # secicisiz ata stili rota satiri kurallarini ezerdi
+        self.setObjectName("OrderDetailDialog")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -216,9 +215,9 @@ class OrderDetailDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet(f"background-color: {Colors.BG};")
         
         self.content_widget = QWidget()
+        self.content_widget.setObjectName("OrderDetailContent")
         content_layout = QVBoxLayout(self.content_widget)
         content_layout.setContentsMargins(20, 16, 20, 16)
         content_layout.setSpacing(16)
@@ -498,13 +497,7 @@ class OrderDetailDialog(QDialog):
         
         # Istasyon listesi
         content = QFrame()
-        content.setStyleSheet(f"""
-            QFrame {{
-                background-color: {Colors.BG};
-                border: 1px solid {Colors.BORDER};
-                border-radius: 4px;
-            }}
-        """)
+        content.setObjectName("RouteStationList")
         
         content_layout = QVBoxLayout(content)
         content_layout.setContentsMargins(8, 8, 8, 8)
@@ -564,97 +557,56 @@ class OrderDetailDialog(QDialog):
         return None
     
     def _create_station_row(self, station, done, total, status):
-        """Tek istasyon satiri"""
+        """Tek istasyon satiri (stil: QFrame#RouteStationRow[status=...])"""
+        if status not in ROUTE_STATES:
+            status = 'pending'
+        icon, status_text = ROUTE_STATES[status]
+        
         row = QFrame()
+        row.setObjectName("RouteStationRow")
+        row.setProperty("status", status)
         row.setFixedHeight(36)
         
-        if status == 'completed':
-            bg_color = Colors.SUCCESS_BG
-            border_color = Colors.SUCCESS
-            icon = "●"
-            icon_color = Colors.SUCCESS
-        elif status == 'partial':
-            bg_color = Colors.WARNING_BG
-            border_color = Colors.WARNING
-            icon = "◐"
-            icon_color = Colors.WARNING
-        elif status == 'current':
-            bg_color = Colors.INFO_BG
-            border_color = Colors.INFO
-            icon = "▶"
-            icon_color = Colors.INFO
-        else:
-            bg_color = Colors.BG
-            border_color = Colors.BORDER
-            icon = "○"
-            icon_color = Colors.TEXT_MUTED
-        
-        row.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border: 1px solid {border_color};
-                border-radius: 3px;
-            }}
-        """)
-        
         layout = QHBoxLayout(row)
         layout.setContentsMargins(10, 0, 10, 0)
         layout.setSpacing(10)
         
         # Ikon
         lbl_icon = QLabel(icon)
+        lbl_icon.setObjectName("RouteStationIcon")
+        lbl_icon.setProperty("status", status)
         lbl_icon.setFixedWidth(16)
-        lbl_icon.setStyleSheet(f"color: {icon_color}; font-size: 12px;")
         layout.addWidget(lbl_icon)
         
         # Istasyon adi
         lbl_name = QLabel(station)
+        lbl_name.setObjectName("RouteStationName")
         lbl_name.setFixedWidth(120)
-        lbl_name.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {Colors.TEXT};")
         layout.addWidget(lbl_name)
         
         # Ilerleme
         pct = int((done / total * 100)) if total > 0 else 0
         
         progress = QProgressBar()
+        progress.setObjectName("RouteStationGauge")
+        progress.setProperty("status", status)
         progress.setFixedSize(80, 6)
         progress.setValue(pct)
         progress.setTextVisible(False)
-        
-        chunk_color = icon_color if status != 'pending' else Colors.GRID
-        progress.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: {Colors.GRID};
-                border: none;
-                border-radius: 3px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {chunk_color};
-                border-radius: 3px;
-            }}
-        """)
         layout.addWidget(progress)
         
         # Adet bilgisi
         lbl_qty = QLabel(f"{done}/{total}")
+        lbl_qty.setObjectName("RouteStationQty")
         lbl_qty.setFixedWidth(60)
-        lbl_qty.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_SECONDARY};")
         layout.addWidget(lbl_qty)
         
         layout.addStretch()
         
         # Durum metni
-        if status == 'completed':
-            status_text = "Tamamlandı"
-        elif status == 'partial':
-            status_text = "Devam ediyor"
-        elif status == 'current':
-            status_text = "Sırada"
-        else:
-            status_text = "Bekliyor"
-        
         lbl_status = QLabel(status_text)
-        lbl_status.setStyleSheet(f"font-size: 10px; color: {icon_color};")
+        lbl_status.setObjectName("RouteStationStatus")
+        lbl_status.setProperty("status", status)
         layout.addWidget(lbl_status)
         
         return row
@@ -772,8 +724,9 @@ class OrderDetailDialog(QDialog):
         return footer
     
     def closeEvent(self, event):
-        """Dialog kapanirken timer'i durdur"""
-        self.timer.stop()
+        """Dialog kapanirken aboneligi kaldir"""
+        if self.subscription:
+            refresh_coordinator.unsubscribe(self.subscription)
         super().closeEvent(event)
 
 
@@ -782,6 +735,7 @@ if __name__ == "__main__":
     import sys
     
     app = QApplication(sys.argv)
+    Theme.apply_app_style(app)
     app.setFont(QFont("Segoe UI", 9))
     
     # Test icin ornek siparis kodu
@@ -1,16 +1,23 @@
 """
 EFES ROTA X - Siparis Listesi
 Excel temali, Anlik Konum sutunu ile
+
+Tablo model/view uzerinde calisir: OrderTableModel satirlari siparis id ile
+tutar, yenilemede yalnizca degisen satirlar icin dataChanged / satir ekleme /
+silme yayinlanir; degisiklikler merkezi yenileme koordinatorunden gelir.
+Arama ve siralama QSortFilterProxyModel ile yapilir; secim ve kaydirma
+konumu yenilemede korunur. Veri OrdersViewModel ile arka planda okunur ve
+satirlara cevrilir; tablo SQLite beklerken donmaz.
 """
 
 import sys
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTableWidget, QTableWidgetItem, 
+    QPushButton, QTableView, 
     QHeaderView, QFrame, QLineEdit, QAbstractItemView, 
     QMessageBox, QApplication, QProgressBar
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PySide6.QtGui import QColor, QFont, QBrush
 
 try:
@@ -18,6 +25,13 @@ try:
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+from core.view_models import OrdersViewModel
+
 try:
     from views.add_order_dialog import AddOrderDialog
 except ImportError:
@@ -82,22 +96,203 @@ class FactoryConfig:
             return 999
 
 
+# =============================================================================
+# TABLO MODELI
+# =============================================================================
+def status_color(status):
+    if "Beklemede" in status:
+        return Colors.WARNING
+    if "Üretimde" in status:
+        return Colors.INFO
+    if "Tamamlandı" in status:
+        return Colors.SUCCESS
+    if "Sevk" in status:
+        return Colors.TEXT_MUTED
+    if "Hata" in status or "Fire" in status:
+        return Colors.CRITICAL
+    return Colors.TEXT_MUTED
+
+
+def build_row(order, location):
+    """
+    Siparisin tablo satiri: sutun basina (metin, renk, kalin, hizalama, siralama degeri)
+    Satirlar karsilastirilabilir; degismeyen siparis icin sinyal yayinlanmaz.
+    """
+    priority = order.get('priority', 'Normal')
+    status = order.get('status', 'Beklemede')
+    left = int(Qt.AlignLeft | Qt.AlignVCenter)
+    center = int(Qt.AlignCenter)
+    
+    text_color = Colors.TEXT
+    is_bold = False
+    prefix = ""
+    if status == "Sevk Edildi":
+        text_color = Colors.TEXT_MUTED
+    elif priority == "Kritik":
+        prefix = "⚠ "
+        text_color = Colors.CRITICAL
+        is_bold = True
+    elif priority == "Acil":
+        prefix = "⚡ "
+        text_color = Colors.WARNING
+        is_bold = True
+    
+    code = str(order.get('order_code', ''))
+    customer = str(order.get('customer_name', ''))
+    product = f"{order.get('thickness', '')}mm {order.get('product_type', '')}"
+    quantity = order.get('quantity', 0)
+    delivery = order.get('delivery_date', '')
+    return (
+        (prefix + code, text_color, is_bold, left, code),
+        (customer, text_color, False, left, customer.lower()),
+        (product, Colors.TEXT_SECONDARY, False, left, product),
+        (str(quantity), Colors.TEXT, False, center, quantity or 0),
+        (status, status_color(status), True, center, status),
+        (f"{location['icon']} {location['text']}", location['color'], False, left, location['progress']),
+        (str(delivery) if delivery else "-", Colors.TEXT_SECONDARY, False, center, str(delivery or "")),
+    )
+
+
+class OrderTableModel(QAbstractTableModel):
+    """Siparis tablosu (satirlar siparis id ile anahtarli)"""
+    
+    HEADERS = ["Siparis Kodu", "Musteri", "Urun", "Adet", "Durum", "Anlik Konum", "Teslim"]
+    ORDER_ID_ROLE = Qt.UserRole
+    SORT_ROLE = Qt.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders = []        # satir -> siparis dict
+        self.rows = []          # satir -> build_row ciktisi
+        self.row_of = {}        # order_id -> satir
+        self._bold = QFont()
+        self._bold.setBold(True)
+    
+    # Qt arayuzu
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        text, color, bold, align, sort_value = self.rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.ForegroundRole:
+            return QColor(color)
+        if role == Qt.FontRole and bold:
+            return self._bold
+        if role == Qt.TextAlignmentRole:
+            return align
+        if role == self.SORT_ROLE:
+            return sort_value
+        if role == self.ORDER_ID_ROLE:
+            return self.orders[index.row()].get('id')
+        return None
+    
+    def order_at(self, row):
+        return self.orders[row] if 0 <= row < len(self.orders) else None
+    
+    # Farka dayali guncelleme
+    def set_orders(self, entries):
+        """Tam liste [(siparis, satir), ...]: listede olmayanlar silinir"""
+        if not self.rows:
+            self.beginResetModel()
+            self.orders = [order for order, _ in entries]
+            self.rows = [row for _, row in entries]
+            self._reindex()
+            self.endResetModel()
+            return
+        keep = {order['id'] for order, _ in entries}
+        self.apply(entries, [oid for oid in self.row_of if oid not in keep])
+    
+    def apply(self, entries, removed_ids=()):
+        """Degisen siparisleri uygula: guncellenen yerinde, silinen cikar, yeni en uste"""
+        self._remove(removed_ids)
+        
+        changed = []
+        new = []
+        for order, row in entries:
+            index = self.row_of.get(order['id'])
+            if index is None:
+                new.append((order, row))
+                continue
+            self.orders[index] = order
+            if self.rows[index] != row:
+                self.rows[index] = row
+                changed.append(index)
+        
+        for first, last in self._ranges(sorted(changed)):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+        
+        if new:
+            # Yeni siparisler en yeni kayitlardir (liste created_at DESC)
+            self.beginInsertRows(QModelIndex(), 0, len(new) - 1)
+            self.orders[:0] = [order for order, _ in new]
+            self.rows[:0] = [row for _, row in new]
+            self._reindex()
+            self.endInsertRows()
+        return bool(changed or new)
+    
+    def _remove(self, order_ids):
+        indexes = sorted((self.row_of[oid] for oid in order_ids if oid in self.row_of), reverse=True)
+        for last, first in self._ranges(indexes, step=-1):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.orders[first:last + 1]
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+        if indexes:
+            self._reindex()
+    
+    def _reindex(self):
+        self.row_of = {order['id']: i for i, order in enumerate(self.orders)}
+    
+    @staticmethod
+    def _ranges(indexes, step=1):
+        """Ardisik indeksleri (ilk, son) araliklarina bol"""
+        ranges = []
+        for i in indexes:
+            if ranges and i == ranges[-1][1] + step:
+                ranges[-1][1] = i
+            else:
+                ranges.append([i, i])
+        return [tuple(r) for r in ranges]
+
+
 # =============================================================================
 # ANA WIDGET
 # =============================================================================
 class OrdersView(QWidget):
+    FULL_RELOAD_THRESHOLD = 2000     # Bundan fazla siparis degistiyse tam yukleme
+    
     def __init__(self):
         super().__init__()
-        self.all_orders = []
+        self.model = OrderTableModel(self)
         self.setup_ui()
         
-        # Canli yenileme (3 saniye)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_data_silent)
-        self.timer.start(3000)
+        # Veri worker thread'de okunur ve satirlara cevrilir (build_entries)
+        self.vm = OrdersViewModel(self.build_entries, self)
+        self.vm.data_ready.connect(self.apply_entries)
+        self.vm.changes_ready.connect(lambda changes: self.apply_entries(*changes))
+        self.vm.failed.connect(lambda msg: print(f"Veri cekme hatasi: {msg}"))
+        
+        # Canli yenileme: merkezi koordinatorden sadece degisen siparisler
+        if refresh_coordinator:
+            refresh_coordinator.subscribe(("orders", "progress"), self.on_data_changed, owner=self)
         
-        self.selected_code = ""  # Secili siparis kodu
         self.refresh_data()
+    
+    @property
+    def all_orders(self):
+        return self.model.orders
 
     def setup_ui(self):
         self.setStyleSheet(f"background-color: {Colors.BG};")
@@ -205,14 +400,19 @@ class OrdersView(QWidget):
         layout.addWidget(header)
         
         # === TABLO ===
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Siparis Kodu", "Musteri", "Urun", "Adet", "Durum", "Anlik Konum", "Teslim"
-        ])
+        # Arama / siralama proxy uzerinden (tum sutunlarda, buyuk-kucuk harf duyarsiz)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(-1)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy.setSortRole(OrderTableModel.SORT_ROLE)
+        
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         
         # Tablo ayarlari
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table.verticalHeader().setDefaultSectionSize(42)
         self.table.setShowGrid(True)
         self.table.setGridStyle(Qt.SolidLine)
@@ -222,6 +422,10 @@ class OrdersView(QWidget):
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setFocusPolicy(Qt.NoFocus)
         
+        # Baslik tiklaninca siralama; baslangicta veritabani sirasi (en yeni ustte)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        
         # Cift tiklama
         self.table.doubleClicked.connect(self.open_order_detail)
         
@@ -239,18 +443,18 @@ class OrdersView(QWidget):
         
         # Tablo stili
         self.table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {Colors.BG};
                 alternate-background-color: {Colors.ROW_ALT};
                 border: none;
                 gridline-color: {Colors.GRID};
                 font-size: 11px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 4px 8px;
                 border-bottom: 1px solid {Colors.GRID};
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {Colors.SELECTION};
                 color: {Colors.TEXT};
             }}
@@ -311,8 +515,11 @@ class OrdersView(QWidget):
     # =========================================================================
     # ANLIK KONUM HESAPLAMA
     # =========================================================================
-    def get_current_location(self, order):
-        """Siparişin anlık konumunu hesapla"""
+    def get_current_location(self, order, progress=None):
+        """
+        Siparişin anlık konumunu hesapla
+        progress: {istasyon: tamamlanan adet} (verilmezse tek sorguyla okunur)
+        """
         order_id = order.get('id')
         route = order.get('route', '')
         quantity = order.get('quantity', 0)
@@ -333,6 +540,9 @@ class OrdersView(QWidget):
         if "Hata" in status or "Fire" in status:
             return {"text": "Fire/Hatalı", "icon": "✗", "color": Colors.CRITICAL, "progress": 0}
         
+        if progress is None:
+            progress = db.get_station_progress_map([order_id]).get(order_id, {})
+        
         # Rota istasyonlari
         route_stations = [s.strip() for s in route.split(',') if s.strip()]
         
@@ -347,7 +557,7 @@ class OrdersView(QWidget):
             if station in ["SEVKIYAT", "SEVKİYAT"]:
                 continue
             
-            done = db.get_station_progress(order_id, station)
+            done = progress.get(station, 0)
             
             if done >= quantity:
                 # Bu istasyon tamamlandi
@@ -397,171 +607,76 @@ class OrdersView(QWidget):
     # =========================================================================
     # VERI ISLEMLERI
     # =========================================================================
-    def refresh_data(self):
-        """Verileri yenile"""
-        if not db:
+    def build_entries(self, orders, progress):
+        """
+        Siparisleri tablo satirlarina cevir; uretim girisine gore durumu guncelle
+        (ViewModel uzerinden worker thread'de cagrilir, widget'lara dokunmaz)
+        """
+        entries = []
+        for order in orders:
+            location = self.get_current_location(order, progress.get(order.get('id'), {}))
+            self.sync_status(order, location)
+            entries.append((order, build_row(order, location)))
+        return entries
+    
+    def sync_status(self, order, location):
+        """Siparis durumlarini guncelle (uretim girisi yapilmissa)"""
+        order_id = order.get('id')
+        if not order_id or order.get('status') in ['Sevk Edildi', 'Hatalı/Fire']:
             return
-        
-        v_scroll = self.table.verticalScrollBar().value()
-        
-        try:
-            # Her seferinde taze veri cek
-            self.all_orders = db.get_all_orders()
-            
-            # Siparis durumlarini guncelle (uretim girisi yapilmissa)
-            for order in self.all_orders:
-                order_id = order.get('id')
-                if order_id and order.get('status') not in ['Sevk Edildi', 'Hatalı/Fire']:
-                    # Anlık durumu kontrol et
-                    location = self.get_current_location(order)
-                    # Eger tum istasyonlar bitmisse ve durum "Tamamlandı" degilse guncelle
-                    if location.get('progress') == 100 and location.get('text') == 'Tamamlandı':
-                        if order.get('status') != 'Tamamlandı':
-                            try:
-                                db.update_order_status(order_id, 'Tamamlandı')
-                                order['status'] = 'Tamamlandı'
-                            except:
-                                pass
-                    # Eger uretim baslamissa ve durum "Beklemede" ise "Uretimde" yap
-                    elif location.get('progress', 0) > 0 or '(' in location.get('text', ''):
-                        if order.get('status') == 'Beklemede':
-                            try:
-                                db.update_order_status(order_id, 'Üretimde')
-                                order['status'] = 'Üretimde'
-                            except:
-                                pass
-        except Exception as e:
-            print(f"Veri cekme hatasi: {e}")
-            self.all_orders = []
-        
-        self.populate_table(self.all_orders)
+        # Eger tum istasyonlar bitmisse ve durum "Tamamlandı" degilse guncelle
+        if location.get('progress') == 100 and location.get('text') == 'Tamamlandı':
+            if order.get('status') != 'Tamamlandı':
+                try:
+                    db.update_order_status(order_id, 'Tamamlandı')
+                    order['status'] = 'Tamamlandı'
+                except:
+                    pass
+        # Eger uretim baslamissa ve durum "Beklemede" ise "Uretimde" yap
+        elif location.get('progress', 0) > 0 or '(' in location.get('text', ''):
+            if order.get('status') == 'Beklemede':
+                try:
+                    db.update_order_status(order_id, 'Üretimde')
+                    order['status'] = 'Üretimde'
+                except:
+                    pass
+    
+    def refresh_data(self):
+        """Tum siparisleri oku, tabloya farkla uygula (secim ve kaydirma korunur)"""
+        if db:
+            self.vm.reload()
+    
+    def apply_entries(self, entries, removed_ids=None):
+        """Hazir satirlari tabloya uygula (removed_ids verilirse artimli)"""
+        if removed_ids is None:
+            self.model.set_orders(entries)
+        else:
+            self.model.apply(entries, removed_ids)
         self.update_summary()
-        
-        self.table.verticalScrollBar().setValue(v_scroll)
-
-    def refresh_data_silent(self):
-        """Sessiz yenileme - secimi ve scroll'u koruyarak"""
-        # Mevcut secimi kaydet
-        selected_row = -1
-        selected_items = self.table.selectedItems()
-        if selected_items:
-            selected_row = selected_items[0].row()
-            # Secili satirın kodunu kaydet (satir numarasi degisebilir)
-            code_item = self.table.item(selected_row, 0)
-            if code_item:
-                self.selected_code = code_item.text().replace("⚠ ", "").replace("⚡ ", "").strip()
-        
-        # Veriyi yenile
-        self.refresh_data()
-        
-        # Eger arama aktifse filtreyi tekrar uygula
-        if self.search_input.text():
-            self.filter_table(self.search_input.text())
-        
-        # Secimi geri yukle (kod ile esleseni bul)
-        if hasattr(self, 'selected_code') and self.selected_code:
-            for row in range(self.table.rowCount()):
-                item = self.table.item(row, 0)
-                if item:
-                    code = item.text().replace("⚠ ", "").replace("⚡ ", "").strip()
-                    if code == self.selected_code:
-                        self.table.selectRow(row)
-                        break
-
-    def populate_table(self, orders):
-        """Tabloyu doldur"""
-        self.table.setRowCount(len(orders))
-        self.lbl_count.setText(f"{len(orders)} siparis")
-        
-        for row, order in enumerate(orders):
-            self.populate_row(row, order)
-
-    def populate_row(self, row, order):
-        """Tek satir doldur"""
-        priority = order.get('priority', 'Normal')
-        status = order.get('status', 'Beklemede')
-        
-        # Renk ve stil
-        text_color = Colors.TEXT
-        bg_color = Colors.BG if row % 2 == 0 else Colors.ROW_ALT
-        is_bold = False
-        prefix = ""
-        
-        if status == "Sevk Edildi":
-            text_color = Colors.TEXT_MUTED
-        elif priority == "Kritik":
-            prefix = "⚠ "
-            text_color = Colors.CRITICAL
-            is_bold = True
-        elif priority == "Acil":
-            prefix = "⚡ "
-            text_color = Colors.WARNING
-            is_bold = True
-        
-        # 1. Siparis Kodu
-        code_text = prefix + str(order.get('order_code', ''))
-        item_code = QTableWidgetItem(code_text)
-        item_code.setForeground(QColor(text_color))
-        if is_bold:
-            font = item_code.font()
-            font.setBold(True)
-            item_code.setFont(font)
-        self.table.setItem(row, 0, item_code)
-        
-        # 2. Musteri
-        item_customer = QTableWidgetItem(str(order.get('customer_name', '')))
-        item_customer.setForeground(QColor(text_color))
-        self.table.setItem(row, 1, item_customer)
-        
-        # 3. Urun
-        product = f"{order.get('thickness', '')}mm {order.get('product_type', '')}"
-        item_product = QTableWidgetItem(product)
-        item_product.setForeground(QColor(Colors.TEXT_SECONDARY))
-        self.table.setItem(row, 2, item_product)
-        
-        # 4. Adet
-        item_qty = QTableWidgetItem(str(order.get('quantity', 0)))
-        item_qty.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 3, item_qty)
-        
-        # 5. Durum
-        item_status = QTableWidgetItem(status)
-        item_status.setTextAlignment(Qt.AlignCenter)
-        
-        status_color = Colors.TEXT_MUTED
-        if "Beklemede" in status:
-            status_color = Colors.WARNING
-        elif "Üretimde" in status:
-            status_color = Colors.INFO
-        elif "Tamamlandı" in status:
-            status_color = Colors.SUCCESS
-        elif "Sevk" in status:
-            status_color = Colors.TEXT_MUTED
-        elif "Hata" in status or "Fire" in status:
-            status_color = Colors.CRITICAL
-        
-        item_status.setForeground(QColor(status_color))
-        font = item_status.font()
-        font.setBold(True)
-        item_status.setFont(font)
-        self.table.setItem(row, 4, item_status)
-        
-        # 6. Anlik Konum
-        location = self.get_current_location(order)
-        location_text = f"{location['icon']} {location['text']}"
-        item_location = QTableWidgetItem(location_text)
-        item_location.setForeground(QColor(location['color']))
-        self.table.setItem(row, 5, item_location)
-        
-        # 7. Teslim Tarihi
-        delivery = order.get('delivery_date', '')
-        item_date = QTableWidgetItem(str(delivery) if delivery else "-")
-        item_date.setTextAlignment(Qt.AlignCenter)
-        item_date.setForeground(QColor(Colors.TEXT_SECONDARY))
-        self.table.setItem(row, 6, item_date)
+
+    def on_data_changed(self, event):
+        """Koordinator olayi: degisen siparisleri uygula (akis budandiysa tam yukleme)"""
+        changed_ids = event.ids("orders", "progress")
+        if changed_ids is None or len(changed_ids) > self.FULL_RELOAD_THRESHOLD:
+            self.refresh_data()
+            return
+        if changed_ids:
+            self.apply_changes(changed_ids)
+    
+    def apply_changes(self, changed_ids):
+        """Degisen siparisleri tabloya uygula (silinenler cikar, yeniler uste)"""
+        self.vm.update(changed_ids)
+
+    def selected_order(self):
+        """Secili satirin siparisi (proxy -> kaynak model)"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.order_at(self.proxy.mapToSource(rows[0]).row())
 
     def update_summary(self):
         """Alt bar ozetini guncelle"""
+        self.lbl_count.setText(f"{len(self.all_orders)} siparis")
         if not self.all_orders:
             self.lbl_summary.setText("")
             return
@@ -576,14 +691,7 @@ class OrdersView(QWidget):
 
     def filter_table(self, text):
         """Tablo filtrele"""
-        for i in range(self.table.rowCount()):
-            match = False
-            for j in range(self.table.columnCount()):
-                item = self.table.item(i, j)
-                if item and text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.table.setRowHidden(i, not match)
+        self.proxy.setFilterFixedString(text)
 
     # =========================================================================
     # DIALOG ISLEMLERI
@@ -603,8 +711,8 @@ class OrdersView(QWidget):
 
     def open_label_printer(self):
         """Etiket basma dialogu"""
-        selected = self.table.selectedItems()
-        if not selected:
+        target_order = self.selected_order()
+        if not target_order:
             QMessageBox.warning(self, "Secim Yok", "Lutfen etiket basilacak siparisi secin!")
             return
         
@@ -612,17 +720,6 @@ class OrdersView(QWidget):
             QMessageBox.warning(self, "Hata", "Etiket modulu yuklenemedi.")
             return
         
-        row = selected[0].row()
-        raw_code = self.table.item(row, 0).text()
-        code = raw_code.replace("⚠ ", "").replace("⚡ ", "").strip()
-        
-        # Siparisi bul
-        target_order = None
-        for o in self.all_orders:
-            if o.get('order_code') == code:
-                target_order = o
-                break
-        
         if target_order:
             try:
                 dialog = LabelDialog({
@@ -641,17 +738,15 @@ class OrdersView(QWidget):
 
     def open_order_detail(self):
         """Siparis detay dialogu"""
-        selected = self.table.selectedItems()
-        if not selected:
+        order = self.selected_order()
+        if not order:
             return
         
         if OrderDetailDialog is None:
             QMessageBox.warning(self, "Hata", "Siparis detay modulu yuklenemedi.")
             return
         
-        row = selected[0].row()
-        raw_code = self.table.item(row, 0).text()
-        code = raw_code.replace("⚠ ", "").replace("⚡ ", "").strip()
+        code = order.get('order_code', '')
         
         try:
             dialog = OrderDetailDialog(code)
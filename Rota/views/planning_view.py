@@ -1,15 +1,15 @@
 import sys
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QTableWidget, QTableWidgetItem, QHeaderView, 
-                               QPushButton, QAbstractItemView, QStyledItemDelegate, 
-                               QDialog, QListWidget, QMessageBox, QStyle)
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor, QFont, QBrush
+                               QPushButton, QDialog, QListWidget, QMessageBox, QComboBox)
+from PySide6.QtCore import Qt
 
 try:
     from ui.theme import Theme
-    from core.smart_planner import planner 
+    from ui.gantt_chart import GanttChart, ZOOM_LEVELS, FIT, nearest_zoom
+    from core.db_manager import db
+    from core.plan_worker import PlanRunner
+    from core.refresh_coordinator import refresh_coordinator
     try:
         from views.weekly_schedule_dialog import WeeklyScheduleView
     except ImportError:
@@ -17,56 +17,10 @@ try:
 except ImportError:
     pass
 
-# --- ÖZEL BOYACI SINIFI (DELEGATE) ---
-class GanttDelegate(QStyledItemDelegate):
-    def paint(self, painter, option, index):
-        bg_color = index.data(Qt.UserRole)      
-        text_color = index.data(Qt.UserRole + 1) 
-        text = index.data(Qt.DisplayRole)        
-
-        painter.save()
-        if bg_color:
-            painter.fillRect(option.rect, bg_color)
-        else:
-            painter.fillRect(option.rect, QColor(Theme.SURFACE))
-
-        if option.state & QStyle.State_Selected:
-            pen = painter.pen()
-            pen.setColor(QColor(Theme.PRIMARY))
-            pen.setWidth(2)
-            painter.setPen(pen)
-            painter.drawRect(option.rect.adjusted(1,1,-1,-1))
-
-        if text:
-            painter.setPen(text_color if text_color else Qt.black)
-            
-            lines = text.split('\n')
-            
-            # Yüzde Fontu
-            font_percent = QFont("Arial", 10, QFont.Bold)
-            painter.setFont(font_percent)
-            
-            rect = option.rect
-            
-            if len(lines) > 1:
-                # Üst Satır: Yüzde
-                painter.drawText(rect.adjusted(0, -8, 0, 0), Qt.AlignCenter, lines[0])
-                
-                # Alt Satır: m2 (Daha küçük)
-                font_m2 = QFont("Segoe UI", 8)
-                painter.setFont(font_m2)
-
-                # Eğer zemin koyu ise yazıyı beyaz yap, yoksa gri
-                if bg_color and bg_color.name() in [Theme.DANGER, Theme.WARNING, Theme.SUCCESS]:
-                     painter.setPen(QColor("white"))
-                else:
-                     painter.setPen(QColor(Theme.TEXT_SECONDARY))
-                     
-                painter.drawText(rect.adjusted(0, 10, 0, 0), Qt.AlignCenter, lines[1])
-            else:
-                painter.drawText(rect, Qt.AlignCenter, text)
-
-        painter.restore()
+try:
+    from core.smart_planner import planner
+except ImportError:
+    planner = None
 
 # --- DETAY PENCERESİ ---
 class DayDetailDialog(QDialog):
@@ -167,14 +121,21 @@ class PlanningView(QWidget):
         
         self.DAYS_RANGE = 30 
         self.cached_details = {}
+        self._data_version = None
+        self._plan_date = None
+        self.source = None              # None = canlı veritabanı, aksi halde what-if sandbox'ı
+        self._zoom_preset = False       # ölçek seçiciden değiştiriliyor (geri senkron yok)
         
         self.setup_ui()
-        self.init_table_structure()
-        self.table.setItemDelegate(GanttDelegate())
         
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_plan)
-        self.timer.start(5000) 
+        # Hesaplama arka planda; yeni istek eskisini iptal eder
+        self.runner = PlanRunner(self)
+        self.runner.result_ready.connect(self.apply_plan)
+        
+        # Sabit aralıklı yeniden hesaplama yerine: sadece veri veya gün değişince hesapla
+        # (merkezi koordinatör olayı; ekran gizliyken bekler)
+        refresh_coordinator.subscribe(("orders", "progress", "capacities", "calendar", "day"),
+                                      lambda event: self.check_for_changes(), owner=self)
         self.refresh_plan()
 
     def setup_ui(self):
@@ -195,7 +156,7 @@ class PlanningView(QWidget):
             color: {Theme.TEXT_PRIMARY};
         """)
 
-        sub_title = QLabel("Kutulara tıklayarak iş listesini görüntüleyin")
+        sub_title = QLabel("Çubukların üzerine gelerek ayrıntıyı görün, tıklayarak günün iş listesini açın (Ctrl + tekerlek: yakınlaştır)")
         sub_title.setStyleSheet(f"""
             color: {Theme.TEXT_SECONDARY};
             font-size: 14px;
@@ -229,9 +190,29 @@ class PlanningView(QWidget):
             header.addWidget(btn_list)
         except: pass
 
+        # Planlama ufku (gün)
+        self.combo_horizon = QComboBox()
+        # Stil uygulama stilinde (QComboBox#PlanningCombo)
+        self.combo_horizon.setObjectName("PlanningCombo")
+        for days in (planner.HORIZON_OPTIONS if planner else (self.DAYS_RANGE,)):
+            self.combo_horizon.addItem(f"{days} GÜN", days)
+        self.combo_horizon.setFixedHeight(40)
+        self.combo_horizon.currentIndexChanged.connect(self.on_horizon_changed)
+        header.addWidget(self.combo_horizon)
+
+        # Zaman ölçeği (saatten aya)
+        self.combo_zoom = QComboBox()
+        for name in list(ZOOM_LEVELS) + [FIT]:
+            self.combo_zoom.addItem(name.upper(), name)
+        self.combo_zoom.setCurrentIndex(self.combo_zoom.findData("Gün"))
+        self.combo_zoom.setObjectName("PlanningCombo")
+        self.combo_zoom.setFixedHeight(40)
+        self.combo_zoom.activated.connect(self.on_zoom_selected)
+        header.addWidget(self.combo_zoom)
+
         btn_refresh = QPushButton("GUNCELLE")
         btn_refresh.setCursor(Qt.PointingHandCursor)
-        btn_refresh.clicked.connect(self.refresh_plan)
+        btn_refresh.clicked.connect(lambda: self.refresh_plan(force=True))
         btn_refresh.setFixedHeight(40)
         btn_refresh.setStyleSheet(f"""
             QPushButton {{
@@ -250,9 +231,18 @@ class PlanningView(QWidget):
         header.addWidget(btn_refresh)
         layout.addLayout(header)
 
-        self.table = QTableWidget()
-        self.table.cellClicked.connect(self.on_cell_clicked)
-        layout.addWidget(self.table)
+        # Gantt: sipariş çubukları aralık verisinden çizilir (görünür bölge kadar)
+        self.chart = GanttChart(self.machines, self.DAYS_RANGE)
+        self.chart.setStyleSheet(f"""
+            GanttChart {{
+                background-color: {Theme.SURFACE};
+                border: 1px solid {Theme.BORDER_LIGHT};
+                border-radius: {Theme.RADIUS_MD};
+            }}
+        """)
+        self.chart.day_clicked.connect(self.on_day_clicked)
+        self.chart.zoom_changed.connect(self.on_zoom_changed)
+        layout.addWidget(self.chart)
         
         legend = QHBoxLayout()
         legend.setSpacing(12)
@@ -281,128 +271,70 @@ class PlanningView(QWidget):
 
     def open_weekly_schedule(self):
         if WeeklyScheduleView:
-            dialog = WeeklyScheduleView(self)
+            # Ekrandaki plan verilir; diyalog yeniden hesaplamaz
+            dialog = WeeklyScheduleView(self, details=self.cached_details or None)
             dialog.exec()
         else:
             QMessageBox.warning(self, "Hata", "Haftalık Liste modülü yüklenemedi.")
 
-    def init_table_structure(self):
-        columns = ["İSTASYON"]
-        today = datetime.now()
-        tr_days = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
-        for i in range(self.DAYS_RANGE):
-            day_date = today + timedelta(days=i)
-            columns.append(f"{day_date.strftime('%d.%m')}\n{tr_days[day_date.weekday()]}")
-            
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
-        self.table.setRowCount(len(self.machines))
-        
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setFocusPolicy(Qt.NoFocus)
-        self.table.verticalHeader().setVisible(False)
-        self.table.verticalHeader().setDefaultSectionSize(60)
-        self.table.setShowGrid(True)
-        
-        header_obj = self.table.horizontalHeader()
-        header_obj.setSectionResizeMode(0, QHeaderView.Fixed)
-        self.table.setColumnWidth(0, 200)
-        for i in range(1, self.DAYS_RANGE + 1):
-            header_obj.setSectionResizeMode(i, QHeaderView.Fixed)
-            self.table.setColumnWidth(i, 70)
-
-        header_obj.setStyleSheet(f"""
-            background-color: {Theme.SURFACE_DARK};
-            color: {Theme.TEXT_SECONDARY};
-            font-weight: 600;
-            font-size: 12px;
-            padding: 14px 16px;
-            border: none;
-            border-bottom: 1px solid {Theme.DIVIDER};
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        """)
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background-color: {Theme.SURFACE};
-                border: 1px solid {Theme.BORDER_LIGHT};
-                gridline-color: {Theme.DIVIDER};
-                border-radius: {Theme.RADIUS_MD};
-            }}
-        """)
-
-        for row_idx, machine_name in enumerate(self.machines):
-            item = QTableWidgetItem(machine_name)
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setFlags(Qt.ItemIsEnabled)
-            item.setData(Qt.UserRole, QColor(Theme.SURFACE_DARK))
-            item.setData(Qt.UserRole + 1, QColor(Theme.TEXT_PRIMARY))
-            item.setData(Qt.DisplayRole, machine_name)
-            self.table.setItem(row_idx, 0, item)
+    def on_zoom_selected(self, index):
+        self._zoom_preset = True
+        try: self.chart.set_zoom(self.combo_zoom.itemData(index))
+        finally: self._zoom_preset = False
+
+    def on_zoom_changed(self, px_per_hour):
+        """Ctrl + tekerlek ile ölçek değişince seçiciyi en yakın ön ayara çek"""
+        if self._zoom_preset: return
+        name = nearest_zoom(px_per_hour)
+        self.combo_zoom.blockSignals(True)
+        self.combo_zoom.setCurrentIndex(self.combo_zoom.findData(name))
+        self.combo_zoom.blockSignals(False)
+
+    def on_horizon_changed(self, index):
+        days = self.combo_horizon.itemData(index)
+        if not days or days == self.DAYS_RANGE: return
+        self.DAYS_RANGE = days
+        self.chart.set_horizon(days)
+        self.refresh_plan()
 
-    def refresh_plan(self):
-        if 'planner' not in globals() or planner is None: return
+    def set_source(self, source=None):
+        """
+        Plani bir what-if sandbox'i uzerinde goster (None = canli veri).
+        Sandbox duzenlemelerinden sonra refresh_plan() cagrilmalidir.
+        """
+        self.source = source
+        self.refresh_plan(force=True)
 
+    def check_for_changes(self):
+        """Veri sürümü veya gün değiştiyse yeniden hesapla"""
+        try: version = (self.source or db).get_data_version()
+        except: return
+        if version != self._data_version or self._plan_date != datetime.now().date():
+            self.refresh_plan()
+
+    def refresh_plan(self, force=False):
+        """Arka planda yeni hesaplama iste (ekran bloklanmaz)"""
+        if planner is None: return
+        try: self._data_version = (self.source or db).get_data_version()
+        except: self._data_version = None
+        self._plan_date = datetime.now().date()
+        self.runner.request(horizon_days=self.DAYS_RANGE, force=force, source=self.source)
+
+    def apply_plan(self, result):
+        """Hazır olan tahmini Gantt'a yansıt (yalnızca değişen satırlar boyanır)"""
         try:
-            result = planner.calculate_forecast()
-            if isinstance(result, tuple) and len(result) >= 3:
-                forecast, details, loads = result
-                self.cached_details = details
-            else:
-                return
+            forecast, details, loads, capacities = result
+            self.cached_details = details
         except: return
+        self.chart.set_plan(details, forecast, loads, capacities)
 
-        for row_idx, machine_name in enumerate(self.machines):
-            machine_key = machine_name.upper()
-            daily_percents = forecast.get(machine_key, [0]*self.DAYS_RANGE)
-            daily_loads = loads.get(machine_key, [0]*self.DAYS_RANGE)
-            
-            capacity = planner.capacities.get(machine_key, 1000)
-
-            if len(daily_percents) < self.DAYS_RANGE:
-                daily_percents += [0] * (self.DAYS_RANGE - len(daily_percents))
-            
-            for day_idx, percent in enumerate(daily_percents):
-                col_idx = day_idx + 1 
-                
-                current_load = daily_loads[day_idx]
-                if percent > 0:
-                    # --- DÜZELTME BURADA: int() ile tam sayıya yuvarlıyoruz ---
-                    text = f"%{int(percent)}\n{int(current_load)}/{int(capacity)} m²"
-                else:
-                    text = "-"
-                
-                item = self.table.item(row_idx, col_idx)
-                if not item:
-                    item = QTableWidgetItem()
-                    self.table.setItem(row_idx, col_idx, item)
-                
-                item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable) 
-                item.setData(Qt.DisplayRole, text)
-                
-                bg_color = QColor(Theme.SURFACE)
-                text_color = QColor(Theme.TEXT_DISABLED)
-
-                if percent > 0:
-                    text_color = QColor("white")
-                    if percent < 50: bg_color = QColor(Theme.SUCCESS)
-                    elif percent < 90: bg_color = QColor(Theme.WARNING)
-                    else: bg_color = QColor(Theme.DANGER)
-                
-                item.setData(Qt.UserRole, bg_color)
-                item.setData(Qt.UserRole + 1, text_color)
-
-    def on_cell_clicked(self, row, col):
-        if col == 0: return
-        day_idx = col - 1
-        machine_name = self.machines[row]
+    def on_day_clicked(self, machine_name, day_idx):
         machine_key = machine_name.upper()
         if machine_key in self.cached_details:
             try:
-                orders = self.cached_details[machine_key][day_idx]
+                orders = self.cached_details.jobs_on_day(machine_key, day_idx)
                 today = datetime.now()
                 target_date = today + timedelta(days=day_idx)
                 dialog = DayDetailDialog(machine_name, target_date.strftime("%d.%m.%Y"), orders, self)
                 dialog.exec()
-            except: pass
\ No newline at end of file
+            except: pass
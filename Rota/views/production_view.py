@@ -7,6 +7,8 @@ Ozellikler:
 - Istasyonlar rota sirasina gore gosterilir
 - Sevkiyat istasyonu gosterilmez (ayri modul)
 - Teslim tarihi ve gecikme uyarisi
+- Veri ProductionViewModel ile arka planda okunur (liste SQLite beklemez);
+  canli yenilemede yalnizca degisen siparisler okunur
 """
 
 import sys
@@ -17,40 +19,31 @@ from PySide6.QtWidgets import (
     QComboBox, QDialog, QTableWidget, QTableWidgetItem,
     QHeaderView, QMessageBox, QAbstractItemView,
     QLineEdit, QSpinBox, QSplitter, QApplication,
-    QInputDialog
+    QInputDialog, QListView, QStyledItemDelegate, QStyle
 )
-from PySide6.QtCore import Qt, QTimer, Signal
-from PySide6.QtGui import QColor, QFont
+from PySide6.QtCore import (Qt, QAbstractListModel, QModelIndex,
+                            QSortFilterProxyModel, QRect, QSize)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
 
 try:
     from core.db_manager import db
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+from core.view_models import ProductionViewModel
+from ui.theme import Theme, ExcelColors
+
 
 # =============================================================================
 # TEMA
 # =============================================================================
-class Colors:
-    BG = "#FFFFFF"
-    HEADER_BG = "#F3F3F3"
-    BORDER = "#D4D4D4"
-    GRID = "#E0E0E0"
-    TEXT = "#1A1A1A"
-    TEXT_SECONDARY = "#666666"
-    TEXT_MUTED = "#999999"
-    SELECTION = "#B4D7FF"
-    ACCENT = "#217346"
-    ROW_ALT = "#F9F9F9"
-    
-    CRITICAL = "#C00000"
-    CRITICAL_BG = "#FDE8E8"
-    WARNING = "#C65911"
-    WARNING_BG = "#FFF3E0"
-    SUCCESS = "#107C41"
-    SUCCESS_BG = "#E6F4EA"
-    INFO = "#0066CC"
-    INFO_BG = "#E3F2FD"
+class Colors(ExcelColors):
+    """Excel paleti (istasyon satiri stilleri ui/styles.qss'te)"""
 
 
 # =============================================================================
@@ -257,206 +250,263 @@ class ProductionEntryDialog(QDialog):
 
 
 # =============================================================================
-# SIPARIS SATIRI
+# SIPARIS SATIRI (model + delegate: satirlar widget degil, gorunurken cizilir)
 # =============================================================================
-class OrderRowWidget(QFrame):
-    """Kompakt siparis satiri"""
+PRIORITY_COLORS = {
+    'Kritik': Colors.CRITICAL,
+    'Acil': Colors.WARNING,
+    'Cok Acil': Colors.WARNING,
+    'Normal': Colors.BORDER
+}
+
+
+def row_summary(order):
+    """Satirda gosterilen ozet (sira, oncelik, teslim, ilerleme, durum)"""
+    priority = order.get('priority', 'Normal')
     
-    clicked = Signal(dict)
+    # Teslim tarihi
+    delivery_text, delivery_color = "", Colors.TEXT_MUTED
+    delivery = order.get('delivery_date', '')
+    if delivery:
+        try:
+            days_left = (datetime.strptime(delivery, '%Y-%m-%d') - datetime.now()).days
+            if days_left < 0:
+                delivery_text, delivery_color = f"Gecikti ({abs(days_left)}g)", Colors.CRITICAL
+            elif days_left == 0:
+                delivery_text, delivery_color = "Bugun!", Colors.WARNING
+            elif days_left <= 3:
+                delivery_text, delivery_color = f"{days_left} gun", Colors.WARNING
+            else:
+                delivery_text = f"{days_left} gun"
+        except:
+            pass
     
-    def __init__(self, order_data):
-        super().__init__()
-        self.order = order_data
-        self.setup_ui()
-        self.setCursor(Qt.PointingHandCursor)
+    # Ilerleme (sevkiyat haric)
+    status_map = order.get('status_map', {})
+    total_stations = sum(1 for s, v in status_map.items() 
+                       if v.get('status') != 'Yok' and FactoryConfig.should_show_station(s))
+    completed_stations = sum(1 for s, v in status_map.items() 
+                            if v.get('status') == 'Bitti' and FactoryConfig.should_show_station(s))
+    progress = int((completed_stations / total_stations * 100)) if total_stations > 0 else 0
     
-    def setup_ui(self):
-        self.setFixedHeight(56)
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {Colors.BG};
-                border-bottom: 1px solid {Colors.GRID};
-            }}
-            QFrame:hover {{
-                background-color: {Colors.SELECTION};
-            }}
-        """)
+    # Durum
+    has_partial = any(s.get('status') == 'Kismi' for s in status_map.values())
+    all_done = all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values()) and total_stations > 0
+    if all_done:
+        status = ("Bitti", Colors.SUCCESS_BG, Colors.SUCCESS)
+    elif has_partial:
+        status = ("Uretimde", Colors.INFO_BG, Colors.INFO)
+    else:
+        status = ("Bekliyor", Colors.HEADER_BG, Colors.TEXT_SECONDARY)
+    
+    return {
+        "rank": order.get('queue_rank', 0),
+        "priority": priority,
+        "priority_color": PRIORITY_COLORS.get(priority, Colors.BORDER),
+        "code": order.get('code', order.get('order_code', '')),
+        "customer": order.get('customer', order.get('customer_name', '')) or '',
+        "delivery_text": delivery_text,
+        "delivery_color": delivery_color,
+        "progress_text": f"{completed_stations}/{total_stations}",
+        "progress": progress,
+        "status": status,
+    }
+
+
+class OrderListModel(QAbstractListModel):
+    """
+    Siparis listesi modeli (siparis id ile anahtarli, yerinde guncellenir)
+    Yenilemede degisen satirlar dataChanged, sira degisimi layoutChanged ile
+    bildirilir; satir ozetleri yalnizca cizilen satirlar icin hesaplanir.
+    """
+    
+    ORDER_ROLE = Qt.UserRole
+    SUMMARY_ROLE = Qt.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders = []
+        self._summaries = {}    # order_id -> row_summary (cizimde doldurulur)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.orders)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        order = self.orders[index.row()]
+        if role == self.SUMMARY_ROLE:
+            summary = self._summaries.get(order['id'])
+            if summary is None:
+                summary = self._summaries[order['id']] = row_summary(order)
+            return summary
+        if role == self.ORDER_ROLE:
+            return order
+        if role == Qt.DisplayRole:
+            return order.get('code', '')
+        return None
+    
+    def set_orders(self, orders, changed_only=False):
+        """
+        Yeni listeyi uygula: silinen cikar, yeni eklenir, sira ve degisen satirlar guncellenir
+        changed_only: yalnizca degisen satirlarin ozeti atilir (artimli guncelleme)
+        """
+        new_by_id = {o['id']: o for o in orders}
+        old_by_id = {o['id']: o for o in self.orders}
+        # Gun degisince teslim metinleri de degisir: tam yenilemede ozetler yeniden hesaplanir
+        if not changed_only:
+            self._summaries.clear()
+        
+        # 1. Silinenler
+        for row in range(len(self.orders) - 1, -1, -1):
+            if self.orders[row]['id'] not in new_by_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._summaries.pop(self.orders[row]['id'], None)
+                del self.orders[row]
+                self.endRemoveRows()
+        
+        # 2. Yeniler (sona; sira 3. adimda duzelir)
+        known = {o['id'] for o in self.orders}
+        new = [o for o in orders if o['id'] not in known]
+        if new:
+            self.beginInsertRows(QModelIndex(), len(self.orders), len(self.orders) + len(new) - 1)
+            self.orders.extend(new)
+            self.endInsertRows()
+        
+        # 3. Sira degistiyse kalici indeksleri (secim) tasiyarak yeniden diz
+        if [o['id'] for o in self.orders] != [o['id'] for o in orders]:
+            self.layoutAboutToBeChanged.emit()
+            old_ids = [o['id'] for o in self.orders]
+            self.orders = list(orders)
+            row_of = {o['id']: i for i, o in enumerate(self.orders)}
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(
+                persistent, [self.index(row_of[old_ids[i.row()]], 0) for i in persistent])
+            self.layoutChanged.emit()
+        
+        # 4. Degisen satirlar
+        self.orders = list(orders)
+        for row, order in enumerate(orders):
+            old = old_by_id.get(order['id'])
+            if old is not None and old != order:
+                self._summaries.pop(order['id'], None)
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+
+
+class OrderFilterProxy(QSortFilterProxyModel):
+    """Durum filtresi + arama (kosul ekran tarafindan verilir)"""
+    
+    def __init__(self, predicate, parent=None):
+        super().__init__(parent)
+        self.predicate = predicate
+    
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.predicate(self.sourceModel().orders[source_row])
+
+
+class OrderRowDelegate(QStyledItemDelegate):
+    """Kompakt siparis satiri (QPainter ile, widget olusturmadan)"""
+    
+    ROW_HEIGHT = 56
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font_code = QFont()
+        self.font_code.setPixelSize(12)
+        self.font_code.setBold(True)
+        self.font_small = QFont()
+        self.font_small.setPixelSize(10)
+        self.font_small_bold = QFont(self.font_small)
+        self.font_small_bold.setBold(True)
+        self.font_badge = QFont()
+        self.font_badge.setPixelSize(9)
+        self.font_badge.setBold(True)
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+    
+    def _badge(self, painter, rect, text, bg, fg, font):
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(bg))
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setFont(font)
+        painter.setPen(QColor(fg))
+        painter.drawText(rect, Qt.AlignCenter, text)
+    
+    def paint(self, painter, option, index):
+        s = index.data(OrderListModel.SUMMARY_ROLE)
+        if s is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
         
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(8, 6, 12, 6)
-        layout.setSpacing(8)
+        # Arka plan ve alt cizgi
+        if option.state & (QStyle.State_Selected | QStyle.State_MouseOver):
+            painter.fillRect(rect, QColor(Colors.SELECTION))
+        else:
+            painter.fillRect(rect, QColor(Colors.BG))
+        painter.setPen(QColor(Colors.GRID))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+        
+        x = rect.left() + 8
+        mid = rect.top() + rect.height() // 2
         
         # Sira numarasi
-        queue_pos = self.order.get('queue_position', 0)
-        if queue_pos and queue_pos < 9999:
-            lbl_pos = QLabel(f"{queue_pos}")
-            lbl_pos.setFixedWidth(24)
-            lbl_pos.setAlignment(Qt.AlignCenter)
-            lbl_pos.setStyleSheet(f"""
-                background-color: {Colors.HEADER_BG};
-                color: {Colors.TEXT_SECONDARY};
-                font-size: 10px;
-                font-weight: bold;
-                border-radius: 3px;
-                padding: 2px;
-            """)
-            layout.addWidget(lbl_pos)
+        if s['rank']:
+            self._badge(painter, QRect(x, mid - 9, 24, 18), str(s['rank']),
+                        Colors.HEADER_BG, Colors.TEXT_SECONDARY, self.font_small_bold)
+            x += 32
         
         # Oncelik indikatoru
-        priority = self.order.get('priority', 'Normal')
-        priority_colors = {
-            'Kritik': Colors.CRITICAL,
-            'Acil': Colors.WARNING,
-            'Cok Acil': Colors.WARNING,
-            'Normal': Colors.BORDER
-        }
-        
-        indicator = QFrame()
-        indicator.setFixedSize(4, 40)
-        indicator.setStyleSheet(f"background-color: {priority_colors.get(priority, Colors.BORDER)}; border-radius: 2px;")
-        layout.addWidget(indicator)
-        
-        # Siparis bilgileri
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(2)
-        
-        # Ust satir: Kod ve Oncelik
-        top_layout = QHBoxLayout()
-        top_layout.setSpacing(8)
-        
-        code = self.order.get('code', self.order.get('order_code', ''))
-        lbl_code = QLabel(code)
-        lbl_code.setStyleSheet(f"font-size: 12px; font-weight: bold; color: {Colors.TEXT};")
-        top_layout.addWidget(lbl_code)
-        
-        if priority in ['Kritik', 'Acil', 'Cok Acil']:
-            lbl_priority = QLabel(priority)
-            lbl_priority.setStyleSheet(f"""
-                background-color: {Colors.CRITICAL_BG if priority == 'Kritik' else Colors.WARNING_BG};
-                color: {Colors.CRITICAL if priority == 'Kritik' else Colors.WARNING};
-                padding: 1px 6px;
-                border-radius: 2px;
-                font-size: 9px;
-                font-weight: bold;
-            """)
-            top_layout.addWidget(lbl_priority)
-        
-        top_layout.addStretch()
-        info_layout.addLayout(top_layout)
-        
-        # Alt satir: Musteri ve Teslim
-        bottom_layout = QHBoxLayout()
-        bottom_layout.setSpacing(12)
-        
-        customer = self.order.get('customer', self.order.get('customer_name', ''))
-        lbl_customer = QLabel(customer)
-        lbl_customer.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_SECONDARY};")
-        bottom_layout.addWidget(lbl_customer)
-        
-        # Teslim tarihi
-        delivery = self.order.get('delivery_date', '')
-        if delivery:
-            try:
-                delivery_date = datetime.strptime(delivery, '%Y-%m-%d')
-                days_left = (delivery_date - datetime.now()).days
-                
-                if days_left < 0:
-                    delivery_text = f"Gecikti ({abs(days_left)}g)"
-                    delivery_color = Colors.CRITICAL
-                elif days_left == 0:
-                    delivery_text = "Bugun!"
-                    delivery_color = Colors.WARNING
-                elif days_left <= 3:
-                    delivery_text = f"{days_left} gun"
-                    delivery_color = Colors.WARNING
-                else:
-                    delivery_text = f"{days_left} gun"
-                    delivery_color = Colors.TEXT_MUTED
-                
-                lbl_delivery = QLabel(delivery_text)
-                lbl_delivery.setStyleSheet(f"font-size: 10px; color: {delivery_color}; font-weight: bold;")
-                bottom_layout.addWidget(lbl_delivery)
-            except:
-                pass
-        
-        bottom_layout.addStretch()
-        info_layout.addLayout(bottom_layout)
-        
-        layout.addLayout(info_layout, 1)
-        
-        # Ilerleme
-        status_map = self.order.get('status_map', {})
-        # Sevkiyat haric say
-        total_stations = sum(1 for s, v in status_map.items() 
-                           if v.get('status') != 'Yok' and FactoryConfig.should_show_station(s))
-        completed_stations = sum(1 for s, v in status_map.items() 
-                                if v.get('status') == 'Bitti' and FactoryConfig.should_show_station(s))
-        progress = int((completed_stations / total_stations * 100)) if total_stations > 0 else 0
-        
-        progress_layout = QVBoxLayout()
-        progress_layout.setSpacing(2)
-        
-        lbl_progress = QLabel(f"{completed_stations}/{total_stations}")
-        lbl_progress.setStyleSheet(f"font-size: 10px; color: {Colors.TEXT_MUTED};")
-        lbl_progress.setAlignment(Qt.AlignCenter)
-        progress_layout.addWidget(lbl_progress)
-        
-        bar = QProgressBar()
-        bar.setRange(0, 100)
-        bar.setValue(progress)
-        bar.setTextVisible(False)
-        bar.setFixedSize(70, 6)
-        
-        bar_color = Colors.SUCCESS if progress >= 100 else Colors.ACCENT
-        bar.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: {Colors.BORDER};
-                border: none;
-                border-radius: 3px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {bar_color};
-                border-radius: 3px;
-            }}
-        """)
-        progress_layout.addWidget(bar)
-        
-        layout.addLayout(progress_layout)
-        
-        # Durum
-        has_partial = any(s.get('status') == 'Kismi' for s in status_map.values())
-        all_done = all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values()) and total_stations > 0
-        
-        if all_done:
-            status_text = "Bitti"
-            status_bg = Colors.SUCCESS_BG
-            status_fg = Colors.SUCCESS
-        elif has_partial:
-            status_text = "Uretimde"
-            status_bg = Colors.INFO_BG
-            status_fg = Colors.INFO
-        else:
-            status_text = "Bekliyor"
-            status_bg = Colors.HEADER_BG
-            status_fg = Colors.TEXT_SECONDARY
-        
-        lbl_status = QLabel(status_text)
-        lbl_status.setFixedWidth(70)
-        lbl_status.setAlignment(Qt.AlignCenter)
-        lbl_status.setStyleSheet(f"""
-            background-color: {status_bg};
-            color: {status_fg};
-            padding: 4px 8px;
-            border-radius: 3px;
-            font-size: 10px;
-            font-weight: bold;
-        """)
-        layout.addWidget(lbl_status)
-    
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self.order)
-        super().mousePressEvent(event)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(s['priority_color']))
+        painter.drawRoundedRect(QRect(x, mid - 20, 4, 40), 2, 2)
+        x += 12
+        
+        # Sag taraf: durum ve ilerleme
+        right = rect.right() - 12
+        status_text, status_bg, status_fg = s['status']
+        self._badge(painter, QRect(right - 70, mid - 11, 70, 22), status_text, status_bg, status_fg, self.font_small_bold)
+        right -= 78
+        
+        bar = QRect(right - 70, mid + 2, 70, 6)
+        painter.setFont(self.font_small)
+        painter.setPen(QColor(Colors.TEXT_MUTED))
+        painter.drawText(QRect(bar.left(), mid - 16, 70, 16), Qt.AlignCenter, s['progress_text'])
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(Colors.BORDER))
+        painter.drawRoundedRect(bar, 3, 3)
+        if s['progress'] > 0:
+            painter.setBrush(QColor(Colors.SUCCESS if s['progress'] >= 100 else Colors.ACCENT))
+            painter.drawRoundedRect(QRect(bar.left(), bar.top(), int(bar.width() * min(s['progress'], 100) / 100), bar.height()), 3, 3)
+        right = bar.left() - 8
+        
+        # Ust satir: kod ve oncelik
+        painter.setFont(self.font_code)
+        painter.setPen(QColor(Colors.TEXT))
+        code_width = QFontMetrics(self.font_code).horizontalAdvance(s['code'])
+        painter.drawText(QRect(x, rect.top() + 8, right - x, 20), Qt.AlignLeft | Qt.AlignVCenter, s['code'])
+        if s['priority'] in ['Kritik', 'Acil', 'Cok Acil']:
+            kritik = s['priority'] == 'Kritik'
+            badge_width = QFontMetrics(self.font_badge).horizontalAdvance(s['priority']) + 12
+            self._badge(painter, QRect(x + code_width + 8, rect.top() + 11, badge_width, 14), s['priority'],
+                        Colors.CRITICAL_BG if kritik else Colors.WARNING_BG,
+                        Colors.CRITICAL if kritik else Colors.WARNING, self.font_badge)
+        
+        # Alt satir: musteri ve teslim
+        painter.setFont(self.font_small)
+        painter.setPen(QColor(Colors.TEXT_SECONDARY))
+        customer_width = QFontMetrics(self.font_small).horizontalAdvance(s['customer'])
+        painter.drawText(QRect(x, rect.top() + 30, right - x, 18), Qt.AlignLeft | Qt.AlignVCenter, s['customer'])
+        if s['delivery_text']:
+            painter.setFont(self.font_small_bold)
+            painter.setPen(QColor(s['delivery_color']))
+            painter.drawText(QRect(x + customer_width + 12, rect.top() + 30, max(0, right - x - customer_width - 12), 18),
+                             Qt.AlignLeft | Qt.AlignVCenter, s['delivery_text'])
+        
+        painter.restore()
 
 
 # =============================================================================
@@ -465,22 +515,34 @@ class OrderRowWidget(QFrame):
 class ProductionView(QWidget):
     """Uretim Takip Ekrani"""
     
+    FULL_RELOAD_THRESHOLD = 2000     # Bundan fazla siparis degistiyse tam yukleme
+    
     def __init__(self):
         super().__init__()
         self.current_filter = "Tumu"
         self.selected_order = None
         self.all_orders = []
+        self.model = OrderListModel(self)
+        self.proxy = OrderFilterProxy(self._matches, self)
+        self.proxy.setSourceModel(self.model)
+        self._reselect_id = None        # Kayittan sonra detayi yeniden gosterilecek siparis
         self.setup_ui()
         
-        # Otomatik yenileme
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_data)
-        self.timer.start(10000)
+        self.vm = ProductionViewModel(self)
+        self.vm.data_ready.connect(self.apply_orders)
+        self.vm.changes_ready.connect(lambda changes: self.apply_orders(self.vm.snapshot, incremental=True))
+        self.vm.failed.connect(lambda msg: self.status_label.setText(f"Hata: {msg}"))
+        
+        # Otomatik yenileme (merkezi koordinator: yalnizca degisen siparisler)
+        if refresh_coordinator:
+            refresh_coordinator.subscribe(("orders", "progress", "day"), self.on_data_changed, owner=self)
         
         self.refresh_data()
     
     def setup_ui(self):
-        self.setStyleSheet(f"background-color: {Colors.BG};")
+        # Arka plan uygulama stilinde (QWidget#ProductionView); secicisiz ata
+        # stili istasyon satiri kurallarini ezerdi
+        self.setObjectName("ProductionView")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -635,27 +697,33 @@ class ProductionView(QWidget):
         
         layout.addWidget(header)
         
-        # Scroll
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet(f"background-color: {Colors.BG};")
-        
-        self.list_container = QWidget()
-        self.list_layout = QVBoxLayout(self.list_container)
-        self.list_layout.setContentsMargins(0, 0, 0, 0)
-        self.list_layout.setSpacing(0)
-        self.list_layout.addStretch()
-        
-        scroll.setWidget(self.list_container)
-        layout.addWidget(scroll)
+        # Liste (sanal: yalnizca gorunen satirlar cizilir)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy)
+        self.list_view.setItemDelegate(OrderRowDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setFrameShape(QFrame.NoFrame)
+        self.list_view.setCursor(Qt.PointingHandCursor)
+        self.list_view.setStyleSheet(f"background-color: {Colors.BG};")
+        self.list_view.clicked.connect(lambda index: self.show_detail(index.data(OrderListModel.ORDER_ROLE)))
+        layout.addWidget(self.list_view, 1)
+        
+        self.lbl_empty = QLabel("Siparis bulunamadi")
+        self.lbl_empty.setAlignment(Qt.AlignCenter)
+        self.lbl_empty.setStyleSheet(f"color: {Colors.TEXT_MUTED}; padding: 40px;")
+        self.lbl_empty.hide()
+        layout.addWidget(self.lbl_empty, 1)
         
         return panel
     
     def _create_detail_panel(self):
         panel = QFrame()
+        panel.setObjectName("DetailPanel")
         panel.setStyleSheet(f"""
-            QFrame {{
+            QFrame#DetailPanel {{
                 background-color: {Colors.BG};
                 border-left: 1px solid {Colors.BORDER};
             }}
@@ -717,82 +785,45 @@ class ProductionView(QWidget):
     
     def refresh_data(self):
         """Verileri yenile - Karar Destek sira numarasini (queue_position) kullanir"""
-        try:
-            if db:
-                # Uretim matrisini al
-                matrix_data = db.get_production_matrix_advanced()
-                
-                # Orders tablosundan queue_position, priority ve delivery_date al
-                orders_info = {}
-                try:
-                    with db.get_connection() as conn:
-                        # queue_position kolonu var mi kontrol et
-                        try:
-                            conn.execute("ALTER TABLE orders ADD COLUMN queue_position INTEGER DEFAULT 9999")
-                        except:
-                            pass  # Kolon zaten var
-                        
-                        rows = conn.execute("""
-                            SELECT id, priority, delivery_date, 
-                                   COALESCE(queue_position, 9999) as queue_position
-                            FROM orders 
-                            WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
-                            ORDER BY queue_position ASC, delivery_date ASC
-                        """).fetchall()
-                        
-                        for row in rows:
-                            orders_info[row['id']] = {
-                                'priority': row['priority'],
-                                'delivery_date': row['delivery_date'],
-                                'queue_position': row['queue_position']
-                            }
-                except Exception as e:
-                    print(f"Orders info error: {e}")
-                
-                # Matrisi zenginlestir
-                for order in matrix_data:
-                    order_id = order.get('id')
-                    if order_id in orders_info:
-                        order['priority'] = orders_info[order_id]['priority']
-                        order['delivery_date'] = orders_info[order_id]['delivery_date']
-                        order['queue_position'] = orders_info[order_id]['queue_position']
-                    else:
-                        order['priority'] = 'Normal'
-                        order['queue_position'] = 9999
-                
-                # Karar Destek siralamasina gore sirala (queue_position)
-                matrix_data.sort(key=lambda x: (x.get('queue_position', 9999), x.get('delivery_date', '9999-12-31')))
-                
-                self.all_orders = matrix_data
-            else:
-                self.all_orders = []
-            
-            self.update_list()
-            self.update_stats()
-            self.status_label.setText(f"{len(self.all_orders)} siparis | {datetime.now().strftime('%H:%M:%S')}")
-        except Exception as e:
-            self.status_label.setText(f"Hata: {str(e)}")
+        if db:
+            self.vm.reload()
+        else:
+            self.apply_orders([])
     
-    def update_list(self):
-        """Listeyi guncelle"""
-        while self.list_layout.count() > 1:
-            item = self.list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        filtered = self._filter_orders(self.all_orders)
-        
-        if not filtered:
-            empty = QLabel("Siparis bulunamadi")
-            empty.setAlignment(Qt.AlignCenter)
-            empty.setStyleSheet(f"color: {Colors.TEXT_MUTED}; padding: 40px;")
-            self.list_layout.insertWidget(0, empty)
+    def on_data_changed(self, event):
+        """Koordinator olayi: degisen siparisleri artimli uygula (gun degisimi / budanmis akista tam yukleme)"""
+        changed_ids = event.ids("orders", "progress")
+        if event.touches("day") or changed_ids is None or len(changed_ids) > self.FULL_RELOAD_THRESHOLD:
+            self.refresh_data()
             return
-        
-        for order in filtered:
-            row = OrderRowWidget(order)
-            row.clicked.connect(self.show_detail)
-            self.list_layout.insertWidget(self.list_layout.count() - 1, row)
+        if changed_ids:
+            self.vm.update(changed_ids)
+    
+    def apply_orders(self, orders, incremental=False):
+        """ViewModel'den gelen hazir siparis listesini uygula (incremental: yalnizca degisen satirlar cizilir)"""
+        self.all_orders = orders
+        self.update_list(incremental)
+        self.update_stats()
+        self.status_label.setText(f"{len(self.all_orders)} siparis | {datetime.now().strftime('%H:%M:%S')}")
+        
+        # Kayittan sonra ayni siparisi tekrar goster
+        order_id, self._reselect_id = self._reselect_id, None
+        if order_id is not None:
+            for order in self.all_orders:
+                if order.get('id') == order_id:
+                    self.show_detail(order)
+                    break
+    
+    def update_list(self, incremental=False):
+        """Listeyi guncelle (model yerinde guncellenir, secim korunur)"""
+        self.model.set_orders(self.all_orders, changed_only=incremental)
+        self.list_view.viewport().update()
+        self._update_empty()
+    
+    def _update_empty(self):
+        empty = self.proxy.rowCount() == 0
+        self.list_view.setVisible(not empty)
+        self.lbl_empty.setVisible(empty)
     
     def update_stats(self):
         """Istatistikleri guncelle"""
@@ -816,45 +847,39 @@ class ProductionView(QWidget):
         self.lbl_urgent.setText(f"Kritik: {urgent}")
         self.lbl_production.setText(f"Uretimde: {production}")
     
-    def _filter_orders(self, orders):
-        """Siparisleri filtrele"""
+    def _matches(self, order):
+        """Siparis filtre ve aramaya uyuyor mu"""
         search_text = self.search_box.text().lower()
-        if search_text:
-            orders = [o for o in orders 
-                     if search_text in o.get('code', '').lower() 
-                     or search_text in o.get('customer', '').lower()]
+        if search_text and not (search_text in (order.get('code') or '').lower()
+                                or search_text in (order.get('customer') or '').lower()):
+            return False
         
         if self.current_filter == "Tumu":
-            return orders
-        
-        filtered = []
-        for order in orders:
-            status_map = order.get('status_map', {})
-            
-            has_work = any(s.get('status') != 'Yok' and FactoryConfig.should_show_station(st) 
-                          for st, s in status_map.items())
-            if not has_work:
-                continue
-            
-            has_partial = any(s.get('status') == 'Kismi' for s in status_map.values())
-            all_done = all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values())
-            not_started = all(s.get('status') in ['Bekliyor', 'Yok'] for s in status_map.values())
-            
-            if self.current_filter == "Beklemede" and not_started:
-                filtered.append(order)
-            elif self.current_filter == "Uretimde" and has_partial:
-                filtered.append(order)
-            elif self.current_filter == "Tamamlanan" and all_done:
-                filtered.append(order)
-        
-        return filtered
+            return True
+        
+        status_map = order.get('status_map', {})
+        
+        has_work = any(s.get('status') != 'Yok' and FactoryConfig.should_show_station(st) 
+                      for st, s in status_map.items())
+        if not has_work:
+            return False
+        
+        if self.current_filter == "Beklemede":
+            return all(s.get('status') in ['Bekliyor', 'Yok'] for s in status_map.values())
+        if self.current_filter == "Uretimde":
+            return any(s.get('status') == 'Kismi' for s in status_map.values())
+        if self.current_filter == "Tamamlanan":
+            return all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values())
+        return False
     
     def apply_filter(self, text):
         self.current_filter = text
-        self.update_list()
+        self.proxy.invalidateFilter()
+        self._update_empty()
     
     def apply_search(self, text):
-        self.update_list()
+        self.proxy.invalidateFilter()
+        self._update_empty()
     
     # =========================================================================
     # DETAY PANELI
@@ -961,7 +986,6 @@ class ProductionView(QWidget):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet(f"background-color: {Colors.BG};")
         
         stations_widget = QWidget()
         stations_layout = QVBoxLayout(stations_widget)
@@ -1044,16 +1068,10 @@ class ProductionView(QWidget):
             return sorted(status_map.items(), key=lambda x: FactoryConfig.get_station_index(x[0]))
     
     def _create_station_row(self, station_name, info):
-        """Istasyon satiri"""
+        """Istasyon satiri (stil uygulama stilinde: QFrame#StationRow, [status=...])"""
         row = QFrame()
+        row.setObjectName("StationRow")
         row.setFixedHeight(44)
-        row.setStyleSheet(f"""
-            QFrame {{
-                background-color: {Colors.ROW_ALT};
-                border: 1px solid {Colors.GRID};
-                border-radius: 4px;
-            }}
-        """)
         
         layout = QHBoxLayout(row)
         layout.setContentsMargins(12, 6, 12, 6)
@@ -1062,24 +1080,22 @@ class ProductionView(QWidget):
         # Durum ikonu
         status = info.get('status', 'Bekliyor')
         if status == 'Bitti':
-            icon_text = "●"
-            icon_color = Colors.SUCCESS
+            icon_text, state = "●", "done"
         elif status == 'Kısmi':
-            icon_text = "◐"
-            icon_color = Colors.WARNING
+            icon_text, state = "◐", "partial"
         else:
-            icon_text = "○"
-            icon_color = Colors.TEXT_MUTED
+            icon_text, state = "○", "waiting"
         
         lbl_icon = QLabel(icon_text)
+        lbl_icon.setObjectName("StationIcon")
+        lbl_icon.setProperty("status", state)
         lbl_icon.setFixedWidth(16)
-        lbl_icon.setStyleSheet(f"font-size: 14px; color: {icon_color};")
         layout.addWidget(lbl_icon)
         
         # Istasyon adi
         lbl_name = QLabel(station_name)
+        lbl_name.setObjectName("StationName")
         lbl_name.setFixedWidth(110)
-        lbl_name.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {Colors.TEXT};")
         layout.addWidget(lbl_name)
         
         # Adet bilgisi
@@ -1087,28 +1103,19 @@ class ProductionView(QWidget):
         total = int(info.get('total', 0))
         
         lbl_qty = QLabel(f"{done}/{total}")
+        lbl_qty.setObjectName("StationQty")
         lbl_qty.setFixedWidth(60)
-        lbl_qty.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
         layout.addWidget(lbl_qty)
         
         # Progress bar
         progress = int((done / total * 100)) if total > 0 else 0
         bar = QProgressBar()
+        bar.setObjectName("StationGauge")
+        bar.setProperty("status", state)
         bar.setRange(0, 100)
         bar.setValue(progress)
         bar.setTextVisible(False)
         bar.setFixedHeight(6)
-        bar.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: {Colors.BORDER};
-                border: none;
-                border-radius: 3px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {icon_color};
-                border-radius: 3px;
-            }}
-        """)
         layout.addWidget(bar, 1)
         
         layout.addStretch()
@@ -1116,26 +1123,14 @@ class ProductionView(QWidget):
         # Uretim gir butonu
         if status in ['Bekliyor', 'Kısmi']:
             btn_entry = QPushButton("Uretim Gir")
+            btn_entry.setObjectName("StationEntryButton")
             btn_entry.setFixedSize(85, 28)
-            btn_entry.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {Colors.ACCENT};
-                    border: none;
-                    border-radius: 3px;
-                    color: white;
-                    font-size: 10px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: #1D6640;
-                }}
-            """)
             btn_entry.clicked.connect(lambda checked, s=station_name, i=info: self.open_production_dialog(s, i))
             layout.addWidget(btn_entry)
         else:
             # Tamamlandi label
             lbl_done = QLabel("Tamamlandi")
-            lbl_done.setStyleSheet(f"font-size: 10px; color: {Colors.SUCCESS}; font-weight: bold;")
+            lbl_done.setObjectName("StationDone")
             layout.addWidget(lbl_done)
         
         return row
@@ -1165,13 +1160,9 @@ class ProductionView(QWidget):
                     
                     self.status_label.setText(f"{dialog.result_qty} adet {station_name} kaydedildi")
                     
+                    # Yenileme gelince ayni siparisi tekrar goster
+                    self._reselect_id = order_id
                     self.refresh_data()
-                    
-                    # Ayni siparisi tekrar goster
-                    for order in self.all_orders:
-                        if order.get('id') == order_id:
-                            self.show_detail(order)
-                            break
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Kayit hatasi:\n{str(e)}")
     
@@ -1199,6 +1190,7 @@ class ProductionView(QWidget):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    Theme.apply_app_style(app)
     app.setFont(QFont("Segoe UI", 9))
     
     window = ProductionView()
@@ -1,13 +1,16 @@
 """
 EFES ROTA X - Raporlama Merkezi
 Excel temali, kompakt tasarim
+Rapor verileri sekme basina bir ReportViewModel ile arka planda okunur.
+Uretim hareketleri sayfa sayfa yuklenir (LazyLogModel); Excel aktarimi
+dogrudan sorgudan akar.
 """
 
 import sys
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QTableWidget, QTableWidgetItem, QHeaderView, 
+    QTableWidget, QTableWidgetItem, QHeaderView, QTableView, 
     QPushButton, QAbstractItemView, QDateEdit, 
     QComboBox, QMessageBox, QFileDialog, QTabWidget, 
     QFrame, QScrollArea, QProgressBar
@@ -20,6 +23,23 @@ try:
 except ImportError:
     db = None
 
+from core.view_models import ReportViewModel
+from ui.log_table_model import LazyLogModel, LogColumn
+
+try:
+    from core.plan_worker import BackgroundRunner
+except ImportError:
+    BackgroundRunner = None
+
+
+def _action_color(row):
+    action = str(row.get('action') or '')
+    if 'Fire' in action or 'Hata' in action:
+        return Colors.CRITICAL
+    if 'Tamamla' in action or 'Yapıldı' in action:
+        return Colors.SUCCESS
+    return None
+
 
 # =============================================================================
 # EXCEL TEMASI
@@ -52,6 +72,32 @@ class Colors:
 class ReportView(QWidget):
     def __init__(self):
         super().__init__()
+        
+        # Sekme basina ViewModel (sorgular worker thread'de, istekler birbirini ezmez)
+        self.perf_vm = ReportViewModel("performance", self)
+        self.fire_vm = ReportViewModel("fire", self)
+        self.perf_vm.data_ready.connect(self.show_performance)
+        self.fire_vm.data_ready.connect(self.show_fire)
+        self.perf_vm.failed.connect(lambda msg: QMessageBox.warning(self, "Uyari", "Performans verisi alinamadi."))
+        self.fire_vm.failed.connect(lambda msg: QMessageBox.warning(self, "Uyari", "Fire verisi alinamadi."))
+        
+        # Uretim hareketleri: sayfali model, Excel aktarimi arka planda
+        self.logs_model = LazyLogModel([
+            LogColumn("Tarih", lambda r: str(r.get('timestamp') or ''), lambda r: Colors.TEXT_SECONDARY),
+            LogColumn("Siparis", lambda r: str(r.get('order_code') or ''), font=QFont("Segoe UI", 9, QFont.Bold)),
+            LogColumn("Musteri", lambda r: str(r.get('customer_name') or '')),
+            LogColumn("Istasyon", lambda r: str(r.get('station_name') or ''), lambda r: Colors.ACCENT),
+            LogColumn("Islem", lambda r: str(r.get('action') or ''), _action_color),
+            LogColumn("Operator", lambda r: str(r.get('operator_name') or '')),
+        ], self)
+        self.logs_model.count_ready.connect(lambda total: self.lbl_result_count.setText(f"{total} kayit bulundu"))
+        self.logs_model.failed.connect(lambda msg: self.lbl_result_count.setText(f"Sorgu hatasi: {msg}"))
+        
+        self.export_runner = BackgroundRunner(self) if BackgroundRunner else None
+        if self.export_runner:
+            self.export_runner.result_ready.connect(self._export_done)
+            self.export_runner.failed.connect(self._export_failed)
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -239,10 +285,10 @@ class ReportView(QWidget):
         layout.addWidget(self.lbl_result_count)
 
         # Tablo
-        self.table_logs = QTableWidget()
-        self.table_logs.setColumnCount(6)
-        self.table_logs.setHorizontalHeaderLabels(["Tarih", "Siparis", "Musteri", "Istasyon", "Islem", "Operator"])
+        self.table_logs = QTableView()
+        self.table_logs.setModel(self.logs_model)
         self.table_logs.verticalHeader().setVisible(False)
+        self.table_logs.verticalHeader().setDefaultSectionSize(32)
         self.table_logs.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table_logs.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
         self.table_logs.setColumnWidth(0, 140)
@@ -257,45 +303,12 @@ class ReportView(QWidget):
             
         d1 = self.date_start.date().toString("yyyy-MM-dd")
         d2 = self.date_end.date().toString("yyyy-MM-dd")
-        data = db.get_production_report_data(d1, d2)
-        
-        self.table_logs.setRowCount(len(data))
-        self.lbl_result_count.setText(f"{len(data)} kayit bulundu")
-        
-        for r, item in enumerate(data):
-            # Tarih
-            date_item = QTableWidgetItem(str(item.get('islem_tarihi', '')))
-            date_item.setForeground(QColor(Colors.TEXT_SECONDARY))
-            self.table_logs.setItem(r, 0, date_item)
-            
-            # Siparis
-            order_item = QTableWidgetItem(str(item.get('siparis_no', '')))
-            order_item.setFont(QFont("Segoe UI", 9, QFont.Bold))
-            self.table_logs.setItem(r, 1, order_item)
-            
-            # Musteri
-            self.table_logs.setItem(r, 2, QTableWidgetItem(str(item.get('musteri', ''))))
-            
-            # Istasyon
-            station_item = QTableWidgetItem(str(item.get('istasyon', '')))
-            station_item.setForeground(QColor(Colors.ACCENT))
-            self.table_logs.setItem(r, 3, station_item)
-            
-            # Islem
-            action = str(item.get('islem', ''))
-            action_item = QTableWidgetItem(action)
-            if 'Fire' in action or 'Hata' in action:
-                action_item.setForeground(QColor(Colors.CRITICAL))
-            elif 'Tamamla' in action or 'Yapıldı' in action:
-                action_item.setForeground(QColor(Colors.SUCCESS))
-            self.table_logs.setItem(r, 4, action_item)
-            
-            # Operator
-            self.table_logs.setItem(r, 5, QTableWidgetItem(str(item.get('operator', ''))))
+        self.lbl_result_count.setText("Sorgulaniyor...")
+        self.logs_model.query(start=d1, end=d2, orders_only=True)
 
     def export_logs(self):
-        """Loglari Excel'e aktar"""
-        if self.table_logs.rowCount() == 0:
+        """Loglari Excel'e aktar (tablodan degil, dogrudan sorgudan; arka planda)"""
+        if self.logs_model.filters is None or self.logs_model.rowCount() == 0:
             QMessageBox.warning(self, "Uyari", "Aktarilacak veri yok. Once sorgulama yapin.")
             return
         
@@ -308,28 +321,28 @@ class ReportView(QWidget):
         if file_path:
             try:
                 import openpyxl
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                ws.title = "Uretim Hareketleri"
-                
-                # Basliklar
-                headers = ["Tarih", "Siparis", "Musteri", "Istasyon", "Islem", "Operator"]
-                ws.append(headers)
-                
-                # Veriler
-                for row in range(self.table_logs.rowCount()):
-                    row_data = []
-                    for col in range(self.table_logs.columnCount()):
-                        item = self.table_logs.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    ws.append(row_data)
-                
-                wb.save(file_path)
-                QMessageBox.information(self, "Basarili", f"Rapor kaydedildi:\n{file_path}")
             except ImportError:
                 QMessageBox.critical(self, "Hata", "openpyxl kutuphanesi yuklu degil.\npip install openpyxl")
-            except Exception as e:
-                QMessageBox.critical(self, "Hata", f"Kayit hatasi: {e}")
+                return
+            
+            self._export_path = file_path
+            self.lbl_result_count.setText("Excel'e aktariliyor...")
+            if self.export_runner:
+                self.export_runner.submit(
+                    lambda cancel_check: self.logs_model.export_xlsx(file_path, "Uretim Hareketleri", cancel_check))
+            else:
+                try:
+                    self._export_done(self.logs_model.export_xlsx(file_path, "Uretim Hareketleri"))
+                except Exception as e:
+                    self._export_failed(str(e))
+    
+    def _export_done(self, count):
+        self.lbl_result_count.setText(f"{count} kayit aktarildi")
+        QMessageBox.information(self, "Basarili", f"Rapor kaydedildi:\n{self._export_path}")
+    
+    def _export_failed(self, msg):
+        self.lbl_result_count.setText("")
+        QMessageBox.critical(self, "Hata", f"Kayit hatasi: {msg}")
 
     # =========================================================================
     # SEKME 2: PERSONEL PERFORMANSI
@@ -390,12 +403,9 @@ class ReportView(QWidget):
         if not db:
             return
             
-        try:
-            data = db.get_operator_performance(days=30)
-        except:
-            QMessageBox.warning(self, "Uyari", "Performans verisi alinamadi.")
-            return
-            
+        self.perf_vm.reload(days=30)
+    
+    def show_performance(self, data):
         if not data:
             self.table_perf.setRowCount(0)
             return
@@ -537,12 +547,9 @@ class ReportView(QWidget):
         if not db:
             return
             
-        try:
-            data = db.get_fire_analysis_data()
-        except:
-            QMessageBox.warning(self, "Uyari", "Fire verisi alinamadi.")
-            return
-            
+        self.fire_vm.reload()
+    
+    def show_fire(self, data):
         if not data:
             self.table_fire.setRowCount(0)
             self.lbl_total_fire.setText("Toplam: 0 adet fire")
@@ -597,22 +604,22 @@ class ReportView(QWidget):
     # =========================================================================
     def _get_table_style(self):
         return f"""
-            QTableWidget {{
+            QTableView {{
                 border: 1px solid {Colors.BORDER};
                 border-radius: 4px;
                 gridline-color: {Colors.GRID};
                 font-size: 11px;
                 background-color: {Colors.BG};
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 8px;
                 border-bottom: 1px solid {Colors.GRID};
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {Colors.SELECTION};
                 color: {Colors.TEXT};
             }}
-            QTableWidget::item:alternate {{
+            QTableView::item:alternate {{
                 background-color: {Colors.ROW_ALT};
             }}
             QHeaderView::section {{
@@ -9,9 +9,9 @@ from PySide6.QtWidgets import (
     QHeaderView, QComboBox, QMessageBox, QFrame, 
     QAbstractItemView, QTabWidget, QSpinBox, QScrollArea,
     QGridLayout, QGroupBox, QDialog, QFormLayout,
-    QCheckBox, QColorDialog
+    QCheckBox, QColorDialog, QDateEdit
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QDate
 from PySide6.QtGui import QColor, QFont
 
 try:
@@ -52,6 +52,7 @@ class SettingsView(QWidget):
         super().__init__()
         self.setup_ui()
         self.refresh_users()
+        self.refresh_holidays()
 
     def setup_ui(self):
         self.setStyleSheet(f"background-color: {Colors.BG};")
@@ -116,6 +117,11 @@ class SettingsView(QWidget):
         self.setup_stations_tab()
         self.tabs.addTab(self.tab_stations, "Istasyon Ayarlari")
         
+        # Sekme 3: Tatil Gunleri (planlama takvimi)
+        self.tab_holidays = QWidget()
+        self.setup_holidays_tab()
+        self.tabs.addTab(self.tab_holidays, "Tatil Gunleri")
+        
         layout.addWidget(self.tabs)
 
     # =========================================================================
@@ -487,6 +493,104 @@ class SettingsView(QWidget):
         
         layout.addLayout(bottom_bar)
 
+    # =========================================================================
+    # SEKME 3: TATIL GUNLERI
+    # =========================================================================
+    def setup_holidays_tab(self):
+        layout = QVBoxLayout(self.tab_holidays)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(16)
+        
+        info_text = QLabel("Tatil gunlerinde vardiya calismaz; planlama takvimi bu gunleri atlar.")
+        info_text.setStyleSheet(f"font-size: 11px; color: {Colors.INFO};")
+        layout.addWidget(info_text)
+        
+        input_style = f"""
+            QLineEdit, QDateEdit {{
+                border: 1px solid {Colors.BORDER};
+                border-radius: 3px;
+                padding: 6px 10px;
+                font-size: 11px;
+                background-color: {Colors.BG};
+            }}
+            QLineEdit:focus, QDateEdit:focus {{
+                border-color: {Colors.ACCENT};
+            }}
+        """
+        
+        # Ekleme satiri
+        form = QHBoxLayout()
+        form.setSpacing(10)
+        
+        self.inp_holiday_date = QDateEdit(QDate.currentDate())
+        self.inp_holiday_date.setCalendarPopup(True)
+        self.inp_holiday_date.setDisplayFormat("yyyy-MM-dd")
+        self.inp_holiday_date.setFixedWidth(140)
+        self.inp_holiday_date.setStyleSheet(input_style)
+        form.addWidget(self.inp_holiday_date)
+        
+        self.inp_holiday_desc = QLineEdit()
+        self.inp_holiday_desc.setPlaceholderText("Aciklama (orn. Cumhuriyet Bayrami)")
+        self.inp_holiday_desc.setStyleSheet(input_style)
+        form.addWidget(self.inp_holiday_desc, 1)
+        
+        btn_add = QPushButton("Tatil Ekle")
+        btn_add.setFixedHeight(30)
+        btn_add.setCursor(Qt.PointingHandCursor)
+        btn_add.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {Colors.ACCENT};
+                border: none;
+                border-radius: 4px;
+                padding: 0 16px;
+                color: white;
+                font-size: 11px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: #1D6640;
+            }}
+        """)
+        btn_add.clicked.connect(self.add_holiday)
+        form.addWidget(btn_add)
+        
+        btn_del = QPushButton("Seciliyi Sil")
+        btn_del.setFixedHeight(30)
+        btn_del.setCursor(Qt.PointingHandCursor)
+        btn_del.setStyleSheet(f"""
+            QPushButton {{
+                background-color: transparent;
+                border: 1px solid {Colors.CRITICAL};
+                border-radius: 3px;
+                padding: 0 12px;
+                color: {Colors.CRITICAL};
+                font-size: 10px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: {Colors.CRITICAL};
+                color: white;
+            }}
+        """)
+        btn_del.clicked.connect(self.delete_holiday)
+        form.addWidget(btn_del)
+        
+        layout.addLayout(form)
+        
+        # Tablo
+        self.holiday_table = QTableWidget()
+        self.holiday_table.setColumnCount(2)
+        self.holiday_table.setHorizontalHeaderLabels(["Tarih", "Aciklama"])
+        self.holiday_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.holiday_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
+        self.holiday_table.setColumnWidth(0, 120)
+        self.holiday_table.verticalHeader().setVisible(False)
+        self.holiday_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.holiday_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.holiday_table.setAlternatingRowColors(True)
+        self.holiday_table.setStyleSheet(self.user_table.styleSheet())
+        layout.addWidget(self.holiday_table, 1)
+
     # =========================================================================
     # FONKSIYONLAR
     # =========================================================================
@@ -552,6 +656,43 @@ class SettingsView(QWidget):
             if db.delete_user(uid):
                 self.refresh_users()
 
+    def refresh_holidays(self):
+        if not db:
+            return
+        holidays = db.get_holiday_list()
+        self.holiday_table.setRowCount(len(holidays))
+        for r, h in enumerate(holidays):
+            self.holiday_table.setItem(r, 0, QTableWidgetItem(h['holiday_date']))
+            self.holiday_table.setItem(r, 1, QTableWidgetItem(h['description'] or ""))
+
+    def add_holiday(self):
+        if not db:
+            return
+        day = self.inp_holiday_date.date().toString("yyyy-MM-dd")
+        if db.add_holiday(day, self.inp_holiday_desc.text().strip()):
+            self.inp_holiday_desc.clear()
+            self.refresh_holidays()
+        else:
+            QMessageBox.warning(self, "Uyari", f"{day} zaten tatil olarak kayitli.")
+
+    def delete_holiday(self):
+        if not db:
+            return
+        sel = self.holiday_table.selectedItems()
+        if not sel:
+            QMessageBox.warning(self, "Uyari", "Silmek icin bir tatil gunu secin.")
+            return
+        
+        day = self.holiday_table.item(sel[0].row(), 0).text()
+        reply = QMessageBox.question(
+            self, "Onay",
+            f"{day} tatil listesinden silinsin mi?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            db.delete_holiday(day)
+            self.refresh_holidays()
+
     def save_all_capacities(self):
         """Tum kapasiteleri kaydet"""
         if not factory_config:
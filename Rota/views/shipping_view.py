@@ -9,6 +9,7 @@ Ozellikler:
 - Hizli sevkiyat ozeti
 - Sehpa yonetimi
 - Tek tikla sevkiyat
+- Veri ShippingViewModel / PalletContentViewModel ile arka planda okunur
 """
 
 import sys
@@ -20,7 +21,7 @@ from PySide6.QtWidgets import (
     QListWidget, QFrame, QMessageBox, QComboBox,
     QScrollArea, QSplitter, QApplication, QListWidgetItem
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QFont
 
 try:
@@ -28,6 +29,13 @@ try:
 except ImportError:
     db = None
 
+try:
+    from core.refresh_coordinator import refresh_coordinator
+except ImportError:
+    refresh_coordinator = None
+
+from core.view_models import ShippingViewModel, PalletContentViewModel
+
 
 # =============================================================================
 # TEMA
@@ -70,10 +78,18 @@ class ShippingView(QWidget):
         self.today_orders = []
         self.setup_ui()
         
-        # Otomatik yenileme
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_data)
-        self.timer.start(30000)  # 30 saniye
+        self.vm = ShippingViewModel(self)
+        self.vm.data_ready.connect(self.apply_data)
+        self.vm.failed.connect(lambda msg: self.status_label.setText(f"Hata: {msg}"))
+        
+        self.pallet_vm = PalletContentViewModel(self)
+        self.pallet_vm.data_ready.connect(self.apply_pallet_content)
+        self.pallet_vm.failed.connect(lambda msg: print(f"Sehpa icerigi yukleme hatasi: {msg}"))
+        
+        # Otomatik yenileme (merkezi koordinator: siparis, uretim veya sehpa degisince)
+        if refresh_coordinator:
+            refresh_coordinator.subscribe(("orders", "progress", "pallets", "day"),
+                                          lambda event: self.refresh_data(), owner=self)
         
         self.refresh_data()
     
@@ -662,227 +678,119 @@ class ShippingView(QWidget):
     # =========================================================================
     
     def refresh_data(self):
-        """Tum verileri yenile"""
+        """Tum verileri yenile (sonuc apply_data ile gelir)"""
+        if db:
+            self.vm.reload()
+    
+    def apply_data(self, data):
+        """ViewModel'den gelen hazir veriyi ekrana uygula"""
         try:
-            self._load_ready_orders()
-            self._load_pallets()
-            self._load_completed_shipments()
+            self._load_ready_orders(data['ready'], data['delayed'], data['today'])
+            self._load_pallets(data['pallets'])
+            self._load_completed_shipments(data['shipped'])
             self._update_summary()
             self.status_label.setText(f"Guncellendi: {datetime.now().strftime('%H:%M:%S')}")
         except Exception as e:
             self.status_label.setText(f"Hata: {str(e)}")
     
-    def _load_ready_orders(self):
-        """Sevke hazir siparisleri yukle"""
-        self.table_orders.setRowCount(0)
-        self.ready_orders = []
-        self.delayed_orders = []
-        self.today_orders = []
+    def _load_ready_orders(self, ready_list, delayed, today):
+        """Sevke hazir siparisleri tabloya yaz (siralama ve gecikme analizi ViewModel'de)"""
+        self.ready_orders = ready_list
+        self.delayed_orders = delayed
+        self.today_orders = today
         
-        if not db:
-            return
+        self.table_orders.setRowCount(0)
+        self.table_orders.setRowCount(len(ready_list))
         
-        try:
-            all_orders = db.get_production_matrix_advanced()
-            today = datetime.now().date()
+        for row, order in enumerate(ready_list):
+            # Siparis kodu
+            code_item = QTableWidgetItem(order.get('code', '-'))
+            code_item.setData(Qt.UserRole, order.get('id'))
+            self.table_orders.setItem(row, 0, code_item)
             
-            # Orders tablosundan ek bilgileri al
-            orders_info = {}
-            try:
-                with db.get_connection() as conn:
-                    rows = conn.execute("""
-                        SELECT id, delivery_date, declared_total_m2, pallet_id, status
-                        FROM orders
-                        WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
-                    """).fetchall()
-                    
-                    for row in rows:
-                        orders_info[row['id']] = {
-                            'delivery_date': row['delivery_date'],
-                            'm2': row['declared_total_m2'] or 0,
-                            'pallet_id': row['pallet_id'],
-                            'status': row['status']
-                        }
-            except:
-                pass
+            # Musteri
+            self.table_orders.setItem(row, 1, QTableWidgetItem(order.get('customer', '-')))
             
-            ready_list = []
+            # Urun
+            self.table_orders.setItem(row, 2, QTableWidgetItem("Cam"))
             
-            for order in all_orders:
-                status_map = order.get('status_map', {})
-                order_id = order.get('id')
-                
-                # Is var mi?
-                has_work = any(s.get('status') != 'Yok' for s in status_map.values())
-                if not has_work:
-                    continue
-                
-                # Tum istasyonlar tamamlandi mi?
-                all_done = all(s.get('status') in ['Bitti', 'Yok'] for s in status_map.values())
-                if not all_done:
-                    continue
-                
-                # Zaten sehpada mi veya sevk edilmis mi?
-                info = orders_info.get(order_id, {})
-                if info.get('pallet_id'):
-                    continue
-                
-                # Bilgileri zenginlestir
-                order['delivery_date'] = info.get('delivery_date', '')
-                order['m2'] = info.get('m2', 0)
-                
-                # Teslim tarihi analizi
-                delivery_str = order['delivery_date']
-                if delivery_str:
-                    try:
-                        delivery_date = datetime.strptime(delivery_str, '%Y-%m-%d').date()
-                        days_diff = (delivery_date - today).days
-                        order['days_diff'] = days_diff
-                        
-                        if days_diff < 0:
-                            order['status_type'] = 'delayed'
-                            self.delayed_orders.append(order)
-                        elif days_diff == 0:
-                            order['status_type'] = 'today'
-                            self.today_orders.append(order)
-                        else:
-                            order['status_type'] = 'normal'
-                    except:
-                        order['status_type'] = 'normal'
-                        order['days_diff'] = 999
-                else:
-                    order['status_type'] = 'normal'
-                    order['days_diff'] = 999
-                
-                ready_list.append(order)
+            # Adet
+            self.table_orders.setItem(row, 3, QTableWidgetItem(str(order.get('total_qty', 0))))
             
-            # Oncelik sirasina gore sirala: geciken > bugun > diger
-            ready_list.sort(key=lambda x: (
-                0 if x.get('status_type') == 'delayed' else (1 if x.get('status_type') == 'today' else 2),
-                x.get('days_diff', 999)
-            ))
+            # m2
+            m2 = order.get('m2', 0)
+            self.table_orders.setItem(row, 4, QTableWidgetItem(f"{m2:.0f}"))
             
-            self.ready_orders = ready_list
+            # Teslim tarihi
+            delivery_str = order.get('delivery_date') or '-'
+            self.table_orders.setItem(row, 5, QTableWidgetItem(delivery_str))
             
-            # Tabloyu doldur
-            self.table_orders.setRowCount(len(ready_list))
+            # Durum
+            status_type = order.get('status_type', 'normal')
+            days_diff = order.get('days_diff', 999)
             
-            for row, order in enumerate(ready_list):
-                # Siparis kodu
-                code_item = QTableWidgetItem(order.get('code', '-'))
-                code_item.setData(Qt.UserRole, order.get('id'))
-                self.table_orders.setItem(row, 0, code_item)
-                
-                # Musteri
-                self.table_orders.setItem(row, 1, QTableWidgetItem(order.get('customer', '-')))
-                
-                # Urun
-                self.table_orders.setItem(row, 2, QTableWidgetItem("Cam"))
-                
-                # Adet
-                status_map = order.get('status_map', {})
-                total_qty = max((s.get('total', 0) for s in status_map.values()), default=0)
-                self.table_orders.setItem(row, 3, QTableWidgetItem(str(int(total_qty))))
-                
-                # m2
-                m2 = order.get('m2', 0)
-                self.table_orders.setItem(row, 4, QTableWidgetItem(f"{m2:.0f}"))
-                
-                # Teslim tarihi
-                delivery_str = order.get('delivery_date', '-')
-                self.table_orders.setItem(row, 5, QTableWidgetItem(delivery_str))
-                
-                # Durum
-                status_type = order.get('status_type', 'normal')
-                days_diff = order.get('days_diff', 999)
-                
-                if status_type == 'delayed':
-                    status_text = f"GECIKTI ({abs(days_diff)}g)"
-                    status_color = Colors.CRITICAL
-                    bg_color = Colors.CRITICAL_BG
-                elif status_type == 'today':
-                    status_text = "BUGUN!"
-                    status_color = Colors.WARNING
-                    bg_color = Colors.WARNING_BG
-                else:
-                    status_text = "Hazir"
-                    status_color = Colors.SUCCESS
-                    bg_color = None
-                
-                status_item = QTableWidgetItem(status_text)
-                status_item.setForeground(QColor(status_color))
-                if bg_color:
-                    status_item.setBackground(QColor(bg_color))
-                self.table_orders.setItem(row, 6, status_item)
-                
-                # Satir arka plan rengi
-                if status_type == 'delayed':
-                    for col in range(6):
-                        item = self.table_orders.item(row, col)
-                        if item:
-                            item.setBackground(QColor(Colors.CRITICAL_BG))
-                elif status_type == 'today':
-                    for col in range(6):
-                        item = self.table_orders.item(row, col)
-                        if item:
-                            item.setBackground(QColor(Colors.WARNING_BG))
+            if status_type == 'delayed':
+                status_text = f"GECIKTI ({abs(days_diff)}g)"
+                status_color = Colors.CRITICAL
+                bg_color = Colors.CRITICAL_BG
+            elif status_type == 'today':
+                status_text = "BUGUN!"
+                status_color = Colors.WARNING
+                bg_color = Colors.WARNING_BG
+            else:
+                status_text = "Hazir"
+                status_color = Colors.SUCCESS
+                bg_color = None
             
-        except Exception as e:
-            print(f"Siparis yukleme hatasi: {e}")
+            status_item = QTableWidgetItem(status_text)
+            status_item.setForeground(QColor(status_color))
+            if bg_color:
+                status_item.setBackground(QColor(bg_color))
+            self.table_orders.setItem(row, 6, status_item)
+            
+            # Satir arka plan rengi
+            if bg_color:
+                for col in range(6):
+                    item = self.table_orders.item(row, col)
+                    if item:
+                        item.setBackground(QColor(bg_color))
     
-    def _load_pallets(self):
-        """Sehpalari yukle"""
-        if not db:
-            return
-        
+    def _load_pallets(self, pallets):
+        """Sehpalari doldur (secim korunur, icerik tek istekle yuklenir)"""
         current_id = self.combo_pallets.currentData()
-        self.combo_pallets.clear()
         
-        try:
-            pallets = db.get_active_pallets()
-            
-            for p in pallets:
-                self.combo_pallets.addItem(
-                    f"{p['pallet_name']} - {p.get('customer_name', 'Genel')}",
-                    p['id']
-                )
-            
-            if current_id:
-                idx = self.combo_pallets.findData(current_id)
-                if idx >= 0:
-                    self.combo_pallets.setCurrentIndex(idx)
-            
-            self.load_pallet_content()
-            
-        except Exception as e:
-            print(f"Sehpa yukleme hatasi: {e}")
+        self.combo_pallets.blockSignals(True)
+        self.combo_pallets.clear()
+        for p in pallets:
+            self.combo_pallets.addItem(
+                f"{p['pallet_name']} - {p.get('customer_name', 'Genel')}",
+                p['id']
+            )
+        if current_id:
+            idx = self.combo_pallets.findData(current_id)
+            if idx >= 0:
+                self.combo_pallets.setCurrentIndex(idx)
+        self.combo_pallets.blockSignals(False)
+        
+        self.load_pallet_content()
     
-    def _load_completed_shipments(self):
-        """Son sevkiyatlari yukle"""
+    def _load_completed_shipments(self, completed):
+        """Son sevkiyatlari listele"""
         self.list_completed.clear()
         
-        if not db:
-            return
-        
-        try:
-            completed = db.get_shipped_pallets()
+        for p in completed:
+            date_str = p.get('shipped_at', p.get('created_at', ''))
+            if date_str:
+                try:
+                    dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+                    date_str = dt.strftime('%d.%m %H:%M')
+                except:
+                    pass
             
-            for p in completed[:10]:  # Son 10 sevkiyat
-                date_str = p.get('shipped_at', p.get('created_at', ''))
-                if date_str:
-                    try:
-                        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        date_str = dt.strftime('%d.%m %H:%M')
-                    except:
-                        pass
-                
-                item = QListWidgetItem(
-                    f"{p.get('pallet_name', '-')} - {p.get('customer_name', '-')} ({date_str})"
-                )
-                self.list_completed.addItem(item)
-                
-        except Exception as e:
-            print(f"Tamamlanan sevkiyat yukleme hatasi: {e}")
+            item = QListWidgetItem(
+                f"{p.get('pallet_name', '-')} - {p.get('customer_name', '-')} ({date_str})"
+            )
+            self.list_completed.addItem(item)
     
     def _update_summary(self):
         """Ozet istatistiklerini guncelle"""
@@ -908,50 +816,31 @@ class ShippingView(QWidget):
         self.lbl_pallet_count.setText(str(self.combo_pallets.count()))
     
     def load_pallet_content(self):
-        """Secili sehpa icerigini yukle"""
-        self.list_pallet.clear()
-        self.lbl_pallet_summary.setText("0 siparis, 0 m2")
-        self.lbl_pallet_info.setText("")
-        
+        """Secili sehpa icerigini yukle (sonuc apply_pallet_content ile gelir)"""
         pallet_id = self.combo_pallets.currentData()
         if not pallet_id or not db:
+            self.apply_pallet_content({'pallet_id': None, 'pallet': None, 'orders': [], 'total_m2': 0})
+            return
+        self.pallet_vm.reload(pallet_id=pallet_id)
+    
+    def apply_pallet_content(self, content):
+        """Sehpa icerigini listele (arada secim degistiyse eski sonuc yok sayilir)"""
+        if content['pallet_id'] != self.combo_pallets.currentData():
             return
         
-        try:
-            with db.get_connection() as conn:
-                # Sehpa bilgisi
-                pallet = conn.execute(
-                    "SELECT * FROM pallets WHERE id = ?", (pallet_id,)
-                ).fetchone()
-                
-                if pallet:
-                    self.lbl_pallet_info.setText(
-                        f"Musteri: {pallet.get('customer_name', 'Genel')}"
-                    )
-                
-                # Sehpadaki siparisler
-                rows = conn.execute("""
-                    SELECT order_code, customer_name, product_type, quantity, declared_total_m2
-                    FROM orders
-                    WHERE pallet_id = ?
-                    ORDER BY order_code
-                """, (pallet_id,)).fetchall()
-                
-                total_m2 = 0
-                for r in rows:
-                    m2 = r['declared_total_m2'] or 0
-                    total_m2 += m2
-                    
-                    item = QListWidgetItem(
-                        f"{r['order_code']} - {r['customer_name']} ({r['quantity']} adet, {m2:.0f} m2)"
-                    )
-                    item.setData(Qt.UserRole, r['order_code'])
-                    self.list_pallet.addItem(item)
-                
-                self.lbl_pallet_summary.setText(f"{len(rows)} siparis, {total_m2:.0f} m2")
-                
-        except Exception as e:
-            print(f"Sehpa icerigi yukleme hatasi: {e}")
+        self.list_pallet.clear()
+        pallet = content['pallet']
+        self.lbl_pallet_info.setText(f"Musteri: {pallet.get('customer_name') or 'Genel'}" if pallet else "")
+        
+        for r in content['orders']:
+            m2 = r['declared_total_m2'] or 0
+            item = QListWidgetItem(
+                f"{r['order_code']} - {r['customer_name']} ({r['quantity']} adet, {m2:.0f} m2)"
+            )
+            item.setData(Qt.UserRole, r['order_code'])
+            self.list_pallet.addItem(item)
+        
+        self.lbl_pallet_summary.setText(f"{len(content['orders'])} siparis, {content['total_m2']:.0f} m2")
     
     # =========================================================================
     # AKSIYONLAR
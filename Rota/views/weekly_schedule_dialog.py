@@ -7,13 +7,17 @@ from PySide6.QtGui import QColor, QFont
 
 try:
     from ui.theme import Theme
-    from core.smart_planner import planner
     from core.pdf_engine import PDFEngine
 except ImportError:
     pass
 
+try:
+    from core.plan_store import plan_store
+except ImportError:
+    plan_store = None
+
 class WeeklyScheduleView(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, details=None):
         super().__init__(parent)
         self.setWindowTitle("Haftalık Üretim Programı")
         self.resize(1000, 700)
@@ -21,34 +25,23 @@ class WeeklyScheduleView(QDialog):
 
         # 1. VERİYİ ÇEK VE KONTROL ET
         print("\n--- HAFTALIK LİSTE OLUŞTURULUYOR ---")
-        self.schedule_data = self.get_plan_data()
+        self.schedule_data = self.get_plan_data(details)
 
         self.setup_ui()
 
-    def get_plan_data(self):
+    def get_plan_data(self, details=None):
         """
-        SmartPlanner'dan detaylı listeyi ister.
+        Çağıranın elindeki planı (PlanningView) kullanır; verilmezse kayıtlı
+        plan tazeyse onu okur. Arayüz thread'inde plan hesaplanmaz.
         """
         try:
-            if 'planner' not in globals() or planner is None:
-                print("❌ HATA: Planner modülü bulunamadı!")
-                return {}
-
-            # Motordan veriyi iste (Grid, Details, [FinishDate])
-            result = planner.calculate_forecast()
-            
-            # Gelen veriyi analiz et
-            details = {}
-            if isinstance(result, tuple):
-                # Eğer 3 veri dönüyorsa (v10 motoru) veya 2 veri dönüyorsa
-                # Genelde 2. eleman details'dir.
-                if len(result) >= 2:
-                    details = result[1]
-                    print(f"✅ Veri başarıyla alındı. {len(details.keys())} makine için veri var.")
-                else:
-                    print("⚠️ Veri formatı beklenenden kısa!")
-            else:
-                print("⚠️ Veri tuple değil!")
+            if details is None:
+                plan = plan_store.get_fresh_plan() if plan_store else None
+                if plan is None:
+                    print("⚠️ Güncel plan yok (İş Yükü ekranında hesaplanır)")
+                    return {}
+                details = plan.details
+            print(f"✅ Veri başarıyla alındı. {len(details.keys())} makine için veri var.")
 
             return details
                 